@@ -1877,11 +1877,11 @@ with tab6:
     if not database_url:
         st.warning("No database URL configured. History is only available when connected to a database.")
     else:
-        import psycopg2
         from psycopg2.extras import RealDictCursor
+        from src.tools import db_pool
 
         try:
-            conn = psycopg2.connect(database_url)
+            conn = db_pool.connect(database_url)
 
             # Section 1: Historical Runs
             st.subheader("Historical Runs")
@@ -25,9 +25,10 @@ from dotenv import load_dotenv
 load_dotenv()
 
 import os
-import psycopg2
 from psycopg2.extras import RealDictCursor
 
+from src.tools import db_pool
+
 st.set_page_config(
     page_title="Efficacy Metrics Browser",
     page_icon="📊",
@@ -47,8 +48,8 @@ st.markdown("Browse structured efficacy metrics extracted from case series paper
 
 
 def get_connection():
-    """Get database connection."""
-    return psycopg2.connect(os.getenv('DATABASE_URL'))
+    """Get a pooled database connection; close() returns it to the pool."""
+    return db_pool.connect(os.getenv('DATABASE_URL'))
 
 
 @st.cache_data(ttl=300)
@@ -39,10 +39,10 @@ if not check_page_access("Disease_Analysis"):
 from dotenv import load_dotenv
 load_dotenv()
 
-import psycopg2
 from psycopg2.extras import RealDictCursor
 import os
 
+from src.tools import db_pool
 from src.drug_extraction_system.database.connection import DatabaseConnection
 from src.drug_extraction_system.api_clients.clinicaltrials_client import ClinicalTrialsClient
 from src.drug_extraction_system.api_clients.openfda_client import OpenFDAClient
@@ -140,7 +140,7 @@ def get_unique_diseases() -> List[Dict[str, Any]]:
     if not database_url:
         return []
 
-    conn = psycopg2.connect(database_url)
+    conn = db_pool.connect(database_url)
     try:
         with conn.cursor(cursor_factory=RealDictCursor) as cur:
             cur.execute("""
@@ -166,7 +166,7 @@ def get_last_workflow_run(disease_name: str, workflow_type: str) -> Optional[dat
     if not database_url:
         return None
 
-    conn = psycopg2.connect(database_url)
+    conn = db_pool.connect(database_url)
     try:
         with conn.cursor(cursor_factory=RealDictCursor) as cur:
             if workflow_type == "pipeline":
@@ -198,7 +198,7 @@ def get_all_disease_intelligence() -> List[Dict[str, Any]]:
     if not database_url:
         return []
 
-    conn = psycopg2.connect(database_url)
+    conn = db_pool.connect(database_url)
     try:
         with conn.cursor(cursor_factory=RealDictCursor) as cur:
             cur.execute("""
@@ -224,7 +224,7 @@ def get_all_pipeline_runs(limit: int = 100) -> List[Dict[str, Any]]:
     if not database_url:
         return []
 
-    conn = psycopg2.connect(database_url)
+    conn = db_pool.connect(database_url)
     try:
         with conn.cursor(cursor_factory=RealDictCursor) as cur:
             cur.execute("""
@@ -261,7 +261,7 @@ def get_pipeline_drugs(disease_name: str) -> List[Dict[str, Any]]:
         return []
 
     try:
-        conn = psycopg2.connect(database_url)
+        conn = db_pool.connect(database_url)
         with conn.cursor(cursor_factory=RealDictCursor) as cur:
             # Get drugs with clinical trial info for this specific indication
             # Use DISTINCT ON to deduplicate by drug_id
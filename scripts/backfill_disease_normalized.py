@@ -27,6 +27,7 @@ def backfill_disease_normalized():
     """Backfill disease_normalized column in cs_extractions."""
     from src.drug_extraction_system.database.connection import DatabaseConnection
     from src.case_series.services.disease_standardizer import DiseaseStandardizer
+    from src.tools.case_series_database import refresh_drug_summaries
 
     db = DatabaseConnection()
     standardizer = DiseaseStandardizer()
@@ -110,6 +111,14 @@ def backfill_disease_normalized():
     except Exception as e:
         logger.warning(f"Could not update parent_disease: {e}")
 
+    # Browser summaries (migration 022) group by the normalized/parent disease;
+    # this touches every drug, so rebuild them all at once
+    if disease_mapping:
+        logger.info("Rebuilding browser summary tables...")
+        with db.cursor() as cur:
+            refresh_drug_summaries(cur)
+            db.commit()
+
     # Print summary of normalizations
     logger.info("\n=== Disease Normalization Summary ===")
     changed = [(d, n) for d, n in disease_mapping.items() if d != n]
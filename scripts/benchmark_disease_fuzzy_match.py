@@ -0,0 +1,88 @@
+"""
+Benchmark the indexed fuzzy disease-name matcher against the exhaustive scan.
+
+Builds misspelled/perturbed queries from every canonical name and alias in
+the expanded taxonomy, checks that DiseaseTaxonomy._fuzzy_match returns the
+same result as _fuzzy_match_exhaustive at the 0.85 threshold, and reports
+timings for the exhaustive scan, the cold index and the warm memo.
+
+Usage:
+    python scripts/benchmark_disease_fuzzy_match.py [--variants 5] [--seed 0]
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.case_series.taxonomy.disease_taxonomy import (
+    FUZZY_MATCH_THRESHOLD,
+    get_default_taxonomy,
+)
+
+ALPHABET = "abcdefghijklmnopqrstuvwxyz -'"
+
+
+def perturb(text: str, rng: random.Random, max_edits: int = 3) -> str:
+    """Apply up to max_edits random insertions, deletions or substitutions."""
+    chars = list(text)
+    for _ in range(rng.randint(0, max_edits)):
+        op = rng.random()
+        pos = rng.randrange(len(chars) + 1)
+        if op < 0.33 and chars:
+            chars.pop(min(pos, len(chars) - 1))
+        elif op < 0.66:
+            chars.insert(pos, rng.choice(ALPHABET))
+        elif chars:
+            chars[min(pos, len(chars) - 1)] = rng.choice(ALPHABET)
+    return "".join(chars)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--variants", type=int, default=5, help="Perturbed queries per taxonomy name")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    taxonomy = get_default_taxonomy()
+    names = [name for name, _ in taxonomy._fuzzy_targets]
+    rng = random.Random(args.seed)
+    queries = [perturb(name, rng) for name in names for _ in range(args.variants)]
+    print(f"Taxonomy: {len(taxonomy.get_all_diseases())} diseases, {len(names)} distinct names")
+    print(f"Queries:  {len(queries)}")
+
+    start = time.perf_counter()
+    expected = [taxonomy._fuzzy_match_exhaustive(q) for q in queries]
+    exhaustive_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    indexed = [taxonomy._fuzzy_match(q) for q in queries]
+    indexed_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for q in queries:
+        taxonomy._fuzzy_match(q)
+    memo_s = time.perf_counter() - start
+
+    mismatches = 0
+    for query, exp, got in zip(queries, expected, indexed):
+        exp_match = exp if exp[1] >= FUZZY_MATCH_THRESHOLD else (None, 0.0)
+        if exp_match != got:
+            mismatches += 1
+            print(f"MISMATCH {query!r}: exhaustive={exp} indexed={got}")
+
+    matched = sum(1 for m, _ in indexed if m)
+    print(f"Matched:  {matched}/{len(queries)} at >= {FUZZY_MATCH_THRESHOLD}")
+    print(f"Exhaustive: {exhaustive_s:.3f}s ({exhaustive_s / len(queries) * 1000:.2f} ms/query)")
+    print(f"Indexed:    {indexed_s:.3f}s ({indexed_s / len(queries) * 1000:.2f} ms/query, "
+          f"{exhaustive_s / max(indexed_s, 1e-9):.0f}x)")
+    print(f"Memo hits:  {memo_s:.3f}s")
+    print(f"Mismatches: {mismatches}")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,422 @@
+"""
+Benchmark the streaming PubMed/PMC XML parsers against the tree parsers.
+
+Runs every XML file in the corpus directory through both
+PubMedAPI._parse_pmc_fulltext (streaming) and PMCTreeParser (the original
+ET.fromstring parser, kept here as the reference), or _parse_xml_response
+and parse_pubmed_tree for PubMed efetch batches, checks that the outputs
+are identical and reports time and peak traced memory for each.
+
+The corpus is real NCBI XML fetched once and kept on disk:
+
+    python scripts/benchmark_pubmed_xml_parsing.py --fetch-pmcids PMC1234567 PMC2345678
+    python scripts/benchmark_pubmed_xml_parsing.py --fetch-pmids 35190385 34567890
+
+Usage:
+    python scripts/benchmark_pubmed_xml_parsing.py [--corpus DIR] [--repeat 3]
+"""
+
+import argparse
+import logging
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from xml.etree import ElementTree as ET
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.tools.pubmed import PMCFullTextParser, PubMedAPI
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CORPUS_DIR = Path("data/pmc_xml_corpus")
+
+
+def parse_pubmed_tree(xml_text: str) -> List[Dict[str, Any]]:
+    """Parse a PubMed efetch batch by building the whole document tree."""
+    try:
+        root = ET.fromstring(xml_text)
+        articles = []
+
+        for article_elem in root.findall(".//PubmedArticle"):
+            article = PubMedAPI._extract_article_data(article_elem)
+            if article:
+                articles.append(article)
+
+        return articles
+
+    except ET.ParseError as e:
+        logger.error(f"XML parsing error: {str(e)}")
+        return []
+
+
+class PMCTreeParser(PMCFullTextParser):
+    """
+    The original tree-based PMC parser: ET.fromstring, then one findall
+    walk per field. Shares the per-element extractors with the streaming
+    parser, so any difference comes from how elements are found.
+    """
+
+    def parse(self, xml_text: str, pmid: str, pmcid: str) -> Optional[Dict[str, Any]]:
+        """Parse PMC full-text XML by building the whole document tree."""
+        try:
+            root = ET.fromstring(xml_text)
+
+            # Extract title
+            title_elem = root.find(".//article-title")
+            title = title_elem.text if title_elem is not None else "No title"
+
+            # Extract authors
+            authors = []
+            for contrib in root.findall(".//contrib[@contrib-type='author']"):
+                author = self._extract_contrib_author(contrib)
+                if author is not None:
+                    authors.append(author)
+
+            # Extract journal
+            journal_elem = root.find(".//journal-title")
+            if not journal_elem:
+                journal_elem = root.find(".//journal-id")
+            journal = journal_elem.text if journal_elem is not None else "Unknown journal"
+
+            # Extract year and month
+            year_elem = root.find(".//pub-date/year")
+            if not year_elem:
+                year_elem = root.find(".//year")
+            year = year_elem.text if year_elem is not None else "Unknown"
+
+            month_elem = root.find(".//pub-date/month")
+            if not month_elem:
+                month_elem = root.find(".//month")
+            month = month_elem.text if month_elem is not None else "01"
+
+            # Extract DOI
+            doi_elem = root.find(".//article-id[@pub-id-type='doi']")
+            doi = doi_elem.text if doi_elem is not None else None
+
+            # Extract abstract
+            abstract_elem = root.find(".//abstract")
+            abstract = ""
+            if abstract_elem is not None:
+                abstract = " ".join(abstract_elem.itertext())
+
+            # Extract full body text
+            body_elem = root.find(".//body")
+            body_text = ""
+            if body_elem is not None:
+                body_text = " ".join(body_elem.itertext())
+
+            fields = {
+                "title": title,
+                "authors": authors,
+                "journal": journal,
+                "year": year,
+                "month": month,
+                "doi": doi,
+                # Additional metadata (based on tidypmc pmc_metadata approach)
+                "keywords": self._extract_keywords(root),
+                "volume": self._extract_volume(root),
+                "issue": self._extract_issue(root),
+                "pages": self._extract_pages(root),
+                "article_type": self._extract_article_type(root),
+                "pub_date": self._extract_pub_date(root),
+                "abstract": abstract,
+                "body_text": body_text,
+                "tables": self._extract_and_validate_pmc_tables(root),
+                "sections": self._extract_sections_from_pmc_xml(root),
+                "captions": self._extract_captions(root),
+                "references": self._extract_references(root),
+            }
+            return self._build_pmc_paper(pmid, pmcid, fields, lambda: " ".join(root.itertext()))
+
+        except Exception as e:
+            logger.error(f"Error parsing PMC full-text for {pmcid}: {str(e)}")
+            return None
+
+    def _extract_and_validate_pmc_tables(self, root: ET.Element) -> List[Dict[str, Any]]:
+        """
+        Extract tables from PMC XML and validate them.
+
+        Only includes tables that have:
+        - A label (Table 1, Table 2, etc.)
+        - Actual table structure (not just text)
+        - Both headers and data rows
+
+        Args:
+            root: XML root element
+
+        Returns:
+            List of validated tables
+        """
+        validated_tables = []
+
+        for table_wrap in root.findall(".//table-wrap"):
+            table = self._validate_pmc_table(table_wrap)
+            if table:
+                validated_tables.append(table)
+
+        return validated_tables
+
+    def _extract_keywords(self, root: ET.Element) -> List[str]:
+        """Extract keywords from PMC XML"""
+        keywords = []
+        for kwd in root.findall(".//kwd"):
+            kwd_text = " ".join(kwd.itertext()).strip()
+            if kwd_text:
+                keywords.append(kwd_text)
+        return keywords
+
+    def _extract_volume(self, root: ET.Element) -> Optional[str]:
+        """Extract volume from PMC XML"""
+        volume_elem = root.find(".//volume")
+        return volume_elem.text if volume_elem is not None else None
+
+    def _extract_issue(self, root: ET.Element) -> Optional[str]:
+        """Extract issue from PMC XML"""
+        issue_elem = root.find(".//issue")
+        return issue_elem.text if issue_elem is not None else None
+
+    def _extract_pages(self, root: ET.Element) -> Optional[str]:
+        """Extract page numbers from PMC XML"""
+        fpage = root.find(".//fpage")
+        lpage = root.find(".//lpage")
+
+        if fpage is not None and lpage is not None:
+            return f"{fpage.text}-{lpage.text}"
+        elif fpage is not None:
+            return fpage.text
+        elif lpage is not None:
+            return lpage.text
+        return None
+
+    def _extract_article_type(self, root: ET.Element) -> Optional[str]:
+        """Extract article type from PMC XML"""
+        article = root.find(".//article")
+        if article is not None:
+            return article.get("article-type")
+        return None
+
+    def _extract_pub_date(self, root: ET.Element) -> Optional[str]:
+        """Extract publication date from PMC XML"""
+        pub_date = root.find(".//pub-date")
+        if pub_date is not None:
+            return self._format_pub_date(pub_date)
+        return None
+
+    def _extract_captions(self, root: ET.Element) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Extract figure, table and supplementary material captions from PMC XML.
+
+        Based on tidypmc's pmc_caption approach:
+        - Extracts captions from <fig>, <table-wrap>, and <supplementary-material>
+        - Maintains association with parent element
+        - Splits captions into sentences
+
+        Args:
+            root: XML root element
+
+        Returns:
+            Dictionary with 'figures', 'tables', 'supplementary' keys containing captions
+        """
+        captions = {
+            'figures': [],
+            'tables': [],
+            'supplementary': []
+        }
+
+        # Extract figure captions
+        for fig in root.findall(".//fig"):
+            caption = self._extract_caption(fig, "Figure")
+            if caption:
+                captions['figures'].append(caption)
+
+        # Extract table captions
+        for table_wrap in root.findall(".//table-wrap"):
+            caption = self._extract_caption(table_wrap, "Table")
+            if caption:
+                captions['tables'].append(caption)
+
+        # Extract supplementary material captions
+        for supp in root.findall(".//supplementary-material"):
+            caption = self._extract_caption(supp, "Supplementary Material")
+            if caption:
+                captions['supplementary'].append(caption)
+
+        return captions
+
+    def _extract_references(self, root: ET.Element) -> List[Dict[str, Any]]:
+        """
+        Extract references from PMC XML.
+
+        Based on tidypmc's pmc_reference approach:
+        - Extracts reference metadata from <back> section
+        - Parses author, title, journal, year, DOI
+        - Returns structured reference data
+
+        Args:
+            root: XML root element
+
+        Returns:
+            List of reference dictionaries
+        """
+        references = []
+
+        # Find all references in back section
+        for ref in root.findall(".//back/ref-list/ref"):
+            reference = self._extract_reference(ref)
+            if reference:
+                references.append(reference)
+
+        return references
+
+    def _extract_sections_from_pmc_xml(self, root: ET.Element) -> Dict[str, Dict[str, Any]]:
+        """
+        Extract sections directly from PMC XML structure.
+
+        Based on tidypmc's pmc_text function approach:
+        - Extracts <sec> elements with <title> tags
+        - Builds full path to subsection titles
+        - Extracts all paragraphs within each section
+
+        Args:
+            root: XML root element
+
+        Returns:
+            Dictionary of sections with content
+        """
+        sections = {}
+
+        # Find all top-level sections
+        for sec in root.findall(".//sec"):
+            # Get section title
+            title_elem = sec.find(".//title")
+            if title_elem is None:
+                continue
+
+            title = " ".join(title_elem.itertext()).strip()
+            if not title:
+                continue
+
+            # Extract all paragraphs in this section
+            paragraphs = []
+            for p in sec.findall(".//p"):
+                p_text = " ".join(p.itertext()).strip()
+                if p_text:
+                    paragraphs.append(p_text)
+
+            # Extract subsections
+            subsections = []
+            for subsec in sec.findall(".//sec"):
+                subsec_title_elem = subsec.find(".//title")
+                if subsec_title_elem is not None:
+                    subsec_title = " ".join(subsec_title_elem.itertext()).strip()
+                    if subsec_title and subsec_title != title:
+                        subsections.append(subsec_title)
+
+            # Create section key (normalize title)
+            section_key = title.lower().replace(" ", "_")
+
+            # Store section
+            if paragraphs or subsections:
+                sections[section_key] = {
+                    "title": title,
+                    "content": "\n\n".join(paragraphs),
+                    "subsections": subsections,
+                    "paragraph_count": len(paragraphs)
+                }
+
+        logger.debug(f"  Extracted {len(sections)} sections from PMC XML: {list(sections.keys())}")
+        return sections
+
+
+def fetch_corpus(api: PubMedAPI, corpus_dir: Path, pmcids, pmids):
+    """Download PMC articles and one PubMed efetch batch into the corpus."""
+    corpus_dir.mkdir(parents=True, exist_ok=True)
+    for pmcid in pmcids:
+        path = corpus_dir / f"{pmcid}.xml"
+        if path.exists():
+            continue
+        xml_text = api.fetch_pmc_fulltext(pmcid)
+        if xml_text:
+            path.write_text(xml_text, encoding="utf-8")
+            print(f"Fetched {pmcid}")
+    if pmids:
+        params = {"db": "pubmed", "id": ",".join(pmids), "retmode": "xml", "rettype": "abstract",
+                  "tool": "biopharma-investment-agent", "email": api.email}
+        response = api._get(f"{api.BASE_URL}/efetch.fcgi", params, "pubmed_efetch")
+        response.raise_for_status()
+        path = corpus_dir / f"pubmed_efetch_{len(pmids)}.xml"
+        path.write_text(response.text, encoding="utf-8")
+        print(f"Fetched PubMed batch of {len(pmids)} -> {path.name}")
+
+
+def measure(parse, xml_text: str, repeat: int):
+    """Best-of-repeat wall time and peak traced allocation for one parse."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = parse(xml_text)
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    parse(xml_text)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, best, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--corpus", type=Path, default=DEFAULT_CORPUS_DIR, help="Directory of NCBI XML files")
+    parser.add_argument("--fetch-pmcids", nargs="*", default=[], help="PMC articles to add to the corpus")
+    parser.add_argument("--fetch-pmids", nargs="*", default=[], help="PMIDs to add as one PubMed efetch batch")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    api = PubMedAPI()
+    if args.fetch_pmcids or args.fetch_pmids:
+        fetch_corpus(api, args.corpus, args.fetch_pmcids, args.fetch_pmids)
+
+    files = sorted(args.corpus.glob("*.xml"))
+    if not files:
+        print(f"No XML in {args.corpus}; add some with --fetch-pmcids / --fetch-pmids")
+        return 1
+
+    logging.disable(logging.CRITICAL)  # the parsers log per article
+    mismatches = 0
+    totals = {"tree": [0.0, 0], "stream": [0.0, 0]}
+    print(f"{'file':<32} {'KB':>7} {'tree ms':>8} {'stream ms':>9} {'tree MB':>8} {'stream MB':>9}")
+
+    for path in files:
+        xml_text = path.read_text(encoding="utf-8")
+        if "<PubmedArticleSet" in xml_text[:2000]:
+            tree_parse = parse_pubmed_tree
+            stream_parse = api._parse_xml_response
+        else:
+            pmcid = path.stem
+            tree_parse = lambda x: PMCTreeParser().parse(x, "0", pmcid)
+            stream_parse = lambda x: api._parse_pmc_fulltext(x, "0", pmcid)
+
+        expected, tree_s, tree_peak = measure(tree_parse, xml_text, args.repeat)
+        got, stream_s, stream_peak = measure(stream_parse, xml_text, args.repeat)
+        if expected != got:
+            mismatches += 1
+            print(f"MISMATCH {path.name}")
+
+        totals["tree"][0] += tree_s
+        totals["tree"][1] = max(totals["tree"][1], tree_peak)
+        totals["stream"][0] += stream_s
+        totals["stream"][1] = max(totals["stream"][1], stream_peak)
+        print(f"{path.name[:32]:<32} {len(xml_text) / 1024:>7.0f} {tree_s * 1000:>8.1f} {stream_s * 1000:>9.1f} "
+              f"{tree_peak / 2**20:>8.2f} {stream_peak / 2**20:>9.2f}")
+
+    print(f"\nFiles: {len(files)}, mismatches: {mismatches}")
+    for name, (seconds, peak) in totals.items():
+        print(f"{name:>6}: {seconds:.3f}s total, {peak / 2**20:.2f} MB max peak")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
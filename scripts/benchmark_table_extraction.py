@@ -0,0 +1,103 @@
+"""
+Benchmark TableExtractionService against the in-process TableExtractor.
+
+For every PDF under the input directory, runs:
+- baseline: TableExtractor().extract(pdf) - Camelot on all pages, in-process
+- cold:     TableExtractionService with an empty cache - table-page
+            detection plus a process pool for Camelot
+- warm:     the same service again, served from the content-hash cache
+
+and reports per-PDF and total times, the pages Camelot read, and whether
+the cold run found the same tables (label, page, content) as the baseline.
+
+Usage:
+    python scripts/benchmark_table_extraction.py [--pdf-dir data] [--workers 4] [--limit 20]
+"""
+
+import argparse
+import logging
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import fitz
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.utils.table_extraction_service import (
+    TableExtractionService,
+    TableResultCache,
+    find_table_pages,
+)
+from src.utils.table_extractor import TableExtractor
+
+
+def _signature(tables):
+    return sorted((t.label, t.page, t.content) for t in tables)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--pdf-dir", type=Path, default=Path("data"), help="Directory searched for *.pdf")
+    parser.add_argument("--workers", type=int, default=None, help="Camelot workers (default: service default)")
+    parser.add_argument("--limit", type=int, default=None, help="Max PDFs to run")
+    parser.add_argument("--skip-baseline", action="store_true")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    pdfs = sorted(args.pdf_dir.rglob("*.pdf"))[:args.limit]
+    if not pdfs:
+        print(f"No PDFs under {args.pdf_dir}")
+        return 1
+    totals = {"baseline": 0.0, "cold": 0.0, "warm": 0.0}
+    mismatches = 0
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = TableResultCache(cache_dir=Path(cache_dir))
+        with TableExtractionService(workers=args.workers, cache=cache) as service:
+            print(f"PDFs: {len(pdfs)}  workers: {service.workers}")
+            for pdf in pdfs:
+                with fitz.open(str(pdf)) as doc:
+                    page_count = len(doc)
+                table_pages = find_table_pages(str(pdf))
+
+                baseline = None
+                if not args.skip_baseline:
+                    start = time.perf_counter()
+                    baseline = TableExtractor().extract(str(pdf))
+                    baseline_s = time.perf_counter() - start
+                    totals["baseline"] += baseline_s
+
+                start = time.perf_counter()
+                cold = service.extract(str(pdf))
+                cold_s = time.perf_counter() - start
+                totals["cold"] += cold_s
+
+                start = time.perf_counter()
+                warm = service.extract(str(pdf))
+                warm_s = time.perf_counter() - start
+                totals["warm"] += warm_s
+                assert _signature(warm) == _signature(cold)
+
+                line = (f"{pdf.name[:40]:40s} pages {len(table_pages):>3}/{page_count:<3} "
+                        f"tables {len(cold):>2}  cold {cold_s:6.2f}s  warm {warm_s * 1000:6.1f}ms")
+                if baseline is not None:
+                    same = _signature(baseline) == _signature(cold)
+                    mismatches += not same
+                    line += f"  baseline {baseline_s:6.2f}s ({len(baseline)} tables){'' if same else '  DIFFERS'}"
+                print(line)
+
+    print()
+    if not args.skip_baseline:
+        print(f"Baseline: {totals['baseline']:.2f}s")
+        print(f"Cold:     {totals['cold']:.2f}s ({totals['baseline'] / max(totals['cold'], 1e-9):.1f}x)")
+    else:
+        print(f"Cold:     {totals['cold']:.2f}s")
+    print(f"Warm:     {totals['warm']:.3f}s")
+    if not args.skip_baseline:
+        print(f"PDFs with different tables than baseline: {mismatches}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -49,6 +49,7 @@ def title_suggests_rct(title: str) -> bool:
 def fix_evidence_levels(dry_run: bool = False):
     """Fix evidence level mismatches in database."""
     from src.drug_extraction_system.database.connection import DatabaseConnection
+    from src.tools.case_series_database import refresh_drug_summaries
 
     db = DatabaseConnection()
 
@@ -139,6 +140,10 @@ def fix_evidence_levels(dry_run: bool = False):
                     """, (new_level, record['id']))
 
         if not dry_run:
+            # Browser summaries (migration 022) carry the best evidence level
+            refresh_drug_summaries(cur, [
+                change['drug'] for records in changes.values() for change in records
+            ])
             db.commit()
 
     # Print summary
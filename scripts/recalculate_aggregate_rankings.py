@@ -121,6 +121,7 @@ def get_aggregate_efficacy_signal(signals: List[str]) -> str:
 def recalculate_aggregate_rankings(drug_names: List[str] = None, dry_run: bool = False):
     """Recalculate aggregate rankings for specified drugs or all drugs."""
     from src.drug_extraction_system.database.connection import DatabaseConnection
+    from src.tools.case_series_database import refresh_drug_summaries
 
     db = DatabaseConnection()
 
@@ -306,6 +307,8 @@ def recalculate_aggregate_rankings(drug_names: List[str] = None, dry_run: bool =
                 WHERE o.id = r.id
             """)
 
+            # Browser summaries (migration 022) read opportunity key findings
+            refresh_drug_summaries(cur, [drug_name for drug_name, _ in groups])
             db.commit()
 
     # Summary
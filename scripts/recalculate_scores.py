@@ -27,6 +27,7 @@ def recalculate_scores(drug_names: list = None, dry_run: bool = False):
     """Recalculate scores for specified drugs or all drugs."""
     from src.drug_extraction_system.database.connection import DatabaseConnection
     from src.case_series.scoring.case_series_scorer import CaseSeriesScorer
+    from src.tools.case_series_database import refresh_drug_summaries
     from src.models.case_series_schemas import (
         CaseSeriesExtraction, CaseSeriesSource, PatientPopulation,
         TreatmentDetails, EfficacyOutcome, SafetyOutcome
@@ -61,6 +62,7 @@ def recalculate_scores(drug_names: list = None, dry_run: bool = False):
 
         updated = 0
         by_drug = {}
+        changed_drugs = set()
 
         for row in rows:
             drug = row['drug_name']
@@ -128,11 +130,14 @@ def recalculate_scores(drug_names: list = None, dry_run: bool = False):
                         row['id']
                     ))
                 updated += 1
+                changed_drugs.add(drug)
 
                 if row['n_patients'] and row['n_patients'] >= 50:
                     logger.info(f"  {row['pmid']}: {drug} N={row['n_patients']} | {old_score} -> {new_score.total_score}")
 
         if not dry_run:
+            # Browser summaries (migration 022) aggregate these scores
+            refresh_drug_summaries(cur, changed_drugs)
             db.commit()
 
     # Summary
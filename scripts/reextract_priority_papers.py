@@ -9,6 +9,10 @@ Priority 2: Potential RCT misclassifications (N>=100)
 
 Usage:
     python scripts/reextract_priority_papers.py [--dry-run] [--pmids PMID1,PMID2]
+
+    # Submit through the Message Batches API (half price, no rate limits);
+    # re-running with the same --manifest resumes an interrupted job
+    python scripts/reextract_priority_papers.py --batch [--manifest PATH]
 """
 
 import os
@@ -103,6 +107,7 @@ def get_drug_info(drug_name: str):
 def delete_existing_extraction(pmid: str, drug_name: str):
     """Delete existing extraction for a paper."""
     from src.drug_extraction_system.database.connection import DatabaseConnection
+    from src.tools.case_series_database import refresh_drug_summary
 
     db = DatabaseConnection()
     with db.cursor() as cur:
@@ -112,6 +117,10 @@ def delete_existing_extraction(pmid: str, drug_name: str):
             RETURNING id
         """, (pmid, drug_name))
         deleted = cur.fetchall()
+        if deleted:
+            # Keep browser summaries (migration 022) consistent even if the
+            # re-extraction below fails and nothing is saved in its place
+            refresh_drug_summary(cur, drug_name)
         db.commit()
 
     if deleted:
@@ -200,6 +209,59 @@ async def reextract_paper(pmid: str, drug_name: str, dry_run: bool = False):
         return None
 
 
+async def reextract_papers_batch(papers_to_process: dict, manifest_path: Path, poll_interval: float):
+    """Re-extract papers as one Message Batches job, saving each as it completes."""
+    from src.case_series.services.batch_extraction import AnthropicBatchBackend, BatchExtractionJob
+    from src.case_series.services.literature_search_service import Paper
+    from src.tools.case_series_database import CaseSeriesDatabase
+    from src.case_series.factory import create_orchestrator
+
+    database_url = os.getenv('DATABASE_URL')
+    orchestrator = create_orchestrator(database_url=database_url)
+    job = BatchExtractionJob(
+        orchestrator._extraction_service,
+        AnthropicBatchBackend(),
+        manifest_path,
+        poll_interval=poll_interval,
+    )
+    cs_db = CaseSeriesDatabase(database_url) if database_url else None
+
+    by_drug = {}
+    for pmid, info in papers_to_process.items():
+        by_drug.setdefault(info['drug'], []).append(pmid)
+
+    for drug_name, pmids in by_drug.items():
+        papers = []
+        for pmid in pmids:
+            paper_data = get_paper_from_pubmed(pmid)
+            if not paper_data:
+                logger.error(f"Could not fetch paper {pmid} from PubMed")
+                continue
+            papers.append(Paper(
+                pmid=paper_data.get('pmid'),
+                pmcid=paper_data.get('pmcid'),
+                doi=paper_data.get('doi'),
+                title=paper_data.get('title', ''),
+                abstract=paper_data.get('abstract', ''),
+                authors=paper_data.get('authors'),
+                journal=paper_data.get('journal'),
+                year=paper_data.get('year'),
+                source='PubMed',
+            ))
+        await job.add_papers(papers, get_drug_info(drug_name))
+
+    def save(extraction, drug_name):
+        delete_existing_extraction(extraction.source.pmid, drug_name)
+        if cs_db and cs_db.is_available:
+            run_id = cs_db.create_run(drug_name, {"type": "re-extraction", "pmids": [extraction.source.pmid]})
+            extraction_id = cs_db.save_extraction(run_id, extraction, drug_name)
+            logger.info(f"Saved extraction ID: {extraction_id} (PMID {extraction.source.pmid})")
+            cs_db.update_run_status(run_id, 'completed')
+
+    logger.info(f"Batch job manifest: {manifest_path}")
+    return await job.run(save)
+
+
 async def main():
     parser = argparse.ArgumentParser(description='Re-extract priority papers')
     parser.add_argument('--dry-run', action='store_true', help='Show what would be done without making changes')
@@ -207,6 +269,12 @@ async def main():
     parser.add_argument('--drug', type=str, help='Process only papers for a specific drug')
     parser.add_argument('--issue', type=str, choices=['complete_failure', 'rct_misclassified'],
                        help='Process only papers with a specific issue type')
+    parser.add_argument('--batch', action='store_true',
+                       help='Submit through the Message Batches API instead of live calls')
+    parser.add_argument('--manifest', type=str,
+                       help='Batch job manifest (default: data/extraction_batches/reextract_<timestamp>.json)')
+    parser.add_argument('--poll-interval', type=float, default=60.0,
+                       help='Seconds between batch status checks')
     args = parser.parse_args()
 
     # Filter papers
@@ -235,6 +303,27 @@ async def main():
         'skipped': []
     }
 
+    if args.batch and not args.dry_run:
+        from src.case_series.services.batch_extraction import DEFAULT_MANIFEST_DIR
+        manifest_path = Path(args.manifest) if args.manifest else (
+            DEFAULT_MANIFEST_DIR / f"reextract_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+        )
+        extractions = await reextract_papers_batch(papers_to_process, manifest_path, args.poll_interval)
+        done = {e.source.pmid: e for e in extractions}
+        for pmid, info in papers_to_process.items():
+            extraction = done.get(pmid)
+            if extraction:
+                results['success'].append({
+                    'pmid': pmid,
+                    'drug': info['drug'],
+                    'disease': extraction.disease,
+                    'evidence_level': str(extraction.evidence_level),
+                    'n_patients': extraction.patient_population.n_patients,
+                })
+            else:
+                results['failed'].append({'pmid': pmid, 'drug': info['drug'], 'reason': 'extraction_returned_none'})
+        papers_to_process = {}
+
     for pmid, info in papers_to_process.items():
         try:
             extraction = await reextract_paper(pmid, info['drug'], dry_run=args.dry_run)
@@ -8,7 +8,8 @@ Extracts structured clinical trial data from scientific papers including:
 
 Uses multi-stage extraction with extended thinking for complex table interpretation.
 """
-from typing import Dict, Any, List, Optional, Callable, TypeVar, Tuple
+from typing import Dict, Any, Iterator, List, Optional, Callable, TypeVar, Tuple
+import hashlib
 import json
 import logging
 import re
@@ -48,6 +49,7 @@ from src.agents.clinical_extraction_constants import (
     CONTENT_TRUNCATION_SHORT,
     MIN_FIGURE_WIDTH,
     MIN_FIGURE_HEIGHT,
+    FIGURE_PREVIEW_MAX_DIMENSION,
 )
 from src.models.clinical_extraction_schemas import (
     ClinicalTrialExtraction,
@@ -933,9 +935,9 @@ PAPER CONTENT:
         Stage 5b: Extract efficacy endpoints from figures using vision API.
 
         This stage:
-        1. Extracts figure images from the PDF
+        1. Reads figure images from the PDF lazily, deduplicated and downsampled
         2. Filters for likely data figures (>200x200 pixels)
-        3. Sends to Claude vision API for data extraction
+        3. Sends accepted figures, at full size, to Claude vision API for data extraction
         4. Parses JSON responses into EfficacyEndpoint objects
         5. Returns endpoints that match the current arm
 
@@ -954,45 +956,40 @@ PAPER CONTENT:
         logger.info(f"Extracting figures from PDF: {pdf_path}")
 
         try:
-            # Step 1: Extract figure images from PDF
-            figures = self._extract_figure_images(pdf_path)
-
-            if not figures:
-                logger.info("No figures found in PDF")
-                return []
-
-            logger.info(f"Found {len(figures)} figure(s) in PDF")
+            # Step 1: Figure images are read lazily, one at a time, as downsampled previews
+            figures = self._iter_figure_images(pdf_path)
 
             # Step 2: Extract figure captions from paper content
             figure_captions = self._extract_figure_captions(paper.get('content', ''))
             logger.info(f"Extracted {len(figure_captions)} figure captions from paper text")
 
             # Step 3: Filter figures by caption relevance (if enabled)
+            efficacy_figures = []
+            figure_count = 0
             if self.filter_figures_by_caption and figure_captions:
                 logger.info(f"Filtering figures by caption relevance using LLM...")
 
                 # Batch classify all captions at once
                 relevant_figure_numbers = self._classify_figure_captions_batch(figure_captions)
 
-                relevant_figures = []
                 for i, figure in enumerate(figures, 1):
+                    figure_count = i
                     caption = figure_captions.get(f"Figure {i}") or figure_captions.get(f"Fig {i}") or figure_captions.get(f"Fig. {i}")
 
                     if i in relevant_figure_numbers:
                         logger.info(f"Figure {i} (page {figure['page']}): Efficacy figure ✓ - '{caption[:80] if caption else 'No caption'}...'")
                         figure['caption'] = caption
-                        relevant_figures.append(figure)
+                        efficacy_figures.append(figure)
                     else:
                         logger.info(f"Figure {i} (page {figure['page']}): Non-efficacy figure (skipped) - '{caption[:80] if caption else 'No caption'}...'")
 
-                efficacy_figures = relevant_figures
-                logger.info(f"Filtered to {len(efficacy_figures)}/{len(figures)} efficacy figures")
+                logger.info(f"Filtered to {len(efficacy_figures)}/{figure_count} efficacy figures")
             else:
                 # Fallback to vision-based classification if caption filtering disabled
                 logger.info(f"Classifying figures using vision API...")
-                efficacy_figures = []
 
                 for i, figure in enumerate(figures, 1):
+                    figure_count = i
                     try:
                         is_efficacy = self._classify_figure(figure)
 
@@ -1006,13 +1003,21 @@ PAPER CONTENT:
                         logger.warning(f"Failed to classify figure {i}: {e}, will attempt extraction anyway")
                         efficacy_figures.append(figure)  # Include if classification fails
 
-                logger.info(f"Identified {len(efficacy_figures)}/{len(figures)} efficacy figures")
+                logger.info(f"Identified {len(efficacy_figures)}/{figure_count} efficacy figures")
+
+            if not figure_count:
+                logger.info("No figures found in PDF")
+                return []
 
             if not efficacy_figures:
                 logger.info("No efficacy figures identified")
                 return []
 
-            # Step 3: Extract data from efficacy figures only
+            # Only accepted figures are kept, without their previews
+            for figure in efficacy_figures:
+                figure.pop('image_data', None)
+
+            # Step 3: Extract data from efficacy figures only, loading each at full size
             all_endpoints = []
 
             for i, figure in enumerate(efficacy_figures, 1):
@@ -1020,7 +1025,8 @@ PAPER CONTENT:
 
                 try:
                     # Extract data from figure using vision API
-                    figure_data = self._extract_data_from_figure(figure, arm, indication)
+                    full_figure = self._load_full_figure(pdf_path, figure)
+                    figure_data = self._extract_data_from_figure(full_figure, arm, indication)
 
                     if figure_data:
                         logger.info(f"Extracted {len(figure_data)} data points from figure {i}")
@@ -1297,64 +1303,120 @@ Your response (JSON array only):"""
             # Fallback: keep all tables if classification fails
             return [table.split(':')[0] for table in table_descriptions]
 
-    def _extract_figure_images(self, pdf_path: str) -> List[Dict[str, Any]]:
-        """
-        Extract figure images from PDF.
-
-        Returns list of dicts with:
-        - page: Page number
-        - image_data: Base64-encoded image
+    def _iter_figure_images(
+        self,
+        pdf_path: str,
+        max_dimension: int = FIGURE_PREVIEW_MAX_DIMENSION
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Yield figure images from PDF one at a time.
+
+        Each embedded image above the size threshold is yielded once: an image
+        reused across pages (same xref) or embedded twice with identical bytes
+        is skipped. Images are downsampled so the longer side is at most
+        max_dimension before encoding; _load_full_figure() re-reads the
+        original for figures that go on to data extraction.
+
+        Yields dicts with:
+        - page: Page number (first occurrence)
+        - index: Image index on that page
+        - xref: PDF object number of the image
+        - image_data: Base64-encoded (downsampled) image
         - media_type: MIME type (image/jpeg, image/png)
-        - width: Image width in pixels
-        - height: Image height in pixels
+        - width: Original image width in pixels
+        - height: Original image height in pixels
         """
-        figures = []
-
         try:
             doc = fitz.open(pdf_path)
+        except Exception as e:
+            logger.error(f"Failed to extract figures from PDF: {e}")
+            return
 
+        seen_xrefs = set()
+        seen_digests = set()
+        try:
             for page_num in range(len(doc)):
-                page = doc[page_num]
-                image_list = page.get_images(full=True)
-
-                for img_index, img in enumerate(image_list):
-                    xref = img[0]
-
-                    # Extract image
-                    base_image = doc.extract_image(xref)
-                    image_bytes = base_image["image"]
-                    width = base_image["width"]
-                    height = base_image["height"]
-                    image_ext = base_image["ext"]
-
-                    # Filter for likely figures (exclude logos/icons)
-                    if width > MIN_FIGURE_WIDTH and height > MIN_FIGURE_HEIGHT:
-                        # Encode as base64
-                        image_data = base64.standard_b64encode(image_bytes).decode('utf-8')
-
-                        # Determine media type
-                        media_type_map = {
-                            'png': 'image/png',
-                            'jpg': 'image/jpeg',
-                            'jpeg': 'image/jpeg'
-                        }
-                        media_type = media_type_map.get(image_ext, 'image/png')
-
-                        figures.append({
-                            'page': page_num + 1,
-                            'index': img_index + 1,
-                            'image_data': image_data,
-                            'media_type': media_type,
-                            'width': width,
-                            'height': height
-                        })
+                for img_index, img in enumerate(doc[page_num].get_images(full=True)):
+                    xref, width, height = img[0], img[2], img[3]
+                    if xref in seen_xrefs:
+                        continue
+                    seen_xrefs.add(xref)
+
+                    # Filter for likely figures (exclude logos/icons) before decoding
+                    if width <= MIN_FIGURE_WIDTH or height <= MIN_FIGURE_HEIGHT:
+                        continue
 
+                    try:
+                        base_image = doc.extract_image(xref)
+                        if not base_image:
+                            continue
+                        digest = hashlib.sha256(base_image["image"]).hexdigest()
+                        if digest in seen_digests:
+                            continue
+                        seen_digests.add(digest)
+
+                        image_data, media_type = self._encode_figure_image(doc, xref, base_image, max_dimension)
+                    except Exception as e:
+                        logger.warning(f"Skipping image {xref} on page {page_num + 1}: {e}")
+                        continue
+
+                    yield {
+                        'page': page_num + 1,
+                        'index': img_index + 1,
+                        'xref': xref,
+                        'image_data': image_data,
+                        'media_type': media_type,
+                        'width': base_image["width"],
+                        'height': base_image["height"]
+                    }
+        finally:
             doc.close()
-            return figures
 
-        except Exception as e:
-            logger.error(f"Failed to extract figures from PDF: {e}")
-            return []
+    def _load_full_figure(self, pdf_path: str, figure: Dict[str, Any]) -> Dict[str, Any]:
+        """Copy of a figure from _iter_figure_images with its full-size image."""
+        doc = fitz.open(pdf_path)
+        try:
+            base_image = doc.extract_image(figure['xref'])
+            image_data, media_type = self._encode_figure_image(doc, figure['xref'], base_image)
+        finally:
+            doc.close()
+        return {**figure, 'image_data': image_data, 'media_type': media_type}
+
+    @staticmethod
+    def _encode_figure_image(
+        doc,
+        xref: int,
+        base_image: Dict[str, Any],
+        max_dimension: Optional[int] = None
+    ) -> Tuple[str, str]:
+        """
+        Base64-encode an embedded image.
+
+        PNG and JPEG images within max_dimension are passed through as stored;
+        larger images are scaled down and other formats converted, as PNG.
+
+        Returns:
+            (base64 data, media type)
+        """
+        media_type_map = {
+            'png': 'image/png',
+            'jpg': 'image/jpeg',
+            'jpeg': 'image/jpeg'
+        }
+        media_type = media_type_map.get(base_image["ext"])
+        longest = max(base_image["width"], base_image["height"])
+        needs_resize = bool(max_dimension) and longest > max_dimension
+
+        if media_type and not needs_resize:
+            return base64.standard_b64encode(base_image["image"]).decode('utf-8'), media_type
+
+        pix = fitz.Pixmap(doc, xref)
+        if pix.colorspace and pix.colorspace.n not in (1, 3):
+            pix = fitz.Pixmap(fitz.csRGB, pix)  # CMYK etc. can't be written as PNG
+        if needs_resize:
+            scale = max_dimension / longest
+            pix = fitz.Pixmap(pix, max(1, round(pix.width * scale)), max(1, round(pix.height * scale)), None)
+        return base64.standard_b64encode(pix.tobytes("png")).decode('utf-8'), 'image/png'
 
     def _classify_figure(self, figure: Dict[str, Any]) -> bool:
         """
@@ -14,6 +14,8 @@ CONTENT_TRUNCATION_MAX = 80_000    # Maximum content length
 # Minimum dimensions for figure extraction
 MIN_FIGURE_WIDTH = 200   # Pixels
 MIN_FIGURE_HEIGHT = 200  # Pixels
+# Figures are downsampled to this longer side for classification
+FIGURE_PREVIEW_MAX_DIMENSION = 1024  # Pixels
 
 # ==================== THINKING BUDGETS BY STAGE ====================
 # Token budgets for extended thinking in each stage
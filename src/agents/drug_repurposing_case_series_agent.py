@@ -58,6 +58,8 @@ from src.models.case_series_schemas import (
     DetailedEfficacyEndpoint,
     DetailedSafetyEndpoint,
 )
+from src.case_series.llm_cache import LLMResponseCache, get_llm_response_cache
+from src.case_series.services.near_duplicates import NearDuplicateIndex, log_clusters
 from src.tools.pubmed import PubMedAPI
 from src.tools.web_search import WebSearchTool
 from src.tools.drug_database import DrugDatabase
@@ -291,12 +293,21 @@ class CaseSeriesDataExtractor:
     - Stage 2: Efficacy extraction (detailed endpoint extraction with extended thinking)
     - Stage 3: Safety extraction (adverse events, discontinuations)
 
-    Uses extended thinking for complex table interpretation.
+    Uses extended thinking for complex table interpretation. With a
+    response_cache, re-extracting an unchanged paper replays the stored
+    stage responses instead of calling the API.
     """
 
-    def __init__(self, client: Anthropic, model: str = "claude-sonnet-4-20250514", prompts: Optional[PromptManager] = None):
+    def __init__(
+        self,
+        client: Anthropic,
+        model: str = "claude-sonnet-4-20250514",
+        prompts: Optional[PromptManager] = None,
+        response_cache: Optional[LLMResponseCache] = None,
+    ):
         self.client = client
         self.model = model
+        self.response_cache = response_cache
         self._prompts = prompts or get_prompt_manager()
         self.stages_completed = []
         self.extraction_metrics = {
@@ -376,7 +387,7 @@ class CaseSeriesDataExtractor:
         )
 
         try:
-            response = self.client.messages.create(
+            request = dict(
                 model=self.model,
                 max_tokens=THINKING_BUDGET_SECTIONS + 2000,  # Must be > thinking budget
                 temperature=1,  # Required for extended thinking
@@ -386,10 +397,11 @@ class CaseSeriesDataExtractor:
                 },
                 messages=[{"role": "user", "content": prompt}]
             )
+            response = self._create_message(**request)
 
             self._track_tokens(response)
             text = self._extract_text_response(response)
-            return self._parse_json(text, default={
+            return self._parse_json(text, request=request, default={
                 'baseline_tables': [],
                 'efficacy_tables': [],
                 'safety_tables': [],
@@ -422,7 +434,7 @@ class CaseSeriesDataExtractor:
         )
 
         try:
-            response = self.client.messages.create(
+            request = dict(
                 model=self.model,
                 max_tokens=THINKING_BUDGET_EFFICACY + 8000,  # Must be > thinking budget
                 temperature=1,
@@ -432,10 +444,11 @@ class CaseSeriesDataExtractor:
                 },
                 messages=[{"role": "user", "content": prompt}]
             )
+            response = self._create_message(**request)
 
             self._track_tokens(response)
             text = self._extract_text_response(response)
-            endpoints = self._parse_json(text, default=[])
+            endpoints = self._parse_json(text, request=request, default=[])
 
             # Convert to DetailedEfficacyEndpoint objects
             validated = []
@@ -467,7 +480,7 @@ class CaseSeriesDataExtractor:
         )
 
         try:
-            response = self.client.messages.create(
+            request = dict(
                 model=self.model,
                 max_tokens=THINKING_BUDGET_SAFETY + 4000,  # Must be > thinking budget
                 temperature=1,
@@ -477,10 +490,11 @@ class CaseSeriesDataExtractor:
                 },
                 messages=[{"role": "user", "content": prompt}]
             )
+            response = self._create_message(**request)
 
             self._track_tokens(response)
             text = self._extract_text_response(response)
-            events = self._parse_json(text, default=[])
+            events = self._parse_json(text, request=request, default=[])
 
             # Validate events
             validated = []
@@ -494,6 +508,17 @@ class CaseSeriesDataExtractor:
             logger.error(f"Stage 3 error: {e}")
             return []
 
+    def _create_message(self, use_cache: bool = True, **kwargs):
+        """messages.create, served from the response cache when possible."""
+        if self.response_cache is not None:
+            cached = self.response_cache.get(kwargs, use_cache=use_cache)
+            if cached is not None:
+                return cached
+        response = self.client.messages.create(**kwargs)
+        if self.response_cache is not None:
+            self.response_cache.put(kwargs, response, use_cache=use_cache)
+        return response
+
     def _track_tokens(self, response) -> None:
         """Track token usage from response."""
         if hasattr(response, 'usage'):
@@ -512,8 +537,13 @@ class CaseSeriesDataExtractor:
                 return block.text
         return ""
 
-    def _parse_json(self, text: str, default: Any = None) -> Any:
-        """Parse JSON from response text."""
+    def _parse_json(self, text: str, default: Any = None, request: Optional[Dict[str, Any]] = None) -> Any:
+        """
+        Parse JSON from response text.
+
+        If it fails to parse, the cached response for ``request`` (the
+        messages.create kwargs) is dropped so the next run asks again.
+        """
         # Clean markdown code blocks
         if '```json' in text:
             text = text.split('```json')[1].split('```')[0]
@@ -524,6 +554,8 @@ class CaseSeriesDataExtractor:
             return json.loads(text.strip())
         except json.JSONDecodeError as e:
             logger.warning(f"JSON parse error: {e}")
+            if request is not None and self.response_cache is not None:
+                self.response_cache.invalidate(request)
             return default if default is not None else {}
 
 
@@ -1699,13 +1731,14 @@ class DrugRepurposingCaseSeriesAgent:
 
     def _deduplicate_papers(self, papers: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
-        Deduplicate papers based on PMID, DOI, or title similarity.
+        Deduplicate papers based on PMID, DOI, title, or near-duplicate title/abstract.
 
         Keeps the first occurrence (PubMed > Semantic Scholar > Citation Mining > Web).
         """
         seen_pmids = set()
         seen_dois = set()
         seen_titles = set()
+        near_duplicates = NearDuplicateIndex()
         unique_papers = []
 
         for paper in papers:
@@ -1726,6 +1759,13 @@ class DrugRepurposingCaseSeriesAgent:
                 if normalized_title in seen_titles:
                     is_duplicate = True
 
+            if not is_duplicate:
+                key = f"pmid:{pmid}" if pmid else f"doi:{doi}" if doi else f"title:{title[:80]}"
+                is_duplicate = near_duplicates.add(
+                    key, paper.get('title') or '', paper.get('abstract') or '',
+                    paper.get('authors'), paper.get('year'),
+                ) is not None
+
             if not is_duplicate:
                 unique_papers.append(paper)
                 if pmid:
@@ -1736,6 +1776,7 @@ class DrugRepurposingCaseSeriesAgent:
                     normalized_title = re.sub(r'[^\w\s]', '', title)[:100]
                     seen_titles.add(normalized_title)
 
+        log_clusters(near_duplicates.clusters())
         logger.info(f"Deduplication: {len(papers)} -> {len(unique_papers)} papers")
         return unique_papers
 
@@ -2535,19 +2576,13 @@ class DrugRepurposingCaseSeriesAgent:
             pmcid = paper.get('pmcid')
             logger.info(f"Fetching full text from PMC for {pmcid}...")
             try:
-                fulltext_xml = self.pubmed.fetch_pmc_fulltext(pmcid)
-                if fulltext_xml:
-                    parsed = self.pubmed._parse_pmc_fulltext(
-                        fulltext_xml,
-                        paper.get('pmid', ''),
-                        pmcid
-                    )
-                    if parsed and parsed.get('content'):
-                        full_text_content = parsed.get('content')
-                        # Limit to 40000 chars for multi-stage extraction
-                        if len(full_text_content) > 40000:
-                            full_text_content = full_text_content[:40000] + "\n\n[... content truncated ...]"
-                        logger.info(f"Successfully fetched {len(full_text_content)} chars of full text")
+                parsed = self.pubmed.get_pmc_paper(pmcid, pmid=paper.get('pmid') or None)
+                if parsed and parsed.get('content'):
+                    full_text_content = parsed.get('content')
+                    # Limit to 40000 chars for multi-stage extraction
+                    if len(full_text_content) > 40000:
+                        full_text_content = full_text_content[:40000] + "\n\n[... content truncated ...]"
+                    logger.info(f"Successfully fetched {len(full_text_content)} chars of full text")
             except Exception as e:
                 logger.warning(f"Failed to fetch PMC full text: {e}")
 
@@ -2575,7 +2610,9 @@ class DrugRepurposingCaseSeriesAgent:
         if use_multi_stage:
             logger.info(f"Using MULTI-STAGE extraction for full-text paper ({len(full_text_content)} chars)")
             try:
-                extractor = CaseSeriesDataExtractor(self.client, self.model)
+                extractor = CaseSeriesDataExtractor(
+                    self.client, self.model, response_cache=get_llm_response_cache()
+                )
                 multi_stage_results = extractor.extract_multi_stage(
                     paper_content=full_text_content,
                     drug_name=drug_name,
@@ -1511,47 +1511,32 @@ IMPORTANT:
 
         logger.info(f"  Attempting to download full text for {len(papers_with_pmid)} papers...")
 
+        # Batched PMCID lookup, concurrent downloads, shared paper cache
+        try:
+            full_texts = self.pubmed.fetch_fulltext_bulk([a.get('pmid') for a in papers_with_pmid])
+        except Exception as e:
+            logger.warning(f"  Full-text download failed: {e}")
+            full_texts = {}
+
         success_count = 0
         failed_count = 0
 
         for article in papers_with_pmid:
-            pmid = article.get('pmid')
-
-            try:
-                # Check PMC availability
-                pmc_map = self.pubmed.check_pmc_availability([pmid])
-                pmcid = pmc_map.get(pmid)
-
-                if pmcid:
-                    # Download full text from PMC
-                    fulltext_xml = self.pubmed.fetch_pmc_fulltext(pmcid)
-
-                    if fulltext_xml:
-                        # Parse full text
-                        parsed = self.pubmed._parse_pmc_fulltext(fulltext_xml, pmid, pmcid)
-
-                        if parsed and parsed.get('content'):
-                            # Add full-text fields to article
-                            article['content'] = parsed.get('content')
-                            article['tables'] = parsed.get('tables', [])
-                            article['sections'] = parsed.get('sections', {})
-                            article['metadata'] = parsed.get('metadata', {})
-
-                            success_count += 1
-                            logger.debug(f"    ✓ Downloaded full text for PMID {pmid}")
-                        else:
-                            failed_count += 1
-                            logger.debug(f"    ✗ Failed to parse full text for PMID {pmid}")
-                    else:
-                        failed_count += 1
-                        logger.debug(f"    ✗ Failed to fetch full text for PMID {pmid}")
-                else:
-                    failed_count += 1
-                    logger.debug(f"    ✗ No PMC ID available for PMID {pmid}")
-
-            except Exception as e:
+            pmid = str(article.get('pmid'))
+            parsed = full_texts.get(pmid)
+
+            if parsed and parsed.get('content'):
+                # Add full-text fields to article
+                article['content'] = parsed.get('content')
+                article['tables'] = parsed.get('tables', [])
+                article['sections'] = parsed.get('sections', {})
+                article['metadata'] = parsed.get('metadata', {})
+
+                success_count += 1
+                logger.debug(f"    ✓ Downloaded full text for PMID {pmid}")
+            else:
                 failed_count += 1
-                logger.debug(f"    ✗ Error downloading PMID {pmid}: {e}")
+                logger.debug(f"    ✗ No PMC full text available for PMID {pmid}")
 
         logger.info(f"  Full-text download complete: {success_count} successful, {failed_count} failed/unavailable")
 
@@ -6,8 +6,11 @@ with all required dependencies.
 """
 
 import os
+import asyncio
 import logging
-from typing import Optional
+import threading
+import weakref
+from typing import Any, Dict, Optional
 
 from src.case_series.orchestrator import CaseSeriesOrchestrator
 from src.case_series.services.drug_info_service import DrugInfoService
@@ -18,9 +21,54 @@ from src.case_series.services.disease_standardizer import DiseaseStandardizer
 from src.case_series.services.preprint_search_service import PreprintSearchService
 from src.case_series.scoring.scoring_engine import ScoringEngine, ScoringWeights
 from src.case_series.repositories.case_series_repository import CaseSeriesRepository
+from src.case_series.llm_cache import LLMResponseCache, get_llm_response_cache
+from src.case_series.run_context import record_llm_cache_hit, record_llm_usage
 
 logger = logging.getLogger(__name__)
 
+# Max in-flight requests per model. Haiku (filtering) has much higher rate
+# limits than Sonnet (extraction), so it gets a wider window.
+DEFAULT_FILTER_MAX_IN_FLIGHT = 16
+DEFAULT_EXTRACTION_MAX_IN_FLIGHT = 6
+
+# Shared HTTP connection pool for all async Anthropic clients. httpx async
+# clients are bound to the event loop they were created on, so one pool is
+# kept per loop (Streamlit re-runs may drive the same cached orchestrator
+# from a fresh loop).
+LLM_POOL_MAX_CONNECTIONS = 50
+LLM_POOL_MAX_KEEPALIVE = 20
+
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, Any]]" = (
+    weakref.WeakKeyDictionary()
+)
+_async_clients_lock = threading.Lock()
+
+
+def _get_async_anthropic(api_key: str):
+    """
+    Get the AsyncAnthropic client for the running event loop.
+
+    Clients (and their connection pool) are shared by every LLM client
+    wrapper using the same API key on that loop.
+    """
+    import httpx
+    from anthropic import AsyncAnthropic, DefaultAsyncHttpxClient
+
+    loop = asyncio.get_running_loop()
+    with _async_clients_lock:
+        clients = _async_clients.setdefault(loop, {})
+        client = clients.get(api_key)
+        if client is None:
+            http_client = DefaultAsyncHttpxClient(
+                limits=httpx.Limits(
+                    max_connections=LLM_POOL_MAX_CONNECTIONS,
+                    max_keepalive_connections=LLM_POOL_MAX_KEEPALIVE,
+                ),
+            )
+            client = AsyncAnthropic(api_key=api_key, http_client=http_client)
+            clients[api_key] = client
+        return client
+
 
 def create_orchestrator(
     anthropic_api_key: Optional[str] = None,
@@ -28,6 +76,9 @@ def create_orchestrator(
     database_url: Optional[str] = None,
     semantic_scholar_api_key: Optional[str] = None,
     scoring_weights: Optional[ScoringWeights] = None,
+    extraction_max_in_flight: int = DEFAULT_EXTRACTION_MAX_IN_FLIGHT,
+    filter_max_in_flight: int = DEFAULT_FILTER_MAX_IN_FLIGHT,
+    llm_response_cache: Optional[LLMResponseCache] = None,
 ) -> CaseSeriesOrchestrator:
     """
     Create a fully-wired CaseSeriesOrchestrator with all dependencies.
@@ -38,6 +89,9 @@ def create_orchestrator(
         database_url: PostgreSQL database URL (defaults to DATABASE_URL env var)
         semantic_scholar_api_key: Semantic Scholar API key (defaults to SEMANTIC_SCHOLAR_API_KEY env var)
         scoring_weights: Optional custom scoring weights
+        extraction_max_in_flight: Max concurrent requests to the extraction model (Sonnet)
+        filter_max_in_flight: Max concurrent requests to the filter model (Haiku)
+        llm_response_cache: Local LLM response cache (defaults to the shared on-disk cache)
 
     Returns:
         Configured CaseSeriesOrchestrator
@@ -61,12 +115,24 @@ def create_orchestrator(
     llm_client = None
     filter_llm_client = None
     if anthropic_api_key:
+        llm_response_cache = llm_response_cache or get_llm_response_cache()
+
         # Main client (Sonnet) for extraction - higher quality
-        llm_client = _create_anthropic_client(anthropic_api_key, model="claude-sonnet-4-20250514")
+        llm_client = _create_anthropic_client(
+            anthropic_api_key,
+            model="claude-sonnet-4-20250514",
+            max_in_flight=extraction_max_in_flight,
+            response_cache=llm_response_cache,
+        )
         logger.info("Created Anthropic LLM client (Sonnet) for extraction")
 
         # Filter client (Haiku) for paper filtering - faster, cheaper, higher rate limits
-        filter_llm_client = _create_anthropic_client(anthropic_api_key, model="claude-3-5-haiku-20241022")
+        filter_llm_client = _create_anthropic_client(
+            anthropic_api_key,
+            model="claude-3-5-haiku-20241022",
+            max_in_flight=filter_max_in_flight,
+            response_cache=llm_response_cache,
+        )
         logger.info("Created Anthropic LLM client (Haiku) for filtering")
     else:
         raise ValueError("ANTHROPIC_API_KEY is required")
@@ -150,16 +216,38 @@ def create_orchestrator(
     )
 
 
-def _create_anthropic_client(api_key: str, model: str = "claude-sonnet-4-20250514"):
-    """Create Anthropic LLM client wrapper."""
-    from anthropic import Anthropic
+def _create_anthropic_client(
+    api_key: str,
+    model: str = "claude-sonnet-4-20250514",
+    max_in_flight: int = DEFAULT_EXTRACTION_MAX_IN_FLIGHT,
+    response_cache: Optional[LLMResponseCache] = None,
+):
+    """
+    Create Anthropic LLM client wrapper (non-blocking, pooled transport).
+
+    With a response_cache, identical requests are answered from disk unless
+    the call passes use_cache=False, which asks the API and replaces the
+    stored answer.
+    """
 
     class AnthropicLLMClient:
-        """LLM client implementation using Anthropic."""
+        """LLM client implementation using AsyncAnthropic."""
 
-        def __init__(self, api_key: str, model: str = "claude-sonnet-4-20250514"):
-            self._client = Anthropic(api_key=api_key)
+        def __init__(
+            self,
+            api_key: str,
+            model: str = "claude-sonnet-4-20250514",
+            max_in_flight: int = DEFAULT_EXTRACTION_MAX_IN_FLIGHT,
+            response_cache: Optional[LLMResponseCache] = None,
+        ):
+            self._api_key = api_key
             self._model = model
+            self._max_in_flight = max(1, max_in_flight)
+            self._response_cache = response_cache
+            # One semaphore per event loop (asyncio primitives are loop-bound)
+            self._semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+                weakref.WeakKeyDictionary()
+            )
             self._usage = {
                 'input_tokens': 0,
                 'output_tokens': 0,
@@ -168,6 +256,30 @@ def _create_anthropic_client(api_key: str, model: str = "claude-sonnet-4-2025051
                 'cache_read_tokens': 0,
             }
 
+        def _get_semaphore(self) -> asyncio.Semaphore:
+            loop = asyncio.get_running_loop()
+            semaphore = self._semaphores.get(loop)
+            if semaphore is None:
+                semaphore = asyncio.Semaphore(self._max_in_flight)
+                self._semaphores[loop] = semaphore
+            return semaphore
+
+        async def _create_message(self, use_cache: bool = True, **kwargs):
+            """Send a messages.create request within this model's in-flight limit."""
+            cache = self._response_cache
+            if cache is not None:
+                cached = cache.get(kwargs, use_cache=use_cache)
+                if cached is not None:
+                    record_llm_cache_hit(cached.saved_input_tokens, cached.saved_output_tokens)
+                    return cached
+
+            client = _get_async_anthropic(self._api_key)
+            async with self._get_semaphore():
+                response = await client.messages.create(**kwargs)
+            if cache is not None:
+                cache.put(kwargs, response, use_cache=use_cache)
+            return response
+
         async def complete(
             self,
             prompt: str,
@@ -175,6 +287,7 @@ def _create_anthropic_client(api_key: str, model: str = "claude-sonnet-4-2025051
             temperature: float = 0.0,
             system: Optional[str] = None,
             cache_system: bool = False,
+            use_cache: bool = True,
         ) -> str:
             messages = [{"role": "user", "content": prompt}]
 
@@ -199,7 +312,7 @@ def _create_anthropic_client(api_key: str, model: str = "claude-sonnet-4-2025051
                 else:
                     kwargs["system"] = system
 
-            response = self._client.messages.create(**kwargs)
+            response = await self._create_message(use_cache=use_cache, **kwargs)
             self._track_usage(response)
 
             if response.content and len(response.content) > 0:
@@ -215,6 +328,7 @@ def _create_anthropic_client(api_key: str, model: str = "claude-sonnet-4-2025051
             temperature: float = 1.0,
             system: Optional[str] = None,
             cache_system: bool = False,
+            use_cache: bool = True,
         ) -> tuple[str, Optional[str]]:
             kwargs = {
                 "model": self._model,
@@ -240,7 +354,7 @@ def _create_anthropic_client(api_key: str, model: str = "claude-sonnet-4-2025051
                 else:
                     kwargs["system"] = system
 
-            response = self._client.messages.create(**kwargs)
+            response = await self._create_message(use_cache=use_cache, **kwargs)
 
             self._track_usage(response)
 
@@ -268,16 +382,31 @@ def _create_anthropic_client(api_key: str, model: str = "claude-sonnet-4-2025051
         def reset_usage_stats(self) -> None:
             self._usage = {k: 0 for k in self._usage}
 
+        def get_cache_stats(self) -> dict:
+            """Response cache hit rate and tokens saved (empty without a cache)."""
+            return self._response_cache.get_stats() if self._response_cache else {}
+
         def _track_usage(self, response) -> None:
+            # Cache hits are counted by record_llm_cache_hit(), not as LLM calls
+            if getattr(response, 'from_cache', False):
+                return
             if hasattr(response, 'usage'):
                 usage = response.usage
-                self._usage['input_tokens'] += getattr(usage, 'input_tokens', 0)
-                self._usage['output_tokens'] += getattr(usage, 'output_tokens', 0)
-                # Track cache tokens for prompt caching
-                self._usage['cache_creation_tokens'] += getattr(usage, 'cache_creation_input_tokens', 0)
-                self._usage['cache_read_tokens'] += getattr(usage, 'cache_read_input_tokens', 0)
-
-    return AnthropicLLMClient(api_key, model=model)
+                counts = {
+                    'input_tokens': getattr(usage, 'input_tokens', 0) or 0,
+                    'output_tokens': getattr(usage, 'output_tokens', 0) or 0,
+                    # Track cache tokens for prompt caching
+                    'cache_creation_tokens': getattr(usage, 'cache_creation_input_tokens', 0) or 0,
+                    'cache_read_tokens': getattr(usage, 'cache_read_input_tokens', 0) or 0,
+                }
+                for key, value in counts.items():
+                    self._usage[key] += value
+                # Attribute to the analysis run this call belongs to
+                record_llm_usage(**counts)
+
+    return AnthropicLLMClient(
+        api_key, model=model, max_in_flight=max_in_flight, response_cache=response_cache
+    )
 
 
 def _create_tavily_client(api_key: str):
@@ -361,8 +490,10 @@ def _create_pubmed_client(api_key: Optional[str] = None):
             # Use search_papers which returns paper dicts (not just PMIDs)
             return self._api.search_papers(query, max_results=max_results)
 
-        async def fetch_fulltext(self, pmcid: str) -> Optional[str]:
-            return self._api.fetch_pmc_fulltext(pmcid)
+        async def fetch_fulltext(self, pmcid: str, pmid: Optional[str] = None) -> Optional[str]:
+            # Through the shared paper cache (parsed once, reused across runs)
+            paper = self._api.get_pmc_paper(pmcid, pmid=pmid)
+            return paper.get('content') if paper else None
 
         async def check_pmc_availability(self, pmid: str) -> Optional[str]:
             # Underlying API expects list and returns dict
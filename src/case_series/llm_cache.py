@@ -0,0 +1,409 @@
+"""
+Content-addressed cache for LLM responses.
+
+Re-running a drug, or mechanism analyses that share papers, re-sends
+identical filter and extraction prompts. Provider-side prompt caching only
+discounts the system-prompt prefix; this cache stores whole responses on
+disk (SQLite, WAL mode) so repeated calls skip the request entirely:
+- Keys hash the model, the system prompt, the messages and the sampling
+  params (max_tokens, temperature, thinking budget), so any prompt change
+  is a miss and nothing needs a TTL
+- Total size is bounded with least-recently-used eviction
+- Callers can skip the lookup per call (use_cache=False); the fresh
+  response replaces the stored one, so a caller whose parse of a cached
+  answer failed retries with use_cache=False. invalidate() drops an entry
+- Hits, misses and the input/output tokens saved are exposed via get_stats()
+
+Set LLM_CACHE_DISABLED=1 to bypass it, or LLM_CACHE_DIR to relocate it.
+"""
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Dict, Mapping, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = Path("data/llm_cache")
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+# messages.create kwargs that change the sampled output
+SAMPLING_PARAMS = ("max_tokens", "temperature", "top_p", "top_k", "stop_sequences", "thinking")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    cache_key TEXT PRIMARY KEY,
+    model TEXT NOT NULL,
+    body BLOB NOT NULL,
+    input_tokens INTEGER NOT NULL,
+    output_tokens INTEGER NOT NULL,
+    size_bytes INTEGER NOT NULL,
+    stored_at REAL NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_llm_responses_last_access ON responses (last_access);
+"""
+
+
+def _sha256(value: Any) -> str:
+    if not isinstance(value, str):
+        value = json.dumps(value, sort_keys=True, default=str)
+    return hashlib.sha256(value.encode("utf-8")).hexdigest()
+
+
+def _system_text(system: Any) -> str:
+    """System prompt as plain text (cache_control blocks don't change the output)."""
+    if isinstance(system, list):
+        return "\n".join(block.get("text", "") for block in system if isinstance(block, dict))
+    return system or ""
+
+
+def _token_count(usage: Any, name: str) -> int:
+    value = getattr(usage, name, 0)
+    return value if isinstance(value, int) else 0
+
+
+class CachedMessage:
+    """Minimal messages.create response served from the cache."""
+
+    from_cache = True
+
+    def __init__(
+        self,
+        model: str,
+        text: str,
+        thinking: Optional[str] = None,
+        saved_input_tokens: int = 0,
+        saved_output_tokens: int = 0,
+        stop_reason: str = "end_turn",
+    ):
+        self.model = model
+        self.stop_reason = stop_reason
+        # Usage of the original call this response replays
+        self.saved_input_tokens = saved_input_tokens
+        self.saved_output_tokens = saved_output_tokens
+        self.content = []
+        if thinking is not None:
+            self.content.append(SimpleNamespace(type="thinking", thinking=thinking))
+        self.content.append(SimpleNamespace(type="text", text=text))
+        # Nothing was spent on this call
+        self.usage = SimpleNamespace(
+            input_tokens=0,
+            output_tokens=0,
+            cache_creation_input_tokens=0,
+            cache_read_input_tokens=0,
+        )
+
+
+class LLMResponseCache:
+    """
+    Disk-backed LLM response cache.
+
+    Thread-safe (one SQLite connection per thread) and safe to share between
+    processes using the same directory.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Path = DEFAULT_CACHE_DIR,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        enabled: bool = True,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir: Directory for the cache database
+            max_bytes: Size bound for stored (compressed) responses
+            enabled: If False, every lookup misses and nothing is stored
+        """
+        self.enabled = enabled
+        self.max_bytes = max_bytes
+        self.db_path = Path(cache_dir) / "responses.sqlite3"
+        self._local = threading.local()
+        # Guards _stats and _approx_bytes
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            "hits": 0,
+            "misses": 0,
+            "bypassed": 0,
+            "stores": 0,
+            "evictions": 0,
+            "saved_input_tokens": 0,
+            "saved_output_tokens": 0,
+        }
+        self._approx_bytes = 0
+
+        if self.enabled:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = self._conn()
+            conn.executescript(_SCHEMA)
+            row = conn.execute("SELECT COALESCE(SUM(size_bytes), 0) FROM responses").fetchone()
+            self._approx_bytes = row[0]
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.db_path), timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _count(self, name: str, n: int = 1):
+        with self._stats_lock:
+            self._stats[name] += n
+
+    @staticmethod
+    def make_key(request: Mapping[str, Any]) -> str:
+        """
+        Content address of a messages.create request.
+
+        Args:
+            request: The kwargs passed to messages.create
+        """
+        canonical = {
+            "model": request.get("model"),
+            "system": _sha256(_system_text(request.get("system"))),
+            "messages": _sha256(request.get("messages") or []),
+            "params": {p: request[p] for p in SAMPLING_PARAMS if request.get(p) is not None},
+        }
+        return _sha256(canonical)
+
+    # ------------------------------------------------------------------
+    # Core operations
+    # ------------------------------------------------------------------
+
+    def get(self, request: Mapping[str, Any], use_cache: bool = True) -> Optional[CachedMessage]:
+        """
+        Look up the response for a messages.create request.
+
+        Args:
+            request: The kwargs passed to messages.create
+            use_cache: False skips the lookup (always a miss)
+
+        Returns:
+            A CachedMessage, or None on a miss
+        """
+        if not self.enabled or not use_cache:
+            if self.enabled:
+                self._count("bypassed")
+            return None
+
+        key = self.make_key(request)
+        try:
+            row = self._conn().execute(
+                "SELECT model, body, input_tokens, output_tokens FROM responses WHERE cache_key = ?",
+                (key,),
+            ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"LLM cache lookup failed, bypassing: {e}")
+            return None
+        if row is None:
+            self._count("misses")
+            return None
+
+        model, body, input_tokens, output_tokens = row
+        try:
+            entry = json.loads(zlib.decompress(body))
+        except (zlib.error, ValueError):
+            logger.warning(f"Dropping corrupt LLM cache entry {key[:12]}")
+            try:
+                self._conn().execute("DELETE FROM responses WHERE cache_key = ?", (key,))
+            except sqlite3.Error as e:
+                logger.warning(f"LLM cache delete failed: {e}")
+            self._count("misses")
+            return None
+
+        try:
+            self._conn().execute(
+                "UPDATE responses SET last_access = ? WHERE cache_key = ?", (time.time(), key)
+            )
+        except sqlite3.Error as e:
+            # Only the LRU position is lost; the hit is still good
+            logger.debug(f"LLM cache access-time update failed: {e}")
+        with self._stats_lock:
+            self._stats["hits"] += 1
+            self._stats["saved_input_tokens"] += input_tokens
+            self._stats["saved_output_tokens"] += output_tokens
+        return CachedMessage(
+            model, entry["text"], entry.get("thinking"), input_tokens, output_tokens,
+            stop_reason=entry.get("stop_reason", "end_turn"),
+        )
+
+    def put(self, request: Mapping[str, Any], response: Any, use_cache: bool = True) -> bool:
+        """
+        Store a messages.create response.
+
+        Only complete responses (stop_reason "end_turn") with plain-text
+        content are cached; truncated (max_tokens), refused or empty
+        responses are retried next time. A use_cache=False call still
+        stores its response, replacing the entry it skipped.
+
+        Returns:
+            True if the response was stored
+        """
+        if not self.enabled or getattr(response, "from_cache", False):
+            return False
+        stop_reason = getattr(response, "stop_reason", None)
+        if stop_reason != "end_turn":
+            return False
+
+        text = None
+        thinking = None
+        for block in getattr(response, "content", None) or []:
+            if isinstance(getattr(block, "text", None), str):
+                text = block.text
+            elif isinstance(getattr(block, "thinking", None), str):
+                thinking = block.thinking
+        if not text:
+            return False
+
+        usage = getattr(response, "usage", None)
+        input_tokens = sum(
+            _token_count(usage, name)
+            for name in ("input_tokens", "cache_creation_input_tokens", "cache_read_input_tokens")
+        )
+        output_tokens = _token_count(usage, "output_tokens")
+
+        body = zlib.compress(
+            json.dumps({"text": text, "thinking": thinking, "stop_reason": stop_reason}).encode("utf-8"), 6
+        )
+        now = time.time()
+        try:
+            self._conn().execute(
+                """
+                INSERT OR REPLACE INTO responses (
+                    cache_key, model, body, input_tokens, output_tokens,
+                    size_bytes, stored_at, last_access
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (self.make_key(request), str(request.get("model")), body,
+                 input_tokens, output_tokens, len(body), now, now),
+            )
+        except sqlite3.Error as e:
+            logger.warning(f"LLM cache store failed: {e}")
+            return False
+        with self._stats_lock:
+            self._stats["stores"] += 1
+            self._approx_bytes += len(body)
+            over_budget = self._approx_bytes > self.max_bytes
+        if over_budget:
+            self.evict()
+        return True
+
+    def invalidate(self, request: Mapping[str, Any]) -> bool:
+        """
+        Drop the stored response for a messages.create request.
+
+        For callers whose parse of a cached response failed, so the next
+        call asks the API again instead of replaying it.
+
+        Returns:
+            True if an entry was removed
+        """
+        if not self.enabled:
+            return False
+        key = self.make_key(request)
+        conn = self._conn()
+        try:
+            row = conn.execute(
+                "SELECT size_bytes FROM responses WHERE cache_key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return False
+            conn.execute("DELETE FROM responses WHERE cache_key = ?", (key,))
+        except sqlite3.Error as e:
+            logger.warning(f"LLM cache invalidate failed: {e}")
+            return False
+        with self._stats_lock:
+            self._approx_bytes -= row[0]
+        return True
+
+    def evict(self, target_fraction: float = 0.9) -> int:
+        """
+        Evict least-recently-used entries until total size is under
+        ``target_fraction`` of max_bytes.
+
+        Returns:
+            Number of entries evicted
+        """
+        conn = self._conn()
+        total = conn.execute("SELECT COALESCE(SUM(size_bytes), 0) FROM responses").fetchone()[0]
+        target = int(self.max_bytes * target_fraction)
+        evicted = 0
+        if total > target:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                for cache_key, size in conn.execute(
+                    "SELECT cache_key, size_bytes FROM responses ORDER BY last_access"
+                ).fetchall():
+                    if total <= target:
+                        break
+                    conn.execute("DELETE FROM responses WHERE cache_key = ?", (cache_key,))
+                    total -= size
+                    evicted += 1
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        with self._stats_lock:
+            self._approx_bytes = total
+        if evicted:
+            self._count("evictions", evicted)
+            logger.info(f"LLM cache evicted {evicted} entries ({total / 1024 / 1024:.1f} MB kept)")
+        return evicted
+
+    def clear(self, model: Optional[str] = None):
+        """Remove all entries, or only those for ``model``."""
+        if not self.enabled:
+            return
+        if model:
+            self._conn().execute("DELETE FROM responses WHERE model = ?", (model,))
+        else:
+            self._conn().execute("DELETE FROM responses")
+        total = self._conn().execute(
+            "SELECT COALESCE(SUM(size_bytes), 0) FROM responses"
+        ).fetchone()[0]
+        with self._stats_lock:
+            self._approx_bytes = total
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and tokens saved in this process plus on-disk totals."""
+        with self._stats_lock:
+            stats = dict(self._stats)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / lookups, 3) if lookups else 0.0
+        stats["enabled"] = self.enabled
+        if self.enabled:
+            entries, total = self._conn().execute(
+                "SELECT COUNT(*), COALESCE(SUM(size_bytes), 0) FROM responses"
+            ).fetchone()
+            stats["entries"] = entries
+            stats["size_mb"] = round(total / (1024 * 1024), 2)
+        return stats
+
+
+_default_cache: Optional[LLMResponseCache] = None
+_default_cache_lock = threading.Lock()
+
+
+def get_llm_response_cache() -> LLMResponseCache:
+    """Get the process-wide LLM response cache shared by all LLM clients."""
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            enabled = os.getenv("LLM_CACHE_DISABLED", "").lower() not in ("1", "true", "yes")
+            cache_dir = Path(os.getenv("LLM_CACHE_DIR", str(DEFAULT_CACHE_DIR)))
+            try:
+                _default_cache = LLMResponseCache(cache_dir=cache_dir, enabled=enabled)
+            except (OSError, sqlite3.Error) as e:
+                logger.warning(f"LLM response cache unavailable ({e}), continuing without it")
+                _default_cache = LLMResponseCache(cache_dir=cache_dir, enabled=False)
+        return _default_cache
@@ -4,10 +4,11 @@ Case Series Analysis Orchestrator
 Main entry point that coordinates all services for drug repurposing analysis.
 """
 
+import functools
 import logging
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import List, Optional, Dict, Any, Set
+from typing import AsyncIterable, List, Optional, Dict, Any, Set, Tuple, Union
 
 from src.case_series.models import (
     CaseSeriesExtraction,
@@ -21,6 +22,7 @@ from src.case_series.models import (
 from src.case_series.services.drug_info_service import DrugInfoService, DrugInfo
 from src.case_series.services.literature_search_service import LiteratureSearchService, Paper, SearchResult
 from src.case_series.services.extraction_service import ExtractionService
+from src.case_series.services.search_checkpoint import SearchCheckpoint, make_run_key
 from src.case_series.services.market_intel_service import MarketIntelService
 from src.case_series.services.disease_standardizer import DiseaseStandardizer
 from src.case_series.services.score_explanation_service import ScoreExplanationService
@@ -32,20 +34,38 @@ from src.case_series.services.aggregation_service import (
 from src.case_series.scoring.scoring_engine import ScoringEngine
 from src.case_series.scoring.case_series_scorer import CaseSeriesScorer
 from src.case_series.repositories.case_series_repository import CaseSeriesRepository
+from src.case_series.run_context import (
+    AnalysisProgress,
+    RunContext,
+    current_run,
+    estimate_cost_usd,
+    run_scope,
+)
 
 logger = logging.getLogger(__name__)
 
 
-@dataclass
-class AnalysisProgress:
-    """Tracks analysis progress for UI updates."""
-    status: str = "initializing"
-    current_step: str = ""
-    papers_found: int = 0
-    papers_extracted: int = 0
-    opportunities_found: int = 0
-    total_tokens: int = 0
-    estimated_cost_usd: float = 0.0
+def _isolated_run(method):
+    """
+    Run an analysis coroutine inside its own RunContext.
+
+    Concurrent analyses on one orchestrator (analyze_mechanism,
+    analyze_drugs_parallel) each get their own run ID, progress and token
+    usage instead of overwriting shared instance state.
+    """
+    @functools.wraps(method)
+    async def wrapper(self, *args, **kwargs):
+        drug_name = kwargs.get('drug_name', args[0] if args else None)
+        run = RunContext(drug_name=drug_name, progress=AnalysisProgress(status="running"))
+        self._active_runs[id(run)] = run
+        self._last_run = run
+        try:
+            with run_scope(run):
+                return await method(self, *args, **kwargs)
+        finally:
+            run.finish()
+            self._active_runs.pop(id(run), None)
+    return wrapper
 
 
 @dataclass
@@ -66,6 +86,9 @@ class AnalysisConfig:
     use_web_search: bool = True
     # Supplemental mode: skip papers already processed in previous runs
     supplemental: bool = False
+    # Stream papers from search into extraction as they pass the filter
+    # (resumable via SearchCheckpoint; no global relevance sort)
+    stream_extraction: bool = False
 
 
 @dataclass
@@ -141,14 +164,63 @@ class CaseSeriesOrchestrator:
         self._repository = repository
         self._case_series_scorer = CaseSeriesScorer()
 
-        self._progress = AnalysisProgress()
-        self._run_id: Optional[str] = None
+        # Per-run state lives in RunContext. Calls made outside a run (e.g. the
+        # UI reading _run_id after analyze()) see the most recently started run.
+        self._default_run = RunContext()
+        self._last_run: Optional[RunContext] = None
+        self._active_runs: Dict[int, RunContext] = {}
+
+    @property
+    def _run(self) -> RunContext:
+        """RunContext of the analysis executing in the current task."""
+        return current_run() or self._last_run or self._default_run
+
+    @property
+    def _progress(self) -> AnalysisProgress:
+        return self._run.progress
+
+    @_progress.setter
+    def _progress(self, value: AnalysisProgress) -> None:
+        self._run.progress = value
+
+    @property
+    def _run_id(self) -> Optional[str]:
+        return self._run.run_id
+
+    @_run_id.setter
+    def _run_id(self, value: Optional[str]) -> None:
+        self._run.run_id = value
 
     @property
     def progress(self) -> AnalysisProgress:
-        """Get current analysis progress."""
-        return self._progress
+        """Get progress of the current run, or of the most recently started one."""
+        return self._run.progress
+
+    @property
+    def active_runs(self) -> List[RunContext]:
+        """Runs currently in flight on this orchestrator."""
+        return list(self._active_runs.values())
 
+    def aggregate_progress(self) -> AnalysisProgress:
+        """
+        Combined live progress across all in-flight runs.
+
+        Counts and token usage are summed; current_step lists each drug's step.
+        """
+        runs = self.active_runs
+        if not runs:
+            return AnalysisProgress(status="idle")
+        return AnalysisProgress(
+            status="running",
+            current_step="; ".join(f"{r.drug_name}: {r.progress.current_step}" for r in runs),
+            papers_found=sum(r.progress.papers_found for r in runs),
+            papers_extracted=sum(r.progress.papers_extracted for r in runs),
+            opportunities_found=sum(r.progress.opportunities_found for r in runs),
+            total_tokens=sum(r.progress.total_tokens for r in runs),
+            estimated_cost_usd=sum(r.progress.estimated_cost_usd for r in runs),
+        )
+
+    @_isolated_run
     async def analyze(
         self,
         drug_name: str,
@@ -165,7 +237,6 @@ class CaseSeriesOrchestrator:
             DrugAnalysisResult with all opportunities
         """
         config = config or AnalysisConfig()
-        self._progress = AnalysisProgress(status="running")
 
         # Create run in database
         if self._repository:
@@ -243,112 +314,63 @@ class CaseSeriesOrchestrator:
                 except Exception as e:
                     logger.warning(f"Checkpoint save failed at batch {batch_num}: {e}")
 
-            search_result = await self.search_literature(
-                drug_name=drug_name,
-                exclude_indications=drug_info.approved_indications,
-                max_per_source=config.max_papers_per_source,
-                max_total_papers=config.max_total_discovered_papers,
-                filter_with_llm=config.filter_with_llm,
-                generic_name=drug_info.generic_name,
-                use_pubmed=config.use_pubmed,
-                use_semantic_scholar=config.use_semantic_scholar,
-                use_citation_mining=config.use_citation_mining,
-                use_web_search=config.use_web_search,
-                skip_pmids=skip_pmids,  # Skip these BEFORE LLM filter
-                filter_checkpoint_callback=filter_checkpoint_callback,
-            )
-            self._progress.papers_found = len(search_result.papers)
-
-            # Save discovered papers to database for future supplemental runs
-            # This saves the papers that passed the Haiku filter
-            if self._repository and self._repository._db and search_result.papers:
-                try:
-                    papers_for_db = []
-                    for p in search_result.papers:
-                        # Handle patient_count - ensure it's an integer or None
-                        patient_count = getattr(p, 'extracted_patient_count', None)
-                        if patient_count is not None:
-                            try:
-                                patient_count = int(patient_count)
-                            except (ValueError, TypeError):
-                                patient_count = None  # Can't convert, set to None
-
-                        papers_for_db.append({
-                            'pmid': p.pmid,
-                            'doi': p.doi,
-                            'title': p.title,
-                            'abstract': p.abstract,
-                            'year': p.year,
-                            'journal': p.journal,
-                            'source': p.source,
-                            'disease': getattr(p, 'extracted_disease', None),
-                            'patient_count': patient_count,
-                            'would_pass_filter': True,  # These all passed the LLM filter
-                            'filter_reason': 'Passed Haiku filter in analyze()',
-                        })
-                    discovery_id = self._repository.save_paper_discovery(
-                        drug_name=drug_name,
-                        generic_name=drug_info.generic_name,
-                        papers=papers_for_db,
-                        approved_indications=drug_info.approved_indications,
-                        sources_searched=search_result.sources_searched,
-                        duplicates_removed=search_result.duplicates_removed,
-                    )
-                    if discovery_id:
-                        logger.info(f"Saved {len(papers_for_db)} papers to discovery cache for future supplemental runs")
-                except Exception as e:
-                    logger.warning(f"Failed to save paper discovery: {e}")
-
-            # Step 3: Extract data
-            self._progress.current_step = "Extracting clinical data"
-            papers_to_extract = search_result.papers
+            if config.stream_extraction:
+                search_result, papers_to_extract, extractions = await self._search_and_extract_stream(
+                    drug_name, drug_info, config, skip_pmids
+                )
+            else:
+                search_result = await self.search_literature(
+                    drug_name=drug_name,
+                    exclude_indications=drug_info.approved_indications,
+                    max_per_source=config.max_papers_per_source,
+                    max_total_papers=config.max_total_discovered_papers,
+                    filter_with_llm=config.filter_with_llm,
+                    generic_name=drug_info.generic_name,
+                    use_pubmed=config.use_pubmed,
+                    use_semantic_scholar=config.use_semantic_scholar,
+                    use_citation_mining=config.use_citation_mining,
+                    use_web_search=config.use_web_search,
+                    skip_pmids=skip_pmids,  # Skip these BEFORE LLM filter
+                    filter_checkpoint_callback=filter_checkpoint_callback,
+                )
+                self._progress.papers_found = len(search_result.papers)
 
-            # Sort by relevance_score (patient count / 100) so high-N papers are extracted first
-            papers_to_extract = sorted(
-                papers_to_extract,
-                key=lambda p: (p.relevance_score or 0, p.pmid or ''),
-                reverse=True
-            )
-            logger.info(f"Sorted {len(papers_to_extract)} papers by relevance (top 5 scores: {[p.relevance_score for p in papers_to_extract[:5]]})")
-
-            # Pre-filter: Skip papers where Haiku already identified an approved indication
-            # This saves expensive Sonnet extraction calls
-            approved_lower = [ind.lower() for ind in drug_info.approved_indications]
-            pre_filter_count = len(papers_to_extract)
-
-            def is_likely_off_label(paper) -> bool:
-                """Check if paper's extracted disease is likely off-label."""
-                raw_disease = getattr(paper, 'extracted_disease', '') or ''
-                # Handle case where extracted_disease is a list
-                if isinstance(raw_disease, list):
-                    raw_disease = ', '.join(str(d) for d in raw_disease) if raw_disease else ''
-                disease = raw_disease.lower()
-                if not disease:
-                    # No disease extracted by Haiku - skip to avoid wasted Sonnet extraction
-                    logger.debug(f"Pre-filter excluding {paper.pmid}: No disease extracted by Haiku")
-                    return False
-                # Check if disease matches any approved indication
-                for approved in approved_lower:
-                    if approved in disease or disease in approved:
-                        logger.debug(f"Pre-filter excluding {paper.pmid}: '{disease}' matches approved '{approved}'")
-                        return False
-                return True
-
-            papers_to_extract = [p for p in papers_to_extract if is_likely_off_label(p)]
-            skipped_count = pre_filter_count - len(papers_to_extract)
-            if skipped_count > 0:
-                logger.info(f"Pre-filter: Skipped {skipped_count} papers (no disease or approved indication), {len(papers_to_extract)} remaining for extraction")
+                # Save discovered papers to database for future supplemental runs
+                # This saves the papers that passed the Haiku filter
+                self._save_discovered_papers(drug_name, drug_info, search_result)
 
-            if config.max_papers_to_extract and len(papers_to_extract) > config.max_papers_to_extract:
-                logger.info(f"Limiting extraction to {config.max_papers_to_extract} papers (found {len(papers_to_extract)})")
-                papers_to_extract = papers_to_extract[:config.max_papers_to_extract]
+                # Step 3: Extract data
+                self._progress.current_step = "Extracting clinical data"
+                papers_to_extract = search_result.papers
 
-            extractions = await self.extract_data(
-                papers=papers_to_extract,
-                drug_info=drug_info,
-                use_cache=config.use_cache,
-                max_concurrent=config.max_concurrent_extractions,
-            )
+                # Sort by relevance_score (patient count / 100) so high-N papers are extracted first
+                papers_to_extract = sorted(
+                    papers_to_extract,
+                    key=lambda p: (p.relevance_score or 0, p.pmid or ''),
+                    reverse=True
+                )
+                logger.info(f"Sorted {len(papers_to_extract)} papers by relevance (top 5 scores: {[p.relevance_score for p in papers_to_extract[:5]]})")
+
+                # Pre-filter: Skip papers where Haiku already identified an approved indication
+                # This saves expensive Sonnet extraction calls
+                approved_lower = [ind.lower() for ind in drug_info.approved_indications]
+                pre_filter_count = len(papers_to_extract)
+
+                papers_to_extract = [p for p in papers_to_extract if self._is_likely_off_label(p, approved_lower)]
+                skipped_count = pre_filter_count - len(papers_to_extract)
+                if skipped_count > 0:
+                    logger.info(f"Pre-filter: Skipped {skipped_count} papers (no disease or approved indication), {len(papers_to_extract)} remaining for extraction")
+
+                if config.max_papers_to_extract and len(papers_to_extract) > config.max_papers_to_extract:
+                    logger.info(f"Limiting extraction to {config.max_papers_to_extract} papers (found {len(papers_to_extract)})")
+                    papers_to_extract = papers_to_extract[:config.max_papers_to_extract]
+
+                extractions = await self.extract_data(
+                    papers=papers_to_extract,
+                    drug_info=drug_info,
+                    use_cache=config.use_cache,
+                    max_concurrent=config.max_concurrent_extractions,
+                )
             self._progress.papers_extracted = len(extractions)
 
             # Filter to relevant extractions only
@@ -503,9 +525,10 @@ class CaseSeriesOrchestrator:
                 # Non-fatal - continue without explanations
 
             # Calculate estimated cost (Claude Sonnet pricing: $3/M input, $15/M output)
-            input_tokens = self._extraction_service.metrics.input_tokens
-            output_tokens = self._extraction_service.metrics.output_tokens
-            estimated_cost = (input_tokens * 3 / 1_000_000) + (output_tokens * 15 / 1_000_000)
+            # Token usage is attributed to this run by the LLM client
+            input_tokens = self._run.input_tokens
+            output_tokens = self._run.output_tokens
+            estimated_cost = estimate_cost_usd(input_tokens, output_tokens)
 
             # Step 9: Identify papers that need manual review (abstract-only)
             self._progress.current_step = "Identifying papers for manual review"
@@ -555,6 +578,8 @@ class CaseSeriesOrchestrator:
                     papers_found=len(search_result.papers),
                     papers_extracted=len(extractions),
                     opportunities_found=len(opportunities),
+                    total_tokens=input_tokens + output_tokens,
+                    estimated_cost_usd=estimated_cost,
                 )
 
             return result
@@ -571,6 +596,144 @@ class CaseSeriesOrchestrator:
 
             raise
 
+    async def _search_and_extract_stream(
+        self,
+        drug_name: str,
+        drug_info: DrugInfo,
+        config: AnalysisConfig,
+        skip_pmids: Optional[Set[str]],
+    ) -> Tuple[SearchResult, List[Paper], List[CaseSeriesExtraction]]:
+        """
+        Streaming Steps 2-3: extract each paper as soon as it passes the filter.
+
+        Search progress is checkpointed per paper, so a crashed run with the
+        same drug and config resumes without repeating LLM filter calls.
+        Papers are extracted in arrival order rather than by relevance.
+
+        Returns:
+            (search_result, papers_to_extract, extractions)
+        """
+        search_params = dict(
+            exclude_indications=drug_info.approved_indications,
+            max_results_per_source=config.max_papers_per_source,
+            max_total_papers=config.max_total_discovered_papers,
+            filter_with_llm=config.filter_with_llm,
+            include_citation_mining=config.use_citation_mining,
+            generic_name=drug_info.generic_name,
+            use_pubmed=config.use_pubmed,
+            use_semantic_scholar=config.use_semantic_scholar,
+            use_web_search=config.use_web_search,
+        )
+        checkpoint = SearchCheckpoint(
+            make_run_key(drug_name, supplemental=config.supplemental, **search_params),
+            drug_name=drug_name,
+        )
+        search_result = SearchResult()
+        papers_to_extract: List[Paper] = []
+        approved_lower = [ind.lower() for ind in drug_info.approved_indications]
+        limit = config.max_papers_to_extract
+
+        async def papers_for_extraction():
+            async for paper in self._literature_search_service.search_stream(
+                drug_name=drug_name,
+                skip_pmids=skip_pmids,
+                checkpoint=checkpoint,
+                result=search_result,
+                **search_params,
+            ):
+                self._progress.papers_found = len(search_result.papers)
+                if limit and len(papers_to_extract) >= limit:
+                    continue  # Keep draining so the search completes and checkpoints
+                if not self._is_likely_off_label(paper, approved_lower):
+                    continue
+                papers_to_extract.append(paper)
+                yield paper
+
+        self._progress.current_step = "Searching literature and extracting clinical data"
+        try:
+            extractions = await self.extract_data(
+                papers=papers_for_extraction(),
+                drug_info=drug_info,
+                use_cache=config.use_cache,
+                max_concurrent=config.max_concurrent_extractions,
+            )
+        finally:
+            checkpoint.close()
+
+        self._progress.papers_found = len(search_result.papers)
+        logger.info(
+            f"Streaming search/extraction: {len(search_result.papers)} papers passed filtering, "
+            f"{len(papers_to_extract)} extracted"
+        )
+        self._save_discovered_papers(drug_name, drug_info, search_result)
+        return search_result, papers_to_extract, extractions
+
+    def _save_discovered_papers(
+        self,
+        drug_name: str,
+        drug_info: DrugInfo,
+        search_result: SearchResult,
+    ) -> None:
+        """Save papers that passed the Haiku filter to the discovery cache."""
+        if not (self._repository and self._repository._db and search_result.papers):
+            return
+        try:
+            papers_for_db = []
+            for p in search_result.papers:
+                # Handle patient_count - ensure it's an integer or None
+                patient_count = getattr(p, 'extracted_patient_count', None)
+                if patient_count is not None:
+                    try:
+                        patient_count = int(patient_count)
+                    except (ValueError, TypeError):
+                        patient_count = None  # Can't convert, set to None
+
+                papers_for_db.append({
+                    'pmid': p.pmid,
+                    'doi': p.doi,
+                    'title': p.title,
+                    'abstract': p.abstract,
+                    'year': p.year,
+                    'journal': p.journal,
+                    'source': p.source,
+                    'disease': getattr(p, 'extracted_disease', None),
+                    'patient_count': patient_count,
+                    'would_pass_filter': True,  # These all passed the LLM filter
+                    'filter_reason': 'Passed Haiku filter in analyze()',
+                })
+            discovery_id = self._repository.save_paper_discovery(
+                drug_name=drug_name,
+                generic_name=drug_info.generic_name,
+                papers=papers_for_db,
+                approved_indications=drug_info.approved_indications,
+                sources_searched=search_result.sources_searched,
+                duplicates_removed=search_result.duplicates_removed,
+            )
+            if discovery_id:
+                logger.info(f"Saved {len(papers_for_db)} papers to discovery cache for future supplemental runs")
+        except Exception as e:
+            logger.warning(f"Failed to save paper discovery: {e}")
+
+    @staticmethod
+    def _is_likely_off_label(paper: Paper, approved_lower: List[str]) -> bool:
+        """Check if paper's extracted disease is likely off-label."""
+        raw_disease = getattr(paper, 'extracted_disease', '') or ''
+        # Handle case where extracted_disease is a list
+        if isinstance(raw_disease, list):
+            raw_disease = ', '.join(str(d) for d in raw_disease) if raw_disease else ''
+        disease = raw_disease.lower()
+        if not disease:
+            # No disease extracted by Haiku - skip to avoid wasted Sonnet extraction
+            logger.debug(f"Pre-filter excluding {paper.pmid}: No disease extracted by Haiku")
+            return False
+        # Check if disease matches any approved indication
+        for approved in approved_lower:
+            if approved in disease or disease in approved:
+                logger.debug(f"Pre-filter excluding {paper.pmid}: '{disease}' matches approved '{approved}'")
+                return False
+        return True
+
+    @_isolated_run
     async def analyze_with_selected_papers(
         self,
         drug_name: str,
@@ -592,7 +755,6 @@ class CaseSeriesOrchestrator:
             DrugAnalysisResult with all opportunities
         """
         config = config or AnalysisConfig()
-        self._progress = AnalysisProgress(status="running")
 
         # Create run in database
         if self._repository:
@@ -775,9 +937,10 @@ class CaseSeriesOrchestrator:
                 logger.warning(f"Score explanation generation failed: {e}")
 
             # Calculate estimated cost (Claude Sonnet pricing: $3/M input, $15/M output)
-            input_tokens = self._extraction_service.metrics.input_tokens
-            output_tokens = self._extraction_service.metrics.output_tokens
-            estimated_cost = (input_tokens * 3 / 1_000_000) + (output_tokens * 15 / 1_000_000)
+            # Token usage is attributed to this run by the LLM client
+            input_tokens = self._run.input_tokens
+            output_tokens = self._run.output_tokens
+            estimated_cost = estimate_cost_usd(input_tokens, output_tokens)
 
             # Identify papers that need manual review (abstract-only)
             papers_for_review = await self.identify_papers_for_manual_review(
@@ -826,6 +989,8 @@ class CaseSeriesOrchestrator:
                     papers_found=len(papers),
                     papers_extracted=len(extractions),
                     opportunities_found=len(opportunities),
+                    total_tokens=input_tokens + output_tokens,
+                    estimated_cost_usd=estimated_cost,
                 )
 
             return result
@@ -982,7 +1147,7 @@ class CaseSeriesOrchestrator:
 
     async def extract_data(
         self,
-        papers: List[Paper],
+        papers: Union[List[Paper], AsyncIterable[Paper]],
         drug_info: DrugInfo,
         use_cache: bool = True,
         max_concurrent: int = 5,
@@ -994,7 +1159,8 @@ class CaseSeriesOrchestrator:
         for real-time visibility and failure recovery.
 
         Args:
-            papers: List of papers to extract
+            papers: List of papers to extract, or an async iterable of papers
+                    (e.g. from search_stream) to extract as they arrive
             drug_info: Drug information
             use_cache: Whether to use extraction cache
             max_concurrent: Max concurrent extractions
@@ -1088,7 +1254,11 @@ class CaseSeriesOrchestrator:
                     title = extraction.source.title if extraction.source else "Unknown"
                     logger.warning(f"Cannot save extraction - no PMID or DOI for paper: {title[:100]}")
 
-        extractions = await self._extraction_service.extract_batch(
+        extract = (
+            self._extraction_service.extract_stream if hasattr(papers, '__aiter__')
+            else self._extraction_service.extract_batch
+        )
+        extractions = await extract(
             papers=papers,
             drug_info=drug_info,
             use_cache=use_cache,
@@ -1480,7 +1650,7 @@ class CaseSeriesOrchestrator:
         total_papers_extracted = sum(r.papers_extracted for r in drug_results.values())
         total_input_tokens = sum(r.total_input_tokens for r in drug_results.values())
         total_output_tokens = sum(r.total_output_tokens for r in drug_results.values())
-        estimated_cost = (total_input_tokens * 3 / 1_000_000) + (total_output_tokens * 15 / 1_000_000)
+        estimated_cost = estimate_cost_usd(total_input_tokens, total_output_tokens)
 
         # Aggregate papers for manual review from all drug results
         all_papers_for_review: List[PaperForManualReview] = []
@@ -1636,7 +1806,7 @@ class CaseSeriesOrchestrator:
         total_papers_extracted = sum(r.papers_extracted for r in drug_results.values())
         total_input_tokens = sum(r.total_input_tokens for r in drug_results.values())
         total_output_tokens = sum(r.total_output_tokens for r in drug_results.values())
-        estimated_cost = (total_input_tokens * 3 / 1_000_000) + (total_output_tokens * 15 / 1_000_000)
+        estimated_cost = estimate_cost_usd(total_input_tokens, total_output_tokens)
 
         # Aggregate papers for manual review from all drug results
         all_papers_for_review: List[PaperForManualReview] = []
@@ -13,6 +13,7 @@ from src.case_series.prompts.extraction_prompts import (
 )
 from src.case_series.prompts.filtering_prompts import (
     build_paper_filter_prompt,
+    build_paper_filter_messages,
     build_disease_classification_prompt,
 )
 from src.case_series.prompts.market_prompts import (
@@ -30,6 +31,7 @@ __all__ = [
     "build_safety_extraction_prompt",
     # Filtering
     "build_paper_filter_prompt",
+    "build_paper_filter_messages",
     "build_disease_classification_prompt",
     # Market
     "build_epidemiology_prompt",
@@ -4,7 +4,7 @@ Filtering Prompt Builders
 Functions for building prompts for paper filtering and classification.
 """
 
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 
 from src.prompts import get_prompt_manager
 
@@ -33,14 +33,7 @@ def build_paper_filter_prompt(
     prompts = get_prompt_manager()
 
     # Format papers as text for the template
-    papers_text_parts = []
-    for i, paper in enumerate(papers, 1):
-        pmid = paper.get('pmid', f'paper_{i}')
-        title = paper.get('title', 'No title')
-        abstract = paper.get('abstract', 'No abstract')[:1500]
-        papers_text_parts.append(f"--- Paper {i} (PMID: {pmid}) ---\nTitle: {title}\nAbstract: {abstract}\n")
-
-    papers_text = "\n".join(papers_text_parts)
+    papers_text = "\n".join(format_filter_paper(i, paper) for i, paper in enumerate(papers, 1))
     exclude_indications = ", ".join(approved_indications) if approved_indications else "None"
 
     return prompts.render(
@@ -52,6 +45,58 @@ def build_paper_filter_prompt(
     )
 
 
+def format_filter_paper(index: int, paper: Dict[str, Any], max_abstract_chars: Optional[int] = 1500) -> str:
+    """Format one paper as it appears in a filter prompt."""
+    pmid = paper.get('pmid', f'paper_{index}')
+    title = paper.get('title', 'No title')
+    abstract = paper.get('abstract', 'No abstract')
+    if max_abstract_chars is not None:
+        abstract = abstract[:max_abstract_chars]
+    return f"--- Paper {index} (PMID: {pmid}) ---\nTitle: {title}\nAbstract: {abstract}\n"
+
+
+def build_paper_filter_messages(
+    drug_name: str,
+    papers: List[Dict[str, Any]],
+    approved_indications: List[str],
+    max_abstract_chars: Optional[int] = None,
+) -> Tuple[str, str]:
+    """
+    Build the filter prompt as a (system, user) pair.
+
+    The system prompt holds the criteria and output format and depends only
+    on the drug, so it is identical for every batch and can be cached on the
+    provider side; the user prompt holds just the papers.
+
+    Args:
+        drug_name: Name of the drug
+        papers: List of paper dicts with title, abstract, pmid
+        approved_indications: List of approved indications to exclude
+        max_abstract_chars: Optional abstract truncation (callers that pack
+            batches by token budget truncate beforehand)
+
+    Returns:
+        Tuple of (system_prompt, user_prompt)
+    """
+    prompts = get_prompt_manager()
+    exclude_indications = ", ".join(approved_indications) if approved_indications else "None"
+    papers_text = "\n".join(
+        format_filter_paper(i, paper, max_abstract_chars) for i, paper in enumerate(papers, 1)
+    )
+
+    system = prompts.render(
+        "case_series/filter_papers_system",
+        drug_name=drug_name,
+        exclude_indications=exclude_indications,
+    )
+    user = prompts.render(
+        "case_series/filter_papers_batch",
+        papers_text=papers_text,
+        batch_size=len(papers),
+    )
+    return system, user
+
+
 def build_disease_classification_prompt(
     drug_name: str,
     papers: List[Dict[str, Any]],
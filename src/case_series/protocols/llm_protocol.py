@@ -18,6 +18,7 @@ class LLMClient(Protocol):
         temperature: float = 0.0,
         system: Optional[str] = None,
         cache_system: bool = False,
+        use_cache: bool = True,
     ) -> str:
         """
         Generate a completion for the given prompt.
@@ -28,6 +29,8 @@ class LLMClient(Protocol):
             temperature: Sampling temperature (0.0 = deterministic)
             system: Optional system prompt
             cache_system: If True, enable prompt caching for system prompt
+            use_cache: If False, skip the local response cache lookup and replace
+                its entry (e.g. retrying after a cached answer failed to parse)
 
         Returns:
             The generated text response
@@ -42,6 +45,7 @@ class LLMClient(Protocol):
         temperature: float = 1.0,
         system: Optional[str] = None,
         cache_system: bool = False,
+        use_cache: bool = True,
     ) -> tuple[str, Optional[str]]:
         """
         Generate a completion with extended thinking enabled.
@@ -53,6 +57,8 @@ class LLMClient(Protocol):
             temperature: Must be 1.0 for extended thinking
             system: Optional system prompt
             cache_system: If True, enable prompt caching for system prompt
+            use_cache: If False, skip the local response cache lookup and replace
+                its entry (e.g. retrying after a cached answer failed to parse)
 
         Returns:
             Tuple of (response_text, thinking_text)
@@ -38,12 +38,13 @@ class PubMedSearcher(Protocol):
         """
         ...
 
-    async def fetch_fulltext(self, pmcid: str) -> Optional[str]:
+    async def fetch_fulltext(self, pmcid: str, pmid: Optional[str] = None) -> Optional[str]:
         """
         Fetch full text from PubMed Central.
 
         Args:
             pmcid: PubMed Central ID (e.g., "PMC1234567")
+            pmid: PubMed ID, if known (lets implementations cache by PMID)
 
         Returns:
             Full text content if available, None otherwise
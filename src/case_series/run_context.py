@@ -0,0 +1,134 @@
+"""
+Per-run context for case series analyses.
+
+Each CaseSeriesOrchestrator.analyze() call runs inside its own RunContext
+(run ID, progress, token usage, metrics). The active context is tracked in a
+ContextVar, so concurrent analyses on one orchestrator (asyncio tasks, and
+threads started via asyncio.to_thread) never see each other's state. LLM
+clients attribute token usage to whichever run is current when a response
+arrives.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, Optional
+
+# Claude Sonnet pricing used for run cost estimates: $3/M input, $15/M output
+INPUT_COST_PER_MTOK = 3.0
+OUTPUT_COST_PER_MTOK = 15.0
+
+USAGE_KEYS = (
+    'input_tokens',
+    'output_tokens',
+    'thinking_tokens',
+    'cache_creation_tokens',
+    'cache_read_tokens',
+)
+
+
+def estimate_cost_usd(input_tokens: int, output_tokens: int) -> float:
+    """Estimated cost of a run at Sonnet pricing."""
+    return (input_tokens * INPUT_COST_PER_MTOK / 1_000_000) + (output_tokens * OUTPUT_COST_PER_MTOK / 1_000_000)
+
+
+@dataclass
+class AnalysisProgress:
+    """Tracks analysis progress for UI updates."""
+    status: str = "initializing"
+    current_step: str = ""
+    papers_found: int = 0
+    papers_extracted: int = 0
+    opportunities_found: int = 0
+    total_tokens: int = 0
+    estimated_cost_usd: float = 0.0
+
+
+@dataclass
+class RunContext:
+    """State owned by a single analysis run."""
+    drug_name: Optional[str] = None
+    run_id: Optional[str] = None
+    progress: AnalysisProgress = field(default_factory=AnalysisProgress)
+    usage: Dict[str, int] = field(default_factory=lambda: {k: 0 for k in USAGE_KEYS})
+    llm_calls: int = 0
+    metrics: Dict[str, Any] = field(default_factory=dict)
+    started_at: float = field(default_factory=time.monotonic)
+    finished_at: Optional[float] = None
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    @property
+    def input_tokens(self) -> int:
+        return self.usage['input_tokens']
+
+    @property
+    def output_tokens(self) -> int:
+        return self.usage['output_tokens']
+
+    @property
+    def elapsed_seconds(self) -> float:
+        return (self.finished_at or time.monotonic()) - self.started_at
+
+    @property
+    def estimated_cost_usd(self) -> float:
+        return estimate_cost_usd(self.input_tokens, self.output_tokens)
+
+    def add_usage(self, **counts: int) -> None:
+        """Add token counts from one LLM response and refresh progress totals."""
+        with self._lock:
+            for key, value in counts.items():
+                if key in self.usage and value:
+                    self.usage[key] += value
+            self.llm_calls += 1
+            self.progress.total_tokens = self.input_tokens + self.output_tokens
+            self.progress.estimated_cost_usd = self.estimated_cost_usd
+
+    def add_cache_hit(self, input_tokens: int = 0, output_tokens: int = 0) -> None:
+        """Count an LLM call served from the response cache and the tokens it saved."""
+        with self._lock:
+            self.metrics['llm_cache_hits'] = self.metrics.get('llm_cache_hits', 0) + 1
+            for key, value in (('llm_cache_saved_input_tokens', input_tokens),
+                               ('llm_cache_saved_output_tokens', output_tokens)):
+                self.metrics[key] = self.metrics.get(key, 0) + value
+
+    def finish(self, status: Optional[str] = None) -> None:
+        """Mark the run finished, optionally overriding the final status."""
+        self.finished_at = time.monotonic()
+        if status:
+            self.progress.status = status
+        self.metrics['elapsed_seconds'] = round(self.elapsed_seconds, 3)
+        self.metrics['llm_calls'] = self.llm_calls
+
+
+_current_run: ContextVar[Optional[RunContext]] = ContextVar("case_series_run", default=None)
+
+
+def current_run() -> Optional[RunContext]:
+    """The RunContext of the analysis running in this task/thread, if any."""
+    return _current_run.get()
+
+
+def record_llm_usage(**counts: int) -> None:
+    """Attribute LLM token usage to the current run (no-op outside a run)."""
+    run = _current_run.get()
+    if run is not None:
+        run.add_usage(**counts)
+
+
+def record_llm_cache_hit(input_tokens: int = 0, output_tokens: int = 0) -> None:
+    """Attribute a cached LLM response to the current run (no-op outside a run)."""
+    run = _current_run.get()
+    if run is not None:
+        run.add_cache_hit(input_tokens, output_tokens)
+
+
+@contextmanager
+def run_scope(run: RunContext) -> Iterator[RunContext]:
+    """Make run the current RunContext for the enclosed code."""
+    token = _current_run.set(run)
+    try:
+        yield run
+    finally:
+        _current_run.reset(token)
@@ -0,0 +1,470 @@
+"""
+Offline extraction through the Message Batches API.
+
+Re-extractions and large extract_batch runs are not latency sensitive. Instead
+of hundreds of live Sonnet calls they can be submitted as provider batch jobs,
+which are billed at half the per-token price and don't count against the
+per-minute rate limits. The multi-stage pipeline becomes two rounds of
+requests:
+
+1. single-pass extraction for every paper, plus section identification for
+   full-text papers;
+2. efficacy and safety extraction for full-text papers, built from the
+   sections found in round 1.
+
+Responses are parsed with the same ExtractionService helpers as the live path
+and post-processed by _finalize_extraction (summary derivation, relevance,
+fixes, repository cache). Each paper is yielded as soon as its last request
+completes.
+
+Job state (paper keys, request custom_ids and status, batch IDs) is kept in a
+small JSON manifest, replaced atomically after every change. Paper inputs
+(metadata and full text) and raw responses are written once each to a
+``<manifest stem>_files`` directory next to it. An interrupted job resumes when
+the same manifest is opened again: submitted batches are polled again,
+collected responses are not re-requested, and papers already emitted are
+skipped.
+
+The backend is anything with submit/is_ended/results; AnthropicBatchBackend
+wraps the SDK, and its base_url can point at a local fake endpoint.
+"""
+
+import asyncio
+import json
+import logging
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional, Union
+
+from src.case_series.models import CaseSeriesExtraction
+from src.case_series.run_context import record_llm_usage
+from src.case_series.services.drug_info_service import DrugInfo
+from src.case_series.services.extraction_service import (
+    MIN_FULLTEXT_LENGTH,
+    STAGE_EFFICACY,
+    STAGE_SAFETY,
+    STAGE_SECTIONS,
+    STAGE_SINGLE_PASS,
+    ExtractionRequest,
+    ExtractionService,
+)
+from src.case_series.services.literature_search_service import Paper
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MANIFEST_DIR = Path("data/extraction_batches")
+DEFAULT_BATCH_MODEL = "claude-sonnet-4-20250514"
+POLL_INTERVAL_SECONDS = 60.0
+# The API allows 100k requests per batch; smaller batches start returning sooner
+MAX_REQUESTS_PER_BATCH = 2000
+# Errored or expired requests are re-submitted once
+MAX_ATTEMPTS = 2
+FULLTEXT_FETCH_CONCURRENCY = 5
+
+REQUEST_PENDING = "pending"
+REQUEST_SUBMITTED = "submitted"
+REQUEST_SUCCEEDED = "succeeded"
+REQUEST_FAILED = "failed"
+_TERMINAL = (REQUEST_SUCCEEDED, REQUEST_FAILED)
+
+
+def build_message_params(request: ExtractionRequest, model: str) -> Dict[str, Any]:
+    """messages.create params for an extraction request, as the live client builds them."""
+    params: Dict[str, Any] = {
+        "model": model,
+        "max_tokens": request.max_tokens,
+        "messages": [{"role": "user", "content": request.prompt}],
+    }
+    if request.thinking_budget:
+        params["temperature"] = 1.0
+        params["thinking"] = {"type": "enabled", "budget_tokens": request.thinking_budget}
+    if request.system:
+        if len(request.system) > 1024:
+            params["system"] = [
+                {"type": "text", "text": request.system, "cache_control": {"type": "ephemeral"}}
+            ]
+        else:
+            params["system"] = request.system
+    return params
+
+
+class AnthropicBatchBackend:
+    """Message Batches API through the Anthropic SDK."""
+
+    def __init__(self, api_key: Optional[str] = None, base_url: Optional[str] = None, client: Any = None):
+        """
+        Args:
+            api_key: Anthropic API key (defaults to ANTHROPIC_API_KEY)
+            base_url: Alternative API root, e.g. a local fake batch endpoint
+            client: Pre-built anthropic.Anthropic client
+        """
+        if client is None:
+            from anthropic import Anthropic
+            client = Anthropic(api_key=api_key or os.getenv("ANTHROPIC_API_KEY"), base_url=base_url)
+        self._client = client
+
+    def submit(self, requests: List[Dict[str, Any]]) -> str:
+        """Create a batch from [{"custom_id", "params"}] and return its ID."""
+        return self._client.messages.batches.create(requests=requests).id
+
+    def is_ended(self, batch_id: str) -> bool:
+        return self._client.messages.batches.retrieve(batch_id).processing_status == "ended"
+
+    def results(self, batch_id: str) -> Iterator[Dict[str, Any]]:
+        """Yield {"custom_id", "status", "text", "usage"} or {"custom_id", "status", "error"}."""
+        for item in self._client.messages.batches.results(batch_id):
+            result = item.result
+            entry: Dict[str, Any] = {"custom_id": item.custom_id, "status": result.type}
+            if result.type == "succeeded":
+                message = result.message
+                entry["text"] = next(
+                    (block.text for block in message.content if getattr(block, "type", None) == "text"), ""
+                )
+                usage = message.usage
+                entry["usage"] = {
+                    "input_tokens": getattr(usage, "input_tokens", 0) or 0,
+                    "output_tokens": getattr(usage, "output_tokens", 0) or 0,
+                    "cache_creation_tokens": getattr(usage, "cache_creation_input_tokens", 0) or 0,
+                    "cache_read_tokens": getattr(usage, "cache_read_input_tokens", 0) or 0,
+                }
+            else:
+                error = getattr(result, "error", None)
+                entry["error"] = str(getattr(error, "error", None) or error or result.type)
+            yield entry
+
+
+def _paper_identity(paper: Paper, drug_info: DrugInfo) -> str:
+    ident = paper.pmid or paper.doi or (paper.title or "").strip().lower()
+    return f"{drug_info.drug_name.lower()}|{ident}"
+
+
+def _write_atomic(path: Path, text: str):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    tmp_path.write_text(text, encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
+class BatchExtractionJob:
+    """An offline extraction job backed by a JSON manifest."""
+
+    def __init__(
+        self,
+        service: ExtractionService,
+        backend: Any,
+        manifest_path: Union[str, Path],
+        model: Optional[str] = None,
+        poll_interval: float = POLL_INTERVAL_SECONDS,
+    ):
+        """
+        Open a job, resuming from ``manifest_path`` if it exists.
+
+        Args:
+            service: ExtractionService providing prompts, parsing and post-processing
+            backend: Batch backend (submit / is_ended / results)
+            manifest_path: JSON manifest location
+            model: Model for new jobs (a resumed job keeps its own)
+            poll_interval: Seconds between batch status checks
+        """
+        self._service = service
+        self._backend = backend
+        self.manifest_path = Path(manifest_path)
+        self.files_dir = self.manifest_path.with_name(f"{self.manifest_path.stem}_files")
+        self.poll_interval = poll_interval
+
+        if self.manifest_path.exists():
+            self._manifest = json.loads(self.manifest_path.read_text(encoding="utf-8"))
+            logger.info(f"Resuming batch extraction job from {self.manifest_path} ({self._summary()})")
+        else:
+            self._manifest = {
+                "model": model or DEFAULT_BATCH_MODEL,
+                "created_at": datetime.now().isoformat(),
+                "papers": {},
+                "requests": {},
+                "batches": {},
+            }
+        self.model = self._manifest["model"]
+        self._identities = {record["identity"]: key for key, record in self._manifest["papers"].items()}
+
+    # ------------------------------------------------------------------
+    # Manifest
+    # ------------------------------------------------------------------
+
+    def _save(self):
+        _write_atomic(self.manifest_path, json.dumps(self._manifest))
+
+    def _write_file(self, name: str, text: str):
+        _write_atomic(self.files_dir / name, text)
+
+    def _read_file(self, name: str) -> str:
+        return (self.files_dir / name).read_text(encoding="utf-8")
+
+    def _summary(self) -> str:
+        stats = self.get_stats()
+        return (f"{stats['papers']} papers, {stats['emitted']} emitted, "
+                f"{stats['requests_succeeded']}/{stats['requests']} requests done")
+
+    def get_stats(self) -> Dict[str, Any]:
+        papers = self._manifest["papers"].values()
+        requests = self._manifest["requests"].values()
+        return {
+            "papers": len(self._manifest["papers"]),
+            "emitted": sum(1 for p in papers if p["emitted"]),
+            "requests": len(self._manifest["requests"]),
+            "requests_succeeded": sum(1 for r in requests if r["status"] == REQUEST_SUCCEEDED),
+            "requests_failed": sum(1 for r in requests if r["status"] == REQUEST_FAILED),
+            "batches": len(self._manifest["batches"]),
+        }
+
+    # ------------------------------------------------------------------
+    # Papers
+    # ------------------------------------------------------------------
+
+    def add(self, paper: Paper, drug_info: DrugInfo, full_text: Optional[str] = None) -> str:
+        """Add a paper (no-op if the job already has it); returns its key."""
+        identity = _paper_identity(paper, drug_info)
+        if identity in self._identities:
+            return self._identities[identity]
+        key = f"p{len(self._manifest['papers'])}"
+        self._write_file(f"{key}.json", json.dumps({
+            "paper": paper.to_dict(),
+            "drug_info": drug_info.to_dict(),
+            "full_text": full_text,
+        }))
+        self._manifest["papers"][key] = {
+            "identity": identity,
+            "multi_stage": self._is_multi_stage(full_text),
+            "emitted": False,
+        }
+        self._identities[identity] = key
+        return key
+
+    async def add_papers(self, papers: List[Paper], drug_info: DrugInfo):
+        """Add papers, fetching PMC full text for the ones the job doesn't have yet."""
+        new = [p for p in papers if _paper_identity(p, drug_info) not in self._identities]
+        semaphore = asyncio.Semaphore(FULLTEXT_FETCH_CONCURRENCY)
+
+        async def fetch(paper: Paper):
+            async with semaphore:
+                return await self._service._fetch_full_text(paper)
+
+        full_texts = await asyncio.gather(*(fetch(p) for p in new))
+        for paper, full_text in zip(new, full_texts):
+            self.add(paper, drug_info, full_text)
+        self._save()
+
+    def _paper(self, key: str):
+        record = json.loads(self._read_file(f"{key}.json"))
+        return Paper(**record["paper"]), DrugInfo(**record["drug_info"]), record["full_text"]
+
+    @staticmethod
+    def _is_multi_stage(full_text: Optional[str]) -> bool:
+        return bool(full_text) and len(full_text) >= MIN_FULLTEXT_LENGTH
+
+    # ------------------------------------------------------------------
+    # Requests
+    # ------------------------------------------------------------------
+
+    def _request(self, key: str, stage: str) -> Optional[Dict[str, Any]]:
+        return self._manifest["requests"].get(f"{key}-{stage}")
+
+    def _response(self, key: str, stage: str) -> Optional[str]:
+        """Raw response text of a stage (None unless it succeeded)."""
+        request = self._request(key, stage)
+        if not request or request["status"] != REQUEST_SUCCEEDED:
+            return None
+        return self._read_file(f"{request['custom_id']}.txt")
+
+    def _stage_output(self, key: str, stage: str) -> Any:
+        """Parsed response of a stage ({} / [] if it failed)."""
+        response = self._response(key, stage)
+        if response is None:
+            return {} if stage == STAGE_SECTIONS else []
+        paper, _, _ = self._paper(key)
+        return ExtractionService._parse_stage(stage, paper, response)
+
+    def _needed_stages(self, key: str) -> List[str]:
+        """Stages this paper needs that can be requested now."""
+        if not self._manifest["papers"][key]["multi_stage"]:
+            return [STAGE_SINGLE_PASS]
+        stages = [STAGE_SINGLE_PASS, STAGE_SECTIONS]
+        sections = self._request(key, STAGE_SECTIONS)
+        if sections and sections["status"] in _TERMINAL:
+            stages += [STAGE_EFFICACY, STAGE_SAFETY]
+        return stages
+
+    def _plan(self):
+        """Create request records for every stage whose inputs are available."""
+        for key, record in self._manifest["papers"].items():
+            if record["emitted"]:
+                continue
+            for stage in self._needed_stages(key):
+                custom_id = f"{key}-{stage}"
+                if custom_id not in self._manifest["requests"]:
+                    self._manifest["requests"][custom_id] = {
+                        "custom_id": custom_id, "paper": key, "stage": stage,
+                        "status": REQUEST_PENDING, "attempts": 0,
+                    }
+
+    def _build_request(self, request: Dict[str, Any]) -> ExtractionRequest:
+        key, stage = request["paper"], request["stage"]
+        paper, drug_info, full_text = self._paper(key)
+        multi_stage = self._manifest["papers"][key]["multi_stage"]
+        if stage == STAGE_SINGLE_PASS:
+            content = full_text or paper.abstract
+            return ExtractionService._single_pass_request(paper, drug_info, content, is_full_text=multi_stage)
+        sections = self._stage_output(key, STAGE_SECTIONS) if stage != STAGE_SECTIONS else None
+        return ExtractionService._stage_request(stage, paper, drug_info, full_text, sections)
+
+    async def _submit_pending(self):
+        pending = [r for r in self._manifest["requests"].values() if r["status"] == REQUEST_PENDING]
+        for start in range(0, len(pending), MAX_REQUESTS_PER_BATCH):
+            chunk = pending[start:start + MAX_REQUESTS_PER_BATCH]
+            payload = [
+                {"custom_id": r["custom_id"], "params": build_message_params(self._build_request(r), self.model)}
+                for r in chunk
+            ]
+            batch_id = await asyncio.to_thread(self._backend.submit, payload)
+            self._manifest["batches"][batch_id] = {
+                "submitted_at": datetime.now().isoformat(),
+                "size": len(chunk),
+                "ended": False,
+            }
+            for request in chunk:
+                request["status"] = REQUEST_SUBMITTED
+                request["batch_id"] = batch_id
+                request["attempts"] += 1
+            # Persist the batch ID before polling so a crash never orphans it
+            self._save()
+            logger.info(f"Submitted batch {batch_id} with {len(chunk)} extraction requests")
+
+    async def _collect(self, batch_id: str):
+        """Store the results of an ended batch."""
+        entries = await asyncio.to_thread(lambda: list(self._backend.results(batch_id)))
+        seen = set()
+        for entry in entries:
+            request = self._manifest["requests"].get(entry["custom_id"])
+            if not request or request.get("batch_id") != batch_id or request["status"] != REQUEST_SUBMITTED:
+                continue
+            seen.add(entry["custom_id"])
+            if entry["status"] == "succeeded":
+                self._write_file(f"{request['custom_id']}.txt", entry.get("text", ""))
+                request["status"] = REQUEST_SUCCEEDED
+                usage = entry.get("usage") or {}
+                request["usage"] = usage
+                record_llm_usage(**usage)
+            else:
+                self._fail(request, entry.get("error") or entry["status"])
+
+        for request in self._manifest["requests"].values():
+            if (request.get("batch_id") == batch_id and request["status"] == REQUEST_SUBMITTED
+                    and request["custom_id"] not in seen):
+                self._fail(request, "missing from batch results")
+
+        self._manifest["batches"][batch_id]["ended"] = True
+        self._save()
+        logger.info(f"Collected batch {batch_id} ({len(seen)} results)")
+
+    @staticmethod
+    def _fail(request: Dict[str, Any], error: str):
+        request["error"] = error
+        request["status"] = REQUEST_PENDING if request["attempts"] < MAX_ATTEMPTS else REQUEST_FAILED
+        logger.warning(f"Batch request {request['custom_id']} failed ({error})"
+                       f"{', will retry' if request['status'] == REQUEST_PENDING else ''}")
+
+    # ------------------------------------------------------------------
+    # Results
+    # ------------------------------------------------------------------
+
+    def _ready_papers(self) -> List[str]:
+        """Papers whose requests are all finished."""
+        ready = []
+        for key, record in self._manifest["papers"].items():
+            if record["emitted"]:
+                continue
+            stages = self._needed_stages(key)
+            requests = [self._request(key, stage) for stage in stages]
+            if all(r and r["status"] in _TERMINAL for r in requests):
+                # Round 2 is planned only after sections finish
+                if not record["multi_stage"] or STAGE_EFFICACY in stages:
+                    ready.append(key)
+        return ready
+
+    def _assemble(self, key: str) -> Optional[CaseSeriesExtraction]:
+        paper, drug_info, _ = self._paper(key)
+        single = self._response(key, STAGE_SINGLE_PASS)
+        try:
+            extraction = (
+                self._service._parse_single_pass(paper, drug_info, single) if single is not None else None
+            )
+            if self._manifest["papers"][key]["multi_stage"]:
+                extraction = ExtractionService._assemble_multi_stage(
+                    extraction,
+                    self._stage_output(key, STAGE_SECTIONS),
+                    self._stage_output(key, STAGE_EFFICACY),
+                    self._stage_output(key, STAGE_SAFETY),
+                )
+            if extraction:
+                extraction = self._service._finalize_extraction(paper, drug_info, extraction)
+        except Exception as e:
+            logger.error(f"Batch extraction failed for {paper.pmid}: {e}")
+            extraction = None
+
+        record = self._manifest["papers"][key]
+        record["emitted"] = True
+        record["succeeded"] = extraction is not None
+        if extraction is None:
+            logger.warning(f"No extraction for {paper.pmid or paper.title[:40]}")
+        return extraction
+
+    async def stream(
+        self,
+        on_extraction_complete: Optional[Callable[[CaseSeriesExtraction, str], Any]] = None,
+    ) -> AsyncIterator[CaseSeriesExtraction]:
+        """
+        Submit, poll and yield extractions as their papers complete.
+
+        Args:
+            on_extraction_complete: Optional callback(extraction, drug_name),
+                called before each extraction is yielded (e.g. to save it)
+        """
+        while True:
+            self._plan()
+            await self._submit_pending()
+
+            ready = self._ready_papers()
+            for key in ready:
+                extraction = self._assemble(key)
+                if extraction is None:
+                    continue
+                if on_extraction_complete:
+                    _, drug_info, _ = self._paper(key)
+                    try:
+                        on_extraction_complete(extraction, drug_info.drug_name)
+                    except Exception as e:
+                        logger.warning(f"Callback failed for batch extraction: {e}")
+                yield extraction
+            if ready:
+                self._save()
+
+            open_batches = [b for b, info in self._manifest["batches"].items() if not info["ended"]]
+            if not open_batches:
+                break
+
+            collected = False
+            for batch_id in open_batches:
+                if await asyncio.to_thread(self._backend.is_ended, batch_id):
+                    await self._collect(batch_id)
+                    collected = True
+            if not collected:
+                await asyncio.sleep(self.poll_interval)
+
+        logger.info(f"Batch extraction job complete: {self._summary()}")
+
+    async def run(
+        self,
+        on_extraction_complete: Optional[Callable[[CaseSeriesExtraction, str], Any]] = None,
+    ) -> List[CaseSeriesExtraction]:
+        """Run the job to completion and return the extractions (see stream())."""
+        return [extraction async for extraction in self.stream(on_extraction_complete)]
@@ -5,20 +5,30 @@ Provides dynamic scoring for the drug-centric case series browser.
 - Refresh scores at drug level
 - Auto-detect stale data
 - Aggregate scores computed from cached individual scores
+- Drug/disease summaries read from materialized tables (migration 022),
+  refreshed per drug whenever its extractions, opportunities or scores change
 """
 
 import json
 import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional, Any
 from dataclasses import dataclass
 from decimal import Decimal
 
-import psycopg2
-from psycopg2.extras import RealDictCursor
+from psycopg2.extras import RealDictCursor, execute_values
+
+from src.tools import db_pool
+from src.tools.case_series_database import refresh_drug_summary
 
 logger = logging.getLogger(__name__)
 
+# Rows scored per batched UPDATE in refresh_scores
+REFRESH_BATCH_SIZE = 500
+# Drugs refreshed concurrently by refresh_all_scores
+REFRESH_MAX_WORKERS = 4
+
 
 @dataclass
 class PaperScore:
@@ -95,8 +105,8 @@ class BrowserScoringService:
         self._scorer = None
 
     def _get_connection(self):
-        """Get database connection."""
-        return psycopg2.connect(self.database_url)
+        """Get a pooled database connection; close() returns it to the pool."""
+        return db_pool.connect(self.database_url)
 
     def _get_scorer(self):
         """Lazy-load the scorer to avoid circular imports."""
@@ -121,7 +131,7 @@ class BrowserScoringService:
                         top_paper_score,
                         last_scored_at,
                         last_extracted_at
-                    FROM v_cs_drug_summary
+                    FROM cs_drug_summary
                     ORDER BY total_papers DESC
                 """)
 
@@ -189,22 +199,28 @@ class BrowserScoringService:
         finally:
             conn.close()
 
-    def refresh_scores(self, drug_name: str, force: bool = False) -> RefreshResult:
+    def refresh_scores(
+        self,
+        drug_name: str,
+        force: bool = False,
+        batch_size: int = REFRESH_BATCH_SIZE,
+    ) -> RefreshResult:
         """
         Refresh all individual paper scores for a drug.
 
+        Rows are scored in batches of batch_size; each batch's changed scores
+        are written with one batched UPDATE ... FROM (VALUES ...), and rows
+        whose score did not change get their scored_at bumped by a single
+        set-based UPDATE at the end.
+
         Args:
             drug_name: Drug to refresh scores for
             force: If True, refresh even if not stale
+            batch_size: Rows scored and written per batched UPDATE
 
         Returns:
             RefreshResult with stats about the refresh
         """
-        from src.models.case_series_schemas import (
-            CaseSeriesExtraction, CaseSeriesSource, PatientPopulation,
-            TreatmentDetails, EfficacyOutcome, SafetyOutcome, BiomarkerResult
-        )
-
         start_time = datetime.now()
         errors = []
         papers_scored = 0
@@ -240,78 +256,51 @@ class BrowserScoringService:
                 rows = cur.fetchall()
                 logger.info(f"Refreshing scores for {len(rows)} papers ({drug_name})")
 
-                for row in rows:
-                    try:
-                        # Build extraction object for scoring
-                        extraction = CaseSeriesExtraction(
-                            source=CaseSeriesSource(
-                                pmid=row['pmid'],
-                                title=row['paper_title'] or '',
-                                year=row['paper_year'],
-                            ),
-                            disease=row['disease'] or 'Unknown',
-                            evidence_level=row['evidence_level'] or 'Case Report',
-                            patient_population=PatientPopulation(
-                                n_patients=row['n_patients'],
-                            ),
-                            treatment=TreatmentDetails(
-                                drug_name=drug_name,
-                            ),
-                            efficacy=EfficacyOutcome(
-                                response_rate=row['response_rate'],
-                                responders_pct=row['responders_pct'],
-                                efficacy_summary=row['efficacy_summary'],
-                                primary_endpoint=row['primary_endpoint'],
-                            ),
-                            safety=SafetyOutcome(),
-                            efficacy_signal=row['efficacy_signal'] or 'Unknown',
-                            study_design=row['study_design'],
-                            follow_up_duration=row['follow_up_duration'],
-                            follow_up_weeks=row['follow_up_weeks'],
-                            response_definition_quality=row['response_definition_quality'],
-                        )
-
-                        # Parse biomarkers if present
-                        if row['biomarkers_data']:
-                            try:
-                                biomarkers = json.loads(row['biomarkers_data']) if isinstance(row['biomarkers_data'], str) else row['biomarkers_data']
-                                extraction.biomarkers = [BiomarkerResult(**b) for b in biomarkers]
-                            except Exception:
-                                pass
-
-                        # Calculate score
-                        score_result = scorer.score_extraction(extraction)
-                        new_score = score_result.total_score
-                        old_score = float(row['individual_score']) if row['individual_score'] else None
-
-                        papers_scored += 1
-
-                        # Update if changed
-                        if old_score is None or abs(new_score - old_score) > 0.01:
-                            cur.execute("""
-                                UPDATE cs_extractions
-                                SET individual_score = %s,
-                                    score_breakdown = %s,
-                                    scored_at = NOW()
-                                WHERE id = %s
-                            """, (
-                                new_score,
-                                json.dumps(score_result.model_dump()),
-                                row['id']
-                            ))
-                            papers_changed += 1
-                        else:
-                            # Update scored_at even if score unchanged
-                            cur.execute("""
-                                UPDATE cs_extractions
-                                SET scored_at = NOW()
-                                WHERE id = %s
-                            """, (row['id'],))
-
-                    except Exception as e:
-                        errors.append(f"PMID {row['pmid']}: {str(e)}")
-                        logger.error(f"Error scoring PMID {row['pmid']}: {e}")
+                unchanged_ids = []
+                for batch_start in range(0, len(rows), batch_size):
+                    changed = []
+                    for row in rows[batch_start:batch_start + batch_size]:
+                        try:
+                            score_result = scorer.score_extraction(self._build_extraction(row, drug_name))
+                            new_score = score_result.total_score
+                            old_score = float(row['individual_score']) if row['individual_score'] else None
+
+                            papers_scored += 1
+
+                            if old_score is None or abs(new_score - old_score) > 0.01:
+                                changed.append((
+                                    row['id'],
+                                    new_score,
+                                    json.dumps(score_result.model_dump()),
+                                ))
+                            else:
+                                unchanged_ids.append(row['id'])
+
+                        except Exception as e:
+                            errors.append(f"PMID {row['pmid']}: {str(e)}")
+                            logger.error(f"Error scoring PMID {row['pmid']}: {e}")
+
+                    if changed:
+                        execute_values(cur, """
+                            UPDATE cs_extractions AS e
+                            SET individual_score = v.individual_score,
+                                score_breakdown = v.score_breakdown::jsonb,
+                                scored_at = NOW()
+                            FROM (VALUES %s) AS v (id, individual_score, score_breakdown)
+                            WHERE e.id = v.id
+                        """, changed, template="(%s::integer, %s::numeric, %s)", page_size=len(changed))
+                        papers_changed += len(changed)
+
+                # Update scored_at even if score unchanged
+                if unchanged_ids:
+                    cur.execute("""
+                        UPDATE cs_extractions
+                        SET scored_at = NOW()
+                        WHERE id = ANY(%s)
+                    """, (unchanged_ids,))
 
+                if rows:
+                    refresh_drug_summary(cur, drug_name)
                 conn.commit()
 
         finally:
@@ -328,6 +317,97 @@ class BrowserScoringService:
             errors=errors
         )
 
+    def refresh_all_scores(
+        self,
+        force: bool = False,
+        max_workers: int = REFRESH_MAX_WORKERS,
+    ) -> List[RefreshResult]:
+        """
+        Refresh scores for every drug with extractions, several drugs at once.
+
+        Each drug is refreshed on its own pooled connection and transaction.
+
+        Args:
+            force: If True, refresh even drugs whose scores are current
+            max_workers: Number of drugs refreshed concurrently
+
+        Returns:
+            RefreshResult per drug, in get_drugs_with_extractions() order
+        """
+        drugs = [d.drug_name for d in self.get_drugs_with_extractions() if force or d.needs_refresh]
+        if not drugs:
+            return []
+
+        self._get_scorer()  # build once before workers share it
+        results: Dict[str, RefreshResult] = {}
+
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(drugs)))) as executor:
+            futures = {
+                executor.submit(self.refresh_scores, drug_name, True): drug_name
+                for drug_name in drugs
+            }
+            for future in as_completed(futures):
+                drug_name = futures[future]
+                try:
+                    results[drug_name] = future.result()
+                except Exception as e:
+                    logger.error(f"Error refreshing scores for {drug_name}: {e}")
+                    results[drug_name] = RefreshResult(
+                        drug_name=drug_name,
+                        papers_scored=0,
+                        papers_changed=0,
+                        duration_seconds=0,
+                        errors=[str(e)]
+                    )
+
+        return [results[drug_name] for drug_name in drugs]
+
+    @staticmethod
+    def _build_extraction(row: Dict[str, Any], drug_name: str):
+        """Build a CaseSeriesExtraction for scoring from a cs_extractions row."""
+        from src.models.case_series_schemas import (
+            CaseSeriesExtraction, CaseSeriesSource, PatientPopulation,
+            TreatmentDetails, EfficacyOutcome, SafetyOutcome, BiomarkerResult
+        )
+
+        extraction = CaseSeriesExtraction(
+            source=CaseSeriesSource(
+                pmid=row['pmid'],
+                title=row['paper_title'] or '',
+                year=row['paper_year'],
+            ),
+            disease=row['disease'] or 'Unknown',
+            evidence_level=row['evidence_level'] or 'Case Report',
+            patient_population=PatientPopulation(
+                n_patients=row['n_patients'],
+            ),
+            treatment=TreatmentDetails(
+                drug_name=drug_name,
+            ),
+            efficacy=EfficacyOutcome(
+                response_rate=row['response_rate'],
+                responders_pct=row['responders_pct'],
+                efficacy_summary=row['efficacy_summary'],
+                primary_endpoint=row['primary_endpoint'],
+            ),
+            safety=SafetyOutcome(),
+            efficacy_signal=row['efficacy_signal'] or 'Unknown',
+            study_design=row['study_design'],
+            follow_up_duration=row['follow_up_duration'],
+            follow_up_weeks=row['follow_up_weeks'],
+            response_definition_quality=row['response_definition_quality'],
+        )
+
+        # Parse biomarkers if present
+        if row['biomarkers_data']:
+            try:
+                biomarkers = json.loads(row['biomarkers_data']) if isinstance(row['biomarkers_data'], str) else row['biomarkers_data']
+                extraction.biomarkers = [BiomarkerResult(**b) for b in biomarkers]
+            except Exception:
+                pass
+
+        return extraction
+
     def get_disease_summaries(
         self,
         drug_name: str,
@@ -376,41 +456,20 @@ class BrowserScoringService:
                         total_patients,
                         aggregate_score,
                         best_paper_score,
+                        best_paper_pmid,
                         avg_response_rate,
                         efficacy_signal,
-                        best_evidence_level
-                    FROM v_cs_drug_disease_summary
+                        best_evidence_level,
+                        explanation
+                    FROM cs_drug_disease_summary
                     WHERE {' AND '.join(where_clauses)}
                     ORDER BY {sort_by} DESC NULLS LAST
                 """
 
                 cur.execute(query, params)
-                rows = cur.fetchall()
 
                 results = []
-                for row in rows:
-                    # Get best paper PMID
-                    cur.execute("""
-                        SELECT pmid FROM cs_extractions
-                        WHERE LOWER(drug_name) = LOWER(%s)
-                          AND disease = %s
-                          AND is_relevant = true
-                        ORDER BY individual_score DESC NULLS LAST
-                        LIMIT 1
-                    """, (drug_name, row['disease']))
-                    best = cur.fetchone()
-                    best_pmid = best['pmid'] if best else None
-
-                    # Get explanation from cs_opportunities
-                    cur.execute("""
-                        SELECT key_findings FROM cs_opportunities
-                        WHERE LOWER(drug_name) = LOWER(%s)
-                          AND LOWER(disease) = LOWER(%s)
-                        LIMIT 1
-                    """, (drug_name, row['disease']))
-                    opp = cur.fetchone()
-                    explanation = opp['key_findings'] if opp else None
-
+                for row in cur.fetchall():
                     results.append(DiseaseSummary(
                         disease=row['disease'],
                         disease_normalized=row['disease_normalized'],
@@ -419,12 +478,12 @@ class BrowserScoringService:
                         total_patients=row['total_patients'],
                         aggregate_score=float(row['aggregate_score'] or 0),
                         best_paper_score=float(row['best_paper_score'] or 0),
-                        best_paper_pmid=best_pmid,
+                        best_paper_pmid=row['best_paper_pmid'],
                         avg_response_rate=float(row['avg_response_rate']) if row['avg_response_rate'] else None,
                         efficacy_signal=row['efficacy_signal'],
                         best_evidence_level=row['best_evidence_level'],
                         consistency_level=None,  # Calculated if needed
-                        explanation=explanation,
+                        explanation=row['explanation'],
                     ))
 
                 return results
@@ -7,11 +7,12 @@ Supports two extraction modes:
 - Multi-stage: For full-text papers with extended thinking
 """
 
+import asyncio
 import json
 import logging
 import re
 from dataclasses import dataclass, field
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, AsyncIterable
 
 from src.case_series.models import (
     CaseSeriesExtraction,
@@ -596,6 +597,22 @@ def safe_parse_json(response: str, context: str = "") -> Optional[Dict]:
         return None
 
 
+STAGE_SINGLE_PASS = "single_pass"
+STAGE_SECTIONS = "sections"
+STAGE_EFFICACY = "efficacy"
+STAGE_SAFETY = "safety"
+
+
+@dataclass
+class ExtractionRequest:
+    """One extraction LLM call: prompt plus sampling settings."""
+    stage: str
+    prompt: str
+    max_tokens: int
+    thinking_budget: Optional[int] = None
+    system: str = EXTRACTION_SYSTEM_PROMPT
+
+
 @dataclass
 class ExtractionMetrics:
     """Token usage metrics for extraction."""
@@ -662,21 +679,14 @@ class ExtractionService:
             CaseSeriesExtraction or None if extraction failed
         """
         # Check cache
-        if use_cache and self._repository and paper.pmid:
-            cached = self._repository.load_extraction(drug_info.drug_name, paper.pmid)
+        if use_cache:
+            cached = self._load_cached(paper, drug_info)
             if cached:
                 logger.info(f"Using cached extraction for {paper.pmid}")
-                extraction = CaseSeriesExtraction(**cached)
                 # Apply post-processing fixes to cached extractions
-                return _apply_extraction_fixes(extraction)
+                return _apply_extraction_fixes(cached)
 
-        # Fetch full text if available
-        full_text = None
-        if paper.pmcid and self._pubmed:
-            try:
-                full_text = await self._pubmed.fetch_fulltext(paper.pmcid)
-            except Exception as e:
-                logger.warning(f"Failed to fetch full text for {paper.pmcid}: {e}")
+        full_text = await self._fetch_full_text(paper)
 
         # Determine extraction method
         content = full_text or paper.abstract
@@ -686,33 +696,63 @@ class ExtractionService:
             extraction = await self._extract_single_pass(paper, drug_info, content)
 
         if extraction:
-            # Derive summary from detailed endpoints (fixes summary/detail mismatch)
-            extraction = self._derive_summary_from_detailed_endpoints(extraction)
-
-            # Assess relevance
-            extraction = self._assess_relevance(extraction, drug_info)
+            extraction = self._finalize_extraction(paper, drug_info, extraction)
+        return extraction
 
-            # Apply post-processing fixes (n_patients parsing, metric type detection)
-            extraction = _apply_extraction_fixes(extraction)
+    def _load_cached(self, paper: Paper, drug_info: DrugInfo) -> Optional[CaseSeriesExtraction]:
+        """Cached extraction for this paper, if the repository has one."""
+        if self._repository and paper.pmid:
+            cached = self._repository.load_extraction(drug_info.drug_name, paper.pmid)
+            if cached:
+                return CaseSeriesExtraction(**cached)
+        return None
 
-            # Save to cache (after fixes so cached data is correct)
-            if self._repository and paper.pmid:
-                self._repository.save_extraction(
-                    drug_info.drug_name,
-                    paper.pmid,
-                    extraction.model_dump(),
-                )
+    async def _fetch_full_text(self, paper: Paper) -> Optional[str]:
+        """Full text from PMC if available."""
+        if paper.pmcid and self._pubmed:
+            try:
+                return await self._pubmed.fetch_fulltext(paper.pmcid, pmid=paper.pmid)
+            except Exception as e:
+                logger.warning(f"Failed to fetch full text for {paper.pmcid}: {e}")
+        return None
 
+    def _finalize_extraction(
+        self,
+        paper: Paper,
+        drug_info: DrugInfo,
+        extraction: CaseSeriesExtraction,
+    ) -> CaseSeriesExtraction:
+        """Post-process a fresh extraction and save it to the cache."""
+        # Derive summary from detailed endpoints (fixes summary/detail mismatch)
+        extraction = self._derive_summary_from_detailed_endpoints(extraction)
+
+        # Assess relevance
+        extraction = self._assess_relevance(extraction, drug_info)
+
+        # Apply post-processing fixes (n_patients parsing, metric type detection)
+        extraction = _apply_extraction_fixes(extraction)
+
+        # Save to cache (after fixes so cached data is correct)
+        if self._repository and paper.pmid:
+            self._repository.save_extraction(
+                drug_info.drug_name,
+                paper.pmid,
+                extraction.model_dump(),
+            )
         return extraction
 
-    async def _extract_single_pass(
-        self,
+    # ------------------------------------------------------------------
+    # Request building and response parsing, shared by the live path and
+    # the offline Message Batches path (batch_extraction.py)
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _single_pass_request(
         paper: Paper,
         drug_info: DrugInfo,
         content: str,
         is_full_text: bool = False,
-    ) -> Optional[CaseSeriesExtraction]:
-        """Single-pass extraction for abstracts and short content."""
+    ) -> ExtractionRequest:
         from src.case_series.prompts.extraction_prompts import build_main_extraction_prompt
 
         prompt = build_main_extraction_prompt(
@@ -722,137 +762,191 @@ class ExtractionService:
             paper_content=content,
             is_full_text=is_full_text,
         )
+        return ExtractionRequest(STAGE_SINGLE_PASS, prompt, max_tokens=4000)
 
-        try:
-            response = await self._llm_client.complete(
-                prompt,
-                max_tokens=4000,
-                system=EXTRACTION_SYSTEM_PROMPT,
-                cache_system=True,  # Cache the system prompt for reuse across papers
-            )
-            data = safe_parse_json(response, f"single-pass {paper.pmid}")
-            if data is None:
-                logger.warning(f"No valid JSON in single-pass extraction for {paper.pmid}")
-                return None
-
-            return self._build_extraction(paper, drug_info, data, 'single_pass')
-
-        except Exception as e:
-            logger.error(f"Single-pass extraction failed for {paper.pmid}: {e}")
-            return None
-
-    async def _extract_multi_stage(
-        self,
+    @staticmethod
+    def _stage_request(
+        stage: str,
         paper: Paper,
         drug_info: DrugInfo,
         full_text: str,
-    ) -> Optional[CaseSeriesExtraction]:
-        """Multi-stage extraction with extended thinking."""
+        sections: Optional[Dict[str, Any]] = None,
+    ) -> ExtractionRequest:
+        """Request for one multi-stage step (sections, efficacy or safety)."""
         from src.case_series.prompts.extraction_prompts import (
             build_section_identification_prompt,
             build_efficacy_extraction_prompt,
             build_safety_extraction_prompt,
         )
 
-        stages_completed = []
-
-        # Stage 1: Section identification
-        try:
-            section_prompt = build_section_identification_prompt(
+        if stage == STAGE_SECTIONS:
+            prompt = build_section_identification_prompt(
                 drug_name=drug_info.drug_name,
                 paper_title=paper.title,
                 paper_content=full_text,
             )
-
-            response, thinking = await self._llm_client.complete_with_thinking(
-                section_prompt,
-                thinking_budget=THINKING_BUDGET_SECTIONS,
-                system=EXTRACTION_SYSTEM_PROMPT,
-                cache_system=True,
-            )
-            sections = safe_parse_json(response, f"sections {paper.pmid}") or {}
-            if sections:
-                stages_completed.append('section_identification')
-
-        except Exception as e:
-            logger.warning(f"Stage 1 failed for {paper.pmid}: {e}")
-            sections = {}
-
-        # Stage 2: Efficacy extraction
-        efficacy_endpoints = []
-        try:
-            efficacy_prompt = build_efficacy_extraction_prompt(
+            budget = THINKING_BUDGET_SECTIONS
+        elif stage == STAGE_EFFICACY:
+            prompt = build_efficacy_extraction_prompt(
                 drug_name=drug_info.drug_name,
                 drug_info=drug_info.to_dict(),
                 paper_content=full_text,
-                sections=sections,
+                sections=sections or {},
             )
-
-            response, thinking = await self._llm_client.complete_with_thinking(
-                efficacy_prompt,
-                thinking_budget=THINKING_BUDGET_EFFICACY,
-                system=EXTRACTION_SYSTEM_PROMPT,
-                cache_system=True,
-            )
-            efficacy_data = safe_parse_json(response, f"efficacy {paper.pmid}")
-            if efficacy_data and isinstance(efficacy_data, list):
-                efficacy_endpoints = efficacy_data
-                stages_completed.append('efficacy_extraction')
-
-        except Exception as e:
-            logger.warning(f"Stage 2 failed for {paper.pmid}: {e}")
-
-        # Stage 3: Safety extraction
-        safety_endpoints = []
-        try:
-            safety_prompt = build_safety_extraction_prompt(
+            budget = THINKING_BUDGET_EFFICACY
+        elif stage == STAGE_SAFETY:
+            prompt = build_safety_extraction_prompt(
                 drug_name=drug_info.drug_name,
                 paper_content=full_text,
-                sections=sections,
+                sections=sections or {},
             )
+            budget = THINKING_BUDGET_SAFETY
+        else:
+            raise ValueError(f"Unknown extraction stage: {stage}")
+        return ExtractionRequest(stage, prompt, max_tokens=8000, thinking_budget=budget)
 
-            response, thinking = await self._llm_client.complete_with_thinking(
-                safety_prompt,
-                thinking_budget=THINKING_BUDGET_SAFETY,
-                system=EXTRACTION_SYSTEM_PROMPT,
-                cache_system=True,
-            )
-            safety_data = safe_parse_json(response, f"safety {paper.pmid}")
-            if safety_data and isinstance(safety_data, list):
-                safety_endpoints = safety_data
-                stages_completed.append('safety_extraction')
+    def _parse_single_pass(
+        self,
+        paper: Paper,
+        drug_info: DrugInfo,
+        response: str,
+    ) -> Optional[CaseSeriesExtraction]:
+        data = safe_parse_json(response, f"single-pass {paper.pmid}")
+        if data is None:
+            logger.warning(f"No valid JSON in single-pass extraction for {paper.pmid}")
+            return None
+        return self._build_extraction(paper, drug_info, data, 'single_pass')
+
+    @staticmethod
+    def _parse_stage(stage: str, paper: Paper, response: str) -> Any:
+        """Parsed stage output: a sections dict or a list of endpoints (empty on failure)."""
+        if stage == STAGE_SECTIONS:
+            return safe_parse_json(response, f"sections {paper.pmid}") or {}
+        data = safe_parse_json(response, f"{stage} {paper.pmid}")
+        return data if data and isinstance(data, list) else []
+
+    @staticmethod
+    def _assemble_multi_stage(
+        basic_extraction: Optional[CaseSeriesExtraction],
+        sections: Dict[str, Any],
+        efficacy_endpoints: List[Dict[str, Any]],
+        safety_endpoints: List[Dict[str, Any]],
+    ) -> Optional[CaseSeriesExtraction]:
+        """Attach multi-stage results to the full-text single-pass extraction."""
+        if not basic_extraction:
+            return None
 
-        except Exception as e:
-            logger.warning(f"Stage 3 failed for {paper.pmid}: {e}")
+        stages_completed = []
+        if sections:
+            stages_completed.append('section_identification')
+        if efficacy_endpoints:
+            stages_completed.append('efficacy_extraction')
+        if safety_endpoints:
+            stages_completed.append('safety_extraction')
+
+        # Add multi-stage data
+        basic_extraction.extraction_method = 'multi_stage'
+        basic_extraction.extraction_stages_completed = stages_completed
+        basic_extraction.data_sections_identified = sections
+
+        # Add detailed endpoints
+        for ep_data in efficacy_endpoints:
+            try:
+                ep = DetailedEfficacyEndpoint(**ep_data)
+                basic_extraction.detailed_efficacy_endpoints.append(ep)
+            except Exception as e:
+                logger.debug(f"Failed to parse efficacy endpoint: {e}")
 
-        # Build extraction from multi-stage results
-        # Also run single-pass for basic fields
-        basic_extraction = await self._extract_single_pass(paper, drug_info, full_text, is_full_text=True)
+        for ep_data in safety_endpoints:
+            try:
+                ep = DetailedSafetyEndpoint(**ep_data)
+                basic_extraction.detailed_safety_endpoints.append(ep)
+            except Exception as e:
+                logger.debug(f"Failed to parse safety endpoint: {e}")
 
-        if basic_extraction:
-            # Add multi-stage data
-            basic_extraction.extraction_method = 'multi_stage'
-            basic_extraction.extraction_stages_completed = stages_completed
-            basic_extraction.data_sections_identified = sections
+        return basic_extraction
 
-            # Add detailed endpoints
-            for ep_data in efficacy_endpoints:
-                try:
-                    ep = DetailedEfficacyEndpoint(**ep_data)
-                    basic_extraction.detailed_efficacy_endpoints.append(ep)
-                except Exception as e:
-                    logger.debug(f"Failed to parse efficacy endpoint: {e}")
+    # ------------------------------------------------------------------
+    # Live extraction
+    # ------------------------------------------------------------------
 
-            for ep_data in safety_endpoints:
-                try:
-                    ep = DetailedSafetyEndpoint(**ep_data)
-                    basic_extraction.detailed_safety_endpoints.append(ep)
-                except Exception as e:
-                    logger.debug(f"Failed to parse safety endpoint: {e}")
+    async def _extract_single_pass(
+        self,
+        paper: Paper,
+        drug_info: DrugInfo,
+        content: str,
+        is_full_text: bool = False,
+    ) -> Optional[CaseSeriesExtraction]:
+        """Single-pass extraction for abstracts and short content."""
+        request = self._single_pass_request(paper, drug_info, content, is_full_text)
 
-            return basic_extraction
+        try:
+            # A malformed answer may be a replayed cached one: retry once past the cache
+            for use_cache in (True, False):
+                response = await self._llm_client.complete(
+                    request.prompt,
+                    max_tokens=request.max_tokens,
+                    system=request.system,
+                    cache_system=True,  # Cache the system prompt for reuse across papers
+                    use_cache=use_cache,
+                )
+                extraction = self._parse_single_pass(paper, drug_info, response)
+                if extraction is not None:
+                    return extraction
+            return None
 
-        return None
+        except Exception as e:
+            logger.error(f"Single-pass extraction failed for {paper.pmid}: {e}")
+            return None
+
+    async def _run_stage(
+        self,
+        stage: str,
+        paper: Paper,
+        drug_info: DrugInfo,
+        full_text: str,
+        sections: Optional[Dict[str, Any]] = None,
+    ) -> Any:
+        """Run one multi-stage step with extended thinking."""
+        try:
+            request = self._stage_request(stage, paper, drug_info, full_text, sections)
+            # A malformed answer may be a replayed cached one: retry once past the cache
+            for use_cache in (True, False):
+                response, thinking = await self._llm_client.complete_with_thinking(
+                    request.prompt,
+                    thinking_budget=request.thinking_budget,
+                    max_tokens=request.max_tokens,
+                    system=request.system,
+                    cache_system=True,
+                    use_cache=use_cache,
+                )
+                if safe_parse_json(response, f"{stage} {paper.pmid}") is not None:
+                    break
+            return self._parse_stage(stage, paper, response)
+        except Exception as e:
+            logger.warning(f"Stage {stage} failed for {paper.pmid}: {e}")
+            return {} if stage == STAGE_SECTIONS else []
+
+    async def _extract_multi_stage(
+        self,
+        paper: Paper,
+        drug_info: DrugInfo,
+        full_text: str,
+    ) -> Optional[CaseSeriesExtraction]:
+        """Multi-stage extraction with extended thinking."""
+        # Stage 1: Section identification
+        sections = await self._run_stage(STAGE_SECTIONS, paper, drug_info, full_text)
+
+        # Stage 2: Efficacy extraction
+        efficacy_endpoints = await self._run_stage(STAGE_EFFICACY, paper, drug_info, full_text, sections)
+
+        # Stage 3: Safety extraction
+        safety_endpoints = await self._run_stage(STAGE_SAFETY, paper, drug_info, full_text, sections)
+
+        # Build extraction from multi-stage results
+        # Also run single-pass for basic fields
+        basic_extraction = await self._extract_single_pass(paper, drug_info, full_text, is_full_text=True)
+        return self._assemble_multi_stage(basic_extraction, sections, efficacy_endpoints, safety_endpoints)
 
     def _build_extraction(
         self,
@@ -1490,6 +1584,56 @@ class ExtractionService:
 
         return " ".join(parts) if parts else "Efficacy outcomes extracted from detailed endpoints."
 
+    async def _extract_with_callback(
+        self,
+        paper: Paper,
+        drug_info: DrugInfo,
+        use_cache: bool,
+        lock: "asyncio.Lock",
+        on_extraction_complete: Optional[Any],
+    ) -> tuple[Optional[CaseSeriesExtraction], bool]:
+        """
+        Extract one paper for batch/stream mode.
+
+        Returns:
+            (extraction, from_cache)
+        """
+        # Check cache first to avoid rate limiting for cached results
+        extraction = self._load_cached(paper, drug_info) if use_cache else None
+        if extraction:
+            logger.debug(f"Using cached extraction for {paper.pmid}")
+            # Still call the callback for cached extractions
+            if on_extraction_complete:
+                async with lock:
+                    try:
+                        on_extraction_complete(extraction, drug_info.drug_name)
+                    except Exception as e:
+                        logger.warning(f"Callback failed for cached extraction: {e}")
+            return extraction, True
+
+        result = await self.extract(paper, drug_info, use_cache=False)  # Already checked cache
+
+        # Save immediately via callback (like V2 agent)
+        if result and on_extraction_complete:
+            async with lock:
+                try:
+                    on_extraction_complete(result, drug_info.drug_name)
+                    logger.debug(f"Saved extraction for PMID {result.source.pmid if result.source else 'N/A'}")
+                except Exception as e:
+                    logger.warning(f"Callback failed for extraction: {e}")
+        return result, False
+
+    @staticmethod
+    def _collect_extractions(results: List[Any]) -> List[CaseSeriesExtraction]:
+        """Keep successful extractions from gathered results, logging failures."""
+        extractions = []
+        for result in results:
+            if isinstance(result, CaseSeriesExtraction):
+                extractions.append(result)
+            elif isinstance(result, Exception):
+                logger.warning(f"Extraction failed: {result}")
+        return extractions
+
     async def extract_batch(
         self,
         papers: List[Paper],
@@ -1513,54 +1657,132 @@ class ExtractionService:
         Returns:
             List of successful extractions
         """
-        import asyncio
-
-        extractions = []
         semaphore = asyncio.Semaphore(max_concurrent)
         lock = asyncio.Lock()  # Lock for thread-safe callback invocation
 
         async def extract_with_limit(paper: Paper, index: int):
             async with semaphore:
-                # Check cache first to avoid rate limiting for cached results
-                if use_cache and self._repository and paper.pmid:
-                    cached = self._repository.load_extraction(drug_info.drug_name, paper.pmid)
-                    if cached:
-                        logger.debug(f"Using cached extraction for {paper.pmid}")
-                        extraction = CaseSeriesExtraction(**cached)
-                        # Still call the callback for cached extractions
-                        if on_extraction_complete:
-                            async with lock:
-                                try:
-                                    on_extraction_complete(extraction, drug_info.drug_name)
-                                except Exception as e:
-                                    logger.warning(f"Callback failed for cached extraction: {e}")
-                        return extraction
+                result, from_cache = await self._extract_with_callback(
+                    paper, drug_info, use_cache, lock, on_extraction_complete
+                )
+                # Rate limiting only for actual API calls (0.5s like original agent)
+                if not from_cache and index < len(papers) - 1:
+                    await asyncio.sleep(0.5)
+                return result
 
-                result = await self.extract(paper, drug_info, use_cache=False)  # Already checked cache
+        tasks = [extract_with_limit(paper, i) for i, paper in enumerate(papers)]
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        return self._collect_extractions(results)
 
-                # Save immediately via callback (like V2 agent)
-                if result and on_extraction_complete:
-                    async with lock:
-                        try:
-                            on_extraction_complete(result, drug_info.drug_name)
-                            logger.debug(f"Saved extraction for PMID {result.source.pmid if result.source else 'N/A'}")
-                        except Exception as e:
-                            logger.warning(f"Callback failed for extraction: {e}")
+    async def extract_stream(
+        self,
+        papers: AsyncIterable[Paper],
+        drug_info: DrugInfo,
+        use_cache: bool = True,
+        max_concurrent: int = 5,
+        on_extraction_complete: Optional[Any] = None,
+    ) -> List[CaseSeriesExtraction]:
+        """
+        Extract papers as they arrive from an async iterable (e.g. search_stream).
+
+        At most max_concurrent extractions run at once; the iterable is not
+        advanced while all slots are busy, so a slow extraction stage applies
+        backpressure to the producer.
+
+        Args:
+            papers: Async iterable of papers
+            drug_info ... on_extraction_complete: Same as extract_batch()
 
+        Returns:
+            List of successful extractions, in arrival order
+        """
+        semaphore = asyncio.Semaphore(max_concurrent)
+        lock = asyncio.Lock()
+        tasks: List[asyncio.Task] = []
+
+        async def extract_and_release(paper: Paper):
+            try:
+                result, from_cache = await self._extract_with_callback(
+                    paper, drug_info, use_cache, lock, on_extraction_complete
+                )
                 # Rate limiting only for actual API calls (0.5s like original agent)
-                if index < len(papers) - 1:
+                if not from_cache:
                     await asyncio.sleep(0.5)
                 return result
+            finally:
+                semaphore.release()
+
+        try:
+            async for paper in papers:
+                await semaphore.acquire()
+                tasks.append(asyncio.create_task(extract_and_release(paper)))
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
 
-        tasks = [extract_with_limit(paper, i) for i, paper in enumerate(papers)]
         results = await asyncio.gather(*tasks, return_exceptions=True)
+        return self._collect_extractions(results)
 
-        for result in results:
-            if isinstance(result, CaseSeriesExtraction):
-                extractions.append(result)
-            elif isinstance(result, Exception):
-                logger.warning(f"Extraction failed: {result}")
+    async def extract_offline(
+        self,
+        papers: List[Paper],
+        drug_info: DrugInfo,
+        backend: Any,
+        manifest_path: Any,
+        use_cache: bool = True,
+        model: Optional[str] = None,
+        poll_interval: Optional[float] = None,
+        on_extraction_complete: Optional[Any] = None,
+    ) -> List[CaseSeriesExtraction]:
+        """
+        Extract papers through the Message Batches API (see batch_extraction).
+
+        For large jobs that aren't latency sensitive: requests are billed at
+        the batch discount and results arrive within hours. Re-running with
+        the same manifest_path resumes an interrupted job.
+
+        Args:
+            papers: List of papers to extract
+            drug_info: Drug information
+            backend: Batch backend, e.g. AnthropicBatchBackend()
+            manifest_path: JSON manifest for the job
+            use_cache: Whether to use cached extractions instead of submitting
+            model: Model for a new job (defaults to the live client's model)
+            poll_interval: Seconds between batch status checks
+            on_extraction_complete: Same as extract_batch()
+
+        Returns:
+            List of successful extractions
+        """
+        from src.case_series.services.batch_extraction import (
+            POLL_INTERVAL_SECONDS,
+            BatchExtractionJob,
+        )
+
+        job = BatchExtractionJob(
+            self, backend, manifest_path,
+            model=model or getattr(self._llm_client, "_model", None),
+            poll_interval=POLL_INTERVAL_SECONDS if poll_interval is None else poll_interval,
+        )
+
+        extractions = []
+        to_submit = []
+        for paper in papers:
+            cached = self._load_cached(paper, drug_info) if use_cache else None
+            if not cached:
+                to_submit.append(paper)
+                continue
+            if on_extraction_complete:
+                try:
+                    on_extraction_complete(cached, drug_info.drug_name)
+                except Exception as e:
+                    logger.warning(f"Callback failed for cached extraction: {e}")
+            extractions.append(cached)
 
+        await job.add_papers(to_submit, drug_info)
+        extractions.extend(await job.run(on_extraction_complete))
         return extractions
 
 
@@ -0,0 +1,243 @@
+"""
+Adaptive batching for the LLM relevance filter.
+
+A fixed 10-paper batch under a fixed concurrency of 5 leaves most of the
+filter model's rate limit unused on large drugs, and one truncated JSON
+response used to decide the whole batch. This module provides:
+
+- pack_batches(): greedy packing of papers into requests by estimated
+  prompt tokens, capped by how many evaluations fit in the output budget;
+- AdaptiveConcurrencyLimiter: an AIMD limit on in-flight requests that
+  grows while per-paper latency stays near the best observed, shrinks when
+  latency degrades, and halves (with a cool-down) on rate-limit errors;
+- parse_filter_evaluations(): reads {"evaluations": [...]} responses and
+  salvages the complete evaluations from a truncated one, so only the
+  papers without an answer need to be re-sent.
+"""
+
+import asyncio
+import json
+import logging
+import re
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Estimated prompt tokens of paper text per request (the instructions are a
+# separate, provider-cached system prompt)
+FILTER_BATCH_TOKEN_BUDGET = 12_000
+# Each evaluation is ~60-120 output tokens; keep a full batch well under max_tokens
+FILTER_MAX_TOKENS = 4000
+FILTER_OUTPUT_TOKENS_PER_PAPER = 130
+FILTER_MAX_PAPERS_PER_BATCH = FILTER_MAX_TOKENS // FILTER_OUTPUT_TOKENS_PER_PAPER
+# Long enough for nearly all structured abstracts (the old cut was 1,500)
+FILTER_ABSTRACT_MAX_CHARS = 4000
+
+FILTER_INITIAL_CONCURRENCY = 5
+FILTER_MIN_CONCURRENCY = 1
+FILTER_MAX_CONCURRENCY = 16
+# Per-paper latency this far above the best observed counts as congestion
+LATENCY_TOLERANCE = 2.0
+LATENCY_SMOOTHING = 0.3
+# The best-latency baseline drifts up by this fraction per sample, so one
+# unusually fast response does not hold the threshold down for the whole run
+LATENCY_BASELINE_DRIFT = 0.02
+# Requests faster than this (e.g. LLM response-cache hits) never reached the
+# API and say nothing about its congestion
+MIN_LATENCY_SAMPLE_SECONDS = 0.05
+RATE_LIMIT_COOLDOWN_SECONDS = 5.0
+FILTER_RATE_LIMIT_RETRIES = 3
+
+
+def pack_batches(
+    items: Sequence[T],
+    cost: Callable[[T], int],
+    budget: int = FILTER_BATCH_TOKEN_BUDGET,
+    max_items: int = FILTER_MAX_PAPERS_PER_BATCH,
+) -> List[List[T]]:
+    """
+    Greedily pack items, in order, into batches of at most ``budget`` total
+    cost and ``max_items`` items. An item costlier than the budget gets a
+    batch of its own.
+    """
+    batches: List[List[T]] = []
+    current: List[T] = []
+    used = 0
+    for item in items:
+        item_cost = cost(item)
+        if current and (used + item_cost > budget or len(current) >= max_items):
+            batches.append(current)
+            current, used = [], 0
+        current.append(item)
+        used += item_cost
+    if current:
+        batches.append(current)
+    return batches
+
+
+def is_rate_limit_error(error: BaseException) -> bool:
+    """True for HTTP 429 / overloaded errors from the Anthropic SDK or httpx."""
+    status = getattr(error, "status_code", None)
+    if status is None:
+        status = getattr(getattr(error, "response", None), "status_code", None)
+    return status in (429, 529) or type(error).__name__ in ("RateLimitError", "OverloadedError")
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    AIMD limit on concurrent requests.
+
+    Each success below the latency threshold adds 1/limit to the limit (so
+    roughly +1 per round of requests); a slow success takes one away; a
+    rate-limit error halves it and pauses new requests for a cool-down.
+    Responses served from a cache (``from_cache``) or faster than
+    ``min_latency`` leave the limit unchanged.
+    """
+
+    def __init__(
+        self,
+        initial: int = FILTER_INITIAL_CONCURRENCY,
+        minimum: int = FILTER_MIN_CONCURRENCY,
+        maximum: int = FILTER_MAX_CONCURRENCY,
+        latency_tolerance: float = LATENCY_TOLERANCE,
+        cooldown_seconds: float = RATE_LIMIT_COOLDOWN_SECONDS,
+        min_latency: float = MIN_LATENCY_SAMPLE_SECONDS,
+    ):
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self.limit = float(min(max(initial, self.minimum), self.maximum))
+        self.latency_tolerance = latency_tolerance
+        self.cooldown_seconds = cooldown_seconds
+        self.min_latency = min_latency
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.rate_limited = 0
+        self._best_latency: Optional[float] = None
+        self._smoothed_latency: Optional[float] = None
+        self._paused_until = 0.0
+        self._condition: Optional[asyncio.Condition] = None
+
+    def _cond(self) -> asyncio.Condition:
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+        return self._condition
+
+    async def run(self, call: Callable[[], Awaitable[T]], weight: int = 1) -> T:
+        """
+        Run ``call`` once a slot is free and feed its outcome back.
+
+        Args:
+            call: Zero-argument coroutine function making one request
+            weight: Work units in the request (papers), to normalize latency
+        """
+        condition = self._cond()
+        while True:
+            pause = self._paused_until - time.monotonic()
+            if pause > 0:
+                await asyncio.sleep(pause)
+                continue
+            async with condition:
+                if self.in_flight < int(self.limit):
+                    self.in_flight += 1
+                    self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+                    break
+                await condition.wait()
+
+        start = time.monotonic()
+        try:
+            result = await call()
+        except Exception as e:
+            if is_rate_limit_error(e):
+                self._on_rate_limited()
+            raise
+        else:
+            elapsed = time.monotonic() - start
+            if elapsed >= self.min_latency and not getattr(result, "from_cache", False):
+                self._on_success(elapsed / max(1, weight))
+            return result
+        finally:
+            async with condition:
+                self.in_flight -= 1
+                condition.notify_all()
+
+    def _on_success(self, latency: float):
+        if self._smoothed_latency is None:
+            self._smoothed_latency = latency
+        else:
+            self._smoothed_latency += LATENCY_SMOOTHING * (latency - self._smoothed_latency)
+        if self._best_latency is None:
+            self._best_latency = self._smoothed_latency
+        else:
+            self._best_latency = min(
+                self._best_latency * (1 + LATENCY_BASELINE_DRIFT), self._smoothed_latency
+            )
+
+        if self._smoothed_latency > self._best_latency * self.latency_tolerance:
+            self.limit = max(self.minimum, self.limit - 1)
+        else:
+            self.limit = min(self.maximum, self.limit + 1 / self.limit)
+
+    def _on_rate_limited(self):
+        self.rate_limited += 1
+        self.limit = max(self.minimum, self.limit / 2)
+        self._paused_until = max(self._paused_until, time.monotonic() + self.cooldown_seconds)
+        logger.info(f"Filter rate limited; concurrency limit now {int(self.limit)}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "limit": int(self.limit),
+            "peak_in_flight": self.peak_in_flight,
+            "rate_limited": self.rate_limited,
+            "latency_per_paper": round(self._smoothed_latency or 0.0, 3),
+        }
+
+
+_EVALUATION_OBJECT = re.compile(r'\{[^{}]*"paper_index"[^{}]*\}')
+
+
+def parse_filter_evaluations(response: str) -> Dict[int, Dict[str, Any]]:
+    """
+    Map 0-based paper position to its evaluation.
+
+    A complete {"evaluations": [...]} object (or bare list) is read as is.
+    Otherwise, e.g. when the response was cut off at max_tokens, every
+    complete evaluation object in the text is kept; papers missing from the
+    result have no answer.
+    """
+    text = (response or "").strip()
+    if text.startswith("```"):
+        text = text.split("\n", 1)[1] if "\n" in text else ""
+        text = text.rstrip("`").strip()
+
+    evaluations: Optional[List[Any]] = None
+    try:
+        parsed = json.loads(text)
+        if isinstance(parsed, dict):
+            parsed = parsed.get("evaluations")
+        if isinstance(parsed, list):
+            evaluations = parsed
+    except json.JSONDecodeError:
+        pass
+
+    if evaluations is None:
+        evaluations = []
+        for match in _EVALUATION_OBJECT.finditer(text):
+            try:
+                evaluations.append(json.loads(match.group()))
+            except json.JSONDecodeError:
+                continue
+
+    by_index: Dict[int, Dict[str, Any]] = {}
+    for evaluation in evaluations:
+        if not isinstance(evaluation, dict):
+            continue
+        try:
+            index = int(evaluation.get("paper_index", 0))
+        except (TypeError, ValueError):
+            continue
+        if index > 0:
+            by_index[index - 1] = evaluation
+    return by_index
@@ -8,23 +8,58 @@ Searches for case series and case reports from multiple sources:
 - Web search (grey literature)
 """
 
+import asyncio
 import json
 import logging
 import re
 import time
 from dataclasses import dataclass, field
-from typing import Optional, List, Dict, Any, Set
+from typing import Optional, List, Dict, Any, Set, AsyncIterator
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from src.case_series.protocols.llm_protocol import LLMClient
+from src.case_series.services.filter_batching import (
+    FILTER_ABSTRACT_MAX_CHARS,
+    FILTER_MAX_CONCURRENCY,
+    FILTER_MAX_PAPERS_PER_BATCH,
+    FILTER_MAX_TOKENS,
+    FILTER_RATE_LIMIT_RETRIES,
+    AdaptiveConcurrencyLimiter,
+    is_rate_limit_error,
+    pack_batches,
+    parse_filter_evaluations,
+)
+from src.case_series.services.near_duplicates import (
+    DuplicateCluster,
+    NearDuplicateIndex,
+    log_clusters,
+)
 from src.case_series.protocols.search_protocol import (
     PubMedSearcher,
     SemanticScholarSearcher,
     WebSearcher,
 )
+from src.case_series.services.search_checkpoint import (
+    STAGE_EMITTED,
+    STAGE_FILTERED_IN,
+    STAGE_FILTERED_OUT,
+    STAGE_PMC_CHECKED,
+    STAGE_PREFILTERED_OUT,
+    SearchCheckpoint,
+)
 
 logger = logging.getLogger(__name__)
 
+# PMC ID converter accepts ~100 PMIDs per request
+PMC_BATCH_SIZE = 100
+# Streaming pipeline: bounded queue size between stages (backpressure) and
+# how long a partial batch waits for more papers before it is flushed
+STREAM_QUEUE_SIZE = 50
+STREAM_FLUSH_SECONDS = 1.0
+# Filter batches are token-packed and larger, so a partial one is flushed
+# sooner (sources deliver papers in bursts, which this still collects)
+STREAM_FILTER_FLUSH_SECONDS = 0.25
+
 
 def _safe_parse_json_list(response: str, context: str = "", list_key: str = None) -> Optional[List]:
     """
@@ -81,6 +116,79 @@ def _safe_parse_json_list(response: str, context: str = "", list_key: str = None
         return None
 
 
+def _normalize_title(title: str) -> str:
+    """Normalize title for comparison: lowercase, remove punctuation, collapse spaces."""
+    if not title:
+        return ""
+    # Lowercase and remove punctuation
+    normalized = re.sub(r'[^\w\s]', '', title.lower())
+    # Collapse multiple spaces
+    normalized = re.sub(r'\s+', ' ', normalized).strip()
+    # Take first 80 chars to handle slight variations at the end
+    return normalized[:80]
+
+
+def _normalize_doi(doi: str) -> str:
+    """Normalize DOI format (lowercase, no resolver prefix)."""
+    doi_lower = doi.lower().strip()
+    if doi_lower.startswith('https://doi.org/'):
+        doi_lower = doi_lower[16:]
+    elif doi_lower.startswith('http://doi.org/'):
+        doi_lower = doi_lower[15:]
+    elif doi_lower.startswith('doi:'):
+        doi_lower = doi_lower[4:]
+    return doi_lower
+
+
+class _DedupIndex:
+    """Incremental PMID / DOI / normalized-title / near-duplicate detection."""
+
+    def __init__(self):
+        self.seen_pmids: Set[str] = set()
+        self.seen_dois: Set[str] = set()
+        self.seen_titles: Set[str] = set()
+        self.near_duplicates = NearDuplicateIndex()
+
+    def add(self, paper: "Paper") -> bool:
+        """Register a paper; returns False if it duplicates one seen before."""
+        # Check PMID
+        if paper.pmid:
+            if paper.pmid in self.seen_pmids:
+                return False
+            self.seen_pmids.add(paper.pmid)
+
+        # Check DOI
+        if paper.doi:
+            doi_key = _normalize_doi(paper.doi)
+            if doi_key in self.seen_dois:
+                return False
+            self.seen_dois.add(doi_key)
+
+        # Check title similarity
+        title_key = _normalize_title(paper.title)
+        if title_key and title_key in self.seen_titles:
+            return False
+        if title_key:
+            self.seen_titles.add(title_key)
+
+        # Check near-duplicates (preprint/published versions, title variants)
+        return self.near_duplicates.add(
+            _paper_key(paper), paper.title, paper.abstract, paper.authors, paper.year
+        ) is None
+
+
+def _paper_key(paper: "Paper") -> str:
+    """Stable identity for checkpointing: PMID, else DOI, else normalized title."""
+    if paper.pmid:
+        return f"pmid:{paper.pmid}"
+    if paper.doi:
+        return f"doi:{_normalize_doi(paper.doi)}"
+    return f"title:{_normalize_title(paper.title)}"
+
+
+_STREAM_DONE = object()
+
+
 @dataclass
 class Paper:
     """Paper metadata."""
@@ -164,6 +272,7 @@ class SearchResult:
     sources_searched: List[str] = field(default_factory=list)
     total_found: int = 0
     duplicates_removed: int = 0
+    duplicate_clusters: List[DuplicateCluster] = field(default_factory=list)
 
 
 class LiteratureSearchService:
@@ -306,32 +415,10 @@ class LiteratureSearchService:
         result = SearchResult()
 
         # Run all searches in parallel for speed (like old agent implementation)
-        import asyncio
-
-        search_tasks = []
-        task_names = []
-
-        # 1. PubMed search (with generic name for better coverage)
-        if use_pubmed and self._pubmed:
-            search_tasks.append(self._search_pubmed(drug_name, max_results_per_source, generic_name))
-            task_names.append('PubMed')
-
-        # 2. Semantic Scholar search (with generic name)
-        if use_semantic_scholar and self._semantic_scholar:
-            search_tasks.append(self._search_semantic_scholar(drug_name, max_results_per_source, generic_name))
-            task_names.append('Semantic Scholar')
-
-        # 3. Citation snowballing (sync function, run in thread)
-        if include_citation_mining and use_semantic_scholar and self._semantic_scholar_api:
-            search_tasks.append(
-                asyncio.to_thread(self._mine_review_citations, drug_name, generic_name)
-            )
-            task_names.append('Citation Mining')
-
-        # 4. Web search (grey literature, with generic name)
-        if use_web_search and self._web_searcher:
-            search_tasks.append(self._search_web(drug_name, generic_name))
-            task_names.append('Web')
+        task_names, search_tasks = self._build_search_tasks(
+            drug_name, max_results_per_source, generic_name,
+            use_pubmed, use_semantic_scholar, include_citation_mining, use_web_search,
+        )
 
         # Execute all searches in parallel
         logger.info(f"Running {len(search_tasks)} search sources in parallel...")
@@ -355,7 +442,7 @@ class LiteratureSearchService:
         total_raw = len(all_papers)
 
         # Deduplicate by PMID/DOI/title
-        deduped_papers = self._deduplicate(all_papers)
+        deduped_papers = self._deduplicate(all_papers, result)
         result.duplicates_removed = total_raw - len(deduped_papers)
 
         # Truncate to max_total_papers if specified (for testing)
@@ -396,6 +483,276 @@ class LiteratureSearchService:
         logger.info(f"Search complete: {len(result.papers)} papers after filtering")
         return result
 
+    def _build_search_tasks(
+        self,
+        drug_name: str,
+        max_results_per_source: int,
+        generic_name: Optional[str],
+        use_pubmed: bool,
+        use_semantic_scholar: bool,
+        include_citation_mining: bool,
+        use_web_search: bool,
+    ) -> tuple[List[str], List[Any]]:
+        """Build (names, coroutines) for the enabled search sources."""
+        search_tasks = []
+        task_names = []
+
+        # 1. PubMed search (with generic name for better coverage)
+        if use_pubmed and self._pubmed:
+            search_tasks.append(self._search_pubmed(drug_name, max_results_per_source, generic_name))
+            task_names.append('PubMed')
+
+        # 2. Semantic Scholar search (with generic name)
+        if use_semantic_scholar and self._semantic_scholar:
+            search_tasks.append(self._search_semantic_scholar(drug_name, max_results_per_source, generic_name))
+            task_names.append('Semantic Scholar')
+
+        # 3. Citation snowballing (sync function, run in thread)
+        if include_citation_mining and use_semantic_scholar and self._semantic_scholar_api:
+            search_tasks.append(
+                asyncio.to_thread(self._mine_review_citations, drug_name, generic_name)
+            )
+            task_names.append('Citation Mining')
+
+        # 4. Web search (grey literature, with generic name)
+        if use_web_search and self._web_searcher:
+            search_tasks.append(self._search_web(drug_name, generic_name))
+            task_names.append('Web')
+
+        return task_names, search_tasks
+
+    async def search_stream(
+        self,
+        drug_name: str,
+        exclude_indications: List[str] = None,
+        max_results_per_source: int = 100,
+        max_total_papers: Optional[int] = None,
+        filter_with_llm: bool = True,
+        include_citation_mining: bool = True,
+        generic_name: Optional[str] = None,
+        use_pubmed: bool = True,
+        use_semantic_scholar: bool = True,
+        use_web_search: bool = True,
+        skip_pmids: Optional[Set[str]] = None,
+        checkpoint: Optional[SearchCheckpoint] = None,
+        result: Optional[SearchResult] = None,
+        queue_size: int = STREAM_QUEUE_SIZE,
+    ) -> AsyncIterator[Paper]:
+        """
+        Streaming variant of search(): yield papers as soon as they pass.
+
+        Papers flow from each source, as that source finishes, through
+        incremental dedup, the keyword prefilter, the LLM filter (token-packed
+        batches under an adaptive concurrency limit) and the PMC availability
+        lookup. Stages are connected by bounded queues, so a slow consumer
+        (e.g. extraction) applies backpressure all the way to the sources.
+
+        With a checkpoint, each paper's stage is recorded durably. A crashed
+        run resumes mid-stream: papers already decided skip the LLM filter
+        and PMC lookup. Papers emitted before the crash are emitted again;
+        extraction results are cached per PMID, so re-emitting them is cheap.
+
+        Args:
+            drug_name ... skip_pmids: Same as search()
+            checkpoint: Optional SearchCheckpoint for resumable runs
+            result: Optional SearchResult filled in with stats and emitted papers
+            queue_size: Maximum papers buffered between stages
+
+        Yields:
+            Papers that passed filtering, in completion order
+        """
+        exclude_indications = exclude_indications or []
+        result = result if result is not None else SearchResult()
+        filter_enabled = bool(filter_with_llm and self._filter_llm_client)
+        total_raw = 0
+
+        to_filter: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        to_pmc: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        out: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+
+        def record(papers: List[Paper], stage: str):
+            if checkpoint and papers:
+                checkpoint.record_many(((_paper_key(p), p.to_dict()) for p in papers), stage)
+
+        async def intake():
+            """Sources -> dedup -> skip/truncate -> checkpoint routing -> prefilter."""
+            nonlocal total_raw
+            dedup = _DedupIndex()
+            deduped_count = 0
+            task_names, search_tasks = self._build_search_tasks(
+                drug_name, max_results_per_source, generic_name,
+                use_pubmed, use_semantic_scholar, include_citation_mining, use_web_search,
+            )
+
+            async def named(name, coro):
+                try:
+                    return name, await coro
+                except Exception as e:
+                    return name, e
+
+            for next_done in asyncio.as_completed([named(n, t) for n, t in zip(task_names, search_tasks)]):
+                name, papers_or_error = await next_done
+                if isinstance(papers_or_error, Exception):
+                    logger.error(f"{name} search failed: {papers_or_error}")
+                    continue
+                if not papers_or_error:
+                    continue
+                result.sources_searched.append(name)
+                logger.info(f"{name} returned {len(papers_or_error)} papers")
+
+                for paper in papers_or_error:
+                    total_raw += 1
+                    if not dedup.add(paper):
+                        result.duplicates_removed += 1
+                        continue
+                    deduped_count += 1
+                    if max_total_papers and deduped_count > max_total_papers:
+                        continue
+                    if skip_pmids and paper.pmid in skip_pmids:
+                        continue
+                    result.total_found += 1
+
+                    saved = checkpoint.get(_paper_key(paper)) if checkpoint else None
+                    if saved:
+                        stage = saved['stage']
+                        if stage in (STAGE_PREFILTERED_OUT, STAGE_FILTERED_OUT):
+                            continue
+                        restored = Paper(**saved['paper'])
+                        if stage == STAGE_FILTERED_IN:
+                            await to_pmc.put(restored)
+                        else:  # pmc_checked / emitted
+                            await out.put(restored)
+                        continue
+
+                    if filter_enabled and not self._passes_keyword_prefilter(paper, drug_name):
+                        record([paper], STAGE_PREFILTERED_OUT)
+                        continue
+                    await to_filter.put(paper)
+
+            result.duplicate_clusters = dedup.near_duplicates.clusters()
+            log_clusters(result.duplicate_clusters, "streaming intake")
+            logger.info(
+                f"Streaming intake complete: {total_raw} raw, {result.duplicates_removed} duplicates, "
+                f"{result.total_found} sent to filtering"
+            )
+            await to_filter.put(_STREAM_DONE)
+
+        async def filter_stage():
+            """Batch papers through the LLM filter as they arrive."""
+            limiter = AdaptiveConcurrencyLimiter()
+            # Bounds buffered batches; the limiter decides how many are sent at once
+            semaphore = asyncio.Semaphore(FILTER_MAX_CONCURRENCY)
+            in_flight: Set[asyncio.Task] = set()
+            batch_idx = 0
+
+            async def run_batch(idx: int, batch: List[Paper]):
+                try:
+                    try:
+                        passed = await self._filter_batch(
+                            idx, batch, drug_name, exclude_indications, limiter=limiter
+                        )
+                    except Exception as e:
+                        logger.warning(f"Batch {idx} raised exception: {e}")
+                        passed = batch  # Include all papers from failed batch
+                    passed_ids = {id(p) for p in passed}
+                    record([p for p in batch if id(p) not in passed_ids], STAGE_FILTERED_OUT)
+                    record(passed, STAGE_FILTERED_IN)
+                    for paper in passed:
+                        await to_pmc.put(paper)
+                finally:
+                    semaphore.release()
+
+            async for batch in self._stream_batches(
+                to_filter, FILTER_MAX_PAPERS_PER_BATCH, flush_seconds=STREAM_FILTER_FLUSH_SECONDS
+            ):
+                if not filter_enabled:
+                    for paper in batch:
+                        await to_pmc.put(paper)
+                    continue
+                await semaphore.acquire()
+                task = asyncio.create_task(run_batch(batch_idx, batch))
+                in_flight.add(task)
+                task.add_done_callback(in_flight.discard)
+                batch_idx += 1
+
+            if in_flight:
+                await asyncio.gather(*in_flight)
+            await to_pmc.put(_STREAM_DONE)
+
+        async def pmc_stage():
+            """Look up PMC availability for passed papers, batching whatever is queued."""
+            async for batch in self._stream_batches(to_pmc, PMC_BATCH_SIZE, flush_seconds=0):
+                if self._pubmed:
+                    batch = await self._check_pmc_availability(batch)
+                record(batch, STAGE_PMC_CHECKED)
+                for paper in batch:
+                    await out.put(paper)
+            await out.put(_STREAM_DONE)
+
+        async def guarded(stage):
+            try:
+                await stage()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Streaming search stage {stage.__name__} failed: {e}")
+                await out.put(e)
+
+        start_time = time.time()
+        tasks = [asyncio.create_task(guarded(stage)) for stage in (intake, filter_stage, pmc_stage)]
+        try:
+            while True:
+                item = await out.get()
+                if item is _STREAM_DONE:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                record([item], STAGE_EMITTED)
+                result.papers.append(item)
+                yield item
+
+            if checkpoint:
+                checkpoint.complete()
+            logger.info(
+                f"Streaming search complete: {len(result.papers)} papers in {time.time() - start_time:.1f}s"
+            )
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    @staticmethod
+    async def _stream_batches(queue: asyncio.Queue, batch_size: int, flush_seconds: float = STREAM_FLUSH_SECONDS):
+        """
+        Group queue items into batches of up to batch_size until _STREAM_DONE.
+
+        A partial batch is flushed once no new item arrives for flush_seconds,
+        so papers never wait on a batch that will not fill. With
+        flush_seconds=0 a batch is whatever is queued right now.
+        """
+        batch: List[Paper] = []
+        while True:
+            try:
+                if not batch:
+                    item = await queue.get()
+                elif flush_seconds > 0:
+                    item = await asyncio.wait_for(queue.get(), timeout=flush_seconds)
+                else:
+                    item = queue.get_nowait()
+            except (asyncio.TimeoutError, asyncio.QueueEmpty):
+                yield batch
+                batch = []
+                continue
+
+            if item is _STREAM_DONE:
+                if batch:
+                    yield batch
+                return
+            batch.append(item)
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+
     async def _search_pubmed(
         self,
         drug_name: str,
@@ -745,61 +1102,15 @@ class LiteratureSearchService:
 
         return papers
 
-    def _deduplicate(self, papers: List[Paper]) -> List[Paper]:
-        """Deduplicate papers by PMID, DOI, or title similarity."""
-        seen_pmids: Set[str] = set()
-        seen_dois: Set[str] = set()
-        seen_titles: Set[str] = set()
-        unique_papers = []
-
-        def normalize_title(title: str) -> str:
-            """Normalize title for comparison: lowercase, remove punctuation, collapse spaces."""
-            if not title:
-                return ""
-            import re
-            # Lowercase and remove punctuation
-            normalized = re.sub(r'[^\w\s]', '', title.lower())
-            # Collapse multiple spaces
-            normalized = re.sub(r'\s+', ' ', normalized).strip()
-            # Take first 80 chars to handle slight variations at the end
-            return normalized[:80]
-
-        for paper in papers:
-            is_duplicate = False
-
-            # Check PMID
-            if paper.pmid:
-                if paper.pmid in seen_pmids:
-                    is_duplicate = True
-                else:
-                    seen_pmids.add(paper.pmid)
-
-            # Check DOI (if not already marked as duplicate)
-            if not is_duplicate and paper.doi:
-                doi_lower = paper.doi.lower().strip()
-                # Normalize DOI format
-                if doi_lower.startswith('https://doi.org/'):
-                    doi_lower = doi_lower[16:]
-                elif doi_lower.startswith('http://doi.org/'):
-                    doi_lower = doi_lower[15:]
-                elif doi_lower.startswith('doi:'):
-                    doi_lower = doi_lower[4:]
-
-                if doi_lower in seen_dois:
-                    is_duplicate = True
-                else:
-                    seen_dois.add(doi_lower)
-
-            # Check title similarity (if not already marked as duplicate)
-            if not is_duplicate:
-                title_key = normalize_title(paper.title)
-                if title_key and title_key in seen_titles:
-                    is_duplicate = True
-                elif title_key:
-                    seen_titles.add(title_key)
+    def _deduplicate(self, papers: List[Paper], result: Optional[SearchResult] = None) -> List[Paper]:
+        """Deduplicate papers by PMID, DOI, title, or near-duplicate title/abstract."""
+        index = _DedupIndex()
+        unique_papers = [paper for paper in papers if index.add(paper)]
 
-            if not is_duplicate:
-                unique_papers.append(paper)
+        clusters = index.near_duplicates.clusters()
+        log_clusters(clusters)
+        if result is not None:
+            result.duplicate_clusters = clusters
 
         logger.info(f"Deduplication: {len(papers)} -> {len(unique_papers)} papers ({len(papers) - len(unique_papers)} duplicates removed)")
         return unique_papers
@@ -814,7 +1125,6 @@ class LiteratureSearchService:
 
         try:
             # Chunk PMIDs to avoid 414 URI Too Long errors (max ~100 per request)
-            PMC_BATCH_SIZE = 100
             pmc_map = {}
 
             for i in range(0, len(pmids_to_check), PMC_BATCH_SIZE):
@@ -860,60 +1170,196 @@ class LiteratureSearchService:
         Returns:
             Tuple of (filtered_papers, num_removed)
         """
-        # Keywords indicating clinical outcomes (must have at least one)
-        clinical_keywords = [
-            'patient', 'case', 'treatment', 'therapy', 'efficacy', 'outcome',
-            'response', 'improvement', 'remission', 'clinical', 'trial',
-            'study', 'retrospective', 'prospective', 'cohort', 'series',
-            'report', 'experience', 'safety', 'adverse', 'tolerability',
-        ]
+        filtered = [paper for paper in papers if self._passes_keyword_prefilter(paper, drug_name)]
 
-        # Keywords indicating non-clinical papers (exclude if present without clinical keywords)
-        exclude_keywords = [
-            'in vitro', 'cell line', 'mouse model', 'rat model', 'animal',
-            'molecular', 'mechanism', 'pathway', 'binding', 'receptor',
-            'pharmacokinetic', 'pk study', 'bioavailability',
-        ]
+        removed = len(papers) - len(filtered)
+        if removed > 0:
+            logger.info(f"Pre-filter removed {removed} papers (no clinical keywords)")
 
-        filtered = []
-        drug_lower = drug_name.lower()
+        return filtered, removed
 
-        # Special case: CAR-T has multiple naming variants in literature
-        is_cart_search = drug_name.upper() in ('CAR-T', 'CAR T', 'CART')
-        cart_variants = ['car-t', 'car t', 'car t cell', 'car-t cell', 'chimeric antigen receptor']
+    # Keywords indicating clinical outcomes (must have at least one)
+    PREFILTER_CLINICAL_KEYWORDS = [
+        'patient', 'case', 'treatment', 'therapy', 'efficacy', 'outcome',
+        'response', 'improvement', 'remission', 'clinical', 'trial',
+        'study', 'retrospective', 'prospective', 'cohort', 'series',
+        'report', 'experience', 'safety', 'adverse', 'tolerability',
+    ]
 
-        for paper in papers:
-            text = f"{paper.title or ''} {paper.abstract or ''}".lower()
+    # Keywords indicating non-clinical papers (exclude if present without clinical keywords)
+    PREFILTER_EXCLUDE_KEYWORDS = [
+        'in vitro', 'cell line', 'mouse model', 'rat model', 'animal',
+        'molecular', 'mechanism', 'pathway', 'binding', 'receptor',
+        'pharmacokinetic', 'pk study', 'bioavailability',
+    ]
 
-            # Citation mining papers are contextually relevant (from reviews about the drug)
-            # Don't require drug name in text - let LLM filter decide
-            is_citation_mining = paper.source == 'Citation Mining'
+    # Special case: CAR-T has multiple naming variants in literature
+    CART_VARIANTS = ['car-t', 'car t', 'car t cell', 'car-t cell', 'chimeric antigen receptor']
 
-            # For non-citation-mining papers, must mention the drug
-            if not is_citation_mining:
-                if is_cart_search:
-                    # For CAR-T, check any variant
-                    if not any(variant in text for variant in cart_variants):
-                        continue
-                elif drug_lower not in text:
-                    continue
+    def _passes_keyword_prefilter(self, paper: Paper, drug_name: str) -> bool:
+        """Keyword pre-filter decision for a single paper (see _pre_filter_by_keywords)."""
+        text = f"{paper.title or ''} {paper.abstract or ''}".lower()
 
-            # Check for clinical keywords
-            has_clinical = any(kw in text for kw in clinical_keywords)
+        # Citation mining papers are contextually relevant (from reviews about the drug)
+        # Don't require drug name in text - let LLM filter decide
+        is_citation_mining = paper.source == 'Citation Mining'
 
-            # Check for exclude keywords
-            has_exclude = any(kw in text for kw in exclude_keywords)
+        # For non-citation-mining papers, must mention the drug
+        if not is_citation_mining:
+            if drug_name.upper() in ('CAR-T', 'CAR T', 'CART'):
+                # For CAR-T, check any variant
+                if not any(variant in text for variant in self.CART_VARIANTS):
+                    return False
+            elif drug_name.lower() not in text:
+                return False
 
-            # Include if has clinical keywords, or doesn't have exclude keywords
-            # (be conservative - if unclear, send to LLM)
-            if has_clinical or not has_exclude:
-                filtered.append(paper)
+        # Check for clinical keywords
+        has_clinical = any(kw in text for kw in self.PREFILTER_CLINICAL_KEYWORDS)
 
-        removed = len(papers) - len(filtered)
-        if removed > 0:
-            logger.info(f"Pre-filter removed {removed} papers (no clinical keywords)")
+        # Check for exclude keywords
+        has_exclude = any(kw in text for kw in self.PREFILTER_EXCLUDE_KEYWORDS)
 
-        return filtered, removed
+        # Include if has clinical keywords, or doesn't have exclude keywords
+        # (be conservative - if unclear, send to LLM)
+        return has_clinical or not has_exclude
+
+    @staticmethod
+    def _filter_paper_tokens(paper: Paper) -> int:
+        """Estimated prompt tokens of one paper in a filter request."""
+        chars = len(paper.title or '') + min(len(paper.abstract or ''), FILTER_ABSTRACT_MAX_CHARS)
+        return chars // 4 + 20
+
+    async def _filter_batch(
+        self,
+        batch_idx: int,
+        batch: List[Paper],
+        drug_name: str,
+        exclude_indications: List[str],
+        limiter: Optional[AdaptiveConcurrencyLimiter] = None,
+    ) -> List[Paper]:
+        """Run the LLM filter over a batch of papers; returns those that pass.
+
+        The batch is packed into requests by token budget. Papers the model
+        gave no answer for (e.g. a truncated response) are re-sent in smaller
+        requests; papers still undecided are kept for downstream filtering.
+        """
+        limiter = limiter or AdaptiveConcurrencyLimiter()
+        chunks = pack_batches(batch, self._filter_paper_tokens)
+        chunk_results = await asyncio.gather(*(
+            self._evaluate_filter_chunk(
+                f"{batch_idx}" if len(chunks) == 1 else f"{batch_idx}.{k}",
+                chunk, drug_name, exclude_indications, limiter,
+            )
+            for k, chunk in enumerate(chunks)
+        ))
+        evaluations = [result for results in chunk_results for result in results]
+
+        passed_papers = []
+        excluded_count = 0
+        undecided_count = 0
+        for paper, result in zip(batch, evaluations):
+            if result is None:
+                undecided_count += 1
+                passed_papers.append(paper)
+            # Template uses 'include', not 'is_relevant'
+            elif result.get('include', False):
+                # Safely calculate relevance score from patient_count
+                patient_count = result.get('patient_count')
+                try:
+                    patient_count_int = int(patient_count) if patient_count else 0
+                    paper.relevance_score = patient_count_int / 100.0 if patient_count_int else 0.5
+                except (ValueError, TypeError):
+                    paper.relevance_score = 0.5  # Default if patient_count is not numeric
+                paper.relevance_reason = result.get('reason', '')
+                paper.extracted_disease = result.get('disease', '')
+                passed_papers.append(paper)
+            else:
+                excluded_count += 1
+                # Log exclusion reason for debugging
+                reason = result.get('reason') or 'No reason given'
+                logger.debug(f"Excluded paper {paper.pmid or paper.title[:30]}: {reason[:100]}")
+
+        undecided = f", {undecided_count} undecided (kept)" if undecided_count else ""
+        logger.info(f"Batch {batch_idx}: {len(passed_papers) - undecided_count} passed, "
+                    f"{excluded_count} excluded{undecided}")
+        return passed_papers
+
+    async def _evaluate_filter_chunk(
+        self,
+        label: str,
+        papers: List[Paper],
+        drug_name: str,
+        exclude_indications: List[str],
+        limiter: AdaptiveConcurrencyLimiter,
+    ) -> List[Optional[Dict[str, Any]]]:
+        """
+        Evaluate papers in one filter request.
+
+        Returns one evaluation per paper, or None where no answer could be
+        obtained. Papers missing from the response are split in two and
+        re-sent on their own, so one truncated response costs only the
+        unanswered papers.
+        """
+        from src.case_series.prompts.filtering_prompts import build_paper_filter_messages
+
+        paper_dicts = [
+            {
+                'pmid': p.pmid or p.doi or f"paper_{j}",
+                'title': p.title or '',
+                'abstract': (p.abstract or '')[:FILTER_ABSTRACT_MAX_CHARS],
+            }
+            for j, p in enumerate(papers)
+        ]
+        system, prompt = build_paper_filter_messages(
+            drug_name=drug_name,
+            papers=paper_dicts,
+            approved_indications=exclude_indications,
+        )
+
+        async def request(use_cache: bool = True):
+            return await self._filter_llm_client.complete(
+                prompt, max_tokens=FILTER_MAX_TOKENS, system=system, cache_system=True,
+                use_cache=use_cache,
+            )
+
+        async def evaluate(use_cache: bool = True) -> Optional[List[Optional[Dict[str, Any]]]]:
+            """One filter request (retrying rate limits); None if it failed."""
+            for attempt in range(FILTER_RATE_LIMIT_RETRIES + 1):
+                try:
+                    response = await limiter.run(lambda: request(use_cache), weight=len(papers))
+                    break
+                except Exception as e:
+                    if is_rate_limit_error(e) and attempt < FILTER_RATE_LIMIT_RETRIES:
+                        continue
+                    logger.warning(f"LLM filtering failed for batch {label}: {e}")
+                    return None
+            by_index = parse_filter_evaluations(response)
+            return [by_index.get(j) for j in range(len(papers))]
+
+        results = await evaluate()
+        if results is None:
+            return [None] * len(papers)
+        if len(papers) == 1 and results[0] is None:
+            # The unparseable answer may be a replayed cached one: ask again past the cache
+            results = await evaluate(use_cache=False) or results
+        missing = [j for j, result in enumerate(results) if result is None]
+        if missing and len(papers) > 1:
+            logger.info(
+                f"Filter batch {label}: no answer for {len(missing)}/{len(papers)} papers "
+                f"(truncated or malformed response), re-sending them"
+            )
+            retry = [papers[j] for j in missing]
+            half = (len(retry) + 1) // 2
+            parts = [part for part in (retry[:half], retry[half:]) if part]
+            retried = await asyncio.gather(*(
+                self._evaluate_filter_chunk(f"{label}.r{k}", part, drug_name, exclude_indications, limiter)
+                for k, part in enumerate(parts)
+            ))
+            for j, result in zip(missing, (r for part in retried for r in part)):
+                results[j] = result
+        elif missing:
+            logger.warning(f"No valid filter answer for batch {label}, keeping the paper")
+        return results
 
     async def _filter_with_llm(
         self,
@@ -925,6 +1371,9 @@ class LiteratureSearchService:
     ) -> List[Paper]:
         """Use LLM to filter papers for relevance.
 
+        Papers are packed into requests by token budget and sent under an
+        adaptive concurrency limit (see filter_batching).
+
         Args:
             papers: Papers to filter
             drug_name: Name of drug
@@ -941,121 +1390,39 @@ class LiteratureSearchService:
             logger.info("No papers remaining after pre-filter")
             return []
 
-        # Build filter prompt
-        from src.case_series.prompts.filtering_prompts import build_paper_filter_prompt
-        import asyncio
-
-        # Process in batches (10 papers per batch for precision)
-        # Run up to 5 batches concurrently (Haiku has high rate limits)
-        batch_size = 10
-        max_concurrent_filter_batches = 5
-
-        # Create batches
-        batches = []
-        for i in range(0, len(papers), batch_size):
-            batches.append((i, papers[i:i + batch_size]))
-
-        logger.info(f"Filtering {len(papers)} papers in {len(batches)} batches ({max_concurrent_filter_batches} concurrent)")
-
-        # Semaphore to limit concurrency
-        semaphore = asyncio.Semaphore(max_concurrent_filter_batches)
-
-        async def process_batch(batch_idx: int, batch: List[Paper]) -> List[Paper]:
-            """Process a single batch of papers."""
-            async with semaphore:
-                paper_dicts = [
-                    {
-                        'pmid': p.pmid or p.doi or f"paper_{j}",
-                        'title': p.title or '',
-                        'abstract': (p.abstract or '')[:1500],
-                    }
-                    for j, p in enumerate(batch)
-                ]
-
-                prompt = build_paper_filter_prompt(
-                    drug_name=drug_name,
-                    papers=paper_dicts,
-                    approved_indications=exclude_indications,
-                )
+        batches = pack_batches(papers, self._filter_paper_tokens)
+        limiter = AdaptiveConcurrencyLimiter()
+        logger.info(f"Filtering {len(papers)} papers in {len(batches)} batches "
+                    f"(up to {FILTER_MAX_PAPERS_PER_BATCH} papers per batch, adaptive concurrency)")
 
-                try:
-                    response = await self._filter_llm_client.complete(prompt, max_tokens=4000)
-
-                    # Parse JSON response safely (template returns {"evaluations": [...]})
-                    results = _safe_parse_json_list(response, f"filter batch {batch_idx}", list_key="evaluations")
-                    if results is None:
-                        logger.warning(f"No valid JSON in filter response for batch {batch_idx}, including all papers")
-                        return batch
-
-                    # Build index map for matching (template uses 1-based paper_index)
-                    result_by_index = {}
-                    for result in results:
-                        idx = result.get('paper_index', 0)
-                        if idx > 0:
-                            result_by_index[idx - 1] = result  # Convert to 0-based
-
-                    # Match results back to papers
-                    passed_papers = []
-                    excluded_count = 0
-                    for j, paper in enumerate(batch):
-                        result = result_by_index.get(j, {})
-                        # Template uses 'include', not 'is_relevant'
-                        if result.get('include', False):
-                            # Safely calculate relevance score from patient_count
-                            patient_count = result.get('patient_count')
-                            try:
-                                patient_count_int = int(patient_count) if patient_count else 0
-                                paper.relevance_score = patient_count_int / 100.0 if patient_count_int else 0.5
-                            except (ValueError, TypeError):
-                                paper.relevance_score = 0.5  # Default if patient_count is not numeric
-                            paper.relevance_reason = result.get('reason', '')
-                            paper.extracted_disease = result.get('disease', '')
-                            passed_papers.append(paper)
-                        else:
-                            excluded_count += 1
-                            # Log exclusion reason for debugging
-                            reason = result.get('reason', 'No reason given')
-                            logger.debug(f"Excluded paper {paper.pmid or paper.title[:30]}: {reason[:100]}")
-
-                    logger.info(f"Batch {batch_idx}: {len(passed_papers)} passed, {excluded_count} excluded")
-                    return passed_papers
-
-                except Exception as e:
-                    logger.warning(f"LLM filtering failed for batch {batch_idx}: {e}")
-                    # Include all papers from failed batch
-                    return batch
+        async def process_batch(batch_idx: int, batch: List[Paper]):
+            try:
+                return batch_idx, await self._filter_batch(
+                    batch_idx, batch, drug_name, exclude_indications, limiter=limiter
+                )
+            except Exception as e:
+                logger.warning(f"Batch {batch_idx} raised exception: {e}")
+                # Include all papers from failed batch
+                return batch_idx, batch
 
-        # Process batches in waves for checkpointing (saves progress every N batches)
-        filtered_papers = []
+        # All batches are queued at once; the limiter paces them. Checkpoints
+        # save the papers passed so far every checkpoint_interval batches.
+        results_by_batch: Dict[int, List[Paper]] = {}
         total_batches = len(batches)
-
-        for wave_start in range(0, total_batches, checkpoint_interval):
-            wave_end = min(wave_start + checkpoint_interval, total_batches)
-            wave_batches = batches[wave_start:wave_end]
-
-            # Process this wave concurrently (limited by semaphore)
-            batch_results = await asyncio.gather(
-                *[process_batch(idx, batch) for idx, batch in wave_batches],
-                return_exceptions=True
-            )
-
-            # Collect results from this wave
-            for i, result in enumerate(batch_results):
-                actual_batch_idx = wave_start + i
-                if isinstance(result, Exception):
-                    logger.warning(f"Batch {actual_batch_idx} raised exception: {result}")
-                    # Include all papers from failed batch
-                    filtered_papers.extend(wave_batches[i][1])
-                else:
-                    filtered_papers.extend(result)
-
-            # Call checkpoint callback if provided
-            if checkpoint_callback and wave_end < total_batches:
+        for next_done in asyncio.as_completed([process_batch(i, b) for i, b in enumerate(batches)]):
+            batch_idx, passed = await next_done
+            results_by_batch[batch_idx] = passed
+            done = len(results_by_batch)
+            if checkpoint_callback and done % checkpoint_interval == 0 and done < total_batches:
+                passed_so_far = [p for i in sorted(results_by_batch) for p in results_by_batch[i]]
                 try:
-                    logger.info(f"Checkpoint: {wave_end}/{total_batches} batches complete, {len(filtered_papers)} papers passed so far")
-                    checkpoint_callback(filtered_papers.copy(), wave_end)
+                    logger.info(f"Checkpoint: {done}/{total_batches} batches complete, {len(passed_so_far)} papers passed so far")
+                    checkpoint_callback(passed_so_far, done)
                 except Exception as e:
-                    logger.warning(f"Checkpoint callback failed at batch {wave_end}: {e}")
+                    logger.warning(f"Checkpoint callback failed at batch {done}: {e}")
+
+        filtered_papers = [p for i in range(total_batches) for p in results_by_batch[i]]
+        logger.info(f"Filter concurrency: {limiter.get_stats()}")
 
         # Log filtering summary
         pass_rate = len(filtered_papers) / len(papers) * 100 if papers else 0
@@ -0,0 +1,248 @@
+"""
+Near-duplicate paper detection with MinHash/LSH.
+
+Exact PMID / DOI / title-prefix deduplication misses preprints and their
+published versions, conference abstracts and the small title variations
+between PubMed, Semantic Scholar and web results. NearDuplicateIndex
+catches those:
+
+- each paper gets two MinHash signatures: character 5-grams of the title
+  and word bigrams of title + abstract;
+- signatures are split into LSH bands, so a new paper is only compared
+  with papers sharing a band bucket (near-linear over thousands of papers);
+- candidates must agree on blocking fields (first author, publication year
+  within YEAR_WINDOW) and reach TITLE_SIMILARITY or TEXT_SIMILARITY exact
+  Jaccard similarity of their shingle sets.
+
+The index is incremental: add() answers "does this duplicate something
+already kept?" and registers the paper otherwise, so it works both for
+batch dedup and for the streaming search intake.
+"""
+
+import logging
+import re
+import unicodedata
+import zlib
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+NUM_PERM = 126
+LSH_BANDS = 42  # 3 rows per band: pairs at Jaccard 0.5 collide with p > 0.99, at 0.1 with p ~0.04
+TITLE_SHINGLE_CHARS = 5
+TEXT_SHINGLE_WORDS = 2
+# Titles shorter than this (normalized) are too generic to match on
+MIN_TITLE_CHARS = 20
+# Title + abstract signatures need this many words to be meaningful
+MIN_TEXT_WORDS = 30
+
+TITLE_SIMILARITY = 0.85
+TEXT_SIMILARITY = 0.5
+# Title-only evidence when either paper has no author list
+TITLE_ONLY_SIMILARITY = 0.95
+# Abstracts this different veto a title match (e.g. "Part I" / "Part II")
+CONFLICTING_TEXT_SIMILARITY = 0.2
+# Preprints are often published the following year or the one after
+YEAR_WINDOW = 2
+
+_rng = np.random.default_rng(20240611)
+_PERM_A = _rng.integers(1, 2**63, size=NUM_PERM, dtype=np.uint64) | np.uint64(1)
+_PERM_B = _rng.integers(0, 2**63, size=NUM_PERM, dtype=np.uint64)
+_ROWS = NUM_PERM // LSH_BANDS
+
+
+def _normalize_text(text: str) -> str:
+    """Lowercase ASCII words separated by single spaces."""
+    text = unicodedata.normalize("NFKD", text or "").encode("ascii", "ignore").decode()
+    return " ".join(re.findall(r"[a-z0-9]+", text.lower()))
+
+
+def _minhash(shingles: Set[str]) -> np.ndarray:
+    """MinHash signature via multiply-shift hashing of 32-bit shingle hashes."""
+    hashes = np.fromiter((zlib.crc32(s.encode()) for s in shingles), dtype=np.uint64, count=len(shingles))
+    with np.errstate(over="ignore"):
+        permuted = (hashes[:, None] * _PERM_A + _PERM_B) >> np.uint64(32)
+    return permuted.min(axis=0)
+
+
+def _jaccard(a: Optional[Set[str]], b: Optional[Set[str]]) -> float:
+    """Jaccard similarity of two shingle sets (0 if either is missing)."""
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def _band_keys(signature: np.ndarray) -> List[Tuple[int, bytes]]:
+    return [(band, signature[band * _ROWS:(band + 1) * _ROWS].tobytes()) for band in range(LSH_BANDS)]
+
+
+def _first_author_tokens(authors: Any) -> Set[str]:
+    """Name tokens of the first author ("Smith J", "Jane Smith", ["Jane Smith", ...])."""
+    if isinstance(authors, (list, tuple)):
+        first = authors[0] if authors else ""
+        if isinstance(first, dict):
+            first = first.get("name") or ""
+    else:
+        first = re.split(r"[,;]| and ", authors or "")[0]
+    return {t for t in _normalize_text(str(first)).split() if len(t) > 1 and t not in ("et", "al")}
+
+
+def _parse_year(year: Any) -> Optional[int]:
+    match = re.search(r"\d{4}", str(year or ""))
+    return int(match.group()) if match else None
+
+
+@dataclass
+class DuplicateCluster:
+    """A kept paper and the near-duplicates merged into it."""
+    kept_key: str
+    kept_title: str
+    merged: List[Dict[str, Any]] = field(default_factory=list)  # key, title, similarity, basis
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"kept_key": self.kept_key, "kept_title": self.kept_title, "merged": list(self.merged)}
+
+
+@dataclass
+class _Entry:
+    key: str
+    title: str
+    title_shingles: Optional[Set[str]]
+    text_shingles: Optional[Set[str]]
+    author_tokens: Set[str]
+    year: Optional[int]
+
+
+class NearDuplicateIndex:
+    """Incremental MinHash/LSH index of kept papers."""
+
+    def __init__(self):
+        self._entries: List[_Entry] = []
+        self._title_buckets: Dict[Tuple[int, bytes], List[int]] = {}
+        self._text_buckets: Dict[Tuple[int, bytes], List[int]] = {}
+        self._clusters: Dict[int, DuplicateCluster] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(
+        self,
+        key: str,
+        title: str,
+        abstract: str = "",
+        authors: Any = None,
+        year: Any = None,
+    ) -> Optional[str]:
+        """
+        Register a paper unless it near-duplicates one already kept.
+
+        Args:
+            key: Identity used in cluster reports (e.g. "pmid:123")
+            title, abstract, authors, year: Paper metadata (authors as a
+                string or list; year as int or string)
+
+        Returns:
+            Key of the kept paper it duplicates, or None if it was kept
+        """
+        entry = self._entry(key, title, abstract, authors, year)
+        banded = [
+            (buckets, _band_keys(_minhash(shingles)))
+            for shingles, buckets in (
+                (entry.title_shingles, self._title_buckets), (entry.text_shingles, self._text_buckets)
+            )
+            if shingles
+        ]
+        match = self._best_match(entry, banded)
+        if match is not None:
+            kept_idx, similarity, basis = match
+            kept = self._entries[kept_idx]
+            cluster = self._clusters.setdefault(kept_idx, DuplicateCluster(kept.key, kept.title))
+            cluster.merged.append({
+                "key": key, "title": title, "similarity": round(similarity, 3), "basis": basis,
+            })
+            logger.debug(f"Near-duplicate ({basis} {similarity:.2f}): {title[:60]!r} ~ {kept.title[:60]!r}")
+            return kept.key
+
+        idx = len(self._entries)
+        self._entries.append(entry)
+        for buckets, band_keys in banded:
+            for band_key in band_keys:
+                buckets.setdefault(band_key, []).append(idx)
+        return None
+
+    def clusters(self) -> List[DuplicateCluster]:
+        """Clusters with at least one merged paper, in order of the kept papers."""
+        return [self._clusters[idx] for idx in sorted(self._clusters)]
+
+    def _entry(self, key, title, abstract, authors, year) -> _Entry:
+        title_norm = _normalize_text(title)
+        title_shingles = None
+        if len(title_norm) >= MIN_TITLE_CHARS:
+            n = TITLE_SHINGLE_CHARS
+            title_shingles = {title_norm[i:i + n] for i in range(len(title_norm) - n + 1)}
+
+        words = _normalize_text(f"{title or ''} {abstract or ''}").split()
+        text_shingles = None
+        if abstract and len(words) >= MIN_TEXT_WORDS:
+            n = TEXT_SHINGLE_WORDS
+            text_shingles = {" ".join(words[i:i + n]) for i in range(len(words) - n + 1)}
+
+        return _Entry(
+            key, title or "", title_shingles, text_shingles, _first_author_tokens(authors), _parse_year(year)
+        )
+
+    def _best_match(self, entry: _Entry, banded) -> Optional[Tuple[int, float, str]]:
+        """Most similar compatible kept paper among the LSH candidates."""
+        candidates: Set[int] = set()
+        for buckets, band_keys in banded:
+            for band_key in band_keys:
+                candidates.update(buckets.get(band_key, ()))
+
+        best = None
+        for idx in sorted(candidates):
+            kept = self._entries[idx]
+            if not self._compatible(entry, kept):
+                continue
+            title_sim = _jaccard(entry.title_shingles, kept.title_shingles)
+            text_sim = _jaccard(entry.text_shingles, kept.text_shingles)
+
+            if text_sim >= TEXT_SIMILARITY:
+                scored = (idx, text_sim, "text")
+            elif title_sim >= TITLE_SIMILARITY:
+                compared_text = bool(entry.text_shingles and kept.text_shingles)
+                if compared_text and text_sim < CONFLICTING_TEXT_SIMILARITY:
+                    continue
+                # Without abstracts or authors on both sides, only near-identical titles merge
+                known_authors = bool(entry.author_tokens and kept.author_tokens)
+                if not compared_text and not known_authors and title_sim < TITLE_ONLY_SIMILARITY:
+                    continue
+                scored = (idx, title_sim, "title")
+            else:
+                continue
+            if best is None or scored[1] > best[1]:
+                best = scored
+        return best
+
+    @staticmethod
+    def _compatible(a: _Entry, b: _Entry) -> bool:
+        """Blocking: first authors share a name token and years are close (unknowns pass)."""
+        if a.year is not None and b.year is not None and abs(a.year - b.year) > YEAR_WINDOW:
+            return False
+        if a.author_tokens and b.author_tokens and not (a.author_tokens & b.author_tokens):
+            return False
+        return True
+
+
+def log_clusters(clusters: List[DuplicateCluster], context: str = ""):
+    """Log a one-line summary and each merged cluster."""
+    if not clusters:
+        return
+    merged = sum(len(c.merged) for c in clusters)
+    logger.info(f"Near-duplicate dedup{f' ({context})' if context else ''}: "
+                f"merged {merged} papers into {len(clusters)} clusters")
+    for cluster in clusters:
+        variants = "; ".join(f"{m['key']} ({m['basis']} {m['similarity']:.2f})" for m in cluster.merged)
+        logger.info(f"  {cluster.kept_key} {cluster.kept_title[:70]!r} <- {variants}")
@@ -0,0 +1,166 @@
+"""
+Durable per-stage checkpoints for the streaming literature search.
+
+LiteratureSearchService.search_stream records what happened to each paper at
+each pipeline stage (keyword prefilter, LLM filter, PMC lookup, emitted to the
+consumer). If a run crashes, the next run with the same parameters resumes
+mid-stream: papers with a recorded decision skip the stages they already
+passed, so LLM filter calls and PMC lookups are not repeated.
+
+Checkpoints live in a small SQLite database (WAL mode). A run that finishes is
+marked complete, and the next run with the same key starts fresh.
+"""
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHECKPOINT_PATH = Path("data/case_series_checkpoints/search_stream.sqlite3")
+
+# Pipeline stages, in order
+STAGE_PREFILTERED_OUT = "prefiltered_out"
+STAGE_FILTERED_OUT = "filtered_out"
+STAGE_FILTERED_IN = "filtered_in"
+STAGE_PMC_CHECKED = "pmc_checked"
+STAGE_EMITTED = "emitted"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS search_runs (
+    run_key TEXT PRIMARY KEY,
+    drug_name TEXT,
+    started_at TEXT,
+    completed_at TEXT
+);
+CREATE TABLE IF NOT EXISTS search_papers (
+    run_key TEXT NOT NULL,
+    paper_key TEXT NOT NULL,
+    stage TEXT NOT NULL,
+    paper TEXT NOT NULL,
+    updated_at TEXT,
+    PRIMARY KEY (run_key, paper_key)
+);
+"""
+
+
+def make_run_key(drug_name: str, **params: Any) -> str:
+    """Stable key for a search run from the drug and the parameters that affect results."""
+    payload = json.dumps({"drug": (drug_name or "").lower(), **params}, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32]
+
+
+class SearchCheckpoint:
+    """
+    Per-paper stage checkpoints for one streaming search run.
+
+    Args:
+        run_key: Key from make_run_key()
+        db_path: SQLite database path
+        drug_name: Stored for inspection only
+    """
+
+    def __init__(
+        self,
+        run_key: str,
+        db_path: Union[str, Path] = DEFAULT_CHECKPOINT_PATH,
+        drug_name: Optional[str] = None,
+    ):
+        self.run_key = run_key
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._start(drug_name)
+
+    def _start(self, drug_name: Optional[str]):
+        """Register the run; a previously completed run with this key starts over."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT completed_at FROM search_runs WHERE run_key = ?", (self.run_key,)
+            ).fetchone()
+            self.resumed = bool(row and row[0] is None)
+            if row and row[0] is not None:
+                self._conn.execute("DELETE FROM search_papers WHERE run_key = ?", (self.run_key,))
+            self._conn.execute(
+                """
+                INSERT INTO search_runs (run_key, drug_name, started_at, completed_at)
+                VALUES (?, ?, ?, NULL)
+                ON CONFLICT (run_key) DO UPDATE SET completed_at = NULL
+                """,
+                (self.run_key, drug_name, datetime.now().isoformat()),
+            )
+        if self.resumed:
+            logger.info(f"Resuming search run {self.run_key} ({self.count()} papers checkpointed)")
+
+    def get(self, paper_key: str) -> Optional[Dict[str, Any]]:
+        """Return {'stage': ..., 'paper': {...}} for a paper, or None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT stage, paper FROM search_papers WHERE run_key = ? AND paper_key = ?",
+                (self.run_key, paper_key),
+            ).fetchone()
+        if not row:
+            return None
+        return {"stage": row[0], "paper": json.loads(row[1])}
+
+    def record(self, paper_key: str, stage: str, paper: Dict[str, Any]):
+        """Record that a paper reached a stage."""
+        self.record_many([(paper_key, paper)], stage)
+
+    def record_many(self, items: Iterable, stage: str):
+        """Record (paper_key, paper_dict) pairs reaching a stage in one transaction."""
+        now = datetime.now().isoformat()
+        rows = [
+            (self.run_key, key, stage, json.dumps(paper, default=str), now)
+            for key, paper in items
+        ]
+        if not rows:
+            return
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.executemany(
+                    """
+                    INSERT INTO search_papers (run_key, paper_key, stage, paper, updated_at)
+                    VALUES (?, ?, ?, ?, ?)
+                    ON CONFLICT (run_key, paper_key)
+                    DO UPDATE SET stage = excluded.stage, paper = excluded.paper,
+                                  updated_at = excluded.updated_at
+                    """,
+                    rows,
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def count(self, stage: Optional[str] = None) -> int:
+        """Number of checkpointed papers, optionally at one stage."""
+        query = "SELECT COUNT(*) FROM search_papers WHERE run_key = ?"
+        params = [self.run_key]
+        if stage:
+            query += " AND stage = ?"
+            params.append(stage)
+        with self._lock:
+            return self._conn.execute(query, params).fetchone()[0]
+
+    def complete(self):
+        """Mark the run finished; the next run with this key starts fresh."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE search_runs SET completed_at = ? WHERE run_key = ?",
+                (datetime.now().isoformat(), self.run_key),
+            )
+
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
@@ -9,12 +9,20 @@ Provides:
 """
 
 import logging
+import math
+import threading
+from collections import Counter, OrderedDict, defaultdict
 from dataclasses import dataclass, field
 from typing import Dict, List, Optional, Set, Tuple
 from difflib import SequenceMatcher
 
 logger = logging.getLogger(__name__)
 
+# Minimum SequenceMatcher ratio for a fuzzy disease-name match
+FUZZY_MATCH_THRESHOLD = 0.85
+# Maximum number of memoized fuzzy lookups per taxonomy
+FUZZY_MEMO_SIZE = 4096
+
 
 @dataclass
 class EndpointDefinition:
@@ -65,6 +73,13 @@ class DiseaseTaxonomy:
         self._subtype_to_parent: Dict[str, str] = {}  # subtype → parent
         self._category_diseases: Dict[str, List[str]] = {}  # category → [diseases]
 
+        # Fuzzy match index (see _build_fuzzy_index)
+        self._fuzzy_targets: List[Tuple[str, str]] = []  # (lowercase name, canonical)
+        self._fuzzy_postings: Dict[str, List[Tuple[int, int]]] = {}  # trigram → [(target, count)]
+        self._fuzzy_by_length: Dict[int, List[int]] = {}  # length → [target]
+        self._fuzzy_memo: "OrderedDict[str, Tuple[Optional[str], float]]" = OrderedDict()
+        self._fuzzy_lock = threading.Lock()
+
         self._build_indexes()
 
     def _build_indexes(self) -> None:
@@ -93,6 +108,38 @@ class DiseaseTaxonomy:
                 self._category_diseases[entry.category] = []
             self._category_diseases[entry.category].append(canonical)
 
+        self._build_fuzzy_index()
+
+    def _build_fuzzy_index(self) -> None:
+        """
+        Build the trigram inverted index used to shortlist fuzzy candidates.
+
+        Targets keep the order the exhaustive scan visits them in (canonical
+        names, then aliases) so ties resolve to the same canonical name.
+        """
+        targets: List[Tuple[str, str]] = []
+        seen: Set[str] = set()
+        candidates = [(c.lower(), c) for c in self._diseases.keys()]
+        candidates.extend(self._alias_map.items())
+        for name, canonical in candidates:
+            # Identical strings score identically; the first occurrence wins ties
+            if name not in seen:
+                seen.add(name)
+                targets.append((name, canonical))
+
+        postings: Dict[str, List[Tuple[int, int]]] = defaultdict(list)
+        by_length: Dict[int, List[int]] = defaultdict(list)
+        for i, (name, _) in enumerate(targets):
+            for gram, count in _trigrams(name).items():
+                postings[gram].append((i, count))
+            by_length[len(name)].append(i)
+
+        with self._fuzzy_lock:
+            self._fuzzy_targets = targets
+            self._fuzzy_postings = dict(postings)
+            self._fuzzy_by_length = dict(by_length)
+            self._fuzzy_memo.clear()
+
     def add_disease(self, entry: DiseaseEntry) -> None:
         """Add or update a disease entry."""
         self._diseases[entry.canonical_name] = entry
@@ -129,8 +176,8 @@ class DiseaseTaxonomy:
             return self._subtype_to_parent[name_lower]
 
         # Fuzzy match
-        best_match, score = self._fuzzy_match(name_lower)
-        if score >= 0.85:
+        best_match, score = self._fuzzy_match(name_lower, min_score=FUZZY_MATCH_THRESHOLD)
+        if score >= FUZZY_MATCH_THRESHOLD:
             return best_match
 
         return None
@@ -285,8 +332,79 @@ class DiseaseTaxonomy:
         """Get all canonical disease names."""
         return list(self._diseases.keys())
 
-    def _fuzzy_match(self, name: str) -> Tuple[Optional[str], float]:
-        """Find best fuzzy match for a disease name."""
+    def _fuzzy_match(self, name: str, min_score: float = FUZZY_MATCH_THRESHOLD) -> Tuple[Optional[str], float]:
+        """
+        Find the best fuzzy match for a disease name scoring at least min_score.
+
+        Candidates are shortlisted with length and shared-trigram bounds that
+        no string scoring >= min_score can violate, then filtered with
+        difflib's quick_ratio upper bounds before the exact ratio is computed.
+        The result is identical to _fuzzy_match_exhaustive whenever its best
+        score is >= min_score; otherwise (None, 0.0) is returned.
+
+        Args:
+            name: Lowercased disease name
+            min_score: Minimum SequenceMatcher ratio to consider
+
+        Returns:
+            Tuple of (canonical_name, score)
+        """
+        key = f"{min_score}\x00{name}"
+        with self._fuzzy_lock:
+            cached = self._fuzzy_memo.get(key)
+            if cached is not None:
+                self._fuzzy_memo.move_to_end(key)
+                return cached
+            targets = self._fuzzy_targets
+            postings = self._fuzzy_postings
+            by_length = self._fuzzy_by_length
+
+        result = self._search_fuzzy_index(name, min_score, targets, postings, by_length)
+
+        with self._fuzzy_lock:
+            if targets is self._fuzzy_targets:
+                self._fuzzy_memo[key] = result
+                if len(self._fuzzy_memo) > FUZZY_MEMO_SIZE:
+                    self._fuzzy_memo.popitem(last=False)
+        return result
+
+    @staticmethod
+    def _search_fuzzy_index(
+        name: str,
+        min_score: float,
+        targets: List[Tuple[str, str]],
+        postings: Dict[str, List[Tuple[int, int]]],
+        by_length: Dict[int, List[int]],
+    ) -> Tuple[Optional[str], float]:
+        """Score the index candidates that can reach min_score."""
+        if min_score <= 0:
+            return _best_ratio(name, enumerate(text for text, _ in targets), targets)
+
+        la = len(name)
+        # ratio <= 2*min(la, lb) / (la + lb) bounds the candidate length
+        eps = 1e-9
+        lb_min = math.ceil(la * min_score / (2 - min_score) - eps)
+        lb_max = math.floor(la * (2 - min_score) / min_score + eps)
+
+        shared: Dict[int, int] = defaultdict(int)
+        for gram, count in _trigrams(name).items():
+            for i, target_count in postings.get(gram, ()):
+                shared[i] += min(count, target_count)
+
+        def candidates():
+            for lb in range(max(lb_min, 0), lb_max + 1):
+                ids = by_length.get(lb)
+                if not ids:
+                    continue
+                required = _min_shared_trigrams(la + lb, min_score)
+                for i in ids:
+                    if required <= 0 or shared.get(i, 0) >= required:
+                        yield i, targets[i][0]
+
+        return _best_ratio(name, candidates(), targets, min_score)
+
+    def _fuzzy_match_exhaustive(self, name: str) -> Tuple[Optional[str], float]:
+        """Find best fuzzy match by scoring every canonical name and alias."""
         best_match = None
         best_score = 0.0
 
@@ -331,6 +449,48 @@ class DiseaseTaxonomy:
         }
 
 
+def _trigrams(text: str) -> Counter:
+    """Multiset of character trigrams in text."""
+    return Counter(text[i:i + 3] for i in range(len(text) - 2))
+
+
+def _min_shared_trigrams(total_length: int, min_score: float) -> int:
+    """
+    Lower bound on shared trigrams for two strings scoring >= min_score.
+
+    ratio = 2*M / (la + lb) where M is the size of SequenceMatcher's k matching
+    blocks. Each block of length L contributes L - 2 aligned trigrams, and
+    blocks are separated by unmatched characters, so k <= (la + lb - 2M) + 1
+    and shared trigrams >= M - 2k >= 5M - 2(la + lb) - 2.
+    """
+    matched = math.ceil(min_score * total_length / 2 - 1e-9)
+    return 5 * matched - 2 * total_length - 2
+
+
+def _best_ratio(name, candidates, targets, min_score: float = 0.0):
+    """
+    Highest SequenceMatcher ratio among (index, text) candidates.
+
+    Ties go to the lowest target index, matching the exhaustive scan order.
+    """
+    best_index = None
+    best_score = 0.0
+    for i, text in candidates:
+        matcher = SequenceMatcher(None, name, text)
+        floor = max(best_score, min_score)
+        # Cheap upper bounds first; they never exceed ratio()
+        if matcher.real_quick_ratio() < floor or matcher.quick_ratio() < floor:
+            continue
+        score = matcher.ratio()
+        if score <= 0 or score < min_score:
+            continue
+        if best_index is None or score > best_score or (score == best_score and i < best_index):
+            best_index, best_score = i, score
+    if best_index is None:
+        return None, 0.0
+    return targets[best_index][1], best_score
+
+
 # =============================================================================
 # Default Taxonomy Data
 # =============================================================================
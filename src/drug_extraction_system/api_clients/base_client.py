@@ -5,20 +5,25 @@ Provides common functionality for all API clients including:
 - Rate limiting
 - Retry logic with exponential backoff
 - Circuit breaker pattern
+- Response caching (memory + disk, per-endpoint TTLs, negative caching)
 - Error handling
 """
 
+import hashlib
+import json as jsonlib
 import time
 import random
 import logging
-from typing import Dict, Optional, Any
+from typing import Dict, Optional, Any, Tuple
 from abc import ABC, abstractmethod
 import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
-from src.drug_extraction_system.utils.rate_limiter import RateLimiter
+from src.drug_extraction_system.utils.rate_limiter import get_shared_rate_limiter
 from src.drug_extraction_system.utils.circuit_breaker import CircuitBreaker, ServiceUnavailableError
+from src.drug_extraction_system.utils.cache import MISSING, TieredCache, get_shared_api_cache
+from src.tools.http_cache import normalize_request
 
 logger = logging.getLogger(__name__)
 
@@ -28,8 +33,19 @@ class BaseAPIClient(ABC):
     Base class for all API clients.
     
     Provides rate limiting, retry logic, and common HTTP functionality.
+
+    GET responses are cached. Subclasses set CACHE_TTL (seconds) and
+    CACHE_TTLS, a map of endpoint prefix -> TTL overriding it (0 disables
+    caching for that endpoint). Responses with a status in
+    NEGATIVE_CACHE_STATUSES (e.g. the 404 returned for an unknown drug)
+    are remembered for NEGATIVE_CACHE_TTL so the lookup isn't repeated.
     """
 
+    CACHE_TTL: int = 24 * 60 * 60
+    CACHE_TTLS: Dict[str, int] = {}
+    NEGATIVE_CACHE_TTL: int = 60 * 60
+    NEGATIVE_CACHE_STATUSES: Tuple[int, ...] = (404,)
+
     def __init__(
         self,
         base_url: str,
@@ -38,7 +54,9 @@ class BaseAPIClient(ABC):
         timeout: int = 30,
         max_retries: int = 3,
         name: Optional[str] = None,
-        enable_circuit_breaker: bool = True
+        enable_circuit_breaker: bool = True,
+        cache: Optional[TieredCache] = None,
+        enable_cache: bool = True
     ):
         """
         Initialize API client.
@@ -51,22 +69,27 @@ class BaseAPIClient(ABC):
             max_retries: Max retry attempts on failure
             name: Client name for logging
             enable_circuit_breaker: Enable circuit breaker pattern
+            cache: Response cache (default: the shared cache for this API name)
+            enable_cache: Cache GET responses
         """
         self.base_url = base_url.rstrip('/')
         self.timeout = timeout
         self.max_retries = max_retries
         self.name = name or self.__class__.__name__
 
-        # Set up rate limiter
-        self.rate_limiter = RateLimiter(
+        # Rate limiter is shared by all clients of the same API in this process
+        self.rate_limiter = get_shared_rate_limiter(
+            self.name,
             requests_per_minute=rate_limit,
-            requests_per_day=daily_limit,
-            name=self.name
+            requests_per_day=daily_limit
         )
 
         # Set up circuit breaker
         self.circuit_breaker = CircuitBreaker(name=self.name) if enable_circuit_breaker else None
 
+        # Response cache is shared by all clients of the same API in this process
+        self.cache = (cache or get_shared_api_cache(self.name)) if enable_cache else None
+
         # Set up session with retry adapter
         self.session = self._create_session()
 
@@ -88,6 +111,17 @@ class BaseAPIClient(ABC):
 
         return session
 
+    def _cache_ttl(self, endpoint: str) -> int:
+        """TTL for an endpoint: the longest matching CACHE_TTLS prefix, else CACHE_TTL."""
+        matches = [prefix for prefix in self.CACHE_TTLS if endpoint.startswith(prefix)]
+        if matches:
+            return self.CACHE_TTLS[max(matches, key=len)]
+        return self.CACHE_TTL
+
+    def _cache_key(self, url: str, params: Optional[Dict]) -> str:
+        canonical = f"{self.name}|{normalize_request(url, params)}"
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
     def _make_request(
         self,
         method: str,
@@ -96,10 +130,11 @@ class BaseAPIClient(ABC):
         data: Optional[Dict] = None,
         json: Optional[Dict] = None,
         headers: Optional[Dict] = None,
-        timeout: Optional[int] = None
+        timeout: Optional[int] = None,
+        use_cache: bool = True
     ) -> Optional[Dict]:
         """
-        Make HTTP request with rate limiting, circuit breaker, and retry logic.
+        Make HTTP request with caching, rate limiting, circuit breaker, and retry logic.
 
         Args:
             method: HTTP method (GET, POST, etc.)
@@ -109,10 +144,25 @@ class BaseAPIClient(ABC):
             json: JSON body
             headers: Additional headers
             timeout: Override default timeout
+            use_cache: Serve and store GET responses via the cache
 
         Returns:
             Response JSON or None on failure
         """
+        url = f"{self.base_url}{endpoint}" if not endpoint.startswith('http') else endpoint
+
+        # Cached GETs skip the circuit breaker and rate limiter entirely
+        cache_key = None
+        ttl = self._cache_ttl(endpoint)
+        if self.cache is not None and use_cache and method.upper() == "GET" and ttl > 0:
+            cache_key = self._cache_key(url, params)
+            cached = self.cache.get(cache_key)
+            if cached is None:
+                # Negative entry: the API answered e.g. 404 for this request
+                return None
+            if cached is not MISSING:
+                return jsonlib.loads(cached) if cached else {}
+
         # Check circuit breaker
         if self.circuit_breaker and not self.circuit_breaker.allow_request():
             logger.warning(f"[{self.name}] Circuit breaker is OPEN - skipping request")
@@ -123,8 +173,6 @@ class BaseAPIClient(ABC):
             logger.error(f"[{self.name}] Rate limiter timeout - aborting request")
             return None
 
-        url = f"{self.base_url}{endpoint}" if not endpoint.startswith('http') else endpoint
-
         # Prepare headers
         request_headers = {"Accept": "application/json"}
         if headers:
@@ -146,7 +194,10 @@ class BaseAPIClient(ABC):
                 retry_after = int(response.headers.get("Retry-After", 60))
                 logger.warning(f"[{self.name}] Rate limited, waiting {retry_after}s")
                 time.sleep(retry_after + random.uniform(0, 5))
-                return self._make_request(method, endpoint, params, data, json, headers, timeout)
+                return self._make_request(method, endpoint, params, data, json, headers, timeout, use_cache)
+
+            if cache_key and response.status_code in self.NEGATIVE_CACHE_STATUSES:
+                self.cache.set(cache_key, None, ttl=min(ttl, self.NEGATIVE_CACHE_TTL))
 
             response.raise_for_status()
 
@@ -154,7 +205,10 @@ class BaseAPIClient(ABC):
             if self.circuit_breaker:
                 self.circuit_breaker.record_success()
 
-            return response.json() if response.content else {}
+            result = response.json() if response.content else {}
+            if cache_key:
+                self.cache.set(cache_key, response.text if response.content else "", ttl=ttl)
+            return result
 
         except requests.exceptions.Timeout:
             logger.error(f"[{self.name}] Request timeout: {url}")
@@ -188,7 +242,7 @@ class BaseAPIClient(ABC):
         return self._make_request("POST", endpoint, json=json, **kwargs)
 
     def get_status(self) -> Dict:
-        """Get client status including rate limiter and circuit breaker status."""
+        """Get client status including rate limiter, circuit breaker and cache status."""
         status = {
             "client": self.name,
             "base_url": self.base_url,
@@ -201,6 +255,9 @@ class BaseAPIClient(ABC):
                 "details": str(self.circuit_breaker)
             }
 
+        if self.cache is not None:
+            status["cache"] = self.cache.get_stats()
+
         return status
 
     @abstractmethod
@@ -31,6 +31,9 @@ class ChEMBLClient(BaseAPIClient):
 
     BASE_URL = "https://www.ebi.ac.uk/chembl/api/data"
 
+    # ChEMBL data changes only with its (roughly quarterly) releases
+    CACHE_TTL = 30 * 24 * 60 * 60
+
     def __init__(self):
         """Initialize ChEMBL client."""
         super().__init__(
@@ -175,7 +178,7 @@ class ChEMBLClient(BaseAPIClient):
     def health_check(self) -> bool:
         """Check if ChEMBL API is accessible."""
         try:
-            result = self.get("/status.json")
+            result = self.get("/status.json", use_cache=False)
             return result is not None
         except Exception:
             return False
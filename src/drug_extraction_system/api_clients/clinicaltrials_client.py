@@ -24,6 +24,9 @@ class ClinicalTrialsClient(BaseAPIClient):
 
     BASE_URL = "https://clinicaltrials.gov/api/v2"
 
+    # Trial records are updated frequently
+    CACHE_TTL = 24 * 60 * 60
+
     def __init__(self):
         """Initialize ClinicalTrials.gov client."""
         super().__init__(
@@ -294,7 +297,7 @@ class ClinicalTrialsClient(BaseAPIClient):
     def health_check(self) -> bool:
         """Check if ClinicalTrials.gov API is accessible."""
         try:
-            result = self.get("/studies", params={"pageSize": 1, "format": "json"})
+            result = self.get("/studies", params={"pageSize": 1, "format": "json"}, use_cache=False)
             return result is not None and "studies" in result
         except Exception:
             return False
@@ -22,6 +22,9 @@ class MeSHClient(BaseAPIClient):
 
     BASE_URL = "https://id.nlm.nih.gov/mesh"
 
+    # MeSH is released yearly
+    CACHE_TTL = 30 * 24 * 60 * 60
+
     def __init__(self):
         """Initialize MeSH client."""
         super().__init__(
@@ -367,8 +370,8 @@ class MeSHClient(BaseAPIClient):
     def health_check(self) -> bool:
         """Check if MeSH API is accessible."""
         try:
-            # Try to get a known descriptor
-            result = self.get_descriptor("D003920")  # Diabetes Mellitus
+            # Try to get a known descriptor (Diabetes Mellitus), bypassing the cache
+            result = self.get("/D003920.json", use_cache=False)
             return result is not None
         except Exception:
             return False
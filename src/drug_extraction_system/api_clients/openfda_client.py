@@ -27,6 +27,11 @@ class OpenFDAClient(BaseAPIClient):
 
     BASE_URL = "https://api.fda.gov"
 
+    # Labels and NDC listings are updated weekly; approval histories rarely change.
+    # openFDA answers 404 for searches with no matches, which are negatively cached.
+    CACHE_TTL = 24 * 60 * 60
+    CACHE_TTLS = {"/drug/drugsfda.json": 7 * 24 * 60 * 60}
+
     def __init__(self, api_key: Optional[str] = None):
         """
         Initialize OpenFDA client.
@@ -507,7 +512,7 @@ class OpenFDAClient(BaseAPIClient):
         """Check if OpenFDA API is accessible."""
         try:
             params = self._add_api_key({"limit": 1})
-            result = self.get("/drug/label.json", params=params)
+            result = self.get("/drug/label.json", params=params, use_cache=False)
             return result is not None
         except Exception:
             return False
@@ -12,9 +12,15 @@ from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
 from functools import lru_cache
 
+from src.drug_extraction_system.utils.rate_limiter import get_shared_token_bucket
+
 logger = logging.getLogger(__name__)
 
 
+class PubChemUnavailableError(Exception):
+    """PubChem could not answer: rate limited, server error or transport failure."""
+
+
 @dataclass
 class PubChemCompound:
     """PubChem compound information."""
@@ -87,6 +93,26 @@ class PubChemClient:
         self.session.headers.update({
             'Accept': 'application/json'
         })
+        # PubChem allows 5 req/sec; shared across all PubChemClient instances
+        self.rate_limiter = get_shared_token_bucket("PubChem", requests_per_second=5, burst=5)
+
+    def _get(self, url: str) -> requests.Response:
+        """
+        Rate-limited GET.
+
+        Raises:
+            PubChemUnavailableError: No rate limiter slot, transport error,
+                HTTP 429 or 5xx. Callers must not read these as "not found".
+        """
+        if not self.rate_limiter.acquire(timeout=120):
+            raise PubChemUnavailableError(f"Rate limiter timeout for {url}")
+        try:
+            response = self.session.get(url, timeout=self.timeout)
+        except requests.exceptions.RequestException as e:
+            raise PubChemUnavailableError(f"Request failed for {url}: {e}") from e
+        if response.status_code == 429 or response.status_code >= 500:
+            raise PubChemUnavailableError(f"HTTP {response.status_code} for {url}")
+        return response
 
     def search_by_name(self, name: str) -> Optional[PubChemCompound]:
         """
@@ -97,11 +123,14 @@ class PubChemClient:
 
         Returns:
             PubChemCompound if found, None otherwise
+
+        Raises:
+            PubChemUnavailableError: PubChem could not answer
         """
         try:
             # First, try the compound database
             url = f"{self.BASE_URL}/compound/name/{requests.utils.quote(name)}/cids/JSON"
-            response = self.session.get(url, timeout=self.timeout)
+            response = self._get(url)
 
             if response.status_code == 200:
                 data = response.json()
@@ -135,7 +164,7 @@ class PubChemClient:
         try:
             # Search substance by name
             url = f"{self.BASE_URL}/substance/name/{requests.utils.quote(name)}/sids/JSON"
-            response = self.session.get(url, timeout=self.timeout)
+            response = self._get(url)
 
             if response.status_code != 200:
                 return None
@@ -168,7 +197,7 @@ class PubChemClient:
         """Get synonyms for a substance."""
         try:
             url = f"{self.BASE_URL}/substance/sid/{sid}/synonyms/JSON"
-            response = self.session.get(url, timeout=self.timeout)
+            response = self._get(url)
 
             if response.status_code != 200:
                 return []
@@ -185,7 +214,7 @@ class PubChemClient:
         """Get the CID linked to a substance (if any)."""
         try:
             url = f"{self.BASE_URL}/substance/sid/{sid}/cids/JSON"
-            response = self.session.get(url, timeout=self.timeout)
+            response = self._get(url)
 
             if response.status_code != 200:
                 return None
@@ -211,7 +240,7 @@ class PubChemClient:
         try:
             # Get basic properties
             url = f"{self.BASE_URL}/compound/cid/{cid}/property/Title,IUPACName,MolecularFormula/JSON"
-            response = self.session.get(url, timeout=self.timeout)
+            response = self._get(url)
             response.raise_for_status()
 
             props = response.json().get('PropertyTable', {}).get('Properties', [{}])[0]
@@ -244,7 +273,7 @@ class PubChemClient:
         """
         try:
             url = f"{self.BASE_URL}/compound/cid/{cid}/synonyms/JSON"
-            response = self.session.get(url, timeout=self.timeout)
+            response = self._get(url)
             response.raise_for_status()
 
             data = response.json()
@@ -271,7 +300,10 @@ class PubChemClient:
         compound = self.search_by_name(name)
         if not compound:
             return None
+        return self.generic_name_for(compound)
 
+    def generic_name_for(self, compound: PubChemCompound) -> Optional[str]:
+        """Pick the generic (INN) name from an already-fetched compound."""
         # Check if the compound's primary name is already a generic name
         if self._is_generic_name(compound.name):
             return compound.name.lower()
@@ -373,13 +405,16 @@ class PubChemClient:
             name: Drug name
 
         Returns:
-            Dict with generic_name, research_codes, cid, synonyms
+            Dict with generic_name, research_codes, cid, synonyms; None if not found
+
+        Raises:
+            PubChemUnavailableError: PubChem could not answer
         """
         compound = self.search_by_name(name)
         if not compound:
             return None
 
-        generic_name = self.find_generic_name(name)
+        generic_name = self.generic_name_for(compound)
         research_codes = [s for s in compound.synonyms if self.RESEARCH_CODE_PATTERN.match(s)]
 
         return {
@@ -25,6 +25,9 @@ class RxNormClient(BaseAPIClient):
 
     BASE_URL = "https://rxnav.nlm.nih.gov/REST"
 
+    # RxNorm is released monthly (weekly updates add new drugs only)
+    CACHE_TTL = 7 * 24 * 60 * 60
+
     def __init__(self):
         """Initialize RxNorm client."""
         super().__init__(
@@ -192,7 +195,7 @@ class RxNormClient(BaseAPIClient):
     def health_check(self) -> bool:
         """Check if RxNorm API is accessible."""
         try:
-            result = self.get("/version.json")
+            result = self.get("/version.json", use_cache=False)
             return result is not None and "version" in result
         except Exception:
             return False
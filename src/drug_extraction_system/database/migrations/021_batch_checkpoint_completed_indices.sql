@@ -0,0 +1,9 @@
+-- Migration 021: Track completed CSV rows as a set for parallel batch processing
+-- Workers finish drugs out of order, so a single "last processed index"
+-- watermark can't describe progress. completed_indices stores the finished
+-- row indices as compact ranges, e.g. '0-199,201,205-250'.
+
+ALTER TABLE batch_checkpoints ADD COLUMN IF NOT EXISTS completed_indices TEXT DEFAULT '';
+
+COMMENT ON COLUMN batch_checkpoints.completed_indices IS
+  'Completed CSV row indices encoded as comma-separated ranges (e.g. 0-199,201). last_processed_index is kept as the contiguous watermark.';
@@ -0,0 +1,215 @@
+-- Migration 022: Materialized summary tables for the Case Series Browser
+-- v_cs_drug_disease_summary / v_cs_drug_summary re-aggregate cs_extractions on
+-- every page load, and the browser then ran two more queries per disease row
+-- (best PMID, explanation). These tables hold the same aggregates plus the
+-- best paper and explanation, and are refreshed one drug at a time by
+-- cs_refresh_drug_summary() at the end of each analysis run and score refresh
+-- (and by maintenance scripts that rewrite cs_extractions / cs_opportunities).
+
+-- Step 1: Functional indexes for the case-insensitive drug lookups
+CREATE INDEX IF NOT EXISTS idx_cs_extractions_lower_drug_disease
+ON cs_extractions (LOWER(drug_name), disease, individual_score DESC NULLS LAST)
+WHERE is_relevant = true;
+
+CREATE INDEX IF NOT EXISTS idx_cs_opportunities_lower_drug_disease
+ON cs_opportunities (LOWER(drug_name), LOWER(disease), created_at DESC);
+
+-- Step 2: Drug/disease summary table (columns of v_cs_drug_disease_summary
+-- plus best paper and explanation)
+CREATE TABLE IF NOT EXISTS cs_drug_disease_summary (
+    drug_name VARCHAR(255) NOT NULL,
+    drug_id INT,
+    disease VARCHAR(500),
+    disease_normalized VARCHAR(500),
+    parent_disease VARCHAR(500),
+    paper_count INT NOT NULL DEFAULT 0,
+    total_patients BIGINT NOT NULL DEFAULT 0,
+    aggregate_score NUMERIC(6, 2),
+    best_paper_score NUMERIC(6, 2),
+    best_paper_pmid VARCHAR(100),
+    avg_response_rate NUMERIC(6, 1),
+    efficacy_signal VARCHAR(50),
+    evidence_rank INT,
+    best_evidence_level VARCHAR(50),
+    explanation TEXT,
+    last_scored_at TIMESTAMP,
+    last_extracted_at TIMESTAMP,
+    refreshed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- One row per (case-insensitive drug, disease)
+CREATE UNIQUE INDEX IF NOT EXISTS uq_cs_drug_disease_summary_drug_disease
+ON cs_drug_disease_summary (LOWER(drug_name), disease);
+
+CREATE INDEX IF NOT EXISTS idx_cs_drug_disease_summary_lower_drug
+ON cs_drug_disease_summary (LOWER(drug_name), aggregate_score DESC NULLS LAST);
+
+-- Step 3: Drug summary table (columns of v_cs_drug_summary)
+CREATE TABLE IF NOT EXISTS cs_drug_summary (
+    drug_name VARCHAR(255) NOT NULL,
+    drug_id INT,
+    disease_count INT NOT NULL DEFAULT 0,
+    total_papers BIGINT NOT NULL DEFAULT 0,
+    total_patients BIGINT NOT NULL DEFAULT 0,
+    avg_disease_score NUMERIC(6, 2),
+    top_paper_score NUMERIC(6, 2),
+    last_scored_at TIMESTAMP,
+    last_extracted_at TIMESTAMP,
+    refreshed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- One row per case-insensitive drug
+CREATE UNIQUE INDEX IF NOT EXISTS uq_cs_drug_summary_lower_drug
+ON cs_drug_summary (LOWER(drug_name));
+
+CREATE INDEX IF NOT EXISTS idx_cs_drug_summary_total_papers
+ON cs_drug_summary (total_papers DESC);
+
+-- Step 4: Incremental refresh for one drug (case-insensitive)
+-- Rows are keyed by (LOWER(drug_name), disease): case variants of a drug name
+-- and differing drug_id / parent_disease values collapse into one row. The
+-- advisory lock serializes concurrent refreshes of the same drug, so two
+-- transactions can't both delete and then both insert.
+CREATE OR REPLACE FUNCTION cs_refresh_drug_summary(p_drug_name TEXT)
+RETURNS VOID AS $$
+BEGIN
+    PERFORM pg_advisory_xact_lock(hashtext(LOWER(p_drug_name)));
+
+    DELETE FROM cs_drug_disease_summary WHERE LOWER(drug_name) = LOWER(p_drug_name);
+    DELETE FROM cs_drug_summary WHERE LOWER(drug_name) = LOWER(p_drug_name);
+
+    INSERT INTO cs_drug_disease_summary (
+        drug_name, drug_id, disease, disease_normalized, parent_disease,
+        paper_count, total_patients, aggregate_score, best_paper_score, best_paper_pmid,
+        avg_response_rate, efficacy_signal, evidence_rank, best_evidence_level,
+        explanation, last_scored_at, last_extracted_at
+    )
+    WITH ranked AS (
+        SELECT e.*,
+            CASE e.evidence_level
+                WHEN 'RCT' THEN 1
+                WHEN 'Randomized Trial' THEN 1
+                WHEN 'Controlled Trial' THEN 2
+                WHEN 'Meta-Analysis' THEN 2
+                WHEN 'Prospective Cohort' THEN 3
+                WHEN 'Retrospective Study' THEN 4
+                WHEN 'Case Series' THEN 5
+                WHEN 'Case Report' THEN 6
+                ELSE 7
+            END AS evidence_rank
+        FROM cs_extractions e
+        WHERE LOWER(e.drug_name) = LOWER(p_drug_name)
+          AND e.is_relevant = true
+    ),
+    s AS (
+        SELECT
+            MIN(drug_name) AS drug_name,
+            MAX(drug_id) AS drug_id,
+            disease,
+            MODE() WITHIN GROUP (ORDER BY disease_normalized) AS disease_normalized,
+            MODE() WITHIN GROUP (ORDER BY parent_disease) AS parent_disease,
+            COUNT(*) AS paper_count,
+            SUM(COALESCE(n_patients, 0)) AS total_patients,
+            -- N-weighted aggregate score (as in v_cs_drug_disease_summary)
+            ROUND(
+                SUM(COALESCE(individual_score, 5.0) * COALESCE(n_patients, 1)::numeric) /
+                NULLIF(SUM(COALESCE(n_patients, 1)), 0),
+                2
+            ) AS aggregate_score,
+            MAX(individual_score) AS best_paper_score,
+            ROUND(AVG(responders_pct)::numeric, 1) AS avg_response_rate,
+            MODE() WITHIN GROUP (ORDER BY efficacy_signal) AS efficacy_signal,
+            MIN(evidence_rank) AS evidence_rank,
+            MAX(scored_at) AS last_scored_at,
+            MAX(extracted_at) AS last_extracted_at
+        FROM ranked
+        GROUP BY disease
+    )
+    SELECT
+        s.drug_name, s.drug_id, s.disease, s.disease_normalized, s.parent_disease,
+        s.paper_count, s.total_patients, s.aggregate_score, s.best_paper_score, best.pmid,
+        s.avg_response_rate, s.efficacy_signal, s.evidence_rank,
+        CASE s.evidence_rank
+            WHEN 1 THEN 'RCT'
+            WHEN 2 THEN 'Controlled Trial'
+            WHEN 3 THEN 'Prospective Cohort'
+            WHEN 4 THEN 'Retrospective Study'
+            WHEN 5 THEN 'Case Series'
+            WHEN 6 THEN 'Case Report'
+            ELSE 'Unknown'
+        END,
+        opp.key_findings, s.last_scored_at, s.last_extracted_at
+    FROM s
+    LEFT JOIN LATERAL (
+        SELECT e.pmid FROM cs_extractions e
+        WHERE LOWER(e.drug_name) = LOWER(p_drug_name)
+          AND e.disease IS NOT DISTINCT FROM s.disease
+          AND e.is_relevant = true
+        ORDER BY e.individual_score DESC NULLS LAST
+        LIMIT 1
+    ) best ON true
+    LEFT JOIN LATERAL (
+        SELECT o.key_findings FROM cs_opportunities o
+        WHERE LOWER(o.drug_name) = LOWER(p_drug_name)
+          AND LOWER(o.disease) = LOWER(s.disease)
+        ORDER BY o.created_at DESC
+        LIMIT 1
+    ) opp ON true;
+
+    INSERT INTO cs_drug_summary (
+        drug_name, drug_id, disease_count, total_papers, total_patients,
+        avg_disease_score, top_paper_score, last_scored_at, last_extracted_at
+    )
+    SELECT
+        MIN(drug_name),
+        MAX(drug_id),
+        COUNT(DISTINCT disease),
+        SUM(paper_count),
+        SUM(total_patients),
+        ROUND(AVG(aggregate_score)::numeric, 2),
+        MAX(best_paper_score),
+        MAX(last_scored_at),
+        MAX(last_extracted_at)
+    FROM cs_drug_disease_summary
+    WHERE LOWER(drug_name) = LOWER(p_drug_name)
+    HAVING COUNT(*) > 0;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Step 5: Full rebuild, for writers outside CaseSeriesDatabase (maintenance
+-- scripts, manual SQL) or after a crashed run left summaries stale
+CREATE OR REPLACE FUNCTION cs_refresh_all_drug_summaries()
+RETURNS VOID AS $$
+DECLARE
+    v_drug TEXT;
+BEGIN
+    -- Drugs whose extractions are all gone
+    DELETE FROM cs_drug_disease_summary s
+    WHERE NOT EXISTS (
+        SELECT 1 FROM cs_extractions e
+        WHERE LOWER(e.drug_name) = LOWER(s.drug_name) AND e.is_relevant = true
+    );
+    DELETE FROM cs_drug_summary s
+    WHERE NOT EXISTS (
+        SELECT 1 FROM cs_extractions e
+        WHERE LOWER(e.drug_name) = LOWER(s.drug_name) AND e.is_relevant = true
+    );
+
+    FOR v_drug IN
+        SELECT DISTINCT LOWER(drug_name) FROM cs_extractions WHERE is_relevant = true
+    LOOP
+        PERFORM cs_refresh_drug_summary(v_drug);
+    END LOOP;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Step 6: Backfill
+SELECT cs_refresh_all_drug_summaries();
+
+COMMENT ON TABLE cs_drug_disease_summary IS
+'Materialized v_cs_drug_disease_summary (one row per LOWER(drug_name), disease) plus best paper PMID
+and explanation. Refreshed per drug by cs_refresh_drug_summary() when an analysis run finishes;
+cs_refresh_all_drug_summaries() rebuilds every drug.';
+
+COMMENT ON TABLE cs_drug_summary IS
+'Materialized v_cs_drug_summary for the browser dropdown. Refreshed with cs_drug_disease_summary.';
@@ -0,0 +1,16 @@
+-- Migration 023: ClinicalTrials.gov sync cursors for pipeline landscapes
+-- A delta refresh of a disease landscape only fetches studies whose
+-- LastUpdatePostDate is on or after the cursor stored for each condition
+-- search term, instead of re-running every search and LLM extraction.
+
+CREATE TABLE IF NOT EXISTS pipeline_sync_cursors (
+    disease_id INT NOT NULL,
+    search_term VARCHAR(500) NOT NULL,
+    last_update_post_date DATE NOT NULL,
+    last_synced_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (disease_id, search_term)
+);
+
+COMMENT ON TABLE pipeline_sync_cursors IS
+'Per disease and condition search term: latest ClinicalTrials.gov LastUpdatePostDate seen.
+Written by PipelineIntelligenceService after full and delta landscape refreshes.';
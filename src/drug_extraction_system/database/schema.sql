@@ -27,6 +27,7 @@ CREATE TABLE IF NOT EXISTS batch_checkpoints (
     total_drugs INTEGER NOT NULL,
     processed_drugs INTEGER DEFAULT 0,
     last_processed_index INTEGER DEFAULT -1,
+    completed_indices TEXT DEFAULT '',  -- finished row indices as ranges, e.g. '0-199,201'
     status TEXT DEFAULT 'in_progress',  -- in_progress, completed, failed, interrupted
     started_at TIMESTAMP DEFAULT NOW(),
     updated_at TIMESTAMP DEFAULT NOW(),
@@ -18,6 +18,7 @@ from src.drug_extraction_system.api_clients.rxnorm_client import RxNormClient
 from src.drug_extraction_system.api_clients.mesh_client import MeSHClient
 from src.drug_extraction_system.api_clients.clinicaltrials_client import ClinicalTrialsClient
 from src.drug_extraction_system.utils.drug_key_generator import DrugKeyGenerator
+from src.drug_extraction_system.utils.stage_graph import StageGraph
 from src.drug_extraction_system.services.drug_type_classifier import DrugTypeClassifier
 from src.drug_extraction_system.parsers.dosing_parser import DosingParser
 from src.tools.dailymed import DailyMedAPI
@@ -93,7 +94,12 @@ class ApprovedDrugExtractor:
         self.dailymed = dailymed_client or DailyMedAPI()
         self.drug_type_classifier = drug_type_classifier or DrugTypeClassifier()
 
-    def extract(self, drug_name: str, development_code: Optional[str] = None) -> ExtractedDrugData:
+    def extract(
+        self,
+        drug_name: str,
+        development_code: Optional[str] = None,
+        stage_timings: Optional[Dict[str, float]] = None
+    ) -> ExtractedDrugData:
         """
         Extract comprehensive data for an approved drug.
 
@@ -103,9 +109,15 @@ class ApprovedDrugExtractor:
         3. RxNorm (standardization)
         4. ClinicalTrials.gov (trial data)
 
+        The OpenFDA, DailyMed, approval and RxNorm lookups only need the drug
+        name, so they run concurrently; their results are merged in the
+        priority order above. Drug type classification, the trial search and
+        MeSH standardization then run concurrently on the merged data.
+
         Args:
             drug_name: Drug name (brand or generic)
             development_code: Optional development code (e.g., "LNP023") for trial search
+            stage_timings: Optional dict that receives per-stage wall times (seconds)
 
         Returns:
             ExtractedDrugData with all available information
@@ -115,41 +127,104 @@ class ApprovedDrugExtractor:
         logger.info(f"Extracting data for approved drug: '{drug_name}'" +
                    (f" (dev code: {development_code})" if development_code else ""))
 
-        # Step 1: Get OpenFDA label data (PRIMARY source for indications and dosing)
-        labels = self.openfda.search_drug_labels(drug_name, limit=1)
-        openfda_data = {}
+        graph = StageGraph()
+        graph.add("openfda_label", lambda r: self.openfda.search_drug_labels(drug_name, limit=1))
+        graph.add("dailymed", lambda r: self._extract_from_dailymed(drug_name))
+        graph.add("approval_info", lambda r: self.openfda.get_approval_info(drug_name))
+        graph.add("rxnorm", lambda r: self.rxnorm.normalize_drug_name(drug_name))
+        graph.add(
+            "merge",
+            lambda r: self._merge_sources(
+                result, drug_name, r["openfda_label"], r["dailymed"], r["approval_info"], r["rxnorm"]
+            ),
+            deps=("openfda_label", "dailymed", "approval_info", "rxnorm")
+        )
+        # Step 4: Infer drug type using DrugTypeClassifier (with Claude fallback)
+        graph.add(
+            "drug_type",
+            lambda r: self.drug_type_classifier.classify(
+                r["merge"], mechanism_of_action=result.mechanism_of_action
+            ),
+            deps=("merge",)
+        )
+        # Step 7: Fetch ALL industry-sponsored clinical trials
+        graph.add(
+            "clinical_trials",
+            lambda r: self._fetch_clinical_trials(
+                drug_name=result.generic_name or drug_name,
+                rxcui=result.rxcui,
+                development_code=development_code,
+                brand_name=result.brand_name
+            ),
+            deps=("merge",)
+        )
+        # Step 8: Standardize indications with MeSH
+        graph.add(
+            "mesh",
+            lambda r: self._standardize_indications(result.indications) if result.indications else None,
+            deps=("merge",)
+        )
+        try:
+            stages = graph.run()
+        finally:
+            if stage_timings is not None:
+                stage_timings.update(graph.timings)
+
+        result.drug_type = stages["drug_type"]
+        clinical_trials = stages["clinical_trials"]
+        if clinical_trials:
+            result.clinical_trials = clinical_trials
+            result.data_sources.append("ClinicalTrials.gov")
+            logger.info(f"Found {len(clinical_trials)} industry-sponsored clinical trials")
+        if stages["mesh"] is not None:
+            result.indications = stages["mesh"]
+
+        # Step 9: Calculate completeness
+        result.completeness_score = self._calculate_completeness(result)
+
+        logger.info(f"Extracted '{result.drug_key}' with completeness {result.completeness_score:.2%}")
+        return result
+
+    def _merge_sources(
+        self,
+        result: ExtractedDrugData,
+        drug_name: str,
+        labels: Optional[List[Dict]],
+        dailymed_data: Optional[Dict],
+        approval_info: Optional[Dict],
+        rxnorm_data: Optional[Dict]
+    ) -> str:
+        """
+        Populate ``result`` from the fetched sources in priority order.
+
+        Returns:
+            Name to classify the drug type with (generic name before RxNorm
+            normalization, else the input name)
+        """
+        # Step 1: OpenFDA label data (PRIMARY source for indications and dosing)
         if labels:
             label_data = self.openfda.extract_drug_data(labels[0])
-            openfda_data = labels[0].get("openfda", {})
             self._populate_from_openfda(result, label_data, is_primary=True)
             result.data_sources.append("openFDA")
             logger.info(f"✓ OpenFDA: Found Indications={bool(label_data.get('indications_and_usage'))}, "
                        f"Dosing={bool(label_data.get('dosage_and_administration'))}")
 
-        # Step 2: Get DailyMed data (PRIMARY source for MOA, fallback for other fields)
-        dailymed_data = self._extract_from_dailymed(drug_name)
+        # Step 2: DailyMed data (PRIMARY source for MOA, fallback for other fields)
         if dailymed_data:
             self._populate_from_dailymed(result, dailymed_data, is_primary=False)
             result.data_sources.append("DailyMed")
             logger.info(f"✓ DailyMed: Found MOA={bool(result.mechanism_of_action)}")
 
-        # Step 3: Get approval info (first_approval_date)
-        approval_info = self.openfda.get_approval_info(drug_name)
+        # Step 3: Approval info (first_approval_date)
         if approval_info:
             result.first_approval_date = approval_info.get("first_approval_date")
             if not result.manufacturer and approval_info.get("sponsor_name"):
                 result.manufacturer = approval_info["sponsor_name"]
 
-        # Step 4: Infer drug type using DrugTypeClassifier (with Claude fallback)
-        # Get the generic name for classification (more reliable than brand name)
+        # Generic name for classification (more reliable than brand name)
         classify_name = result.generic_name or drug_name
-        result.drug_type = self.drug_type_classifier.classify(
-            classify_name,
-            mechanism_of_action=result.mechanism_of_action
-        )
 
         # Step 5: Normalize with RxNorm
-        rxnorm_data = self.rxnorm.normalize_drug_name(drug_name)
         if rxnorm_data:
             if not result.rxcui:
                 result.rxcui = rxnorm_data["rxcui"]
@@ -167,27 +242,7 @@ class ApprovedDrugExtractor:
             result.generic_name = drug_name
             result.drug_key = DrugKeyGenerator.generate(drug_name)
 
-        # Step 7: Fetch ALL industry-sponsored clinical trials
-        clinical_trials = self._fetch_clinical_trials(
-            drug_name=result.generic_name or drug_name,
-            rxcui=result.rxcui,
-            development_code=development_code,
-            brand_name=result.brand_name
-        )
-        if clinical_trials:
-            result.clinical_trials = clinical_trials
-            result.data_sources.append("ClinicalTrials.gov")
-            logger.info(f"Found {len(clinical_trials)} industry-sponsored clinical trials")
-
-        # Step 8: Standardize indications with MeSH
-        if result.indications:
-            result.indications = self._standardize_indications(result.indications)
-
-        # Step 9: Calculate completeness
-        result.completeness_score = self._calculate_completeness(result)
-
-        logger.info(f"Extracted '{result.drug_key}' with completeness {result.completeness_score:.2%}")
-        return result
+        return classify_name
 
     def _extract_from_dailymed(self, drug_name: str) -> Optional[Dict]:
         """
@@ -15,6 +15,7 @@ from src.drug_extraction_system.api_clients.clinicaltrials_client import Clinica
 from src.drug_extraction_system.api_clients.rxnorm_client import RxNormClient
 from src.drug_extraction_system.api_clients.mesh_client import MeSHClient
 from src.drug_extraction_system.utils.drug_key_generator import DrugKeyGenerator
+from src.drug_extraction_system.utils.stage_graph import StageGraph
 from src.drug_extraction_system.extractors.approved_drug_extractor import ExtractedDrugData
 from src.drug_extraction_system.services.drug_type_classifier import DrugTypeClassifier
 
@@ -44,13 +45,21 @@ class PipelineDrugExtractor:
         self.mesh = mesh_client or MeSHClient()
         self.drug_type_classifier = drug_type_classifier or DrugTypeClassifier()
 
-    def extract(self, drug_name: str, development_code: Optional[str] = None) -> ExtractedDrugData:
+    def extract(
+        self,
+        drug_name: str,
+        development_code: Optional[str] = None,
+        stage_timings: Optional[Dict[str, float]] = None
+    ) -> ExtractedDrugData:
         """
         Extract data for a pipeline drug.
 
+        The trial search and RxNorm normalization run concurrently.
+
         Args:
             drug_name: Drug name (generic or research code)
             development_code: Optional alternate development code to search
+            stage_timings: Optional dict that receives per-stage wall times (seconds)
 
         Returns:
             ExtractedDrugData with all available information
@@ -75,17 +84,26 @@ class PipelineDrugExtractor:
                 if match:
                     search_terms.append(f"{match.group(1)}-{match.group(2)}")
 
-        trials = self.clinicaltrials.search_trials_all(
+        graph = StageGraph()
+        graph.add("clinical_trials", lambda r: self.clinicaltrials.search_trials_all(
             search_terms=search_terms,
             sponsor_class="INDUSTRY",  # Only industry-sponsored
             max_results=1000
-        )
+        ))
+        # Step 2: Try RxNorm normalization
+        graph.add("rxnorm", lambda r: self.rxnorm.normalize_drug_name(drug_name))
+        try:
+            stages = graph.run()
+        finally:
+            if stage_timings is not None:
+                stage_timings.update(graph.timings)
+
+        trials = stages["clinical_trials"]
         if trials:
             self._populate_from_trials(result, trials, drug_name)
             result.data_sources.append("ClinicalTrials.gov")
 
-        # Step 2: Try RxNorm normalization
-        rxnorm_data = self.rxnorm.normalize_drug_name(drug_name)
+        rxnorm_data = stages["rxnorm"]
         if rxnorm_data:
             result.rxcui = rxnorm_data["rxcui"]
             if not result.generic_name:
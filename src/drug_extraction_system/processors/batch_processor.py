@@ -6,8 +6,9 @@ Processes multiple drugs from CSV input with parallel execution.
 
 import csv
 import logging
+import threading
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional, Set, Tuple
 from uuid import uuid4
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass, field
@@ -43,7 +44,9 @@ class BatchProcessor:
     Processes batches of drugs from CSV files.
     
     Features:
-    - Parallel processing with ThreadPoolExecutor
+    - Parallel processing with ThreadPoolExecutor (one DrugProcessor and
+      database connection per worker, shared API rate limiters)
+    - Resumable checkpoints of completed row indices
     - Progress tracking and logging
     - Error aggregation
     - Database batch logging
@@ -74,21 +77,35 @@ class BatchProcessor:
         self.db = db
         self.db_ops = DrugDatabaseOperations(db) if db else None
 
+        # Per-worker-thread DrugProcessor/connection state for parallel runs
+        self._worker_state = threading.local()
+        self._worker_lock = threading.Lock()
+        self._worker_connections: List[DatabaseConnection] = []
+
     def process_csv(
         self,
         csv_path: str,
         drug_name_column: str = "drug_name",
         force_refresh: bool = False,
-        resume: bool = True
+        resume: bool = True,
+        checkpoint_every: Optional[int] = None
     ) -> BatchResult:
         """
         Process drugs from a CSV file with checkpointing support.
 
+        With max_workers > 1 the CSV is sharded across a worker pool: each
+        worker thread owns its own DrugProcessor and database connection, and
+        all workers share the process-wide API rate limiters. Completed row
+        indices are checkpointed as a compact set, so drugs that finish out of
+        order resume correctly.
+
         Args:
             csv_path: Path to CSV file
             drug_name_column: Column name containing drug names
             force_refresh: If True, refresh existing drugs
             resume: If True, resume from last checkpoint if available
+            checkpoint_every: Flush the checkpoint after this many completions
+                (defaults to batch_size)
 
         Returns:
             BatchResult with processing summary
@@ -105,12 +122,14 @@ class BatchProcessor:
 
         # Check for existing checkpoint
         checkpoint = None
-        start_index = 0
+        completed: Set[int] = set()
         if resume and self.db:
             checkpoint = self._load_checkpoint(batch_id)
-            if checkpoint and checkpoint['status'] == 'in_progress':
-                start_index = checkpoint['last_processed_index'] + 1
-                logger.info(f"Resuming batch {batch_id} from index {start_index}/{len(drug_names)}")
+            if checkpoint and checkpoint['status'] in ('in_progress', 'interrupted', 'failed'):
+                completed = self._checkpoint_completed_indices(checkpoint)
+                logger.info(f"Resuming batch {batch_id}: {len(completed)}/{len(drug_names)} drugs already done")
+
+        pending = [i for i in range(len(drug_names)) if i not in completed]
 
         # Create result object
         result = BatchResult(batch_id=batch_id, csv_file=csv_path, total=len(drug_names))
@@ -133,54 +152,28 @@ class BatchProcessor:
             except Exception as e:
                 logger.warning(f"Failed to log batch start: {e}")
 
-        # Process drugs starting from checkpoint
-        try:
-            for i in range(start_index, len(drug_names)):
-                drug_name = drug_names[i]
-
-                try:
-                    # Create processor for each drug
-                    processor = DrugProcessor(db=self.db)
-                    drug_result = processor.process(drug_name, force_refresh, batch_id)
-                    result.results.append(drug_result)
-
-                    # Update counts
-                    if drug_result.status == ProcessingStatus.SUCCESS:
-                        result.successful += 1
-                    elif drug_result.status == ProcessingStatus.PARTIAL:
-                        result.partial += 1
-                    elif drug_result.status == ProcessingStatus.SKIPPED:
-                        result.skipped += 1
-                    else:
-                        result.failed += 1
-                        if drug_result.error:
-                            result.errors.append({"drug": drug_name, "error": drug_result.error})
-
-                    # Update checkpoint after each drug
-                    if self.db:
-                        self._update_checkpoint(batch_id, i, result.successful + result.partial + result.failed + result.skipped)
-
-                    # Log progress every 10 drugs
-                    if (i + 1) % 10 == 0 or (i + 1) == len(drug_names):
-                        logger.info(f"Progress: {i + 1}/{len(drug_names)} drugs processed")
-
-                except Exception as e:
-                    logger.error(f"Failed to process '{drug_name}': {e}")
-                    result.failed += 1
-                    result.errors.append({"drug": drug_name, "error": str(e)})
-
-                    # Update checkpoint with error
-                    if self.db:
-                        self._update_checkpoint(batch_id, i, result.successful + result.partial + result.failed + result.skipped, error=str(e))
+        tracker = _CheckpointTracker(
+            completed=completed,
+            flush_every=checkpoint_every or self.batch_size,
+        )
 
-                    if not self.continue_on_error:
-                        raise
+        try:
+            if self.max_workers > 1 and len(pending) > 1:
+                self._process_parallel(drug_names, pending, batch_id, force_refresh, result, tracker)
+            else:
+                self._process_sequential(drug_names, pending, batch_id, force_refresh, result, tracker)
 
         except KeyboardInterrupt:
             logger.warning("Batch processing interrupted by user")
             if self.db:
                 self._update_checkpoint_status(batch_id, 'interrupted')
             raise
+        finally:
+            # Flush completed indices on every exit path (including a
+            # continue_on_error=False failure) so a resume skips them
+            if self.db:
+                self._update_checkpoint(batch_id, tracker)
+            self._close_worker_connections()
 
         result.completed_at = datetime.now()
 
@@ -213,6 +206,151 @@ class BatchProcessor:
 
         return result
 
+    def _process_sequential(
+        self,
+        drug_names: List[str],
+        pending: List[int],
+        batch_id: str,
+        force_refresh: bool,
+        result: BatchResult,
+        tracker: "_CheckpointTracker"
+    ):
+        """Process pending drugs one at a time with a single DrugProcessor."""
+        processor = DrugProcessor(db=self.db)
+
+        for i in pending:
+            drug_name = drug_names[i]
+            try:
+                drug_result = processor.process(drug_name, force_refresh, batch_id)
+            except Exception as e:
+                logger.error(f"Failed to process '{drug_name}': {e}")
+                drug_result = ProcessingResult(
+                    drug_name=drug_name,
+                    status=ProcessingStatus.FAILED,
+                    error=str(e)
+                )
+                self._record_result(i, drug_result, batch_id, result, tracker)
+                if not self.continue_on_error:
+                    raise
+                continue
+
+            self._record_result(i, drug_result, batch_id, result, tracker)
+
+    def _process_parallel(
+        self,
+        drug_names: List[str],
+        pending: List[int],
+        batch_id: str,
+        force_refresh: bool,
+        result: BatchResult,
+        tracker: "_CheckpointTracker"
+    ):
+        """Shard pending drugs across the worker pool."""
+        logger.info(f"Processing {len(pending)} drugs with {self.max_workers} workers")
+
+        executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="drug-worker")
+        try:
+            futures = {
+                executor.submit(self._process_in_worker, drug_names[i], force_refresh, batch_id): i
+                for i in pending
+            }
+
+            for future in as_completed(futures):
+                i = futures[future]
+                drug_name = drug_names[i]
+                try:
+                    drug_result = future.result()
+                except Exception as e:
+                    logger.error(f"Failed to process '{drug_name}': {e}")
+                    drug_result = ProcessingResult(
+                        drug_name=drug_name,
+                        status=ProcessingStatus.FAILED,
+                        error=str(e)
+                    )
+                    self._record_result(i, drug_result, batch_id, result, tracker)
+                    if not self.continue_on_error:
+                        raise
+                    continue
+
+                self._record_result(i, drug_result, batch_id, result, tracker)
+        except BaseException:
+            # Don't start queued drugs once we're bailing out
+            executor.shutdown(wait=True, cancel_futures=True)
+            raise
+        else:
+            executor.shutdown(wait=True)
+
+    def _process_in_worker(self, drug_name: str, force_refresh: bool, batch_id: str) -> ProcessingResult:
+        """Process one drug on a pool thread using that thread's processor."""
+        return self._get_worker_processor().process(drug_name, force_refresh, batch_id)
+
+    def _get_worker_processor(self) -> DrugProcessor:
+        """
+        Get the DrugProcessor owned by the current worker thread.
+
+        Each worker gets its own database connection (psycopg2 connections
+        can't interleave transactions across threads) and its own API client
+        objects; the clients' rate limiters are shared process-wide.
+        """
+        processor = getattr(self._worker_state, "processor", None)
+        if processor is None:
+            worker_db = None
+            if self.db:
+                worker_db = DatabaseConnection(self.db.database_url)
+                with self._worker_lock:
+                    self._worker_connections.append(worker_db)
+            processor = DrugProcessor(db=worker_db)
+            self._worker_state.processor = processor
+        return processor
+
+    def _close_worker_connections(self):
+        """Close database connections opened by worker threads."""
+        with self._worker_lock:
+            connections, self._worker_connections = self._worker_connections, []
+        for conn in connections:
+            try:
+                conn.close()
+            except Exception as e:
+                logger.debug(f"Failed to close worker connection: {e}")
+        self._worker_state = threading.local()
+
+    def _record_result(
+        self,
+        index: int,
+        drug_result: ProcessingResult,
+        batch_id: str,
+        result: BatchResult,
+        tracker: "_CheckpointTracker"
+    ):
+        """Update counts for a finished drug and flush the checkpoint when due."""
+        result.results.append(drug_result)
+
+        if drug_result.status == ProcessingStatus.SUCCESS:
+            result.successful += 1
+        elif drug_result.status == ProcessingStatus.PARTIAL:
+            result.partial += 1
+        elif drug_result.status == ProcessingStatus.SKIPPED:
+            result.skipped += 1
+        else:
+            result.failed += 1
+            if drug_result.error:
+                result.errors.append({"drug": drug_result.drug_name, "error": drug_result.error})
+
+        log_drug_processing(
+            drug_result.drug_name,
+            drug_result.status.value,
+            drug_result.completeness_score,
+            drug_result.error
+        )
+
+        if tracker.mark_done(index, error=drug_result.error if drug_result.status == ProcessingStatus.FAILED else None):
+            if self.db:
+                self._update_checkpoint(batch_id, tracker)
+
+        done = len(tracker.completed)
+        if done % 10 == 0 or done == result.total:
+            logger.info(f"Progress: {done}/{result.total} drugs processed")
+
     def _read_csv(self, csv_path: str, drug_name_column: str) -> List[str]:
         """Read drug names from CSV file."""
         drug_names = []
@@ -249,12 +387,9 @@ class BatchProcessor:
         """Process a batch of drugs in parallel."""
         results = []
 
-        # Create processor for this batch
-        processor = DrugProcessor(db=self.db)
-
         with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
             futures = {
-                executor.submit(processor.process, name, force_refresh, batch_id): name
+                executor.submit(self._process_in_worker, name, force_refresh, batch_id): name
                 for name in drug_names
             }
 
@@ -291,16 +426,18 @@ class BatchProcessor:
             return
 
         try:
-            with self.db.get_cursor() as cur:
+            with self.db.cursor() as cur:
                 cur.execute("""
                     INSERT INTO batch_checkpoints
-                    (batch_id, csv_file, total_drugs, status, started_at, updated_at)
-                    VALUES (%s, %s, %s, 'in_progress', NOW(), NOW())
+                    (batch_id, csv_file, total_drugs, status, completed_indices, started_at, updated_at)
+                    VALUES (%s, %s, %s, 'in_progress', '', NOW(), NOW())
                     ON CONFLICT (batch_id) DO UPDATE
                     SET status = 'in_progress', updated_at = NOW()
                 """, (batch_id, csv_file, total_drugs))
+            self.db.commit()
             logger.info(f"Created checkpoint for batch {batch_id}")
         except Exception as e:
+            self.db.rollback()
             logger.warning(f"Failed to create checkpoint: {e}")
 
     def _load_checkpoint(self, batch_id: str) -> Optional[Dict]:
@@ -309,44 +446,52 @@ class BatchProcessor:
             return None
 
         try:
-            with self.db.get_cursor() as cur:
+            with self.db.cursor() as cur:
                 cur.execute("""
                     SELECT batch_id, csv_file, total_drugs, processed_drugs,
-                           last_processed_index, status, started_at, error_message
+                           last_processed_index, completed_indices, status,
+                           started_at, error_message
                     FROM batch_checkpoints
                     WHERE batch_id = %s
                 """, (batch_id,))
                 row = cur.fetchone()
-                return dict(row) if row else None
+            self.db.commit()
+            return dict(row) if row else None
         except Exception as e:
+            self.db.rollback()
             logger.warning(f"Failed to load checkpoint: {e}")
             return None
 
-    def _update_checkpoint(self, batch_id: str, last_index: int, processed_count: int, error: Optional[str] = None):
-        """Update checkpoint progress."""
+    @staticmethod
+    def _checkpoint_completed_indices(checkpoint: Dict) -> Set[int]:
+        """Completed indices from a checkpoint (falls back to the legacy watermark)."""
+        if checkpoint.get('completed_indices'):
+            return decode_index_set(checkpoint['completed_indices'])
+        last_index = checkpoint.get('last_processed_index')
+        if last_index is not None and last_index >= 0:
+            return set(range(last_index + 1))
+        return set()
+
+    def _update_checkpoint(self, batch_id: str, tracker: "_CheckpointTracker"):
+        """Persist the completed index set."""
         if not self.db:
             return
 
+        encoded, processed_count, last_index, error = tracker.snapshot()
         try:
-            with self.db.get_cursor() as cur:
-                if error:
-                    cur.execute("""
-                        UPDATE batch_checkpoints
-                        SET last_processed_index = %s,
-                            processed_drugs = %s,
-                            error_message = %s,
-                            updated_at = NOW()
-                        WHERE batch_id = %s
-                    """, (last_index, processed_count, error, batch_id))
-                else:
-                    cur.execute("""
-                        UPDATE batch_checkpoints
-                        SET last_processed_index = %s,
-                            processed_drugs = %s,
-                            updated_at = NOW()
-                        WHERE batch_id = %s
-                    """, (last_index, processed_count, batch_id))
+            with self.db.cursor() as cur:
+                cur.execute("""
+                    UPDATE batch_checkpoints
+                    SET completed_indices = %s,
+                        processed_drugs = %s,
+                        last_processed_index = %s,
+                        error_message = COALESCE(%s, error_message),
+                        updated_at = NOW()
+                    WHERE batch_id = %s
+                """, (encoded, processed_count, last_index, error, batch_id))
+            self.db.commit()
         except Exception as e:
+            self.db.rollback()
             logger.warning(f"Failed to update checkpoint: {e}")
 
     def _update_checkpoint_status(self, batch_id: str, status: str):
@@ -355,13 +500,15 @@ class BatchProcessor:
             return
 
         try:
-            with self.db.get_cursor() as cur:
+            with self.db.cursor() as cur:
                 cur.execute("""
                     UPDATE batch_checkpoints
                     SET status = %s, updated_at = NOW()
                     WHERE batch_id = %s
                 """, (status, batch_id))
+            self.db.commit()
         except Exception as e:
+            self.db.rollback()
             logger.warning(f"Failed to update checkpoint status: {e}")
 
     def _complete_checkpoint(self, batch_id: str):
@@ -370,7 +517,7 @@ class BatchProcessor:
             return
 
         try:
-            with self.db.get_cursor() as cur:
+            with self.db.cursor() as cur:
                 cur.execute("""
                     UPDATE batch_checkpoints
                     SET status = 'completed',
@@ -378,7 +525,81 @@ class BatchProcessor:
                         updated_at = NOW()
                     WHERE batch_id = %s
                 """, (batch_id,))
+            self.db.commit()
             logger.info(f"Completed checkpoint for batch {batch_id}")
         except Exception as e:
+            self.db.rollback()
             logger.warning(f"Failed to complete checkpoint: {e}")
 
+
+class _CheckpointTracker:
+    """
+    Thread-safe set of completed CSV row indices.
+
+    Decides when the checkpoint is due for a flush (every ``flush_every``
+    completions) so the database isn't written after every drug.
+    """
+
+    def __init__(self, completed: Optional[Set[int]] = None, flush_every: int = 10):
+        self.completed: Set[int] = set(completed or ())
+        self.flush_every = max(1, flush_every)
+        self._since_flush = 0
+        self._last_error: Optional[str] = None
+        self._lock = threading.Lock()
+
+    def mark_done(self, index: int, error: Optional[str] = None) -> bool:
+        """Record a finished index. Returns True when a flush is due."""
+        with self._lock:
+            self.completed.add(index)
+            if error:
+                self._last_error = error
+            self._since_flush += 1
+            if self._since_flush >= self.flush_every:
+                self._since_flush = 0
+                return True
+            return False
+
+    def snapshot(self) -> Tuple[str, int, int, Optional[str]]:
+        """(encoded set, count, contiguous watermark, last error) for persisting."""
+        with self._lock:
+            completed = set(self.completed)
+            error, self._last_error = self._last_error, None
+        # Highest index such that every index up to it is done (legacy column)
+        watermark = -1
+        while watermark + 1 in completed:
+            watermark += 1
+        return encode_index_set(completed), len(completed), watermark, error
+
+
+def encode_index_set(indices: Iterable[int]) -> str:
+    """
+    Encode a set of indices as compact ranges, e.g. {0,1,2,5,7,8} -> "0-2,5,7-8".
+    """
+    parts = []
+    run_start = prev = None
+    for i in sorted(set(indices)):
+        if run_start is None:
+            run_start = prev = i
+        elif i == prev + 1:
+            prev = i
+        else:
+            parts.append(f"{run_start}-{prev}" if prev != run_start else str(run_start))
+            run_start = prev = i
+    if run_start is not None:
+        parts.append(f"{run_start}-{prev}" if prev != run_start else str(run_start))
+    return ",".join(parts)
+
+
+def decode_index_set(encoded: str) -> Set[int]:
+    """Decode a range string produced by encode_index_set."""
+    indices: Set[int] = set()
+    for part in (encoded or "").split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if "-" in part:
+            start, end = part.split("-", 1)
+            indices.update(range(int(start), int(end) + 1))
+        else:
+            indices.add(int(part))
+    return indices
@@ -22,6 +22,7 @@ from src.drug_extraction_system.services.pipeline_dosing_extractor import Pipeli
 from src.drug_extraction_system.database.connection import DatabaseConnection
 from src.drug_extraction_system.database.operations import DrugDatabaseOperations
 from src.drug_extraction_system.config import get_config
+from src.drug_extraction_system.utils.stage_graph import StageGraph
 from src.tools.approval_date_extractor import ApprovalDateExtractor
 
 logger = logging.getLogger(__name__)
@@ -47,10 +48,13 @@ class ProcessingResult:
     completeness_score: float = 0.0
     error: Optional[str] = None
     data_sources: list = None
+    stage_timings: Dict[str, float] = None  # stage name -> wall seconds ("total" for the drug)
 
     def __post_init__(self):
         if self.data_sources is None:
             self.data_sources = []
+        if self.stage_timings is None:
+            self.stage_timings = {}
 
 
 class DrugProcessor:
@@ -63,6 +67,9 @@ class DrugProcessor:
     3. Extract data from appropriate sources
     4. Enrich data with AI/search
     5. Store in database
+
+    Steps 1-4 and the Claude parsing run as a StageGraph: each step starts
+    as soon as its inputs are available, so independent lookups overlap.
     """
 
     def __init__(
@@ -126,60 +133,30 @@ class DrugProcessor:
             ProcessingResult with status and details
         """
         result = ProcessingResult(drug_name=drug_name, status=ProcessingStatus.FAILED)
+        extract_timings: Dict[str, float] = {}
+        graph = StageGraph()
 
         try:
             logger.info(f"Processing drug: '{drug_name}'")
 
-            # Step 0: Resolve drug name via PubChem (maps research codes to generic names)
-            resolved = self.resolver.resolve(drug_name)
-            canonical_name = resolved.generic_name or drug_name
-
-            # If this is a research code that resolved to a generic name, log it
-            if resolved.name_type == "research_code" and resolved.generic_name != drug_name:
-                logger.info(f"Resolved research code '{drug_name}' -> generic name '{resolved.generic_name}'")
-
-            # Step 1: Check if drug already exists (unless force refresh)
-            # Now checks by: original name, resolved generic name, development code, and PubChem CID
-            if self.db_ops and not force_refresh:
-                existing = self._find_existing_drug(drug_name, resolved)
-                if existing:
-                    logger.info(f"Drug '{drug_name}' already exists as '{existing.get('generic_name')}' (ID: {existing['drug_id']})")
-                    result.status = ProcessingStatus.SKIPPED
-                    result.drug_id = existing["drug_id"]
-                    result.drug_key = existing.get("drug_key")
-                    result.completeness_score = existing.get("completeness_score", 0)
-
-                    # Update the existing drug with any new info from resolution
-                    self._update_existing_drug_with_resolved_info(existing['drug_id'], resolved)
+            final_stage = self._add_pipeline_stages(graph, drug_name, force_refresh, extract_timings)
+            stages = graph.run()
 
-                    return result
-
-            # Step 2: Detect drug status
-            status_result = self.status_detector.detect(drug_name)
-
-            # Step 3: Extract data based on status
-            if status_result.status == DrugStatus.APPROVED:
-                extracted = self.approved_extractor.extract(drug_name)
-            elif status_result.status == DrugStatus.PIPELINE:
-                extracted = self.pipeline_extractor.extract(drug_name)
-            else:
-                # Unknown - try both
-                extracted = self.approved_extractor.extract(drug_name)
-                if extracted.completeness_score < 0.3:
-                    extracted = self.pipeline_extractor.extract(drug_name)
+            # Step 1: Drug already exists (unless force refresh)
+            existing = stages.get("existing")
+            if existing:
+                logger.info(f"Drug '{drug_name}' already exists as '{existing.get('generic_name')}' (ID: {existing['drug_id']})")
+                result.status = ProcessingStatus.SKIPPED
+                result.drug_id = existing["drug_id"]
+                result.drug_key = existing.get("drug_key")
+                result.completeness_score = existing.get("completeness_score", 0)
 
-            # Step 4: Enrich data
-            extracted = self.enricher.enrich(extracted)
+                # Update the existing drug with any new info from resolution
+                self._update_existing_drug_with_resolved_info(existing['drug_id'], stages["resolve"])
 
-            # Step 5: Parse raw text into structured data (Phase 2 - Claude-based)
-            if not self.skip_parsing:
-                extracted = self._parse_structured_data(extracted)
-            else:
-                logger.info(f"Skipping Phase 2 parsing for '{drug_name}' (skip_parsing=True)")
+                return result
 
-            # Step 5b: Extract dosing for investigational drugs (no FDA labels)
-            if not self.skip_parsing and self.pipeline_dosing_extractor:
-                extracted = self._extract_pipeline_dosing(extracted)
+            extracted = stages[final_stage]
 
             # Step 6: Determine processing status
             result.completeness_score = extracted.completeness_score
@@ -196,7 +173,7 @@ class DrugProcessor:
 
             # Step 7: Store in database (if partial or better)
             if self.db_ops and result.status in [ProcessingStatus.SUCCESS, ProcessingStatus.PARTIAL]:
-                drug_id, drug_key = self._store_drug(extracted, batch_id)
+                drug_id, drug_key = self._store_drug(extracted, batch_id, stages.get("target_moa"))
                 result.drug_id = drug_id
                 result.drug_key = drug_key
 
@@ -209,6 +186,137 @@ class DrugProcessor:
             result.error = str(e)
             return result
 
+        finally:
+            result.stage_timings = {
+                **graph.timings,
+                **{f"extract.{name}": t for name, t in extract_timings.items() if name != "total"},
+            }
+            logger.debug(f"Stage timings for '{drug_name}': {result.stage_timings}")
+
+    def _add_pipeline_stages(
+        self,
+        graph: StageGraph,
+        drug_name: str,
+        force_refresh: bool,
+        extract_timings: Dict[str, float]
+    ) -> str:
+        """
+        Add the per-drug pipeline to ``graph``.
+
+        Dependencies:
+            resolve -> existing (only with a database and no force refresh)
+            existing -> status -> extract -> enrich -> target_moa
+            extract -> parse_indications, parse_dosing (alongside enrich)
+            enrich, parse_* -> structure -> pipeline_dosing
+
+        Without the existing-drug check, status detection runs alongside
+        name resolution. target_moa is only added when its result can be
+        stored.
+
+        Returns:
+            Name of the stage whose result is the final ExtractedDrugData
+        """
+        parsing = not self.skip_parsing
+
+        # Step 0: Resolve drug name via PubChem (maps research codes to generic names)
+        def resolve(stages):
+            resolved = self.resolver.resolve(drug_name)
+            # If this is a research code that resolved to a generic name, log it
+            if resolved.name_type == "research_code" and resolved.generic_name != drug_name:
+                logger.info(f"Resolved research code '{drug_name}' -> generic name '{resolved.generic_name}'")
+            return resolved
+
+        graph.add("resolve", resolve)
+
+        # Step 1: Check if drug already exists (unless force refresh)
+        # Now checks by: original name, resolved generic name, development code, and PubChem CID
+        status_deps: Tuple[str, ...] = ()
+        if self.db_ops and not force_refresh:
+            def find_existing(stages):
+                existing = self._find_existing_drug(drug_name, stages["resolve"])
+                if existing:
+                    graph.stop()
+                return existing
+
+            graph.add("existing", find_existing, deps=("resolve",))
+            status_deps = ("existing",)
+
+        # Step 2: Detect drug status
+        graph.add("status", lambda stages: self.status_detector.detect(drug_name), deps=status_deps)
+
+        # Step 3: Extract data based on status
+        graph.add(
+            "extract",
+            lambda stages: self._extract_by_status(drug_name, stages["status"], extract_timings),
+            deps=("status",)
+        )
+
+        # Step 4: Enrich data
+        graph.add("enrich", lambda stages: self.enricher.enrich(stages["extract"]), deps=("extract",))
+
+        # Step 5: Parse raw text into structured data (Phase 2 - Claude-based).
+        # The parsers only need the raw label text, so they run alongside enrichment.
+        structure_deps = ["enrich"]
+        if parsing:
+            graph.add(
+                "parse_indications",
+                lambda stages: self._parse_indications(stages["extract"]),
+                deps=("extract",)
+            )
+            graph.add(
+                "parse_dosing",
+                lambda stages: self._parse_dosing(stages["extract"]),
+                deps=("extract",)
+            )
+            structure_deps += ["parse_indications", "parse_dosing"]
+
+        def structure(stages):
+            data = stages["enrich"]
+            if parsing:
+                return self._apply_parsed_data(data, stages["parse_indications"], stages["parse_dosing"])
+            logger.info(f"Skipping Phase 2 parsing for '{drug_name}' (skip_parsing=True)")
+            return data
+
+        graph.add("structure", structure, deps=structure_deps)
+
+        # Target/MoA is only stored with the drug, so only parse it when storing is possible
+        if self.db_ops and self.target_moa_parser:
+            def target_moa(stages):
+                data = stages["enrich"]
+                if data.completeness_score < self.partial_threshold:
+                    return None
+                return self._parse_target_and_moa(data)
+
+            graph.add("target_moa", target_moa, deps=("enrich",))
+
+        # Step 5b: Extract dosing for investigational drugs (no FDA labels)
+        if parsing and self.pipeline_dosing_extractor:
+            graph.add(
+                "pipeline_dosing",
+                lambda stages: self._extract_pipeline_dosing(stages["structure"]),
+                deps=("structure",)
+            )
+            return "pipeline_dosing"
+        return "structure"
+
+    def _extract_by_status(
+        self,
+        drug_name: str,
+        status_result,
+        stage_timings: Dict[str, float]
+    ) -> ExtractedDrugData:
+        """Run the approved or pipeline extractor for the detected status."""
+        if status_result.status == DrugStatus.APPROVED:
+            return self.approved_extractor.extract(drug_name, stage_timings=stage_timings)
+        if status_result.status == DrugStatus.PIPELINE:
+            return self.pipeline_extractor.extract(drug_name, stage_timings=stage_timings)
+
+        # Unknown - try both
+        extracted = self.approved_extractor.extract(drug_name, stage_timings=stage_timings)
+        if extracted.completeness_score < 0.3:
+            extracted = self.pipeline_extractor.extract(drug_name, stage_timings=stage_timings)
+        return extracted
+
     def _find_existing_drug(self, original_name: str, resolved) -> Optional[Dict]:
         """
         Find an existing drug in the database using multiple identifiers.
@@ -320,12 +428,24 @@ class DrugProcessor:
             logger.warning(f"Failed to update drug with resolved info: {e}")
             self.db.rollback()
 
-    def _store_drug(self, data: ExtractedDrugData, batch_id: Optional[str]) -> Tuple[int, str]:
-        """Store extracted drug data in database."""
+    def _store_drug(
+        self,
+        data: ExtractedDrugData,
+        batch_id: Optional[str],
+        target_moa: Optional[Tuple[Optional[str], Optional[str]]] = None
+    ) -> Tuple[int, str]:
+        """
+        Store extracted drug data in database.
+
+        Args:
+            data: Extracted drug data
+            batch_id: Optional batch ID for tracking
+            target_moa: (target, moa_category) if already parsed
+        """
         from uuid import UUID
 
         # Parse target and MoA category from mechanism text
-        target, moa_category = self._parse_target_and_moa(data)
+        target, moa_category = target_moa if target_moa is not None else self._parse_target_and_moa(data)
 
         # Convert ExtractedDrugData to dict for database
         drug_data = {
@@ -394,83 +514,124 @@ class DrugProcessor:
         This parses:
         - Raw indication text -> structured ParsedIndication records
         - Raw dosing text -> structured ParsedDosingRegimen records
+
+        process() runs the two parsers concurrently; this is the sequential form.
+        """
+        return self._apply_parsed_data(data, self._parse_indications(data), self._parse_dosing(data))
+
+    def _parse_indications(self, data: ExtractedDrugData) -> Optional[List[Dict]]:
+        """
+        Parse the first raw indication text into indication dicts.
+
+        Returns:
+            Parsed indications, or None if there was nothing to parse or parsing failed
         """
         drug_name = data.generic_name or data.brand_name or "unknown"
+        raw_indication_text = None
+        for ind in data.indications:
+            if isinstance(ind, dict) and ind.get("raw_text"):
+                raw_indication_text = ind["raw_text"]
+                break
 
-        # Parse indications
-        if data.indications:
-            raw_indication_text = None
-            for ind in data.indications:
-                if isinstance(ind, dict) and ind.get("raw_text"):
-                    raw_indication_text = ind["raw_text"]
-                    break
+        if not raw_indication_text:
+            return None
 
-            if raw_indication_text:
-                try:
-                    parsed_indications = self.indication_parser.parse(raw_indication_text, drug_name)
-                    if parsed_indications:
-                        # Convert ParsedIndication objects to dicts
-                        data.indications = [
-                            {
-                                "disease_name": pi.disease_name,
-                                "population": pi.population,
-                                "severity": pi.severity,
-                                "line_of_therapy": pi.line_of_therapy,
-                                "combination_therapy": pi.combination_therapy,
-                                "special_conditions": pi.special_conditions,
-                                "mesh_id": pi.mesh_id,
-                                "confidence_score": pi.confidence_score,
-                            }
-                            for pi in parsed_indications
-                        ]
-                        logger.info(f"Parsed {len(parsed_indications)} indications for {drug_name}")
-                except Exception as e:
-                    logger.warning(f"Failed to parse indications for {drug_name}: {e}")
+        try:
+            parsed_indications = self.indication_parser.parse(raw_indication_text, drug_name)
+        except Exception as e:
+            logger.warning(f"Failed to parse indications for {drug_name}: {e}")
+            return None
+        if not parsed_indications:
+            return None
 
-        # Parse dosing regimens
-        if data.dosing_regimens:
-            raw_dosing_text = None
-            for dr in data.dosing_regimens:
-                if isinstance(dr, dict) and dr.get("raw_text"):
-                    raw_dosing_text = dr["raw_text"]
-                    break
+        # Convert ParsedIndication objects to dicts
+        logger.info(f"Parsed {len(parsed_indications)} indications for {drug_name}")
+        return [
+            {
+                "disease_name": pi.disease_name,
+                "population": pi.population,
+                "severity": pi.severity,
+                "line_of_therapy": pi.line_of_therapy,
+                "combination_therapy": pi.combination_therapy,
+                "special_conditions": pi.special_conditions,
+                "mesh_id": pi.mesh_id,
+                "confidence_score": pi.confidence_score,
+            }
+            for pi in parsed_indications
+        ]
 
-            if raw_dosing_text:
+    def _parse_dosing(self, data: ExtractedDrugData) -> Optional[List[Dict]]:
+        """
+        Parse the first raw dosing text into dosing regimen dicts.
+
+        Returns:
+            Parsed regimens, or None if there was nothing to parse or parsing failed
+        """
+        drug_name = data.generic_name or data.brand_name or "unknown"
+        raw_dosing_text = None
+        for dr in data.dosing_regimens:
+            if isinstance(dr, dict) and dr.get("raw_text"):
+                raw_dosing_text = dr["raw_text"]
+                break
+
+        if not raw_dosing_text:
+            return None
+
+        try:
+            parsed_dosing = self.dosing_parser.parse(raw_dosing_text, drug_name)
+        except Exception as e:
+            logger.warning(f"Failed to parse dosing for {drug_name}: {e}")
+            return None
+        if not parsed_dosing:
+            return None
+
+        # Convert ParsedDosingRegimen objects to dicts
+        return [
+            {
+                "indication_name": pd.indication_name,
+                "dose_amount": pd.dose_amount,
+                "dose_unit": pd.dose_unit,
+                "dose_range_min": pd.dose_range_min,
+                "dose_range_max": pd.dose_range_max,
+                "frequency": pd.frequency,
+                "route": pd.route,
+                "duration": pd.duration,
+                "max_daily_dose": pd.max_daily_dose,
+                "max_daily_dose_unit": pd.max_daily_dose_unit,
+                "population": pd.population,
+                "titration_schedule": pd.titration_schedule,
+                "special_instructions": pd.special_instructions,
+                "formulation": pd.formulation,
+                "confidence_score": pd.confidence_score,
+            }
+            for pd in parsed_dosing
+        ]
+
+    def _apply_parsed_data(
+        self,
+        data: ExtractedDrugData,
+        indications: Optional[List[Dict]],
+        dosing_regimens: Optional[List[Dict]]
+    ) -> ExtractedDrugData:
+        """Replace raw indications/dosing with their parsed forms (where parsing succeeded)."""
+        if indications:
+            data.indications = indications
+
+        if dosing_regimens:
+            data.dosing_regimens = dosing_regimens
+
+            drug_name = data.generic_name or data.brand_name or "unknown"
+            # Ensure every indication has at least one dosing regimen
+            # If dosing exists but doesn't cover all indications, expand it
+            if data.indications and data.dosing_regimens:
                 try:
-                    parsed_dosing = self.dosing_parser.parse(raw_dosing_text, drug_name)
-                    if parsed_dosing:
-                        # Convert ParsedDosingRegimen objects to dicts
-                        data.dosing_regimens = [
-                            {
-                                "indication_name": pd.indication_name,
-                                "dose_amount": pd.dose_amount,
-                                "dose_unit": pd.dose_unit,
-                                "dose_range_min": pd.dose_range_min,
-                                "dose_range_max": pd.dose_range_max,
-                                "frequency": pd.frequency,
-                                "route": pd.route,
-                                "duration": pd.duration,
-                                "max_daily_dose": pd.max_daily_dose,
-                                "max_daily_dose_unit": pd.max_daily_dose_unit,
-                                "population": pd.population,
-                                "titration_schedule": pd.titration_schedule,
-                                "special_instructions": pd.special_instructions,
-                                "formulation": pd.formulation,
-                                "confidence_score": pd.confidence_score,
-                            }
-                            for pd in parsed_dosing
-                        ]
-
-                        # Ensure every indication has at least one dosing regimen
-                        # If dosing exists but doesn't cover all indications, expand it
-                        if data.indications and data.dosing_regimens:
-                            data.dosing_regimens = self._expand_dosing_to_indications(
-                                data.dosing_regimens, data.indications
-                            )
-
-                        logger.info(f"Parsed {len(data.dosing_regimens)} dosing regimens for {drug_name}")
+                    data.dosing_regimens = self._expand_dosing_to_indications(
+                        data.dosing_regimens, data.indications
+                    )
                 except Exception as e:
-                    logger.warning(f"Failed to parse dosing for {drug_name}: {e}")
+                    logger.warning(f"Failed to expand dosing for {drug_name}: {e}")
+
+            logger.info(f"Parsed {len(data.dosing_regimens)} dosing regimens for {drug_name}")
 
         return data
 
@@ -658,11 +819,10 @@ class DrugProcessor:
             from src.drug_extraction_system.services.condition_standardizer import ConditionStandardizer
             standardizer = ConditionStandardizer(self.db)
 
-            total_mapped = 0
-            for trial_id, conditions in trial_data:
-                if conditions:
-                    results = standardizer.standardize_trial_conditions(trial_id, conditions)
-                    total_mapped += len([r for r in results if r.get('confidence', 0) > 0])
+            by_trial = standardizer.standardize_trials(trial_data)
+            total_mapped = sum(
+                1 for results in by_trial.values() for r in results if r.get('confidence', 0) > 0
+            )
 
             if total_mapped > 0:
                 logger.info(f"Standardized {total_mapped} trial conditions")
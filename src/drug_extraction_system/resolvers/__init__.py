@@ -1,14 +1,22 @@
 """
 Resolvers module for drug extraction system.
 
-Provides drug name resolution and status detection.
+Provides drug name resolution, cached PubChem resolution and status detection.
 """
 
 from src.drug_extraction_system.resolvers.drug_name_resolver import DrugNameResolver
+from src.drug_extraction_system.resolvers.pubchem_resolution import (
+    PubChemNameStore,
+    PubChemResolver,
+    get_pubchem_name_store,
+)
 from src.drug_extraction_system.resolvers.status_detector import DrugStatusDetector
 
 __all__ = [
     "DrugNameResolver",
+    "PubChemNameStore",
+    "PubChemResolver",
+    "get_pubchem_name_store",
     "DrugStatusDetector",
 ]
 
@@ -17,6 +17,7 @@ logger = logging.getLogger(__name__)
 # Try to import PubChem client
 try:
     from src.drug_extraction_system.api_clients.pubchem_client import PubChemClient
+    from src.drug_extraction_system.resolvers.pubchem_resolution import PubChemResolver
     PUBCHEM_AVAILABLE = True
 except ImportError:
     PUBCHEM_AVAILABLE = False
@@ -61,7 +62,8 @@ class DrugNameResolver:
         rxnorm_client: Optional[RxNormClient] = None,
         openfda_client: Optional[OpenFDAClient] = None,
         pubchem_client: Optional['PubChemClient'] = None,
-        use_pubchem: bool = True
+        use_pubchem: bool = True,
+        pubchem_resolver: Optional['PubChemResolver'] = None
     ):
         """
         Initialize resolver with API clients.
@@ -71,14 +73,17 @@ class DrugNameResolver:
             openfda_client: OpenFDA client (created if not provided)
             pubchem_client: PubChem client (created if not provided and use_pubchem=True)
             use_pubchem: Whether to use PubChem for resolution (recommended for pipeline drugs)
+            pubchem_resolver: Cached PubChem resolver (created around pubchem_client if not provided)
         """
         self.rxnorm = rxnorm_client or RxNormClient()
         self.openfda = openfda_client or OpenFDAClient()
 
         # Initialize PubChem client for research code resolution
         self.pubchem = None
+        self.pubchem_resolver = None
         if use_pubchem and PUBCHEM_AVAILABLE:
             self.pubchem = pubchem_client or PubChemClient()
+            self.pubchem_resolver = pubchem_resolver or PubChemResolver(self.pubchem)
             logger.debug("PubChem client initialized for drug name resolution")
 
     def resolve(self, drug_name: str) -> ResolvedDrug:
@@ -167,11 +172,11 @@ class DrugNameResolver:
         Returns:
             Dict with cid, generic_name, synonyms, research_codes
         """
-        if not self.pubchem:
+        if not self.pubchem_resolver:
             return None
 
         try:
-            info = self.pubchem.get_drug_info(name)
+            info = self.pubchem_resolver.resolve(name)
             if info:
                 return {
                     'cid': info['cid'],
@@ -321,18 +326,28 @@ class DrugNameResolver:
         Returns:
             Dictionary mapping original names to ResolvedDrug objects
         """
-        results = {}
-        for name in drug_names:
+        # Each distinct name is resolved once; PubChem lookups for all of them
+        # run up front in concurrent batches and land in the shared store
+        unique = list(dict.fromkeys(name.strip() for name in drug_names))
+        if self.pubchem_resolver and unique:
             try:
-                results[name] = self.resolve(name)
+                self.pubchem_resolver.resolve_many(unique)
+            except Exception as e:
+                logger.warning(f"PubChem batch prefetch failed: {e}")
+
+        resolved: Dict[str, ResolvedDrug] = {}
+        for name in unique:
+            try:
+                resolved[name] = self.resolve(name)
             except Exception as e:
                 logger.error(f"Failed to resolve '{name}': {e}")
-                results[name] = ResolvedDrug(
+                resolved[name] = ResolvedDrug(
                     original_name=name,
                     generic_name=name,
                     confidence="low"
                 )
-        return results
+
+        return {name: resolved[name.strip()] for name in drug_names}
 
     def get_generic_name(self, drug_name: str) -> str:
         """
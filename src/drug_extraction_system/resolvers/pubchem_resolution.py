@@ -0,0 +1,244 @@
+"""
+Batched, cached PubChem name resolution.
+
+Pipeline landscapes and the drug resolver look up the same few hundred drug
+names on every refresh, one PubChem round-trip chain at a time. This module
+resolves names once and remembers the answer:
+- Names are deduplicated case-insensitively before any lookup
+- Misses are resolved concurrently in batches; every request still goes
+  through PubChemClient's shared "PubChem" token bucket (5 req/sec)
+- Results (name -> CID, canonical generic name, synonyms) are persisted in a
+  local SQLite table with a TTL; "not found" answers are cached too, with a
+  shorter TTL. Failed lookups (rate limits, 5xx, timeouts) are never cached
+- names_for_cid() answers the reverse question from the same table, so the
+  pipeline repository can match drugs stored without a CID
+
+Set PUBCHEM_CACHE_DIR to relocate the table.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = Path("data/pubchem_cache")
+
+DAY = 24 * 60 * 60
+DEFAULT_TTL_SECONDS = 30 * DAY
+# "Not found" may become found as PubChem indexes new investigational drugs
+DEFAULT_NEGATIVE_TTL_SECONDS = 1 * DAY
+
+# Names resolved per batch (results are persisted after each batch)
+DEFAULT_BATCH_SIZE = 50
+# Concurrent lookups; PubChemClient's shared token bucket caps PubChem at 5 req/sec regardless
+DEFAULT_MAX_WORKERS = 5
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pubchem_names (
+    name_key TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    cid INTEGER,
+    canonical_name TEXT,
+    info TEXT,
+    resolved_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_pubchem_names_cid ON pubchem_names(cid);
+"""
+
+
+def normalize_name(name: str) -> str:
+    """Key used for deduplication and storage."""
+    return " ".join((name or "").lower().split())
+
+
+class PubChemNameStore:
+    """
+    SQLite table of name -> PubChem drug info with TTL.
+
+    Values are PubChemClient.get_drug_info() dicts, or None for names PubChem
+    does not know.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Path = DEFAULT_CACHE_DIR,
+        ttl_seconds: int = DEFAULT_TTL_SECONDS,
+        negative_ttl_seconds: int = DEFAULT_NEGATIVE_TTL_SECONDS,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.negative_ttl_seconds = negative_ttl_seconds
+        self.db_path = Path(cache_dir) / "names.sqlite3"
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        self._conn().executescript(_SCHEMA)
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.db_path), timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get_many(self, names: Iterable[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Fresh entries for the given names, keyed by normalize_name().
+
+        Names without a fresh entry are absent; a cached "not found" maps to None.
+        """
+        keys = list({normalize_name(n) for n in names if n})
+        now = time.time()
+        found: Dict[str, Optional[Dict[str, Any]]] = {}
+        # Stay well under SQLite's bound-parameter limit
+        for i in range(0, len(keys), 500):
+            chunk = keys[i:i + 500]
+            rows = self._conn().execute(
+                f"SELECT name_key, cid, info, resolved_at FROM pubchem_names "
+                f"WHERE name_key IN ({','.join('?' * len(chunk))})",
+                chunk,
+            ).fetchall()
+            for key, cid, info, resolved_at in rows:
+                ttl = self.ttl_seconds if cid is not None else self.negative_ttl_seconds
+                if now - resolved_at <= ttl:
+                    found[key] = json.loads(info) if info else None
+        return found
+
+    def put_many(self, results: Dict[str, Optional[Dict[str, Any]]]) -> None:
+        """Store resolution results keyed by original name."""
+        now = time.time()
+        rows = [
+            (
+                normalize_name(name),
+                name,
+                info.get('cid') if info else None,
+                (info.get('generic_name') or None) if info else None,
+                json.dumps(info) if info else None,
+                now,
+            )
+            for name, info in results.items() if name
+        ]
+        if not rows:
+            return
+        self._conn().executemany(
+            """
+            INSERT INTO pubchem_names (name_key, name, cid, canonical_name, info, resolved_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT (name_key) DO UPDATE SET
+                name = excluded.name, cid = excluded.cid, canonical_name = excluded.canonical_name,
+                info = excluded.info, resolved_at = excluded.resolved_at
+            """,
+            rows,
+        )
+
+    def names_for_cid(self, cid: int) -> List[str]:
+        """All known names (lowercase) that resolved to this CID/SID."""
+        if not cid:
+            return []
+        rows = self._conn().execute(
+            "SELECT name_key, canonical_name FROM pubchem_names WHERE cid = ?", (cid,)
+        ).fetchall()
+        names = set()
+        for key, canonical in rows:
+            names.add(key)
+            if canonical:
+                names.add(canonical.lower())
+        return sorted(names)
+
+
+class PubChemResolver:
+    """
+    Resolve drug names to PubChem info with dedup, batching and a persistent store.
+
+    Args:
+        client: PubChemClient (its shared rate limiter bounds request rate)
+        store: PubChemNameStore (defaults to the shared store)
+        max_workers: Concurrent lookups per batch
+        batch_size: Names resolved (and persisted) per batch
+    """
+
+    def __init__(
+        self,
+        client=None,
+        store: Optional[PubChemNameStore] = None,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ):
+        self.client = client
+        self.store = store or get_pubchem_name_store()
+        self.max_workers = max(1, max_workers)
+        self.batch_size = max(1, batch_size)
+
+    def resolve(self, name: str) -> Optional[Dict[str, Any]]:
+        """Resolve one name (see resolve_many)."""
+        return self.resolve_many([name]).get(name)
+
+    def resolve_many(self, names: Iterable[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Resolve names, each distinct name at most once.
+
+        Returns:
+            Dict mapping every input name to its get_drug_info() dict, or None
+        """
+        names = [n for n in names if n]
+        by_key: Dict[str, str] = {}
+        for name in names:
+            by_key.setdefault(normalize_name(name), name)
+
+        results = self.store.get_many(by_key)
+        misses = [(key, name) for key, name in by_key.items() if key not in results]
+
+        if misses and self.client:
+            logger.info(
+                f"PubChem: {len(by_key)} distinct names, {len(by_key) - len(misses)} cached, "
+                f"resolving {len(misses)}"
+            )
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                for i in range(0, len(misses), self.batch_size):
+                    batch = misses[i:i + self.batch_size]
+                    infos = list(executor.map(lambda item: self._lookup(item[1]), batch))
+                    fetched = {name: info for (_, name), info in zip(batch, infos) if info is not False}
+                    self.store.put_many(fetched)
+                    for (key, _), info in zip(batch, infos):
+                        results[key] = info or None
+
+        return {name: results.get(normalize_name(name)) for name in names}
+
+    def _lookup(self, name: str):
+        """
+        get_drug_info() for one name; False if the lookup itself raised.
+
+        PubChemClient raises PubChemUnavailableError for rate limits, 5xx and
+        transport errors, so those are retried next time instead of being
+        cached as "not found".
+        """
+        try:
+            return self.client.get_drug_info(name)
+        except Exception as e:
+            logger.debug(f"PubChem lookup failed for '{name}': {e}")
+            return False
+
+    def names_for_cid(self, cid: int) -> List[str]:
+        """Names previously resolved to this CID."""
+        return self.store.names_for_cid(cid)
+
+
+_default_store: Optional[PubChemNameStore] = None
+_default_store_lock = threading.Lock()
+
+
+def get_pubchem_name_store() -> PubChemNameStore:
+    """Process-wide store shared by all resolvers and repositories."""
+    global _default_store
+    with _default_store_lock:
+        if _default_store is None:
+            cache_dir = Path(os.getenv("PUBCHEM_CACHE_DIR", str(DEFAULT_CACHE_DIR)))
+            _default_store = PubChemNameStore(cache_dir)
+        return _default_store
@@ -6,12 +6,20 @@ Normalizes disease/condition names from clinical trials using:
 2. MeSH API for standardized medical terminology
 3. Fuzzy string matching for similar names
 4. Manual mapping rules for common variations
+
+standardize_trials() is the bulk path: each distinct raw condition across
+the given trials is standardized once and conditions, mappings and trial
+links are written with set-based upserts in a single transaction.
 """
 
 import re
+import time
 import logging
-from typing import Optional, Dict, List, Tuple, Any
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from typing import Optional, Dict, Iterable, List, Tuple, Any
 from difflib import SequenceMatcher
+from psycopg2.extras import execute_values
 from ..database.connection import DatabaseConnection
 from ..api_clients.mesh_client import MeSHClient
 
@@ -242,6 +250,75 @@ THERAPEUTIC_AREAS = {
 }
 
 
+FUZZY_MATCH_THRESHOLD = 0.8
+# Rows per INSERT statement in the bulk upserts
+BULK_PAGE_SIZE = 1000
+
+
+class FuzzyConditionIndex:
+    """
+    Candidate index for fuzzy matching against the predefined conditions.
+
+    SequenceMatcher.ratio() is 2*M / (len(a) + len(b)), where the number of
+    matched characters M is at most the shorter length and at most the
+    size of the two strings' common character multiset. Names are indexed
+    by length, so only the length window that can reach the threshold is
+    scanned, and the character-count bound rejects most of that window
+    before running SequenceMatcher. Results are identical to comparing
+    against every name.
+    """
+
+    def __init__(self, names: Dict[str, str], threshold: float = FUZZY_MATCH_THRESHOLD):
+        """
+        Build the index.
+
+        Args:
+            names: Known (lowercase) name -> standard name, in priority order
+            threshold: Minimum SequenceMatcher ratio for a match
+        """
+        self.threshold = threshold
+        # (length, insertion order, name, standard name, character counts), by length
+        self._entries = sorted(
+            (len(name), order, name, std_name, Counter(name))
+            for order, (name, std_name) in enumerate(names.items())
+        )
+        self._lengths = [entry[0] for entry in self._entries]
+
+    def best_match(self, query: str) -> Optional[Tuple[str, float]]:
+        """
+        Best-scoring standard name for ``query``.
+
+        Returns:
+            (standard name, score) or None if nothing reaches the threshold.
+            Ties go to the name defined first, as in a linear scan.
+        """
+        n = len(query)
+        if not n:
+            return None
+        t = self.threshold
+        lo = bisect_left(self._lengths, n * t / (2 - t) - 1e-9)
+        hi = bisect_right(self._lengths, n * (2 - t) / t + 1e-9)
+
+        query_counts = Counter(query)
+        candidates = []
+        for length, order, name, std_name, counts in self._entries[lo:hi]:
+            common = sum((query_counts & counts).values())
+            if 2.0 * common / (n + length) >= t:
+                candidates.append((order, name, std_name))
+
+        best_match = None
+        best_score = 0.0
+        for _, name, std_name in sorted(candidates):
+            score = SequenceMatcher(None, query, name).ratio()
+            if score > best_score and score >= t:
+                best_score = score
+                best_match = std_name
+        return (best_match, best_score) if best_match else None
+
+
+_FUZZY_INDEX = FuzzyConditionIndex(CONDITION_NORMALIZATIONS)
+
+
 class ConditionStandardizer:
     """Service for standardizing condition/disease names."""
 
@@ -250,14 +327,17 @@ class ConditionStandardizer:
         self.db = db
         self.mesh = MeSHClient()
         self._cache: Dict[str, Optional[Dict]] = {}
+        # Database mappings loaded up front by the bulk path (normalized name -> result)
+        self._db_mappings: Optional[Dict[str, Dict]] = None
         logger.info("ConditionStandardizer initialized")
 
-    def standardize(self, raw_name: str) -> Optional[Dict[str, Any]]:
+    def standardize(self, raw_name: str, use_mesh: bool = True) -> Optional[Dict[str, Any]]:
         """
         Standardize a condition name.
 
         Args:
             raw_name: Raw condition name from clinical trial
+            use_mesh: Query the MeSH API for names without a local match
 
         Returns:
             Dictionary with standardized info or None if not found
@@ -290,7 +370,7 @@ class ConditionStandardizer:
             return db_result
 
         # 3. Try MeSH lookup
-        mesh_result = self._lookup_mesh(raw_name)
+        mesh_result = self._lookup_mesh(raw_name) if use_mesh else None
         if mesh_result and mesh_result.get("confidence", 0) >= 0.8:
             self._cache[normalized] = mesh_result
             return mesh_result
@@ -307,7 +387,9 @@ class ConditionStandardizer:
             match_type="unmatched",
             confidence=0.0
         )
-        self._cache[normalized] = result
+        if use_mesh:
+            # Without the MeSH step a later call may still find a match
+            self._cache[normalized] = result
         return result
 
     def _create_result(
@@ -328,6 +410,9 @@ class ConditionStandardizer:
 
     def _lookup_db_mapping(self, normalized: str) -> Optional[Dict]:
         """Look up existing mapping in database."""
+        if self._db_mappings is not None and normalized in self._db_mappings:
+            return self._db_mappings[normalized]
+
         result = self.db.execute("""
             SELECT sc.standard_name, sc.mesh_id, sc.therapeutic_area,
                    cm.match_type, cm.confidence
@@ -370,16 +455,9 @@ class ConditionStandardizer:
 
     def _fuzzy_match(self, normalized: str) -> Optional[Dict]:
         """Find fuzzy match in predefined conditions."""
-        best_match = None
-        best_score = 0.0
-
-        for known, std_name in CONDITION_NORMALIZATIONS.items():
-            score = SequenceMatcher(None, normalized, known).ratio()
-            if score > best_score and score >= 0.8:
-                best_score = score
-                best_match = std_name
-
-        if best_match:
+        match = _FUZZY_INDEX.best_match(normalized)
+        if match:
+            best_match, best_score = match
             return self._create_result(
                 normalized, best_match,
                 match_type="fuzzy",
@@ -432,6 +510,127 @@ class ConditionStandardizer:
 
         return results
 
+    def standardize_trials(
+        self,
+        trial_data: Iterable[Tuple[int, List[str]]],
+        use_mesh: bool = True
+    ) -> Dict[int, List[Dict]]:
+        """
+        Standardize the conditions of many trials at once and store mappings.
+
+        Each distinct raw condition is standardized once (existing database
+        mappings are loaded with one query), then standardized conditions,
+        raw-name mappings and trial links are written with set-based upserts
+        in a single transaction.
+
+        Args:
+            trial_data: (trial_id, raw condition names) pairs
+            use_mesh: Query the MeSH API for names without a local match
+
+        Returns:
+            Standardization results (with condition_id) per trial ID
+        """
+        start = time.perf_counter()
+        trials = [(trial_id, [c for c in (conditions or []) if c]) for trial_id, conditions in trial_data]
+        distinct = list(dict.fromkeys(raw for _, conditions in trials for raw in conditions))
+
+        self._load_db_mappings({raw.strip().lower() for raw in distinct})
+        standardized = {raw: self.standardize(raw, use_mesh=use_mesh) for raw in distinct}
+
+        # First result per standard name supplies its MeSH ID / therapeutic area
+        new_conditions: Dict[str, Dict] = {}
+        for std_result in standardized.values():
+            if std_result:
+                new_conditions.setdefault(std_result["standard_name"], std_result)
+
+        condition_ids: Dict[str, int] = {}
+        if new_conditions:
+            with self.db.transaction(), self.db.cursor() as cur:
+                execute_values(cur, """
+                    INSERT INTO standardized_conditions (standard_name, mesh_id, therapeutic_area)
+                    VALUES %s
+                    ON CONFLICT (standard_name) DO NOTHING
+                """, [
+                    (name, r.get("mesh_id"), r.get("therapeutic_area"))
+                    for name, r in new_conditions.items()
+                ], page_size=BULK_PAGE_SIZE)
+
+                cur.execute(
+                    "SELECT condition_id, standard_name FROM standardized_conditions WHERE standard_name = ANY(%s)",
+                    (list(new_conditions),)
+                )
+                condition_ids = {row["standard_name"]: row["condition_id"] for row in cur.fetchall()}
+
+                execute_values(cur, """
+                    INSERT INTO condition_mappings (raw_name, condition_id, match_type, confidence)
+                    VALUES %s
+                    ON CONFLICT (raw_name) DO NOTHING
+                """, [
+                    (raw, condition_ids[r["standard_name"]], r["match_type"], r["confidence"])
+                    for raw, r in standardized.items()
+                    if r and r["standard_name"] in condition_ids
+                ], page_size=BULK_PAGE_SIZE)
+
+                links = dict.fromkeys(
+                    (trial_id, condition_ids[standardized[raw]["standard_name"]])
+                    for trial_id, conditions in trials
+                    for raw in conditions
+                    if standardized[raw] and standardized[raw]["standard_name"] in condition_ids
+                )
+                execute_values(cur, """
+                    INSERT INTO trial_conditions (trial_id, condition_id)
+                    VALUES %s
+                    ON CONFLICT (trial_id, condition_id) DO NOTHING
+                """, list(links), page_size=BULK_PAGE_SIZE)
+
+        results: Dict[int, List[Dict]] = {}
+        for trial_id, conditions in trials:
+            trial_results = results.setdefault(trial_id, [])
+            for raw in conditions:
+                std_result = standardized[raw]
+                if std_result:
+                    trial_results.append({
+                        **std_result,
+                        "condition_id": condition_ids.get(std_result["standard_name"]),
+                    })
+
+        logger.info(
+            f"Standardized {len(distinct)} distinct conditions across {len(trials)} trials "
+            f"({len(condition_ids)} standard conditions) in {time.perf_counter() - start:.1f}s"
+        )
+        return results
+
+    def _load_db_mappings(self, normalized_names: Iterable[str]):
+        """Load existing database mappings for many names with one query."""
+        names = [n for n in normalized_names if n and n not in CONDITION_NORMALIZATIONS]
+        if self._db_mappings is None:
+            self._db_mappings = {}
+        names = [n for n in names if n not in self._db_mappings]
+        if not names:
+            return
+
+        # Names without a mapping are remembered too, so they are not queried again
+        self._db_mappings.update(dict.fromkeys(names))
+        rows = self.db.execute("""
+            SELECT LOWER(cm.raw_name) AS raw_lower, sc.standard_name, sc.mesh_id,
+                   sc.therapeutic_area, cm.match_type, cm.confidence
+            FROM condition_mappings cm
+            JOIN standardized_conditions sc ON cm.condition_id = sc.condition_id
+            WHERE LOWER(cm.raw_name) = ANY(%s)
+        """, (names,))
+
+        for row in rows or []:
+            if self._db_mappings.get(row["raw_lower"]) is not None:
+                continue
+            self._db_mappings[row["raw_lower"]] = {
+                "raw_name": row["raw_lower"],
+                "standard_name": row["standard_name"],
+                "mesh_id": row["mesh_id"],
+                "therapeutic_area": row["therapeutic_area"],
+                "match_type": row["match_type"],
+                "confidence": float(row["confidence"])
+            }
+
     def _ensure_condition_exists(self, std_result: Dict) -> Optional[int]:
         """Ensure standardized condition exists in database, return ID."""
         std_name = std_result["standard_name"]
@@ -474,12 +673,20 @@ class ConditionStandardizer:
         """, (trial_id, condition_id))
         self.db.commit()
 
-    def process_all_trials(self, drug_name: Optional[str] = None) -> Dict[str, int]:
+    def process_all_trials(
+        self,
+        drug_name: Optional[str] = None,
+        bulk: bool = True,
+        use_mesh: bool = True
+    ) -> Dict[str, int]:
         """
         Process all trials and standardize their conditions.
 
         Args:
             drug_name: Optional drug name filter
+            bulk: Standardize distinct conditions once and write in one
+                transaction (standardize_trials); False processes trial by trial
+            use_mesh: Query the MeSH API for names without a local match
 
         Returns:
             Statistics dict
@@ -500,11 +707,18 @@ class ConditionStandardizer:
 
         stats = {"trials_processed": 0, "conditions_mapped": 0, "unique_conditions": set()}
 
-        for trial in trials:
-            trial_id = trial["trial_id"]
-            raw_conditions = trial["conditions"] or []
+        if bulk:
+            by_trial = self.standardize_trials(
+                [(trial["trial_id"], trial["conditions"]) for trial in trials], use_mesh=use_mesh
+            )
+            trial_results = [by_trial.get(trial["trial_id"], []) for trial in trials]
+        else:
+            trial_results = (
+                self.standardize_trial_conditions(trial["trial_id"], trial["conditions"] or [])
+                for trial in trials
+            )
 
-            results = self.standardize_trial_conditions(trial_id, raw_conditions)
+        for results in trial_results:
             stats["trials_processed"] += 1
             stats["conditions_mapped"] += len(results)
 
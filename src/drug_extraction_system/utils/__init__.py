@@ -4,12 +4,20 @@ Utilities module for drug extraction system.
 Provides rate limiting, logging, and helper functions.
 """
 
-from src.drug_extraction_system.utils.rate_limiter import RateLimiter
+from src.drug_extraction_system.utils.rate_limiter import (
+    RateLimiter,
+    TokenBucketRateLimiter,
+    get_shared_rate_limiter,
+    get_shared_token_bucket,
+)
 from src.drug_extraction_system.utils.drug_key_generator import DrugKeyGenerator
 from src.drug_extraction_system.utils.logger import setup_logger, get_logger
 
 __all__ = [
     "RateLimiter",
+    "TokenBucketRateLimiter",
+    "get_shared_rate_limiter",
+    "get_shared_token_bucket",
     "DrugKeyGenerator",
     "setup_logger",
     "get_logger",
@@ -1,18 +1,43 @@
 """
 Caching Layer for API Responses
 
-Provides TTL-based in-memory caching to reduce redundant API calls
-and improve performance.
+Provides TTL-based caching to reduce redundant API calls and improve
+performance:
+- TTLCache: in-memory LRU with O(1) eviction; expiry is tracked in
+  time buckets so expired entries are purged without scanning the cache
+- DiskTTLCache: optional on-disk tier (SQLite, WAL mode) shared by all
+  clients and processes using the same directory
+- TieredCache: memory in front of disk, used by BaseAPIClient
+
+Set API_CACHE_DISABLED=1 to bypass the shared API cache, or API_CACHE_DIR
+to relocate its on-disk tier.
 """
 
+import heapq
+import json
+import os
+import sqlite3
 import time
 import logging
-from typing import Dict, Any, Optional
+import zlib
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Set, Tuple
 from dataclasses import dataclass
-from threading import Lock
+from threading import Lock, local
 
 logger = logging.getLogger(__name__)
 
+# Returned by get() on a miss, so None can be cached (negative caching)
+MISSING = object()
+
+# Granularity of the expiry buckets in seconds
+TTL_BUCKET_SECONDS = 60
+
+DEFAULT_CACHE_DIR = Path("data/api_cache")
+DEFAULT_DISK_MAX_BYTES = 256 * 1024 * 1024
+API_CACHE_MAX_ENTRIES = 5000
+
 
 @dataclass
 class CacheEntry:
@@ -21,6 +46,10 @@ class CacheEntry:
     expires_at: float
     created_at: float
 
+    @property
+    def bucket(self) -> int:
+        return int(self.expires_at // TTL_BUCKET_SECONDS)
+
 
 class TTLCache:
     """
@@ -28,9 +57,10 @@ class TTLCache:
     
     Features:
     - Automatic expiration based on TTL
+    - Least-recently-used eviction in O(1) when full
     - Thread-safe operations
     - Cache statistics tracking
-    - Memory-efficient cleanup
+    - Cleanup proportional to the number of expired entries
     
     Usage:
         cache = TTLCache(default_ttl=3600)  # 1 hour
@@ -53,7 +83,11 @@ class TTLCache:
             default_ttl: Default time-to-live in seconds (default: 1 hour)
             max_size: Maximum number of entries (default: 1000)
         """
-        self._cache: Dict[str, CacheEntry] = {}
+        # Ordered from least to most recently used
+        self._cache: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        # Expiry bucket -> keys expiring in it, plus a min-heap of bucket ids
+        self._buckets: Dict[int, Set[str]] = {}
+        self._bucket_heap: List[int] = []
         self._lock = Lock()
         self.default_ttl = default_ttl
         self.max_size = max_size
@@ -63,33 +97,43 @@ class TTLCache:
         self._misses = 0
         self._evictions = 0
     
-    def get(self, key: str) -> Optional[Any]:
+    def get(self, key: str, default: Any = None) -> Optional[Any]:
         """
         Get value from cache if exists and not expired.
         
         Args:
             key: Cache key
+            default: Returned on a miss (pass MISSING to tell a miss from a cached None)
         
         Returns:
-            Cached value or None if not found/expired
+            Cached value or ``default`` if not found/expired
         """
         with self._lock:
             entry = self._cache.get(key)
             
             if entry is None:
                 self._misses += 1
-                return None
+                return default
             
             # Check if expired
             if time.time() > entry.expires_at:
-                del self._cache[key]
+                self._remove(key)
                 self._misses += 1
-                return None
+                return default
             
+            self._cache.move_to_end(key)
             self._hits += 1
             return entry.value
+
+    def get_entry(self, key: str) -> Optional[CacheEntry]:
+        """Get the live entry for ``key`` without counting a lookup."""
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is None or time.time() > entry.expires_at:
+                return None
+            return entry
     
-    def set(self, key: str, value: Any, ttl: Optional[int] = None):
+    def set(self, key: str, value: Any, ttl: Optional[float] = None):
         """
         Set value in cache with TTL.
         
@@ -99,18 +143,28 @@ class TTLCache:
             ttl: Time-to-live in seconds (uses default_ttl if None)
         """
         with self._lock:
-            # Enforce max size by removing oldest entries
-            if len(self._cache) >= self.max_size and key not in self._cache:
-                self._evict_oldest()
+            if key in self._cache:
+                self._remove(key)
+            elif len(self._cache) >= self.max_size:
+                # Expired entries go first, then the least recently used
+                self._purge_expired(time.time())
+                if len(self._cache) >= self.max_size:
+                    self._evict_oldest()
             
             ttl = ttl or self.default_ttl
             now = time.time()
             
-            self._cache[key] = CacheEntry(
+            entry = CacheEntry(
                 value=value,
                 expires_at=now + ttl,
                 created_at=now
             )
+            self._cache[key] = entry
+            bucket = self._buckets.get(entry.bucket)
+            if bucket is None:
+                bucket = self._buckets[entry.bucket] = set()
+                heapq.heappush(self._bucket_heap, entry.bucket)
+            bucket.add(key)
     
     def delete(self, key: str) -> bool:
         """
@@ -124,7 +178,7 @@ class TTLCache:
         """
         with self._lock:
             if key in self._cache:
-                del self._cache[key]
+                self._remove(key)
                 return True
             return False
     
@@ -132,6 +186,8 @@ class TTLCache:
         """Clear all cached values."""
         with self._lock:
             self._cache.clear()
+            self._buckets.clear()
+            self._bucket_heap.clear()
             logger.info("Cache cleared")
     
     def cleanup_expired(self) -> int:
@@ -142,29 +198,40 @@ class TTLCache:
             Number of entries removed
         """
         with self._lock:
-            now = time.time()
-            expired_keys = [
-                key for key, entry in self._cache.items()
-                if now > entry.expires_at
-            ]
+            removed = self._purge_expired(time.time())
             
-            for key in expired_keys:
-                del self._cache[key]
+            if removed:
+                logger.debug(f"Cleaned up {removed} expired cache entries")
             
-            if expired_keys:
-                logger.debug(f"Cleaned up {len(expired_keys)} expired cache entries")
-            
-            return len(expired_keys)
+            return removed
+
+    def _remove(self, key: str):
+        """Remove an entry and its expiry bucket membership (lock held)."""
+        entry = self._cache.pop(key)
+        bucket = self._buckets.get(entry.bucket)
+        if bucket is not None:
+            bucket.discard(key)
+
+    def _purge_expired(self, now: float) -> int:
+        """Drop entries in fully expired buckets (lock held)."""
+        removed = 0
+        current = int(now // TTL_BUCKET_SECONDS)
+        while self._bucket_heap and self._bucket_heap[0] < current:
+            bucket_id = heapq.heappop(self._bucket_heap)
+            for key in self._buckets.pop(bucket_id, ()):
+                self._cache.pop(key, None)
+                removed += 1
+        return removed
     
     def _evict_oldest(self):
-        """Evict the oldest cache entry."""
+        """Evict the least recently used cache entry (lock held)."""
         if not self._cache:
             return
         
-        oldest_key = min(self._cache.keys(), key=lambda k: self._cache[k].created_at)
-        del self._cache[oldest_key]
+        oldest_key = next(iter(self._cache))
+        self._remove(oldest_key)
         self._evictions += 1
-        logger.debug(f"Evicted oldest cache entry: {oldest_key}")
+        logger.debug(f"Evicted least recently used cache entry: {oldest_key}")
     
     def get_stats(self) -> Dict[str, Any]:
         """
@@ -195,3 +262,285 @@ class TTLCache:
         """Check if key exists and is not expired."""
         return self.get(key) is not None
 
+
+
+_DISK_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    cache_key TEXT PRIMARY KEY,
+    namespace TEXT NOT NULL,
+    body BLOB NOT NULL,
+    size_bytes INTEGER NOT NULL,
+    expires_at REAL NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_entries_last_access ON entries (last_access);
+"""
+
+
+class DiskTTLCache:
+    """
+    On-disk TTL cache for JSON-serializable values.
+
+    Thread-safe (one SQLite connection per thread) and safe to share between
+    processes using the same directory. Total size is bounded with
+    least-recently-used eviction.
+    """
+
+    def __init__(self, cache_dir: Path = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_DISK_MAX_BYTES):
+        """
+        Initialize disk cache.
+
+        Args:
+            cache_dir: Directory for the cache database
+            max_bytes: Size bound for stored (compressed) values
+        """
+        self.max_bytes = max_bytes
+        self.db_path = Path(cache_dir) / "api_responses.sqlite3"
+        self._local = local()
+        self._stats_lock = Lock()
+        self._stores = 0
+        self._evictions = 0
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = self._conn()
+        conn.executescript(_DISK_SCHEMA)
+        self._approx_bytes = conn.execute(
+            "SELECT COALESCE(SUM(size_bytes), 0) FROM entries"
+        ).fetchone()[0]
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.db_path), timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def lookup(self, key: str) -> Optional[Tuple[Any, float]]:
+        """
+        Get a live entry.
+
+        Returns:
+            (value, expires_at), or None if not found/expired
+        """
+        now = time.time()
+        row = self._conn().execute(
+            "SELECT body, expires_at FROM entries WHERE cache_key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        body, expires_at = row
+        if expires_at <= now:
+            self._conn().execute("DELETE FROM entries WHERE cache_key = ?", (key,))
+            return None
+        try:
+            value = json.loads(zlib.decompress(body))
+        except (zlib.error, ValueError):
+            logger.warning(f"Dropping corrupt API cache entry {key[:12]}")
+            self._conn().execute("DELETE FROM entries WHERE cache_key = ?", (key,))
+            return None
+        self._conn().execute("UPDATE entries SET last_access = ? WHERE cache_key = ?", (now, key))
+        return value, expires_at
+
+    def set(self, key: str, value: Any, ttl: float, namespace: str = ""):
+        """Insert or replace an entry, evicting LRU entries if over the size bound."""
+        now = time.time()
+        body = zlib.compress(json.dumps(value).encode("utf-8"), 6)
+        self._conn().execute(
+            """
+            INSERT OR REPLACE INTO entries (cache_key, namespace, body, size_bytes, expires_at, last_access)
+            VALUES (?, ?, ?, ?, ?, ?)
+            """,
+            (key, namespace, body, len(body), now + ttl, now),
+        )
+        with self._stats_lock:
+            self._stores += 1
+            self._approx_bytes += len(body)
+            over = self._approx_bytes > self.max_bytes
+        if over:
+            self.evict()
+
+    def evict(self, target_fraction: float = 0.9) -> int:
+        """
+        Drop expired entries, then least-recently-used ones until total size
+        is under ``target_fraction`` of max_bytes.
+
+        Returns:
+            Number of entries evicted
+        """
+        conn = self._conn()
+        conn.execute("DELETE FROM entries WHERE expires_at <= ?", (time.time(),))
+        total = conn.execute("SELECT COALESCE(SUM(size_bytes), 0) FROM entries").fetchone()[0]
+        target = int(self.max_bytes * target_fraction)
+        evicted = 0
+        if total > target:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                for cache_key, size in conn.execute(
+                    "SELECT cache_key, size_bytes FROM entries ORDER BY last_access"
+                ).fetchall():
+                    if total <= target:
+                        break
+                    conn.execute("DELETE FROM entries WHERE cache_key = ?", (cache_key,))
+                    total -= size
+                    evicted += 1
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        with self._stats_lock:
+            self._approx_bytes = total
+            self._evictions += evicted
+        if evicted:
+            logger.info(f"API cache evicted {evicted} entries ({total / 1024 / 1024:.1f} MB kept)")
+        return evicted
+
+    def clear(self, namespace: Optional[str] = None):
+        """Remove all entries, or only those for ``namespace``."""
+        if namespace:
+            self._conn().execute("DELETE FROM entries WHERE namespace = ?", (namespace,))
+        else:
+            self._conn().execute("DELETE FROM entries")
+        with self._stats_lock:
+            self._approx_bytes = self._conn().execute(
+                "SELECT COALESCE(SUM(size_bytes), 0) FROM entries"
+            ).fetchone()[0]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Store/eviction counters for this process plus on-disk totals."""
+        entries, total = self._conn().execute(
+            "SELECT COUNT(*), COALESCE(SUM(size_bytes), 0) FROM entries"
+        ).fetchone()
+        with self._stats_lock:
+            return {
+                "entries": entries,
+                "size_mb": round(total / (1024 * 1024), 2),
+                "stores": self._stores,
+                "evictions": self._evictions,
+            }
+
+
+class TieredCache:
+    """
+    In-memory TTLCache in front of an optional DiskTTLCache.
+
+    Disk hits are promoted to memory with their remaining TTL. Values must
+    be JSON-serializable when a disk tier is used; None is a valid value
+    (use it for negative caching).
+    """
+
+    def __init__(
+        self,
+        memory: Optional[TTLCache] = None,
+        disk: Optional[DiskTTLCache] = None,
+        namespace: str = "",
+    ):
+        """
+        Initialize tiered cache.
+
+        Args:
+            memory: Memory tier (default: TTLCache(max_size=API_CACHE_MAX_ENTRIES))
+            disk: Optional disk tier
+            namespace: Label stored with disk entries (e.g. the API name)
+        """
+        self.memory = memory or TTLCache(max_size=API_CACHE_MAX_ENTRIES)
+        self.disk = disk
+        self.namespace = namespace
+        self._lock = Lock()
+        self._disk_hits = 0
+        self._negative_hits = 0
+
+    def get(self, key: str, default: Any = MISSING) -> Any:
+        """
+        Get a value from memory, then disk.
+
+        Returns:
+            Cached value (possibly None) or ``default`` on a miss
+        """
+        value = self.memory.get(key, MISSING)
+        if value is MISSING and self.disk is not None:
+            try:
+                found = self.disk.lookup(key)
+            except sqlite3.Error as e:
+                logger.warning(f"API cache disk lookup failed, bypassing: {e}")
+                found = None
+            if found is not None:
+                value, expires_at = found
+                self.memory.set(key, value, ttl=max(1.0, expires_at - time.time()))
+                with self._lock:
+                    self._disk_hits += 1
+        if value is MISSING:
+            return default
+        if value is None:
+            with self._lock:
+                self._negative_hits += 1
+        return value
+
+    def set(self, key: str, value: Any, ttl: float):
+        """Store a value in both tiers."""
+        self.memory.set(key, value, ttl=ttl)
+        if self.disk is not None:
+            try:
+                self.disk.set(key, value, ttl, namespace=self.namespace)
+            except (sqlite3.Error, TypeError, ValueError) as e:
+                logger.warning(f"API cache disk store failed: {e}")
+
+    def clear(self):
+        """Clear both tiers (the disk tier only for this namespace)."""
+        self.memory.clear()
+        if self.disk is not None:
+            self.disk.clear(self.namespace or None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Memory stats plus disk hits, negative hits and the overall hit rate."""
+        stats = self.memory.get_stats()
+        with self._lock:
+            disk_hits = self._disk_hits
+            stats["negative_hits"] = self._negative_hits
+        # Memory misses that the disk tier answered are hits overall
+        stats["disk_hits"] = disk_hits
+        total = stats["total_requests"]
+        overall_hits = stats["hits"] + disk_hits
+        stats["overall_hit_rate"] = round(overall_hits / total * 100, 2) if total else 0
+        if self.disk is not None:
+            stats["disk"] = self.disk.get_stats()
+        return stats
+
+
+_shared_caches: Dict[str, TieredCache] = {}
+_shared_disk: Optional[DiskTTLCache] = None
+_shared_disk_initialized = False
+_shared_caches_lock = Lock()
+
+
+def get_shared_api_cache(name: str) -> Optional[TieredCache]:
+    """
+    Get the process-wide response cache for an API.
+
+    Like the shared rate limiters, every client instance with the same name
+    (e.g. one per batch worker) uses the same memory tier; all APIs share
+    one disk tier under API_CACHE_DIR (default data/api_cache).
+
+    Args:
+        name: API name (e.g. "RxNorm")
+
+    Returns:
+        Shared TieredCache, or None if API_CACHE_DISABLED is set
+    """
+    global _shared_disk, _shared_disk_initialized
+    if os.getenv("API_CACHE_DISABLED", "").lower() in ("1", "true", "yes"):
+        return None
+    with _shared_caches_lock:
+        cache = _shared_caches.get(name)
+        if cache is None:
+            if not _shared_disk_initialized:
+                _shared_disk_initialized = True
+                cache_dir = Path(os.getenv("API_CACHE_DIR", str(DEFAULT_CACHE_DIR)))
+                try:
+                    _shared_disk = DiskTTLCache(cache_dir=cache_dir)
+                except (OSError, sqlite3.Error) as e:
+                    logger.warning(f"API cache disk tier unavailable ({e}), using memory only")
+            cache = TieredCache(disk=_shared_disk, namespace=name)
+            _shared_caches[name] = cache
+        return cache
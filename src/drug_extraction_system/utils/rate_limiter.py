@@ -1,7 +1,7 @@
 """
 Rate Limiter
 
-Implements sliding window rate limiting for API calls.
+Implements sliding window and token bucket rate limiting for API calls.
 """
 
 import time
@@ -146,3 +146,143 @@ class RateLimiter:
             "daily_limit": self.requests_per_day,
         }
 
+
+class TokenBucketRateLimiter:
+    """
+    Token bucket rate limiter for APIs with per-second limits.
+
+    A sliding minute window lets a whole minute's quota go out in one burst;
+    APIs such as PubChem (5 req/sec) reject that. The bucket refills at
+    requests_per_second and holds at most `burst` tokens.
+
+    Same acquire()/get_status() interface as RateLimiter.
+    """
+
+    def __init__(self, requests_per_second: float, burst: int = 1, name: str = "default"):
+        """
+        Initialize token bucket.
+
+        Args:
+            requests_per_second: Sustained request rate
+            burst: Max requests allowed back-to-back (bucket capacity)
+            name: Name for logging purposes
+        """
+        self.requests_per_second = requests_per_second
+        self.burst = max(1, burst)
+        self.name = name
+
+        self.tokens = float(self.burst)
+        self.updated_at = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self, timeout: float = 60.0) -> bool:
+        """
+        Acquire permission to make an API call.
+
+        Blocks until a token is available, or timeout expires.
+
+        Args:
+            timeout: Max seconds to wait (default: 60)
+
+        Returns:
+            True if acquired, False if timeout
+        """
+        deadline = time.monotonic() + timeout
+
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(
+                    self.burst, self.tokens + (now - self.updated_at) * self.requests_per_second
+                )
+                self.updated_at = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return True
+                wait_time = (1 - self.tokens) / self.requests_per_second
+
+            if now + wait_time > deadline:
+                logger.warning(f"[{self.name}] Rate limiter timeout after {timeout}s")
+                return False
+            time.sleep(wait_time)
+
+    def get_status(self) -> Dict:
+        """Get current rate limiter status."""
+        with self.lock:
+            tokens = self.tokens
+
+        return {
+            "name": self.name,
+            "tokens_available": tokens,
+            "requests_per_second": self.requests_per_second,
+            "burst": self.burst,
+        }
+
+
+_shared_limiters: Dict[str, RateLimiter] = {}
+_shared_limiters_lock = threading.Lock()
+
+
+def get_shared_rate_limiter(
+    name: str,
+    requests_per_minute: int = 60,
+    requests_per_day: Optional[int] = None
+) -> RateLimiter:
+    """
+    Get the process-wide rate limiter for an API.
+
+    External APIs limit per caller, not per client object, so every client
+    instance with the same name (e.g. one per batch worker) draws from the
+    same window. The limits of the first registration win.
+
+    Args:
+        name: API name (e.g. "OpenFDA")
+        requests_per_minute: Max requests per minute
+        requests_per_day: Max requests per day (optional)
+
+    Returns:
+        Shared RateLimiter
+    """
+    with _shared_limiters_lock:
+        limiter = _shared_limiters.get(name)
+        if limiter is None:
+            limiter = RateLimiter(
+                requests_per_minute=requests_per_minute,
+                requests_per_day=requests_per_day,
+                name=name
+            )
+            _shared_limiters[name] = limiter
+        return limiter
+
+
+_shared_buckets: Dict[str, TokenBucketRateLimiter] = {}
+
+
+def get_shared_token_bucket(
+    name: str,
+    requests_per_second: float,
+    burst: int = 1
+) -> TokenBucketRateLimiter:
+    """
+    Get the process-wide token bucket for an API.
+
+    Like get_shared_rate_limiter(), for APIs whose limit is per second.
+
+    Args:
+        name: API name (e.g. "PubChem")
+        requests_per_second: Sustained request rate
+        burst: Max requests allowed back-to-back
+
+    Returns:
+        Shared TokenBucketRateLimiter
+    """
+    with _shared_limiters_lock:
+        bucket = _shared_buckets.get(name)
+        if bucket is None:
+            bucket = TokenBucketRateLimiter(
+                requests_per_second=requests_per_second,
+                burst=burst,
+                name=name
+            )
+            _shared_buckets[name] = bucket
+        return bucket
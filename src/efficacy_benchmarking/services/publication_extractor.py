@@ -705,17 +705,15 @@ Return ONLY a valid JSON array. No markdown formatting, no explanations."""
                 pmcid = pmc_map.get(pmid)
                 if pmcid:
                     logger.info(f"Paper {pmid} is open access (PMCID: {pmcid}), fetching full text...")
-                    pmc_xml = self.pubmed.fetch_pmc_fulltext(pmcid)
-                    if pmc_xml:
-                        parsed = self.pubmed._parse_pmc_fulltext(pmc_xml, pmid, pmcid)
-                        if parsed:
-                            # Use 'content' field from PMC parser
-                            full_content = parsed.get('content', '')
-                            tables = parsed.get('tables', [])
-                            sections = parsed.get('sections', [])
-                            is_full_text = bool(full_content and len(full_content) > 500)
-                            if is_full_text:
-                                logger.info(f"Successfully extracted full text for {pmid} ({len(full_content)} chars, {len(tables)} tables, {len(sections)} sections)")
+                    parsed = self.pubmed.get_pmc_paper(pmcid, pmid=pmid)
+                    if parsed:
+                        # Use 'content' field from PMC parser
+                        full_content = parsed.get('content', '')
+                        tables = parsed.get('tables', [])
+                        sections = parsed.get('sections', [])
+                        is_full_text = bool(full_content and len(full_content) > 500)
+                        if is_full_text:
+                            logger.info(f"Successfully extracted full text for {pmid} ({len(full_content)} chars, {len(tables)} tables, {len(sections)} sections)")
                 else:
                     # PMC not available - log DOI if available for manual access
                     if doi:
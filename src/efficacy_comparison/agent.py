@@ -5,6 +5,7 @@ Main orchestrator for the efficacy comparison pipeline.
 Coordinates all services to generate comprehensive efficacy comparison data.
 """
 
+import asyncio
 import logging
 from datetime import datetime
 from typing import Callable, Dict, List, Optional
@@ -27,6 +28,11 @@ from src.efficacy_comparison.services import (
 
 logger = logging.getLogger(__name__)
 
+# Concurrent web/API stages (trial identification, paper discovery, source resolution)
+DEFAULT_WEB_CONCURRENCY = 6
+# Concurrent LLM extractions
+DEFAULT_LLM_CONCURRENCY = 4
+
 
 # Expected endpoints by disease (common endpoints to look for)
 DISEASE_EXPECTED_ENDPOINTS = {
@@ -57,6 +63,36 @@ DISEASE_EXPECTED_ENDPOINTS = {
 }
 
 
+class _ComparisonRun:
+    """
+    Per-run concurrency limits and progress for one comparison.
+
+    Progress only ever advances: each drug owns a fixed share of the range,
+    and work units add to a running total as they finish, in whatever order
+    that happens.
+    """
+
+    def __init__(
+        self,
+        report: Callable[[str, float], None],
+        web_concurrency: int,
+        llm_concurrency: int,
+        progress_start: float,
+        progress_range: float,
+    ):
+        self.web = asyncio.Semaphore(web_concurrency)
+        self.llm = asyncio.Semaphore(llm_concurrency)
+        self._report = report
+        self._start = progress_start
+        self._range = progress_range
+        self._done = 0.0
+
+    def report(self, message: str, advance: float = 0.0):
+        """Report a message, optionally advancing progress by a fraction of the run."""
+        self._done = min(1.0, self._done + advance)
+        self._report(message, self._start + self._range * self._done)
+
+
 class EfficacyComparisonAgent:
     """
     Main orchestrator for efficacy comparison analysis.
@@ -69,6 +105,9 @@ class EfficacyComparisonAgent:
     5. Extract comprehensive efficacy data
     6. Store results
 
+    Drugs and trials (steps 2-6) run concurrently, bounded separately for
+    web/API stages and LLM extraction. Results keep drug and trial order.
+
     Usage:
         agent = EfficacyComparisonAgent()
         result = await agent.run_comparison("atopic dermatitis")
@@ -85,6 +124,8 @@ class EfficacyComparisonAgent:
         progress_callback: Optional[Callable[[str, float], None]] = None,
         save_to_db: bool = True,
         skip_existing: bool = True,
+        web_concurrency: int = DEFAULT_WEB_CONCURRENCY,
+        llm_concurrency: int = DEFAULT_LLM_CONCURRENCY,
     ):
         """
         Initialize the agent with optional service overrides.
@@ -99,6 +140,8 @@ class EfficacyComparisonAgent:
             progress_callback: Optional callback for progress updates (message, progress 0-1)
             save_to_db: If True, save each trial extraction to database incrementally
             skip_existing: If True, skip trials that already exist in the database
+            web_concurrency: Maximum concurrent web/API stages
+            llm_concurrency: Maximum concurrent LLM extractions
         """
         self.drug_finder = drug_finder or InnovativeDrugFinder()
         self.trial_identifier = trial_identifier or PivotalTrialIdentifier()
@@ -109,6 +152,8 @@ class EfficacyComparisonAgent:
         self.progress_callback = progress_callback
         self.save_to_db = save_to_db
         self.skip_existing = skip_existing
+        self.web_concurrency = max(1, web_concurrency)
+        self.llm_concurrency = max(1, llm_concurrency)
 
     def _report_progress(self, message: str, progress: float):
         """Report progress if callback is set."""
@@ -164,33 +209,20 @@ class EfficacyComparisonAgent:
 
         logger.info(f"Processing {len(drugs)} drugs for {indication}")
 
-        # Process each drug
-        drug_profiles = []
-        total_drugs = len(drugs)
-
-        for i, drug in enumerate(drugs):
-            drug_progress_base = 0.1 + (0.85 * i / total_drugs)
-
-            try:
-                profile = await self._process_drug(
-                    drug=drug,
-                    indication=indication,
-                    expected_endpoints=expected_endpoints,
-                    max_trials=max_trials_per_drug,
-                    progress_base=drug_progress_base,
-                    progress_range=0.85 / total_drugs,
-                )
-                drug_profiles.append(profile)
-
-            except Exception as e:
-                logger.error(f"Error processing drug {drug.drug_name}: {e}")
-                # Create empty profile to track the failure
-                drug_profiles.append(DrugEfficacyProfile(
-                    drug=drug,
-                    indication_name=indication,
-                    pivotal_trials=[],
-                    extractions=[],
-                ))
+        # Process drugs concurrently; gather keeps input order
+        run = self._new_run(progress_start=0.1, progress_range=0.85)
+        share = 1.0 / len(drugs) if drugs else 0.0
+        drug_profiles = list(await asyncio.gather(*(
+            self._process_drug_safe(
+                drug=drug,
+                indication=indication,
+                expected_endpoints=expected_endpoints,
+                max_trials=max_trials_per_drug,
+                run=run,
+                share=share,
+            )
+            for drug in drugs
+        )))
 
         # Calculate totals
         total_trials = sum(len(p.pivotal_trials) for p in drug_profiles)
@@ -210,73 +242,121 @@ class EfficacyComparisonAgent:
             analysis_timestamp=datetime.now(),
         )
 
+    def _new_run(self, progress_start: float, progress_range: float) -> _ComparisonRun:
+        """Create limits and progress tracking for one run on the current event loop."""
+        return _ComparisonRun(
+            report=self._report_progress,
+            web_concurrency=self.web_concurrency,
+            llm_concurrency=self.llm_concurrency,
+            progress_start=progress_start,
+            progress_range=progress_range,
+        )
+
+    async def _run_stage(self, limit: asyncio.Semaphore, stage: Callable, **kwargs):
+        """
+        Run a service stage under a concurrency limit.
+
+        The trial identifier, paper identifier and extractor are async but do
+        blocking I/O (sync Anthropic, requests-based API clients), so each call
+        runs on a worker thread with its own event loop to let stages overlap.
+        """
+        async with limit:
+            return await asyncio.to_thread(asyncio.run, stage(**kwargs))
+
+    async def _process_drug_safe(self, drug: ApprovedDrug, indication: str, **kwargs) -> DrugEfficacyProfile:
+        """Process a drug, returning an empty profile on failure."""
+        try:
+            return await self._process_drug(drug=drug, indication=indication, **kwargs)
+        except Exception as e:
+            logger.error(f"Error processing drug {drug.drug_name}: {e}")
+            # Create empty profile to track the failure
+            return DrugEfficacyProfile(
+                drug=drug,
+                indication_name=indication,
+                pivotal_trials=[],
+                extractions=[],
+            )
+
     async def _process_drug(
         self,
         drug: ApprovedDrug,
         indication: str,
         expected_endpoints: List[str],
         max_trials: int,
-        progress_base: float,
-        progress_range: float,
+        run: _ComparisonRun,
+        share: float,
     ) -> DrugEfficacyProfile:
         """
         Process a single drug: find trials, papers, and extract data.
+
+        Args:
+            run: Limits and progress for the current run
+            share: Fraction of the run's progress owned by this drug
         """
-        self._report_progress(f"Processing {drug.drug_name}...", progress_base)
+        advanced = 0.0
 
-        # Step 2: Identify pivotal trials
-        self._report_progress(
-            f"Identifying pivotal trials for {drug.drug_name}...",
-            progress_base + progress_range * 0.1
-        )
+        def advance(message: str, amount: float):
+            nonlocal advanced
+            advanced += amount
+            run.report(message, amount)
 
-        pivotal_trials = await self.trial_identifier.identify_pivotal_trials(
-            drug=drug,
-            indication=indication,
-            max_trials=max_trials,
-        )
+        try:
+            run.report(f"Processing {drug.drug_name}...")
 
-        if not pivotal_trials:
-            logger.warning(f"No pivotal trials found for {drug.drug_name}")
-            return DrugEfficacyProfile(
+            # Step 2: Identify pivotal trials
+            pivotal_trials = await self._run_stage(
+                run.web,
+                self.trial_identifier.identify_pivotal_trials,
                 drug=drug,
-                indication_name=indication,
-                pivotal_trials=[],
-                extractions=[],
+                indication=indication,
+                max_trials=max_trials,
             )
+            advance(f"Identified pivotal trials for {drug.drug_name}", share * 0.1)
 
-        logger.info(f"Found {len(pivotal_trials)} pivotal trials for {drug.drug_name}")
-
-        # Process each trial
-        extractions = []
-        total_trials = len(pivotal_trials)
-
-        for j, trial in enumerate(pivotal_trials):
-            trial_progress = progress_base + progress_range * (0.2 + 0.8 * j / total_trials)
-
-            try:
-                extraction = await self._process_trial(
-                    trial=trial,
+            if not pivotal_trials:
+                logger.warning(f"No pivotal trials found for {drug.drug_name}")
+                return DrugEfficacyProfile(
                     drug=drug,
-                    indication=indication,
-                    expected_endpoints=expected_endpoints,
-                    progress=trial_progress,
+                    indication_name=indication,
+                    pivotal_trials=[],
+                    extractions=[],
                 )
-                if extraction:
-                    extractions.append(extraction)
 
-            except Exception as e:
-                logger.error(
-                    f"Error processing trial {trial.trial_name or trial.nct_id}: {e}"
-                )
+            logger.info(f"Found {len(pivotal_trials)} pivotal trials for {drug.drug_name}")
+
+            # Process trials concurrently; results stay in trial order
+            trial_share = share * 0.9 / len(pivotal_trials)
+
+            async def process(trial: PivotalTrial) -> Optional[TrialExtraction]:
+                trial_id = trial.trial_name or trial.nct_id
+                try:
+                    return await self._process_trial(
+                        trial=trial,
+                        drug=drug,
+                        indication=indication,
+                        expected_endpoints=expected_endpoints,
+                        run=run,
+                    )
+                except Exception as e:
+                    logger.error(f"Error processing trial {trial_id}: {e}")
+                    return None
+                finally:
+                    advance(f"Finished trial {trial_id}", trial_share)
 
-        return DrugEfficacyProfile(
-            drug=drug,
-            indication_name=indication,
-            pivotal_trials=pivotal_trials,
-            extractions=extractions,
-            extraction_timestamp=datetime.now(),
-        )
+            results = await asyncio.gather(*(process(trial) for trial in pivotal_trials))
+            extractions = [extraction for extraction in results if extraction]
+
+            return DrugEfficacyProfile(
+                drug=drug,
+                indication_name=indication,
+                pivotal_trials=pivotal_trials,
+                extractions=extractions,
+                extraction_timestamp=datetime.now(),
+            )
+        finally:
+            # Account for the whole share even when trials were missing or failed
+            if share - advanced > 1e-12:
+                advance(f"Finished {drug.drug_name}", share - advanced)
 
     async def _process_trial(
         self,
@@ -284,13 +364,13 @@ class EfficacyComparisonAgent:
         drug: ApprovedDrug,
         indication: str,
         expected_endpoints: List[str],
-        progress: float,
+        run: _ComparisonRun,
     ) -> Optional[TrialExtraction]:
         """
         Process a single trial: find paper, resolve source, extract data, save to DB.
         """
         trial_id = trial.trial_name or trial.nct_id
-        self._report_progress(f"Processing trial {trial_id}...", progress)
+        run.report(f"Processing trial {trial_id}...")
 
         # Check if trial already exists in database (skip if requested)
         if self.skip_existing and trial.nct_id:
@@ -298,13 +378,15 @@ class EfficacyComparisonAgent:
                 exists = await self.repository.trial_exists(trial.nct_id, drug.drug_name)
                 if exists:
                     logger.info(f"Skipping {trial_id} - already exists in database")
-                    self._report_progress(f"Skipping {trial_id} (already extracted)...", progress)
+                    run.report(f"Skipping {trial_id} (already extracted)...")
                     return None
             except Exception as e:
                 logger.warning(f"Could not check if trial exists: {e}")
 
         # Step 3: Find primary papers
-        papers = await self.paper_identifier.find_primary_papers(
+        papers = await self._run_stage(
+            run.web,
+            self.paper_identifier.find_primary_papers,
             trial=trial,
             drug=drug,
             max_papers=2,
@@ -314,16 +396,15 @@ class EfficacyComparisonAgent:
         paper = papers[0] if papers else None
 
         # Step 4: Resolve data source
-        self._report_progress(
-            f"Resolving data source for {trial_id}...",
-            progress + 0.02
-        )
+        run.report(f"Resolving data source for {trial_id}...")
 
-        data_source = await self.data_resolver.resolve_data_source(
-            paper=paper,
-            trial=trial,
-            drug=drug,
-        )
+        # Stays on this loop: the resolver shares one httpx.AsyncClient
+        async with run.web:
+            data_source = await self.data_resolver.resolve_data_source(
+                paper=paper,
+                trial=trial,
+                drug=drug,
+            )
 
         logger.info(
             f"Using {data_source.source_type} for {trial_id} "
@@ -331,12 +412,11 @@ class EfficacyComparisonAgent:
         )
 
         # Step 5: Extract data
-        self._report_progress(
-            f"Extracting data from {trial_id}...",
-            progress + 0.05
-        )
+        run.report(f"Extracting data from {trial_id}...")
 
-        extraction = await self.extractor.extract_trial_data(
+        extraction = await self._run_stage(
+            run.llm,
+            self.extractor.extract_trial_data,
             data_source=data_source,
             trial=trial,
             drug=drug,
@@ -420,8 +500,8 @@ class EfficacyComparisonAgent:
             indication=indication,
             expected_endpoints=expected_endpoints,
             max_trials=max_trials,
-            progress_base=0.1,
-            progress_range=0.9,
+            run=self._new_run(progress_start=0.1, progress_range=0.9),
+            share=1.0,
         )
 
     async def close(self):
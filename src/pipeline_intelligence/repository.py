@@ -7,20 +7,30 @@ from datetime import datetime
 
 from .models import PipelineSource, PipelineRun, PipelineDrug
 
+# Local PubChem name store (names previously resolved to each CID)
+try:
+    from src.drug_extraction_system.resolvers.pubchem_resolution import get_pubchem_name_store
+    PUBCHEM_STORE_AVAILABLE = True
+except ImportError:
+    PUBCHEM_STORE_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
 
 class PipelineIntelligenceRepository:
     """Database operations for pipeline intelligence data."""
 
-    def __init__(self, db):
+    def __init__(self, db, pubchem_store=None):
         """
         Initialize repository.
 
         Args:
             db: Database connection (DatabaseConnection instance)
+            pubchem_store: PubChemNameStore for CID -> name lookups
+                (defaults to the shared store)
         """
         self.db = db
+        self._pubchem_store = pubchem_store
 
     def get_disease_key(self, disease_id: int) -> Optional[str]:
         """Get disease_key for a disease_id."""
@@ -178,6 +188,47 @@ class PipelineIntelligenceRepository:
             result = cur.fetchone()
             return PipelineRun(**dict(result)) if result else None
 
+    # ClinicalTrials.gov sync cursors (delta refresh)
+
+    def get_sync_cursors(self, disease_id: int) -> Dict[str, str]:
+        """Get search term -> last LastUpdatePostDate (YYYY-MM-DD) for a disease."""
+        self.db.ensure_connected()
+        with self.db.cursor() as cur:
+            cur.execute(
+                """
+                SELECT search_term, last_update_post_date
+                FROM pipeline_sync_cursors
+                WHERE disease_id = %s
+                """,
+                (disease_id,)
+            )
+            return {
+                r["search_term"]: r["last_update_post_date"].isoformat()
+                for r in cur.fetchall()
+            }
+
+    def save_sync_cursors(self, disease_id: int, cursors: Dict[str, str]):
+        """Upsert search term cursors for a disease."""
+        if not cursors:
+            return
+        self.db.ensure_connected()
+        with self.db.cursor() as cur:
+            for search_term, last_update_post_date in cursors.items():
+                cur.execute(
+                    """
+                    INSERT INTO pipeline_sync_cursors (disease_id, search_term, last_update_post_date)
+                    VALUES (%s, %s, %s)
+                    ON CONFLICT (disease_id, search_term) DO UPDATE SET
+                        last_update_post_date = GREATEST(
+                            pipeline_sync_cursors.last_update_post_date,
+                            EXCLUDED.last_update_post_date
+                        ),
+                        last_synced_at = CURRENT_TIMESTAMP
+                    """,
+                    (disease_id, search_term, last_update_post_date)
+                )
+            self.db.commit()
+
     # Pipeline Source operations
 
     def add_source(self, source: PipelineSource) -> int:
@@ -251,6 +302,9 @@ class PipelineIntelligenceRepository:
     def find_drug_by_pubchem_cid(self, pubchem_cid: int) -> Optional[Dict]:
         """Find existing drug by PubChem CID/SID.
 
+        Drugs saved before their CID was known are matched by any name the
+        local PubChem name store has seen resolve to this CID.
+
         Args:
             pubchem_cid: PubChem identifier (positive = CID, negative = SID)
 
@@ -266,8 +320,33 @@ class PipelineIntelligenceRepository:
                 (pubchem_cid,)
             )
             result = cur.fetchone()
+            if result:
+                return dict(result)
+
+            names = self._pubchem_names_for_cid(pubchem_cid)
+            if not names:
+                return None
+            cur.execute(
+                """
+                SELECT * FROM drugs
+                WHERE LOWER(generic_name) = ANY(%s) OR LOWER(development_code) = ANY(%s)
+                LIMIT 1
+                """,
+                (names, names)
+            )
+            result = cur.fetchone()
             return dict(result) if result else None
 
+    def _pubchem_names_for_cid(self, pubchem_cid: int) -> List[str]:
+        """Names the local PubChem store has resolved to this CID."""
+        try:
+            if self._pubchem_store is None and PUBCHEM_STORE_AVAILABLE:
+                self._pubchem_store = get_pubchem_name_store()
+            return self._pubchem_store.names_for_cid(pubchem_cid) if self._pubchem_store else []
+        except Exception as e:
+            logger.debug(f"PubChem name store lookup failed: {e}")
+            return []
+
     def upsert_drug(self, drug: PipelineDrug) -> int:
         """Insert or update a drug in the database.
 
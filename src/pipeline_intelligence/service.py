@@ -7,7 +7,7 @@ import logging
 import json
 import re
 from datetime import datetime
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 from pathlib import Path
 
 from jinja2 import Environment, FileSystemLoader
@@ -42,6 +42,7 @@ except ImportError:
 # Import PubChem client for drug deduplication
 try:
     from src.drug_extraction_system.api_clients.pubchem_client import PubChemClient
+    from src.drug_extraction_system.resolvers.pubchem_resolution import PubChemResolver
     PUBCHEM_CLIENT_AVAILABLE = True
 except ImportError:
     PUBCHEM_CLIENT_AVAILABLE = False
@@ -79,7 +80,8 @@ class PipelineIntelligenceService:
         web_searcher,
         llm_client,
         repository: PipelineIntelligenceRepository,
-        openfda_client=None
+        openfda_client=None,
+        pubchem_resolver=None
     ):
         """
         Initialize the service.
@@ -90,6 +92,8 @@ class PipelineIntelligenceService:
             llm_client: LLM client for extraction
             repository: Database repository
             openfda_client: Client for OpenFDA API (for approved drug verification)
+            pubchem_resolver: Cached PubChem resolver (created around the PubChem
+                client with the shared store if not provided)
         """
         self.ct_client = clinicaltrials_client
         self.web_searcher = web_searcher
@@ -102,6 +106,9 @@ class PipelineIntelligenceService:
         self.mesh_client = MeSHClient() if MESH_CLIENT_AVAILABLE else None
         # Initialize PubChem client for drug deduplication
         self.pubchem_client = PubChemClient() if PUBCHEM_CLIENT_AVAILABLE else None
+        self.pubchem_resolver = pubchem_resolver
+        if self.pubchem_resolver is None and self.pubchem_client:
+            self.pubchem_resolver = PubChemResolver(self.pubchem_client)
 
     async def _expand_disease_terms(self, disease_name: str) -> Dict[str, Any]:
         """
@@ -400,16 +407,7 @@ class PipelineIntelligenceService:
             discontinued_drugs = []
 
             for drug_data in cached_drugs:
-                drug = PipelineDrug(
-                    generic_name=drug_data.get("generic_name", ""),
-                    brand_name=drug_data.get("brand_name"),
-                    manufacturer=drug_data.get("manufacturer"),
-                    drug_type=drug_data.get("drug_type"),
-                    mechanism_of_action=drug_data.get("mechanism_of_action"),
-                    approval_status=drug_data.get("approval_status"),
-                    highest_phase=drug_data.get("highest_phase"),
-                    data_sources=["Cached"],
-                )
+                drug = self._drug_from_cache_row(drug_data)
 
                 phase = drug_data.get("highest_phase", "").lower()
                 status = drug_data.get("indication_status", "").lower()
@@ -459,6 +457,21 @@ class PipelineIntelligenceService:
             logger.warning(f"Failed to build landscape from cache: {e}")
             return None
 
+    @staticmethod
+    def _drug_from_cache_row(drug_data: Dict[str, Any]) -> PipelineDrug:
+        """Build a PipelineDrug from a get_pipeline_for_disease() row."""
+        return PipelineDrug(
+            drug_id=drug_data.get("drug_id"),
+            generic_name=drug_data.get("generic_name", ""),
+            brand_name=drug_data.get("brand_name"),
+            manufacturer=drug_data.get("manufacturer"),
+            drug_type=drug_data.get("drug_type"),
+            mechanism_of_action=drug_data.get("mechanism_of_action"),
+            approval_status=drug_data.get("approval_status") or "investigational",
+            highest_phase=drug_data.get("highest_phase"),
+            data_sources=["Cached"],
+        )
+
     def _is_cache_valid(self, disease_id: int) -> bool:
         """Check if cached data is recent enough to use."""
         latest_run = self.repo.get_latest_run(disease_id)
@@ -480,6 +493,7 @@ class PipelineIntelligenceService:
         force_refresh: bool = False,
         filter_related_conditions: bool = True,
         enrich_new_drugs: bool = False,
+        delta_refresh: bool = False,
     ) -> CompetitiveLandscape:
         """
         Get complete competitive landscape for a disease.
@@ -493,6 +507,9 @@ class PipelineIntelligenceService:
                                        but distinct conditions (e.g., TED vs Graves Disease)
             enrich_new_drugs: If True, run new drugs through full DrugProcessor extraction
                              to get detailed MOA, targets, dosing, indications
+            delta_refresh: When the cache is stale, fetch only trials new or changed
+                           since the last sync and merge their drugs into the cached
+                           landscape instead of re-running the full extraction
 
         Returns:
             CompetitiveLandscape with all pipeline drugs
@@ -514,6 +531,18 @@ class PipelineIntelligenceService:
                 return cached_landscape
             logger.info("Cache build failed, proceeding with fresh extraction")
 
+        if delta_refresh and not force_refresh:
+            sync_cursors = self.repo.get_sync_cursors(disease_id)
+            if sync_cursors:
+                delta_landscape = await self._refresh_landscape_delta(
+                    disease_name, disease_id, disease_key, therapeutic_area, sync_cursors,
+                    filter_related_conditions=filter_related_conditions,
+                    enrich_new_drugs=enrich_new_drugs,
+                )
+                if delta_landscape:
+                    return delta_landscape
+            logger.info("No sync cursors or cached drugs, proceeding with full extraction")
+
         # Create pipeline run record
         run_id = self.repo.create_run(disease_id, disease_key, "full")
 
@@ -535,7 +564,8 @@ class PipelineIntelligenceService:
 
             # Step 3: Search ClinicalTrials.gov (ENHANCED with synonyms)
             logger.info("Step 3: Searching ClinicalTrials.gov (industry-sponsored, with synonyms)...")
-            trials = await self._search_clinical_trials(disease_name, search_terms)
+            sync_cursors: Dict[str, str] = {}
+            trials = await self._search_clinical_trials(disease_name, search_terms, sync_cursors)
             logger.info(f"  Found {len(trials)} industry-sponsored clinical trials")
 
             # Step 4: Extract drugs from trials (in batches to avoid JSON parsing issues)
@@ -634,6 +664,9 @@ class PipelineIntelligenceService:
                     drugs_new=len(all_drugs),  # For now, count all as new
                     drugs_updated=0
                 )
+            # Seed cursors for later delta refreshes
+            if disease_id:
+                self.repo.save_sync_cursors(disease_id, sync_cursors)
 
             return landscape
 
@@ -643,6 +676,101 @@ class PipelineIntelligenceService:
                 self.repo.update_run(run_id, status="failed", error_message=str(e))
             raise
 
+    async def _refresh_landscape_delta(
+        self,
+        disease_name: str,
+        disease_id: int,
+        disease_key: str,
+        therapeutic_area: Optional[str],
+        sync_cursors: Dict[str, str],
+        filter_related_conditions: bool = True,
+        enrich_new_drugs: bool = False,
+    ) -> Optional[CompetitiveLandscape]:
+        """
+        Refresh a cached landscape from ClinicalTrials.gov changes only.
+
+        Searches each cursor term for studies updated since its cursor, extracts
+        drugs from just those trials, and merges them into the cached drugs. Only
+        drugs touched by changed trials are filtered, stored and linked. Web
+        search steps are skipped; run a full refresh to pick up news.
+
+        Returns:
+            Updated landscape, or None if there is nothing cached to merge into
+        """
+        cached_rows = self.repo.get_pipeline_for_disease(disease_name)
+        if not cached_rows:
+            return None
+
+        logger.info(f"Delta refresh for {disease_name} ({len(sync_cursors)} search terms)")
+        run_id = self.repo.create_run(disease_id, disease_key, "incremental")
+
+        try:
+            search_terms = list(sync_cursors)
+            cursors = dict(sync_cursors)
+            changed_trials = await self._search_clinical_trials(disease_name, search_terms, cursors)
+            logger.info(f"  {len(changed_trials)} trials new or updated since last sync")
+
+            new_drugs = await self._extract_drugs_from_trials_batched(disease_name, changed_trials)
+            new_drugs = [
+                d for d in new_drugs
+                if not self._is_established_drug(d.generic_name) or d.approval_status == "approved"
+            ]
+            if filter_related_conditions and new_drugs:
+                new_drugs = await self._filter_related_conditions(disease_name, new_drugs)
+            logger.info(f"  Extracted {len(new_drugs)} drugs from changed trials")
+
+            cached_drugs = []
+            for row in cached_rows:
+                drug = self._drug_from_cache_row(row)
+                if (row.get("indication_status") or "").lower() in ("discontinued", "failed"):
+                    drug.development_status = "discontinued"
+                cached_drugs.append(drug)
+
+            all_drugs = self._merge_drugs(cached_drugs, new_drugs)
+
+            # Cached drugs carry no NCT IDs, so any NCT ID means a changed trial touched it
+            changed_ncts = {
+                t.get("protocolSection", {}).get("identificationModule", {}).get("nctId")
+                for t in changed_trials
+            }
+            touched = [d for d in all_drugs if changed_ncts.intersection(d.source_nct_ids)]
+            drugs_new = sum(1 for d in touched if d.drug_id is None)
+
+            landscape = self._build_landscape(
+                disease_name=disease_name,
+                drugs=all_drugs,
+                therapeutic_area=therapeutic_area,
+                disease_synonyms=search_terms,
+            )
+            landscape.disease_key = disease_key
+            landscape.disease_id = disease_id
+            landscape.trials_reviewed = len(changed_trials)
+            landscape.search_timestamp = datetime.now()
+            landscape.sources_searched = ["ClinicalTrials.gov (cached)", "ClinicalTrials.gov (delta)"]
+
+            if touched:
+                await self._store_drugs(
+                    touched, disease_id, disease_name, therapeutic_area,
+                    enrich_new_drugs=enrich_new_drugs
+                )
+
+            self.repo.update_run(
+                run_id=run_id,
+                status="completed",
+                clinicaltrials_searched=len(changed_trials),
+                drugs_found_total=len(all_drugs),
+                drugs_new=drugs_new,
+                drugs_updated=len(touched) - drugs_new,
+            )
+            self.repo.save_sync_cursors(disease_id, cursors)
+            logger.info(f"  Delta refresh: {drugs_new} new, {len(touched) - drugs_new} updated drugs")
+            return landscape
+
+        except Exception as e:
+            logger.error(f"Pipeline delta refresh failed: {e}")
+            self.repo.update_run(run_id, status="failed", error_message=str(e))
+            raise
+
     # Active trial statuses
     ACTIVE_TRIAL_STATUSES = [
         "RECRUITING",
@@ -658,10 +786,106 @@ class PipelineIntelligenceService:
         "SUSPENDED",
     ]
 
+    # Studies fetched per query in a delta sync before it resumes next time
+    DELTA_SYNC_MAX_STUDIES = 100
+
+    @staticmethod
+    def _last_update_posted(study: Dict) -> str:
+        """LastUpdatePostDate of a study (YYYY-MM-DD, or '' if missing)."""
+        return (
+            study.get("protocolSection", {})
+            .get("statusModule", {})
+            .get("lastUpdatePostDateStruct", {})
+            .get("date", "")
+        )
+
+    def _fetch_studies(
+        self,
+        params: Dict[str, Any],
+        max_studies: int,
+        finish_last_date: bool = False,
+    ) -> Tuple[List[Dict], bool]:
+        """
+        Page through a ClinicalTrials.gov /studies query.
+
+        Args:
+            params: Query parameters
+            max_studies: Stop paging once this many studies are fetched
+            finish_last_date: For queries sorted by LastUpdatePostDate, keep
+                paging past max_studies until every study sharing the date of
+                the max_studies-th study is fetched, so a capped delta sync
+                always ends past a date it fully covered
+
+        Returns:
+            (studies, drained): drained is False if the query stopped at
+            max_studies or on an error with results left unfetched
+        """
+        studies: List[Dict] = []
+        page_token = None
+        while True:
+            page_params = dict(params)
+            if page_token:
+                page_params["pageToken"] = page_token
+
+            result = self.ct_client.get("/studies", params=page_params)
+            if not result or "studies" not in result:
+                return studies, False
+
+            studies.extend(result["studies"])
+            page_token = result.get("nextPageToken")
+            if not page_token:
+                return studies, True
+            if len(studies) >= max_studies:
+                if not finish_last_date or (
+                    self._last_update_posted(studies[-1])
+                    != self._last_update_posted(studies[max_studies - 1])
+                ):
+                    return studies, False
+
+    @classmethod
+    def _next_sync_cursor(
+        cls,
+        since: Optional[str],
+        streams: List[Tuple[List[Dict], bool]],
+    ) -> Optional[str]:
+        """
+        Cursor for a search term after syncing it.
+
+        A full sync (no ``since``) is a capped snapshot, so its cursor is the
+        latest update it saw. A delta sync sorts every query by
+        LastUpdatePostDate ascending: a drained query saw all its changes,
+        a capped one only those up to its last study, so the cursor stops
+        there and the next delta resumes from it (the range is inclusive).
+        Capped delta queries page past every study of their last full date
+        (see _fetch_studies), so the cursor moves even when more than
+        DELTA_SYNC_MAX_STUDIES changes share one date.
+
+        Args:
+            since: The term's cursor before this sync, if any
+            streams: (studies, drained) per query, in fetch order
+
+        Returns:
+            New cursor, or None if nothing establishes one
+        """
+        latest = max(
+            (cls._last_update_posted(study) for studies, _ in streams for study in studies),
+            default="",
+        )
+        if since is None:
+            return latest or None
+
+        cursor = max(since, latest)
+        for studies, drained in streams:
+            if not drained:
+                resumed_at = cls._last_update_posted(studies[-1]) if studies else ""
+                cursor = min(cursor, max(since, resumed_at))
+        return cursor
+
     async def _search_clinical_trials(
         self,
         disease_name: str,
-        search_terms: Optional[List[str]] = None
+        search_terms: Optional[List[str]] = None,
+        sync_cursors: Optional[Dict[str, str]] = None
     ) -> List[Dict]:
         """
         Search ClinicalTrials.gov for INDUSTRY-SPONSORED trials related to the disease.
@@ -669,6 +893,10 @@ class PipelineIntelligenceService:
         Args:
             disease_name: Primary disease name
             search_terms: Optional list of synonym search terms from MeSH expansion
+            sync_cursors: Optional search term -> LastUpdatePostDate cursors. Terms
+                with a cursor only fetch studies updated on or after it (delta
+                sync), oldest change first. Updated in place with each term's
+                next cursor (see _next_sync_cursor).
 
         Returns:
             Deduplicated list of clinical trials (by NCT ID)
@@ -687,80 +915,70 @@ class PipelineIntelligenceService:
         all_trials = {}
 
         for condition in conditions_to_search:
-            logger.info(f"    Searching: {condition}")
-
-            # Search for active/recruiting industry-sponsored trials
-            search_params = {
+            since = (sync_cursors or {}).get(condition)
+            logger.info(f"    Searching: {condition}" + (f" (updated since {since})" if since else ""))
+
+            def query(params: Dict[str, Any], max_studies: int) -> Tuple[List[Dict], bool]:
+                """Run a query; with a cursor, only studies updated since it, oldest first."""
+                if since:
+                    params["filter.advanced"] += f" AND AREA[LastUpdatePostDate]RANGE[{since},MAX]"
+                    params["sort"] = "LastUpdatePostDate:asc"
+                    params["pageSize"] = 100
+                    max_studies = self.DELTA_SYNC_MAX_STUDIES
+                return self._fetch_studies(params, max_studies, finish_last_date=bool(since))
+
+            # Search for active/recruiting industry-sponsored trials (cap per condition)
+            active = query({
                 "query.cond": condition,
                 "pageSize": 100,
                 "format": "json",
                 "filter.advanced": "AREA[LeadSponsorClass]INDUSTRY",
                 "filter.overallStatus": ",".join(self.ACTIVE_TRIAL_STATUSES),
-            }
-
-            page_token = None
-            condition_trials = 0
-
-            while True:
-                params = search_params.copy()
-                if page_token:
-                    params["pageToken"] = page_token
-
-                result = self.ct_client.get("/studies", params=params)
-
-                if not result or "studies" not in result:
-                    break
-
-                for study in result["studies"]:
-                    nct_id = study.get("protocolSection", {}).get("identificationModule", {}).get("nctId")
-                    if nct_id and nct_id not in all_trials:
-                        all_trials[nct_id] = study
-                        condition_trials += 1
-
-                page_token = result.get("nextPageToken")
-                if not page_token or condition_trials >= 100:  # Cap per condition
-                    break
+            }, max_studies=100)
+            for study in active[0]:
+                nct_id = study.get("protocolSection", {}).get("identificationModule", {}).get("nctId")
+                if nct_id and nct_id not in all_trials:
+                    all_trials[nct_id] = study
 
             # Search for completed Phase 3 trials (late-stage drugs)
-            phase3_params = {
+            phase3 = query({
                 "query.cond": condition,
                 "pageSize": 30,
                 "format": "json",
                 "filter.advanced": "AREA[LeadSponsorClass]INDUSTRY AND AREA[OverallStatus]COMPLETED",
                 "sort": "CompletionDate:desc",
-            }
-
-            result = self.ct_client.get("/studies", params=phase3_params)
-            if result and "studies" in result:
-                for study in result["studies"]:
-                    phases = study.get("protocolSection", {}).get("designModule", {}).get("phases", [])
-                    if "PHASE3" in phases or "PHASE2/PHASE3" in phases:
-                        nct_id = study.get("protocolSection", {}).get("identificationModule", {}).get("nctId")
-                        if nct_id and nct_id not in all_trials:
-                            all_trials[nct_id] = study
+            }, max_studies=30)
+            for study in phase3[0]:
+                phases = study.get("protocolSection", {}).get("designModule", {}).get("phases", [])
+                if "PHASE3" in phases or "PHASE2/PHASE3" in phases:
+                    nct_id = study.get("protocolSection", {}).get("identificationModule", {}).get("nctId")
+                    if nct_id and nct_id not in all_trials:
+                        all_trials[nct_id] = study
 
             # Search for recently completed trials (last 4 years)
-            recent_params = {
+            recent = query({
                 "query.cond": condition,
                 "pageSize": 30,
                 "format": "json",
                 "filter.advanced": "AREA[LeadSponsorClass]INDUSTRY",
                 "filter.overallStatus": "COMPLETED",
                 "sort": "CompletionDate:desc",
-            }
+            }, max_studies=30)
+            cutoff_year = str(datetime.now().year - 4)
+            for study in recent[0]:
+                try:
+                    completion_date = study.get("protocolSection", {}).get("statusModule", {}).get("completionDateStruct", {}).get("date", "")
+                    if completion_date and completion_date >= cutoff_year:
+                        nct_id = study.get("protocolSection", {}).get("identificationModule", {}).get("nctId")
+                        if nct_id and nct_id not in all_trials:
+                            all_trials[nct_id] = study
+                except:
+                    pass
 
-            result = self.ct_client.get("/studies", params=recent_params)
-            if result and "studies" in result:
-                cutoff_year = str(datetime.now().year - 4)
-                for study in result["studies"][:30]:
-                    try:
-                        completion_date = study.get("protocolSection", {}).get("statusModule", {}).get("completionDateStruct", {}).get("date", "")
-                        if completion_date and completion_date >= cutoff_year:
-                            nct_id = study.get("protocolSection", {}).get("identificationModule", {}).get("nctId")
-                            if nct_id and nct_id not in all_trials:
-                                all_trials[nct_id] = study
-                    except:
-                        pass
+            if sync_cursors is not None:
+                cursor = self._next_sync_cursor(since, [active, phase3, recent])
+                if cursor:
+                    sync_cursors[condition] = cursor
 
         logger.info(f"  Found {len(all_trials)} unique trials across {len(conditions_to_search)} search terms")
         return list(all_trials.values())
@@ -1461,20 +1679,31 @@ IMPORTANT:
         Returns dict with 'cid' and 'generic_name' if found, None on failure.
         Graceful degradation - returns None if PubChem unavailable or lookup fails.
         """
-        if not self.pubchem_client:
-            return None
+        return self._resolve_drugs_via_pubchem([name]).get(name)
+
+    def _resolve_drugs_via_pubchem(self, names: List[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Resolve many drug names via PubChem in one pass.
+
+        Names are deduplicated, cached answers come from the local PubChem
+        name store, and the rest are looked up concurrently in batches under
+        the shared PubChem rate limit.
+
+        Returns:
+            Dict mapping each name to {'cid', 'generic_name'} or None
+        """
+        if not self.pubchem_resolver:
+            return {}
 
         try:
-            compound = self.pubchem_client.search_by_name(name)
-            if compound:
-                generic_name = self.pubchem_client.find_generic_name(name)
-                return {
-                    'cid': compound.cid,
-                    'generic_name': generic_name
-                }
+            resolved = self.pubchem_resolver.resolve_many(names)
         except Exception as e:
-            logger.debug(f"PubChem lookup failed for {name}: {e}")
-        return None
+            logger.debug(f"PubChem batch lookup failed: {e}")
+            return {}
+        return {
+            name: {'cid': info['cid'], 'generic_name': info.get('generic_name')} if info else None
+            for name, info in resolved.items()
+        }
 
     # Phase ranking for comparison (lower number = more advanced)
     PHASE_RANK = {
@@ -1495,11 +1724,14 @@ IMPORTANT:
         # Maps for deduplication
         drug_map: Dict[str, PipelineDrug] = {}  # canonical_name → drug
         cid_map: Dict[int, str] = {}  # pubchem_cid → canonical_name
+        all_drugs = trials_drugs + news_drugs
+
+        # Resolve every distinct name up front (cached, concurrent, batched)
+        pubchem_results = self._resolve_drugs_via_pubchem([drug.generic_name for drug in all_drugs])
 
         def get_canonical_key(drug: PipelineDrug) -> str:
             """Get canonical key for drug, using PubChem when available."""
-            # Try to resolve via PubChem
-            pubchem_info = self._resolve_drug_via_pubchem(drug.generic_name)
+            pubchem_info = pubchem_results.get(drug.generic_name)
 
             if pubchem_info and pubchem_info.get('cid'):
                 cid = pubchem_info['cid']
@@ -1555,7 +1787,7 @@ IMPORTANT:
                 existing.pubchem_cid = incoming.pubchem_cid
 
         # Process all drugs (trials first, then news)
-        for drug in trials_drugs + news_drugs:
+        for drug in all_drugs:
             key = get_canonical_key(drug)
 
             if key in drug_map:
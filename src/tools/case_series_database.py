@@ -6,12 +6,13 @@ Handles progressive saving, caching, and historical run management.
 
 import json
 import logging
+import threading
 import uuid
 from datetime import datetime, timedelta
-from typing import List, Optional, Dict, Any, Tuple, Set
-import psycopg2
+from typing import List, Optional, Dict, Any, Iterable, Tuple, Set
 from psycopg2.extras import RealDictCursor, Json
 
+from src.tools import db_pool
 from src.models.case_series_schemas import (
     CaseSeriesExtraction,
     MarketIntelligence,
@@ -28,6 +29,48 @@ from src.models.case_series_schemas import (
 logger = logging.getLogger(__name__)
 
 
+def refresh_drug_summary(cur, drug_name: Optional[str]) -> None:
+    """
+    Refresh the materialized browser summaries (migration 022) for one drug.
+
+    Runs in a savepoint on the caller's cursor, so it commits with the write
+    that touched the drug, and a failure (e.g. migration not yet applied)
+    never aborts that write.
+    """
+    if not drug_name:
+        return
+    cur.execute("SAVEPOINT cs_drug_summary")
+    try:
+        cur.execute("SELECT cs_refresh_drug_summary(%s)", (drug_name,))
+        cur.execute("RELEASE SAVEPOINT cs_drug_summary")
+    except Exception as e:
+        cur.execute("ROLLBACK TO SAVEPOINT cs_drug_summary")
+        logger.debug(f"Could not refresh browser summary for {drug_name}: {e}")
+
+
+def refresh_drug_summaries(cur, drug_names: Optional[Iterable[str]] = None) -> None:
+    """
+    Refresh the browser summaries for several drugs, once per drug.
+
+    Args:
+        cur: Cursor of the transaction that wrote the drugs' rows
+        drug_names: Drugs to refresh (case-insensitive); None rebuilds every
+            drug with cs_refresh_all_drug_summaries()
+    """
+    if drug_names is not None:
+        for drug_name in sorted({name.lower() for name in drug_names if name}):
+            refresh_drug_summary(cur, drug_name)
+        return
+
+    cur.execute("SAVEPOINT cs_drug_summary")
+    try:
+        cur.execute("SELECT cs_refresh_all_drug_summaries()")
+        cur.execute("RELEASE SAVEPOINT cs_drug_summary")
+    except Exception as e:
+        cur.execute("ROLLBACK TO SAVEPOINT cs_drug_summary")
+        logger.warning(f"Could not rebuild browser summaries: {e}")
+
+
 class CaseSeriesDatabase:
     """
     Database interface for case series workflow.
@@ -37,6 +80,11 @@ class CaseSeriesDatabase:
     - Check cache before making API calls
     - Load historical runs
     - Track token usage and costs
+
+    Writes to extractions and opportunities mark their drug's browser
+    summary stale; update_run_status() refreshes each stale drug once when
+    the run completes or fails. Use refresh_drug_summaries() after writing
+    outside a run.
     """
 
     def __init__(self, database_url: str, cache_max_age_days: int = 30):
@@ -49,8 +97,10 @@ class CaseSeriesDatabase:
         """
         self.database_url = database_url
         self.cache_max_age_days = cache_max_age_days
-        self._conn = None
         self._available = None
+        # run_id -> drugs whose browser summaries the run has made stale
+        self._stale_summaries: Dict[str, Set[str]] = {}
+        self._stale_summaries_lock = threading.Lock()
 
     @property
     def is_available(self) -> bool:
@@ -67,14 +117,12 @@ class CaseSeriesDatabase:
         return self._available
 
     def _get_connection(self):
-        """Get a new database connection."""
-        return psycopg2.connect(self.database_url)
+        """Get a pooled database connection; close() returns it to the pool."""
+        return db_pool.connect(self.database_url)
 
     def _get_persistent_connection(self):
-        """Get persistent database connection (reuses connection)."""
-        if self._conn is None or self._conn.closed:
-            self._conn = psycopg2.connect(self.database_url)
-        return self._conn
+        """Get the calling thread's pinned pooled connection."""
+        return db_pool.get_pool(self.database_url).thread_connection()
 
     # =====================================================
     # RUN MANAGEMENT
@@ -106,10 +154,20 @@ class CaseSeriesDatabase:
 
     def update_run_status(self, run_id: str, status: str,
                           error_message: Optional[str] = None) -> None:
-        """Update run status (in_progress, completed, failed)."""
+        """
+        Update run status (in_progress, completed, failed).
+
+        A finished run (completed or failed) also refreshes the browser
+        summaries of the drugs it wrote.
+        """
         if not self.is_available:
             return
 
+        stale_drugs: Set[str] = set()
+        if status in ('completed', 'failed'):
+            with self._stale_summaries_lock:
+                stale_drugs = self._stale_summaries.pop(str(run_id), set())
+
         conn = self._get_connection()
         try:
             with conn.cursor() as cur:
@@ -129,13 +187,45 @@ class CaseSeriesDatabase:
                     cur.execute("""
                         UPDATE cs_analysis_runs SET status = %s WHERE run_id = %s
                     """, (status, run_id))
+                refresh_drug_summaries(cur, stale_drugs)
                 conn.commit()
         except Exception as e:
             conn.rollback()
+            if stale_drugs:
+                with self._stale_summaries_lock:
+                    self._stale_summaries.setdefault(str(run_id), set()).update(stale_drugs)
             logger.error(f"Error updating run status: {e}")
         finally:
             conn.close()
 
+    def _mark_summary_stale(self, run_id: str, drug_name: Optional[str]) -> None:
+        """Record that a run changed rows behind a drug's browser summary."""
+        if not drug_name:
+            return
+        with self._stale_summaries_lock:
+            self._stale_summaries.setdefault(str(run_id), set()).add(drug_name.lower())
+
+    def refresh_drug_summaries(self, drug_names: Optional[Iterable[str]] = None) -> None:
+        """
+        Refresh browser summaries now.
+
+        Args:
+            drug_names: Drugs to refresh; None rebuilds the summaries of every drug
+        """
+        if not self.is_available:
+            return
+
+        conn = self._get_connection()
+        try:
+            with conn.cursor() as cur:
+                refresh_drug_summaries(cur, drug_names)
+                conn.commit()
+        except Exception as e:
+            conn.rollback()
+            logger.error(f"Error refreshing browser summaries: {e}")
+        finally:
+            conn.close()
+
     def update_run_stats(self, run_id: str, **kwargs) -> None:
         """Update run statistics (papers_found, tokens, etc.)."""
         if not self.is_available:
@@ -531,6 +621,7 @@ class CaseSeriesDatabase:
                 ))
                 extraction_id = cur.fetchone()[0]
                 conn.commit()
+                self._mark_summary_stale(run_id, drug_name)
                 logger.info(f"Saved extraction {extraction_id} for {extraction.disease}")
                 return extraction_id
         except Exception as e:
@@ -874,6 +965,7 @@ class CaseSeriesDatabase:
                     consistency_level, study_count, response_rate_cv
                 ))
                 conn.commit()
+                self._mark_summary_stale(run_id, drug_name)
         except Exception as e:
             conn.rollback()
             logger.error(f"Error saving opportunity: {e}")
@@ -1030,8 +1122,13 @@ class CaseSeriesDatabase:
                     UPDATE cs_extractions
                     SET parent_disease = %s
                     WHERE run_id = %s AND pmid = %s
+                    RETURNING drug_name
                 """, (parent_disease, run_id, pmid))
+                drug_names = {row[0] for row in cur.fetchall()}
                 conn.commit()
+                # parent_disease is a summary column
+                for drug_name in drug_names:
+                    self._mark_summary_stale(run_id, drug_name)
         except Exception as e:
             conn.rollback()
             logger.error(f"Error updating parent disease for PMID {pmid}: {e}")
@@ -1066,6 +1163,7 @@ class CaseSeriesDatabase:
                     WHERE run_id = %s AND drug_name = %s AND disease = %s
                 """, (parent_disease, run_id, drug_name, disease))
                 conn.commit()
+                self._mark_summary_stale(run_id, drug_name)
         except Exception as e:
             conn.rollback()
             logger.error(f"Error updating parent disease for {disease}: {e}")
@@ -3,8 +3,8 @@ Clinical Extraction Database Interface
 
 Service class for saving and retrieving clinical trial extractions.
 """
-import psycopg2
 from psycopg2.extras import Json, RealDictCursor
+from src.tools import db_pool
 from typing import Dict, List, Optional, Any
 import logging
 from datetime import datetime
@@ -53,7 +53,7 @@ class ClinicalExtractionDatabase:
     def connect(self):
         """Establish database connection."""
         try:
-            self.connection = psycopg2.connect(self.database_url)
+            self.connection = db_pool.connect(self.database_url)
             logger.info("Connected to clinical extraction database")
         except Exception as e:
             logger.error(f"Failed to connect to clinical extraction database: {e}")
@@ -518,7 +518,7 @@ class ClinicalExtractionDatabase:
 
         quality_conn = None
         try:
-            quality_conn = psycopg2.connect(self.database_url)
+            quality_conn = db_pool.connect(self.database_url)
             cursor = quality_conn.cursor()
 
             # Save issues
@@ -687,7 +687,7 @@ class ClinicalExtractionDatabase:
         error_conn = None
         try:
             # Create a NEW connection for error logging to avoid transaction conflicts
-            error_conn = psycopg2.connect(self.database_url)
+            error_conn = db_pool.connect(self.database_url)
             cursor = error_conn.cursor()
 
             query = """
@@ -4,14 +4,63 @@ ClinicalTrials.gov API wrapper for querying clinical trial data.
 NOTE: This uses the 'requests' library instead of 'httpx' because ClinicalTrials.gov
 blocks httpx requests (likely due to HTTP/2 or TLS fingerprinting).
 """
+import time
 import requests
-from typing import List, Dict, Optional, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Optional, Any, Iterator, Sequence, Union
 import logging
 from datetime import datetime
 
+from src.drug_extraction_system.utils.rate_limiter import (
+    TokenBucketRateLimiter,
+    get_shared_token_bucket as get_shared_rate_bucket,
+)
+from src.tools.http_cache import ResponseCache, get_response_cache
+
 
 logger = logging.getLogger(__name__)
 
+# ClinicalTrials.gov allows ~50 requests/minute per client IP
+DEFAULT_REQUESTS_PER_MINUTE = 50
+DEFAULT_BURST = 5
+# Max seconds a request waits for a rate limiter token
+RATE_LIMIT_TIMEOUT = 120
+
+# Studies per page when paginating (API maximum is 1000)
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+# Concurrent queries in fan-out searches (all share the token bucket)
+DEFAULT_MAX_WORKERS = 4
+
+# Modules read by _parse_studies_for_landscape; requesting only these keeps
+# payloads small (results, derived and document sections are skipped)
+LANDSCAPE_FIELDS = [
+    "protocolSection.identificationModule",
+    "protocolSection.statusModule",
+    "protocolSection.sponsorCollaboratorsModule",
+    "protocolSection.conditionsModule",
+    "protocolSection.designModule",
+    "protocolSection.armsInterventionsModule",
+]
+
+
+class ClinicalTrialsIncompleteError(Exception):
+    """A paginated /studies query failed after some pages were already returned."""
+
+    def __init__(self, message: str, studies_fetched: int):
+        super().__init__(message)
+        self.studies_fetched = studies_fetched
+
+
+def get_shared_token_bucket() -> TokenBucketRateLimiter:
+    """Process-wide ClinicalTrials.gov limiter (the API limits per caller, not per client)."""
+    return get_shared_rate_bucket(
+        "ClinicalTrials.gov",
+        requests_per_second=DEFAULT_REQUESTS_PER_MINUTE / 60.0,
+        burst=DEFAULT_BURST
+    )
+
 
 class ClinicalTrialsAPI:
     """
@@ -22,16 +71,21 @@ class ClinicalTrialsAPI:
 
     BASE_URL = "https://clinicaltrials.gov/api/v2"
 
-    def __init__(self, api_key: Optional[str] = None, timeout: int = 30):
+    def __init__(self, api_key: Optional[str] = None, timeout: int = 30,
+                 response_cache: Optional[ResponseCache] = None,
+                 rate_limiter: Optional[TokenBucketRateLimiter] = None):
         """
         Initialize ClinicalTrials.gov API client.
 
         Args:
             api_key: Optional API key (for higher rate limits)
             timeout: Request timeout in seconds
+            response_cache: HTTP response cache (defaults to the shared on-disk cache)
+            rate_limiter: Token bucket (defaults to the process-wide bucket)
         """
         self.api_key = api_key
         self.timeout = timeout
+        self.response_cache = response_cache or get_response_cache()
         # Use requests library instead of httpx (ClinicalTrials.gov blocks httpx)
         self.session = requests.Session()
         self.session.headers.update({
@@ -39,25 +93,148 @@ class ClinicalTrialsAPI:
             'Accept': 'application/json',
             'Accept-Language': 'en-US,en;q=0.9'
         })
-        # Global rate limiter: 50 req/min = 1.2s minimum, we use 2s to be safe
-        self._last_request_time = None
-        self._min_request_interval = 2.0  # seconds between requests
+        self.rate_limiter = rate_limiter or get_shared_token_bucket()
 
     def _ensure_rate_limit(self):
-        """Enforce global rate limit by waiting if needed."""
-        import time
-        if self._last_request_time is not None:
-            time_since_last = time.time() - self._last_request_time
-            if time_since_last < self._min_request_interval:
-                wait_time = self._min_request_interval - time_since_last
-                logger.debug(f"Rate limit: waiting {wait_time:.2f}s")
-                time.sleep(wait_time)
-        self._last_request_time = time.time()
+        """Wait for a token from the shared rate limiter."""
+        if not self.rate_limiter.acquire(timeout=RATE_LIMIT_TIMEOUT):
+            raise requests.exceptions.RequestException("ClinicalTrials.gov rate limiter timeout")
+
+    def _get(self, url: str, params: Dict[str, Any]):
+        """GET through the shared response cache; only network calls are rate limited."""
+        def send(headers: Dict[str, str]):
+            # Enforce global rate limit
+            self._ensure_rate_limit()
+            return self.session.get(url, params=params, headers=headers, timeout=self.timeout)
+
+        return self.response_cache.fetch("clinicaltrials", url, params, send)
+
+    def _get_page(self, params: Dict[str, Any], max_retries: int = 3, label: str = "") -> Optional[Dict[str, Any]]:
+        """
+        Fetch one /studies page, retrying on 429.
+
+        Returns:
+            Parsed JSON page, or None on failure (logged)
+        """
+        for attempt in range(max_retries):
+            try:
+                response = self._get(f"{self.BASE_URL}/studies", params)
+                response.raise_for_status()
+                return response.json()
+
+            except requests.exceptions.HTTPError as e:
+                if e.response.status_code == 403:
+                    # 403 typically means access forbidden (not rate limit) - skip instead of retrying
+                    logger.warning(f"Access forbidden (403) for {label} - skipping")
+                    return None
+                elif e.response.status_code == 429:
+                    # 429 is actual rate limiting - wait and retry
+                    wait_time = (attempt + 1) * 2  # 2s, 4s, 6s
+                    logger.warning(f"Rate limited (429), waiting {wait_time}s before retry {attempt + 1}/{max_retries}")
+                    time.sleep(wait_time)
+                    continue
+                else:
+                    logger.error(f"ClinicalTrials.gov search failed with status {e.response.status_code}: {e}")
+                    return None
+            except requests.exceptions.RequestException as e:
+                logger.error(f"ClinicalTrials.gov search failed: {e}")
+                return None
+
+        logger.error(f"All {max_retries} retries exhausted for {label}")
+        return None
+
+    def iter_studies(
+        self,
+        params: Dict[str, Any],
+        max_results: Optional[int] = None,
+        fields: Optional[Union[str, Sequence[str]]] = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        max_retries: int = 3
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Yield raw studies for a /studies query, following nextPageToken.
+
+        Studies are yielded as each page arrives, so callers can stop early.
+        If the first page fails nothing is yielded (as for a failed search);
+        if a later page fails the results would be silently truncated, so
+        ClinicalTrialsIncompleteError is raised instead.
+
+        Args:
+            params: Query parameters (query.term, query.cond, query.intr, filter.*, sort)
+            max_results: Stop after this many studies (None = all pages)
+            fields: Modules/fields to return (e.g. LANDSCAPE_FIELDS); None = full records
+            page_size: Studies per request (capped at the API maximum of 1000)
+            max_retries: Retries per page on 429
+
+        Yields:
+            Raw study records
+
+        Raises:
+            ClinicalTrialsIncompleteError: A page after the first failed
+        """
+        params = dict(params, format="json")
+        params["pageSize"] = min(page_size, max_results or page_size, MAX_PAGE_SIZE)
+        if fields:
+            params["fields"] = fields if isinstance(fields, str) else ",".join(fields)
+        if self.api_key:
+            params["api_key"] = self.api_key
+
+        label = params.get("query.term") or params.get("query.intr") or params.get("query.cond") or "query"
+        yielded = 0
+        while True:
+            data = self._get_page(params, max_retries=max_retries, label=label)
+            if not data:
+                if "pageToken" in params:
+                    raise ClinicalTrialsIncompleteError(
+                        f"CT.gov pagination for '{label}' failed after {yielded} studies",
+                        studies_fetched=yielded
+                    )
+                return
+
+            for study in data.get("studies", []):
+                yield study
+                yielded += 1
+                if max_results is not None and yielded >= max_results:
+                    if data.get("nextPageToken"):
+                        logger.info(f"CT.gov results for '{label}' capped at {max_results} (more available)")
+                    return
+
+            page_token = data.get("nextPageToken")
+            if not page_token:
+                return
+            params["pageToken"] = page_token
+
+    def fetch_studies_concurrent(
+        self,
+        queries: List[Dict[str, Any]],
+        max_results_per_query: Optional[int] = None,
+        fields: Optional[Union[str, Sequence[str]]] = None,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        max_retries: int = 3
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Run several /studies queries concurrently.
+
+        Returns:
+            One list of raw studies per query, in query order
+
+        Raises:
+            ClinicalTrialsIncompleteError: A query's pagination failed part way
+        """
+        if not queries:
+            return []
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(queries)))) as executor:
+            return list(executor.map(
+                lambda params: list(self.iter_studies(
+                    params, max_results_per_query, fields, max_retries=max_retries
+                )),
+                queries
+            ))
 
     def search_studies(
         self,
         query: str,
-        max_results: int = 10,
+        max_results: Optional[int] = 10,
         filter_advanced: Optional[str] = None
     ) -> List[Dict[str, Any]]:
         """
@@ -65,44 +242,22 @@ class ClinicalTrialsAPI:
 
         Args:
             query: Search query (drug name, condition, etc.)
-            max_results: Maximum number of results to return
+            max_results: Maximum number of results to return (None = all pages)
             filter_advanced: Advanced filter expression
 
         Returns:
             List of study records
-        """
-        try:
-            params = {
-                "query.term": query,
-                "pageSize": max_results,
-                "format": "json"
-            }
-
-            if filter_advanced:
-                params["filter.advanced"] = filter_advanced
-
-            if self.api_key:
-                params["api_key"] = self.api_key
-
-            # Enforce global rate limit
-            self._ensure_rate_limit()
-
-            response = self.session.get(
-                f"{self.BASE_URL}/studies",
-                params=params,
-                timeout=self.timeout
-            )
-            response.raise_for_status()
-
-            data = response.json()
-            studies = data.get("studies", [])
 
-            logger.info(f"Found {len(studies)} studies for query: {query}")
-            return studies
+        Raises:
+            ClinicalTrialsIncompleteError: Pagination failed part way
+        """
+        params = {"query.term": query}
+        if filter_advanced:
+            params["filter.advanced"] = filter_advanced
 
-        except requests.exceptions.RequestException as e:
-            logger.error(f"ClinicalTrials.gov API error: {str(e)}")
-            return []
+        studies = list(self.iter_studies(params, max_results=max_results))
+        logger.info(f"Found {len(studies)} studies for query: {query}")
+        return studies
 
     def get_study_details(self, nct_id: str) -> Optional[Dict[str, Any]]:
         """
@@ -119,14 +274,7 @@ class ClinicalTrialsAPI:
             if self.api_key:
                 params["api_key"] = self.api_key
 
-            # Enforce global rate limit
-            self._ensure_rate_limit()
-
-            response = self.session.get(
-                f"{self.BASE_URL}/studies/{nct_id}",
-                params=params,
-                timeout=self.timeout
-            )
+            response = self._get(f"{self.BASE_URL}/studies/{nct_id}", params)
             response.raise_for_status()
 
             data = response.json()
@@ -238,7 +386,7 @@ Primary Outcomes: {len(summary['primary_outcomes'])} defined
         self,
         drug_name: str,
         condition: Optional[str] = None,
-        max_results: int = 50,
+        max_results: Optional[int] = 50,
         max_retries: int = 3,
         use_fuzzy_search: bool = True
     ) -> List[Dict[str, Any]]:
@@ -251,78 +399,32 @@ Primary Outcomes: {len(summary['primary_outcomes'])} defined
         Args:
             drug_name: Name of drug or intervention
             condition: Optional condition filter
-            max_results: Maximum number of results
+            max_results: Maximum number of results (None = every page)
             max_retries: Maximum number of retry attempts for rate limits
             use_fuzzy_search: If True, use general term search (recommended). If False, use structured field search.
 
         Returns:
             List of trial summaries with parsed data
         """
-        import time
-
         if use_fuzzy_search:
             # Use general term search (fuzzy) - searches all fields
             query = f"{drug_name} {condition}" if condition else drug_name
-            params = {
-                "query.term": query,
-                "pageSize": max_results,
-                "format": "json"
-            }
+            params = {"query.term": query}
         else:
             # Use structured field search (restrictive) - exact field matching
-            params = {
-                "query.intr": drug_name,
-                "pageSize": max_results,
-                "format": "json"
-            }
+            params = {"query.intr": drug_name}
             if condition:
                 params["query.cond"] = condition
 
-        if self.api_key:
-            params["api_key"] = self.api_key
-
-        for attempt in range(max_retries):
-            try:
-                # Enforce global rate limit
-                self._ensure_rate_limit()
-
-                response = self.session.get(
-                    f"{self.BASE_URL}/studies",
-                    params=params,
-                    timeout=self.timeout
-                )
-                response.raise_for_status()
-
-                data = response.json()
-                studies = data.get("studies", [])
-
-                search_type = "fuzzy term search" if use_fuzzy_search else "structured field search"
-                logger.info(f"Found {len(studies)} trials for {drug_name} using {search_type}")
-
-                # Parse studies into simplified format
-                return self._parse_studies_for_landscape(studies)
+        studies = list(self.iter_studies(
+            params, max_results=max_results, fields=LANDSCAPE_FIELDS, max_retries=max_retries
+        ))
 
-            except requests.exceptions.HTTPError as e:
-                if e.response.status_code == 403:
-                    # 403 typically means access forbidden (not rate limit) - skip drug instead of retrying
-                    logger.warning(f"Access forbidden (403) for {drug_name} - skipping")
-                    return []
-                elif e.response.status_code == 429:
-                    # 429 is actual rate limiting - wait and retry
-                    wait_time = (attempt + 1) * 2  # 2s, 4s, 6s
-                    logger.warning(f"Rate limited (429), waiting {wait_time}s before retry {attempt + 1}/{max_retries}")
-                    time.sleep(wait_time)
-                    continue
-                else:
-                    logger.error(f"ClinicalTrials.gov search failed with status {e.response.status_code}: {e}")
-                    return []
-            except requests.exceptions.RequestException as e:
-                logger.error(f"ClinicalTrials.gov search failed: {e}")
-                return []
+        search_type = "fuzzy term search" if use_fuzzy_search else "structured field search"
+        logger.info(f"Found {len(studies)} trials for {drug_name} using {search_type}")
 
-        # All retries exhausted
-        logger.error(f"All {max_retries} retries exhausted for {drug_name}")
-        return []
+        # Parse studies into simplified format
+        return self._parse_studies_for_landscape(studies)
 
     def search_pivotal_trials(
         self,
@@ -355,8 +457,6 @@ Primary Outcomes: {len(summary['primary_outcomes'])} defined
         Returns:
             List of trial summaries with parsed data
         """
-        import time
-
         all_trials = []
         seen_ncts = set()
 
@@ -379,65 +479,29 @@ Primary Outcomes: {len(summary['primary_outcomes'])} defined
 
         advanced_filter = " AND ".join(filter_parts) if filter_parts else None
 
-        # Search for each condition term
+        # Search all condition terms concurrently (shared token bucket)
+        queries = []
         for condition in conditions:
-            if len(all_trials) >= max_results:
-                break
-
-            params = {
-                "query.intr": drug_name,
-                "query.cond": condition,
-                "pageSize": max_results,
-                "format": "json"
-            }
-
+            params = {"query.intr": drug_name, "query.cond": condition}
             if advanced_filter:
                 params["filter.advanced"] = advanced_filter
+            queries.append(params)
 
-            if self.api_key:
-                params["api_key"] = self.api_key
-
-            for attempt in range(max_retries):
-                try:
-                    self._ensure_rate_limit()
-
-                    response = self.session.get(
-                        f"{self.BASE_URL}/studies",
-                        params=params,
-                        timeout=self.timeout
-                    )
-                    response.raise_for_status()
-
-                    data = response.json()
-                    studies = data.get("studies", [])
-
-                    logger.info(
-                        f"CT.gov structured search: intr='{drug_name}' cond='{condition}' "
-                        f"filter='{advanced_filter}' -> {len(studies)} trials"
-                    )
+        per_condition = self.fetch_studies_concurrent(
+            queries, max_results_per_query=max_results, fields=LANDSCAPE_FIELDS, max_retries=max_retries
+        )
 
-                    # Parse and deduplicate
-                    parsed = self._parse_studies_for_landscape(studies)
-                    for trial in parsed:
-                        nct_id = trial.get('nct_id')
-                        if nct_id and nct_id not in seen_ncts:
-                            seen_ncts.add(nct_id)
-                            all_trials.append(trial)
-
-                    break  # Success
-
-                except requests.exceptions.HTTPError as e:
-                    if e.response.status_code == 429:
-                        wait_time = (attempt + 1) * 2
-                        logger.warning(f"Rate limited, waiting {wait_time}s")
-                        time.sleep(wait_time)
-                        continue
-                    else:
-                        logger.warning(f"Search failed for condition '{condition}': {e}")
-                        break
-                except requests.exceptions.RequestException as e:
-                    logger.warning(f"Search failed for condition '{condition}': {e}")
-                    break
+        # Deduplicate in condition order so earlier (primary) terms win
+        for condition, studies in zip(conditions, per_condition):
+            logger.info(
+                f"CT.gov structured search: intr='{drug_name}' cond='{condition}' "
+                f"filter='{advanced_filter}' -> {len(studies)} trials"
+            )
+            for trial in self._parse_studies_for_landscape(studies):
+                nct_id = trial.get('nct_id')
+                if nct_id and nct_id not in seen_ncts:
+                    seen_ncts.add(nct_id)
+                    all_trials.append(trial)
 
         logger.info(f"Total unique pivotal trials found: {len(all_trials)}")
         return all_trials[:max_results]
@@ -471,7 +535,7 @@ Primary Outcomes: {len(summary['primary_outcomes'])} defined
         condition: str,
         sponsor_type: Optional[str] = "INDUSTRY",
         min_phase: Optional[str] = None,
-        max_results: int = 100
+        max_results: Optional[int] = 100
     ) -> List[Dict[str, Any]]:
         """
         Search trials by medical condition.
@@ -480,50 +544,25 @@ Primary Outcomes: {len(summary['primary_outcomes'])} defined
             condition: Disease or condition
             sponsor_type: "INDUSTRY", "NIH", or None for all
             min_phase: Minimum phase (e.g., "Phase 2")
-            max_results: Maximum number of results
+            max_results: Maximum number of results (None = every page)
 
         Returns:
             List of trial summaries
         """
-        try:
-            params = {
-                "query.cond": condition,
-                "pageSize": max_results,
-                "format": "json"
-            }
+        params = {"query.cond": condition}
+        if sponsor_type:
+            params["filter.advanced"] = f"AREA[LeadSponsorClass]{sponsor_type}"
 
-            if sponsor_type:
-                params["filter.advanced"] = f"AREA[LeadSponsorClass]{sponsor_type}"
+        studies = list(self.iter_studies(params, max_results=max_results, fields=LANDSCAPE_FIELDS))
+        logger.info(f"Found {len(studies)} trials for condition: {condition}")
 
-            if self.api_key:
-                params["api_key"] = self.api_key
+        # Parse and optionally filter by phase
+        parsed = self._parse_studies_for_landscape(studies)
 
-            # Enforce global rate limit
-            self._ensure_rate_limit()
+        if min_phase:
+            parsed = [s for s in parsed if self._meets_phase_requirement(s.get("phase"), min_phase)]
 
-            response = self.session.get(
-                f"{self.BASE_URL}/studies",
-                params=params,
-                timeout=self.timeout
-            )
-            response.raise_for_status()
-
-            data = response.json()
-            studies = data.get("studies", [])
-
-            logger.info(f"Found {len(studies)} trials for condition: {condition}")
-
-            # Parse and optionally filter by phase
-            parsed = self._parse_studies_for_landscape(studies)
-
-            if min_phase:
-                parsed = [s for s in parsed if self._meets_phase_requirement(s.get("phase"), min_phase)]
-
-            return parsed
-
-        except requests.exceptions.RequestException as e:
-            logger.error(f"ClinicalTrials.gov search by condition failed: {e}")
-            return []
+        return parsed
 
     def get_trial_details(self, nct_id: str) -> Optional[Dict[str, Any]]:
         """
@@ -540,14 +579,7 @@ Primary Outcomes: {len(summary['primary_outcomes'])} defined
             if self.api_key:
                 params["api_key"] = self.api_key
 
-            # Enforce global rate limit
-            self._ensure_rate_limit()
-
-            response = self.session.get(
-                f"{self.BASE_URL}/studies/{nct_id}",
-                params=params,
-                timeout=self.timeout
-            )
+            response = self._get(f"{self.BASE_URL}/studies/{nct_id}", params)
             response.raise_for_status()
 
             data = response.json()
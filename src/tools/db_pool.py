@@ -0,0 +1,410 @@
+"""
+Process-wide PostgreSQL connection pool shared by the psycopg2 database layers.
+
+The database classes in this package historically opened a fresh
+``psycopg2.connect`` for every method call (a TCP + auth handshake per query).
+``connect(database_url)`` is a drop-in replacement: it checks a connection out
+of a bounded pool keyed by DSN and returns a proxy whose ``close()`` hands the
+connection back instead of closing it, so existing
+``conn = ...; try: ... finally: conn.close()`` call sites keep working.
+
+Features:
+- Bounded size; callers wait (up to a timeout) when every slot is checked out
+- Health checks: closed/broken connections are discarded, idle ones are pinged
+- Connections are rolled back and reset on return
+- Per-thread checkout (``thread_connection``) for ThreadPoolExecutor workers
+  and other long-lived callers that want one connection per thread
+- Metrics: created, in use, idle, checkouts, wait time, health check failures
+
+Configuration (environment):
+    DB_POOL_MAX_SIZE: Maximum connections per DSN (default 10)
+    DB_POOL_TIMEOUT: Seconds to wait for a free connection (default 30)
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Optional
+
+import psycopg2
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_SIZE = 10
+DEFAULT_TIMEOUT = 30.0
+# Idle connections older than this are pinged before being handed out
+DEFAULT_HEALTH_CHECK_AFTER = 30.0
+
+
+class PoolTimeoutError(psycopg2.OperationalError):
+    """Raised when no pooled connection becomes available within the timeout."""
+
+
+class PooledConnection:
+    """
+    Proxy around a pooled psycopg2 connection.
+
+    Attribute access is forwarded to the underlying connection. ``close()``
+    returns the connection to its pool; it is idempotent, and a proxy that is
+    garbage collected without being closed is returned automatically.
+    """
+
+    def __init__(self, pool: "ConnectionPool", raw):
+        self._pool = pool
+        self._raw = raw
+
+    @property
+    def closed(self) -> int:
+        """Mirror ``connection.closed``: non-zero once returned to the pool."""
+        if self._raw is None:
+            return 1
+        return self._raw.closed
+
+    @property
+    def raw(self):
+        """The underlying psycopg2 connection (None after close)."""
+        return self._raw
+
+    def close(self):
+        """Return the connection to the pool."""
+        raw, self._raw = self._raw, None
+        if raw is not None:
+            self._pool._release(raw)
+
+    def __getattr__(self, name):
+        raw = self.__dict__.get("_raw")
+        if raw is None:
+            raise psycopg2.InterfaceError("connection already returned to pool")
+        return getattr(raw, name)
+
+    def __setattr__(self, name, value):
+        if name in ("_pool", "_raw"):
+            object.__setattr__(self, name, value)
+        else:
+            # e.g. conn.autocommit = True
+            setattr(self._raw, name, value)
+
+    def __enter__(self):
+        # Same semantics as psycopg2: commit/rollback on exit, do not close
+        self._raw.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        return self._raw.__exit__(exc_type, exc_val, exc_tb)
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+
+
+class _ThreadCheckout:
+    """Holder for a thread's pinned connection; released when the thread exits."""
+
+    def __init__(self, conn: PooledConnection):
+        self.conn = conn
+
+    def __del__(self):
+        try:
+            self.conn.close()
+        except Exception:
+            pass
+
+
+class ConnectionPool:
+    """
+    Bounded, thread-safe pool of psycopg2 connections for a single DSN.
+
+    Args:
+        dsn: PostgreSQL connection string
+        max_size: Maximum number of open connections
+        timeout: Seconds to wait for a free connection before raising
+            PoolTimeoutError
+        health_check_after: Idle seconds after which a connection is pinged
+            with ``SELECT 1`` before reuse
+        connect: Connection factory (defaults to ``psycopg2.connect``);
+            tests pass an in-process stand-in
+    """
+
+    def __init__(
+        self,
+        dsn: str,
+        max_size: int = DEFAULT_MAX_SIZE,
+        timeout: float = DEFAULT_TIMEOUT,
+        health_check_after: float = DEFAULT_HEALTH_CHECK_AFTER,
+        connect: Optional[Callable[[str], Any]] = None,
+    ):
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        self.dsn = dsn
+        self.max_size = max_size
+        self.timeout = timeout
+        self.health_check_after = health_check_after
+        self._connect = connect or psycopg2.connect
+
+        # RLock so a proxy finalized by GC on a thread already inside the
+        # pool can still release without deadlocking
+        self._cond = threading.Condition(threading.RLock())
+        self._idle = deque()  # (raw, returned_at), most recently used last
+        self._size = 0  # open connections, idle + in use
+        self._in_use = 0
+        self._closed = False
+        self._local = threading.local()
+
+        self._stats = {
+            "created": 0,
+            "discarded": 0,
+            "checkouts": 0,
+            "waits": 0,
+            "wait_time_total": 0.0,
+            "wait_time_max": 0.0,
+            "timeouts": 0,
+            "health_check_failures": 0,
+        }
+
+    # -----------------------------------------------------
+    # Checkout / return
+    # -----------------------------------------------------
+
+    def getconn(self, timeout: Optional[float] = None) -> PooledConnection:
+        """
+        Check out a connection.
+
+        Args:
+            timeout: Override for the pool's wait timeout
+
+        Returns:
+            PooledConnection; call ``close()`` to return it
+        """
+        timeout = self.timeout if timeout is None else timeout
+        start = time.monotonic()
+        deadline = start + timeout
+        waited = False
+
+        while True:
+            raw = None
+            create = False
+            with self._cond:
+                if self._closed:
+                    raise psycopg2.InterfaceError("connection pool is closed")
+                while not self._idle and self._size >= self.max_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._stats["timeouts"] += 1
+                        raise PoolTimeoutError(
+                            f"No database connection available after {timeout:.1f}s "
+                            f"(pool size {self.max_size}, all in use)"
+                        )
+                    waited = True
+                    self._cond.wait(remaining)
+                if self._idle:
+                    raw, returned_at = self._idle.pop()
+                else:
+                    create = True
+                    returned_at = None
+                self._size += 1 if create else 0
+                self._in_use += 1
+
+            # Connect / ping outside the lock so slow servers don't block others
+            if create:
+                try:
+                    raw = self._connect(self.dsn)
+                except Exception:
+                    self._forget(count_discard=False)
+                    raise
+                with self._cond:
+                    self._stats["created"] += 1
+            elif not self._is_healthy(raw, returned_at):
+                self._discard(raw)
+                continue
+
+            wait_time = time.monotonic() - start
+            with self._cond:
+                self._stats["checkouts"] += 1
+                if waited:
+                    self._stats["waits"] += 1
+                self._stats["wait_time_total"] += wait_time
+                self._stats["wait_time_max"] = max(self._stats["wait_time_max"], wait_time)
+            return PooledConnection(self, raw)
+
+    @contextmanager
+    def connection(self, timeout: Optional[float] = None):
+        """Context manager that checks a connection out and returns it on exit."""
+        conn = self.getconn(timeout=timeout)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def thread_connection(self) -> PooledConnection:
+        """
+        Get the connection pinned to the calling thread.
+
+        The first call in a thread checks a connection out; later calls in the
+        same thread return it again. It goes back to the pool when the thread
+        exits, when ``release_thread_connection()`` is called, or when the
+        caller closes it. Use this for per-worker connections in
+        ThreadPoolExecutor paths and for long-lived "persistent" connections.
+        """
+        holder = getattr(self._local, "checkout", None)
+        if holder is not None and not holder.conn.closed:
+            return holder.conn
+        conn = self.getconn()
+        self._local.checkout = _ThreadCheckout(conn)
+        return conn
+
+    def release_thread_connection(self):
+        """Return the calling thread's pinned connection, if any."""
+        holder = getattr(self._local, "checkout", None)
+        self._local.checkout = None
+        if holder is not None:
+            holder.conn.close()
+
+    def _release(self, raw):
+        """Return a raw connection to the idle set, or drop it if unusable."""
+        if raw.closed:
+            self._discard(raw)
+            return
+        try:
+            # Leave no open transaction or changed session state behind
+            if not raw.autocommit:
+                raw.rollback()
+            else:
+                raw.autocommit = False
+        except Exception as e:
+            logger.debug(f"Discarding connection that failed reset: {e}")
+            self._discard(raw)
+            return
+
+        with self._cond:
+            self._in_use -= 1
+            if self._closed:
+                self._size -= 1
+                self._close_raw(raw)
+            else:
+                self._idle.append((raw, time.monotonic()))
+            self._cond.notify()
+
+    def _is_healthy(self, raw, returned_at: Optional[float]) -> bool:
+        if raw.closed:
+            return False
+        if returned_at is None or time.monotonic() - returned_at < self.health_check_after:
+            return True
+        try:
+            cur = raw.cursor()
+            try:
+                cur.execute("SELECT 1")
+            finally:
+                cur.close()
+            raw.rollback()
+            return True
+        except Exception as e:
+            logger.warning(f"Pooled connection failed health check: {e}")
+            with self._cond:
+                self._stats["health_check_failures"] += 1
+            return False
+
+    def _discard(self, raw):
+        self._close_raw(raw)
+        self._forget(count_discard=True)
+
+    def _forget(self, count_discard: bool):
+        with self._cond:
+            self._size -= 1
+            self._in_use -= 1
+            if count_discard:
+                self._stats["discarded"] += 1
+            self._cond.notify()
+
+    @staticmethod
+    def _close_raw(raw):
+        try:
+            raw.close()
+        except Exception:
+            pass
+
+    # -----------------------------------------------------
+    # Lifecycle / metrics
+    # -----------------------------------------------------
+
+    def close(self):
+        """Close idle connections; in-use ones are closed when returned."""
+        with self._cond:
+            self._closed = True
+            while self._idle:
+                raw, _ = self._idle.pop()
+                self._size -= 1
+                self._close_raw(raw)
+            self._cond.notify_all()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return pool metrics."""
+        with self._cond:
+            stats = dict(self._stats)
+            stats.update({
+                "size": self._size,
+                "in_use": self._in_use,
+                "idle": len(self._idle),
+                "max_size": self.max_size,
+            })
+        checkouts = stats["checkouts"]
+        stats["wait_time_avg"] = stats["wait_time_total"] / checkouts if checkouts else 0.0
+        return stats
+
+
+# =====================================================
+# Process-wide registry
+# =====================================================
+
+_pools: Dict[str, ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(database_url: str, **kwargs) -> ConnectionPool:
+    """
+    Get the shared pool for a database URL, creating it on first use.
+
+    Keyword arguments are only applied when the pool is created.
+    """
+    if not database_url:
+        raise ValueError("database_url is required")
+    with _pools_lock:
+        pool = _pools.get(database_url)
+        if pool is None:
+            kwargs.setdefault("max_size", int(os.getenv("DB_POOL_MAX_SIZE", DEFAULT_MAX_SIZE)))
+            kwargs.setdefault("timeout", float(os.getenv("DB_POOL_TIMEOUT", DEFAULT_TIMEOUT)))
+            pool = ConnectionPool(database_url, **kwargs)
+            _pools[database_url] = pool
+        return pool
+
+
+def connect(database_url: str) -> PooledConnection:
+    """Drop-in replacement for ``psycopg2.connect`` backed by the shared pool."""
+    return get_pool(database_url).getconn()
+
+
+def get_pool_stats() -> Dict[str, Dict[str, Any]]:
+    """Metrics for every shared pool, keyed by DSN with credentials masked."""
+    with _pools_lock:
+        pools = list(_pools.items())
+    return {_mask_dsn(dsn): pool.get_stats() for dsn, pool in pools}
+
+
+def close_all_pools():
+    """Close and forget every shared pool."""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close()
+
+
+def _mask_dsn(dsn: str) -> str:
+    if "@" in dsn and "://" in dsn:
+        scheme, rest = dsn.split("://", 1)
+        return f"{scheme}://***@{rest.rsplit('@', 1)[1]}"
+    return dsn
@@ -0,0 +1,424 @@
+"""
+Persistent HTTP response cache shared by the src/tools API clients.
+
+Re-running the same drug issues identical E-utilities, Semantic Scholar,
+ClinicalTrials.gov and bioRxiv requests, each paying rate-limit sleeps.
+This cache stores successful GET responses on disk (SQLite, WAL mode) so
+overlapping runs mostly skip the network:
+- Keys are the normalized URL plus sorted query params (credentials and
+  tracking params like api_key/email/tool are excluded)
+- Each source has its own TTL
+- Expired entries with an ETag/Last-Modified are revalidated with a
+  conditional request; a 304 refreshes the entry without re-downloading
+- Total size is bounded with least-recently-used eviction
+- Hit/miss/revalidation counters are exposed via get_stats()
+
+Set HTTP_CACHE_DISABLED=1 to bypass it, or HTTP_CACHE_DIR to relocate it.
+"""
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Mapping, Optional
+from urllib.parse import urlencode, urlsplit, urlunsplit, parse_qsl
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = Path("data/http_cache")
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+# Time-to-live per source, in seconds
+DAY = 24 * 60 * 60
+DEFAULT_TTLS: Dict[str, int] = {
+    "pubmed_esearch": 1 * DAY,      # search results change as papers are indexed
+    "pubmed_efetch": 30 * DAY,      # article records are effectively immutable
+    "pmc_efetch": 30 * DAY,
+    "semantic_scholar": 7 * DAY,
+    "clinicaltrials": 1 * DAY,      # trial records are updated frequently
+    "biorxiv": 1 * DAY,
+}
+DEFAULT_TTL = 1 * DAY
+
+# Params that identify the caller rather than the resource
+IGNORED_PARAMS = frozenset({"api_key", "email", "tool"})
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    cache_key TEXT PRIMARY KEY,
+    source TEXT NOT NULL,
+    url TEXT NOT NULL,
+    status_code INTEGER NOT NULL,
+    headers TEXT,
+    body BLOB NOT NULL,
+    size_bytes INTEGER NOT NULL,
+    stored_at REAL NOT NULL,
+    expires_at REAL NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_responses_last_access ON responses (last_access);
+"""
+
+# Response headers kept with the entry (validators + content type)
+_KEPT_HEADERS = ("etag", "last-modified", "content-type")
+
+
+def normalize_request(url: str, params: Optional[Mapping[str, Any]] = None) -> str:
+    """
+    Build a canonical string for a GET request.
+
+    Scheme/host are lowercased, query params from the URL and ``params`` are
+    merged, sorted and percent-encoded (so a value containing "&" or "="
+    cannot collide with another param), and caller-identifying params are
+    dropped.
+    """
+    parts = urlsplit(url)
+    items = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)]
+    for key, value in (params or {}).items():
+        if value is None:
+            continue
+        if isinstance(value, (list, tuple)):
+            items.extend((key, str(v)) for v in value)
+        else:
+            items.append((key, str(value)))
+    items = sorted((k, v) for k, v in items if k not in IGNORED_PARAMS)
+    query = urlencode(items, doseq=True)
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path.rstrip("/"), query, ""))
+
+
+class CachedResponse:
+    """Minimal response object served from the cache (httpx/requests compatible subset)."""
+
+    from_cache = True
+
+    def __init__(self, url: str, status_code: int, headers: Dict[str, str], content: bytes):
+        self.url = url
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+
+    @property
+    def text(self) -> str:
+        return self.content.decode("utf-8", errors="replace")
+
+    def iter_bytes(self, chunk_size: Optional[int] = None) -> Iterator[bytes]:
+        if chunk_size is None:
+            yield self.content
+            return
+        for i in range(0, len(self.content), chunk_size):
+            yield self.content[i:i + chunk_size]
+
+    def json(self) -> Any:
+        return json.loads(self.content)
+
+    def raise_for_status(self) -> None:
+        """Cached entries are always successful responses."""
+        return None
+
+
+class ResponseCache:
+    """
+    Disk-backed GET response cache.
+
+    Thread-safe (one SQLite connection per thread) and safe to share between
+    processes using the same directory.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Path = DEFAULT_CACHE_DIR,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        ttls: Optional[Dict[str, int]] = None,
+        enabled: bool = True,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir: Directory for the cache database
+            max_bytes: Size bound for stored (compressed) bodies
+            ttls: Per-source TTL overrides in seconds
+            enabled: If False, every fetch goes to the network
+        """
+        self.enabled = enabled
+        self.max_bytes = max_bytes
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.db_path = Path(cache_dir) / "responses.sqlite3"
+        self._local = threading.local()
+        self._stats_lock = threading.Lock()
+        # Serializes writes with the size accounting and eviction they trigger
+        # (reentrant: store() evicts while holding it)
+        self._write_lock = threading.RLock()
+        self._stats = {
+            "hits": 0,
+            "misses": 0,
+            "revalidated": 0,
+            "stale_served": 0,
+            "stores": 0,
+            "evictions": 0,
+        }
+        self._approx_bytes = 0
+
+        if self.enabled:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = self._conn()
+            conn.executescript(_SCHEMA)
+            row = conn.execute("SELECT COALESCE(SUM(size_bytes), 0) FROM responses").fetchone()
+            self._approx_bytes = row[0]
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.db_path), timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _count(self, name: str, n: int = 1):
+        with self._stats_lock:
+            self._stats[name] += n
+
+    def ttl_for(self, source: str) -> int:
+        return self.ttls.get(source, DEFAULT_TTL)
+
+    @staticmethod
+    def make_key(source: str, url: str, params: Optional[Mapping[str, Any]] = None) -> str:
+        canonical = f"{source}|{normalize_request(url, params)}"
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    # ------------------------------------------------------------------
+    # Core operations
+    # ------------------------------------------------------------------
+
+    def lookup(self, key: str) -> Optional[Dict[str, Any]]:
+        """Get a raw entry (fresh or stale) or None."""
+        row = self._conn().execute(
+            "SELECT url, status_code, headers, body, expires_at FROM responses WHERE cache_key = ?",
+            (key,),
+        ).fetchone()
+        if row is None:
+            return None
+        url, status_code, headers, body, expires_at = row
+        try:
+            content = zlib.decompress(body)
+        except zlib.error:
+            logger.warning(f"Dropping corrupt HTTP cache entry for {url}")
+            self._conn().execute("DELETE FROM responses WHERE cache_key = ?", (key,))
+            return None
+        return {
+            "url": url,
+            "status_code": status_code,
+            "headers": json.loads(headers) if headers else {},
+            "content": content,
+            "fresh": expires_at > time.time(),
+        }
+
+    def store(
+        self,
+        key: str,
+        source: str,
+        url: str,
+        status_code: int,
+        headers: Mapping[str, str],
+        content: bytes,
+        ttl: Optional[int] = None,
+    ):
+        """Insert or replace an entry, evicting LRU entries if over the size bound."""
+        now = time.time()
+        kept = {h: headers[h] for h in _KEPT_HEADERS if headers.get(h)}
+        body = zlib.compress(content, 6)
+        size = len(body)
+        ttl = self.ttl_for(source) if ttl is None else ttl
+        with self._write_lock:
+            self._conn().execute(
+                """
+                INSERT OR REPLACE INTO responses (
+                    cache_key, source, url, status_code, headers, body,
+                    size_bytes, stored_at, expires_at, last_access
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (key, source, url, status_code, json.dumps(kept), body, size, now, now + ttl, now),
+            )
+            self._count("stores")
+            self._approx_bytes += size
+            if self._approx_bytes > self.max_bytes:
+                self.evict()
+
+    def touch(self, key: str, refresh_ttl: Optional[int] = None):
+        """Update last access (and optionally extend expiry after a 304)."""
+        now = time.time()
+        if refresh_ttl is None:
+            self._conn().execute(
+                "UPDATE responses SET last_access = ? WHERE cache_key = ?", (now, key)
+            )
+        else:
+            self._conn().execute(
+                "UPDATE responses SET last_access = ?, expires_at = ? WHERE cache_key = ?",
+                (now, now + refresh_ttl, key),
+            )
+
+    def evict(self, target_fraction: float = 0.9) -> int:
+        """
+        Evict least-recently-used entries until total size is under
+        ``target_fraction`` of max_bytes.
+
+        Returns:
+            Number of entries evicted
+        """
+        conn = self._conn()
+        target = int(self.max_bytes * target_fraction)
+        evicted = 0
+        with self._write_lock:
+            total = conn.execute("SELECT COALESCE(SUM(size_bytes), 0) FROM responses").fetchone()[0]
+            if total > target:
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    for cache_key, size in conn.execute(
+                        "SELECT cache_key, size_bytes FROM responses ORDER BY last_access"
+                    ).fetchall():
+                        if total <= target:
+                            break
+                        conn.execute("DELETE FROM responses WHERE cache_key = ?", (cache_key,))
+                        total -= size
+                        evicted += 1
+                    conn.execute("COMMIT")
+                except Exception:
+                    conn.execute("ROLLBACK")
+                    raise
+            self._approx_bytes = total
+        if evicted:
+            self._count("evictions", evicted)
+            logger.info(f"HTTP cache evicted {evicted} entries ({total / 1024 / 1024:.1f} MB kept)")
+        return evicted
+
+    def fetch(
+        self,
+        source: str,
+        url: str,
+        params: Optional[Mapping[str, Any]],
+        send: Callable[[Dict[str, str]], Any],
+        ttl: Optional[int] = None,
+    ) -> Any:
+        """
+        Serve a GET from the cache, falling back to ``send``.
+
+        Args:
+            source: Source name (selects the TTL)
+            url: Request URL
+            params: Query params
+            send: Callable that performs the real request given extra headers
+                (used for conditional revalidation). It should apply the
+                client's own rate limiting and return an httpx/requests
+                response, or None on failure.
+            ttl: Optional TTL override for this request
+
+        Returns:
+            A CachedResponse, the live response, or None
+        """
+        if not self.enabled:
+            return send({})
+
+        key = self.make_key(source, url, params)
+        try:
+            entry = self.lookup(key)
+        except sqlite3.Error as e:
+            logger.warning(f"HTTP cache lookup failed, bypassing: {e}")
+            return send({})
+
+        if entry and entry["fresh"]:
+            self._count("hits")
+            self.touch(key)
+            return CachedResponse(entry["url"], entry["status_code"], entry["headers"], entry["content"])
+
+        conditional = {}
+        if entry:
+            if entry["headers"].get("etag"):
+                conditional["If-None-Match"] = entry["headers"]["etag"]
+            if entry["headers"].get("last-modified"):
+                conditional["If-Modified-Since"] = entry["headers"]["last-modified"]
+
+        try:
+            response = send(conditional)
+        except Exception:
+            if entry:
+                # Network failure: serving stale data beats failing the run
+                self._count("stale_served")
+                logger.warning(f"Request failed, serving stale cached response for {url}")
+                return CachedResponse(entry["url"], entry["status_code"], entry["headers"], entry["content"])
+            raise
+
+        if response is None:
+            if entry:
+                self._count("stale_served")
+                return CachedResponse(entry["url"], entry["status_code"], entry["headers"], entry["content"])
+            return None
+
+        if response.status_code == 304 and entry:
+            self._count("revalidated")
+            self.touch(key, refresh_ttl=self.ttl_for(source) if ttl is None else ttl)
+            return CachedResponse(entry["url"], entry["status_code"], entry["headers"], entry["content"])
+
+        self._count("misses")
+        if response.status_code == 200:
+            try:
+                self.store(
+                    key, source, str(getattr(response, "url", url)), 200,
+                    {k.lower(): v for k, v in response.headers.items()},
+                    response.content, ttl=ttl,
+                )
+            except sqlite3.Error as e:
+                logger.warning(f"HTTP cache store failed: {e}")
+        return response
+
+    def clear(self, source: Optional[str] = None):
+        """Remove all entries, or only those for ``source``."""
+        if not self.enabled:
+            return
+        with self._write_lock:
+            if source:
+                self._conn().execute("DELETE FROM responses WHERE source = ?", (source,))
+            else:
+                self._conn().execute("DELETE FROM responses")
+            self._approx_bytes = self._conn().execute(
+                "SELECT COALESCE(SUM(size_bytes), 0) FROM responses"
+            ).fetchone()[0]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for this process plus on-disk totals."""
+        with self._stats_lock:
+            stats = dict(self._stats)
+        served = stats["hits"] + stats["revalidated"] + stats["stale_served"]
+        lookups = served + stats["misses"]
+        stats["hit_rate"] = round(served / lookups, 3) if lookups else 0.0
+        stats["enabled"] = self.enabled
+        if self.enabled:
+            entries, total = self._conn().execute(
+                "SELECT COUNT(*), COALESCE(SUM(size_bytes), 0) FROM responses"
+            ).fetchone()
+            stats["entries"] = entries
+            stats["size_mb"] = round(total / (1024 * 1024), 2)
+        return stats
+
+
+_default_cache: Optional[ResponseCache] = None
+_default_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> ResponseCache:
+    """Get the process-wide response cache shared by all API clients."""
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            enabled = os.getenv("HTTP_CACHE_DISABLED", "").lower() not in ("1", "true", "yes")
+            cache_dir = Path(os.getenv("HTTP_CACHE_DIR", str(DEFAULT_CACHE_DIR)))
+            try:
+                _default_cache = ResponseCache(cache_dir=cache_dir, enabled=enabled)
+            except (OSError, sqlite3.Error) as e:
+                logger.warning(f"HTTP response cache unavailable ({e}), continuing without it")
+                _default_cache = ResponseCache(cache_dir=cache_dir, enabled=False)
+        return _default_cache
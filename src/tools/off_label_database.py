@@ -11,6 +11,7 @@ from typing import List, Optional, Dict, Any, Tuple
 import psycopg2
 from psycopg2.extras import RealDictCursor, Json
 
+from src.tools import db_pool
 from src.models.off_label_schemas import (
     OffLabelCaseStudy,
     OffLabelBaseline,
@@ -36,18 +37,15 @@ class OffLabelDatabase:
             database_url: PostgreSQL database URL
         """
         self.database_url = database_url
-        self._conn = None
 
     @property
     def conn(self):
-        """Get persistent database connection."""
-        if self._conn is None or self._conn.closed:
-            self._conn = psycopg2.connect(self.database_url)
-        return self._conn
+        """Get the calling thread's pinned pooled connection."""
+        return db_pool.get_pool(self.database_url).thread_connection()
 
     def _get_connection(self):
-        """Get database connection."""
-        return psycopg2.connect(self.database_url)
+        """Get a pooled database connection; close() returns it to the pool."""
+        return db_pool.connect(self.database_url)
     
     # =====================================================
     # SAVE METHODS
@@ -0,0 +1,500 @@
+"""
+Indexed paper cache store backed by SQLite.
+
+Replaces the whole-file ``index.json`` used by the PubMed downloader with an
+embedded database:
+- Lookups by PMID, PMCID or DOI hit B-tree indexes
+- Writes are single-row upserts (WAL mode, safe across workers sharing the
+  cache directory)
+- Paper payloads are stored zlib-compressed
+- Title search uses an FTS5 trigram index when SQLite supports it
+"""
+import json
+import logging
+import sqlite3
+import threading
+import zlib
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DB_FILENAME = "papers.sqlite3"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS papers (
+    pmid TEXT PRIMARY KEY,
+    pmcid TEXT,
+    doi TEXT,
+    doi_norm TEXT,
+    title TEXT,
+    authors TEXT,
+    journal TEXT,
+    year TEXT,
+    year_int INTEGER,
+    cached_date TEXT,
+    file_path TEXT,
+    payload BLOB,
+    payload_bytes INTEGER DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_papers_pmcid ON papers (pmcid);
+CREATE INDEX IF NOT EXISTS idx_papers_doi_norm ON papers (doi_norm);
+CREATE INDEX IF NOT EXISTS idx_papers_year_int ON papers (year_int);
+CREATE TABLE IF NOT EXISTS store_meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+# store_meta key set once the legacy index.json has been imported
+_LEGACY_INDEX_MIGRATED = "legacy_index_migrated_at"
+
+_METADATA_COLUMNS = (
+    "pmid, pmcid, doi, title, authors, journal, year, cached_date, file_path"
+)
+
+
+def normalize_doi(doi: Optional[str]) -> Optional[str]:
+    """Normalize a DOI for lookup (lowercase, no resolver prefix)."""
+    if not doi:
+        return None
+    doi = doi.strip().lower()
+    for prefix in ("https://doi.org/", "http://doi.org/", "https://dx.doi.org/", "doi:"):
+        if doi.startswith(prefix):
+            doi = doi[len(prefix):]
+    return doi or None
+
+
+def _normalize_pmcid(pmcid: Optional[str]) -> Optional[str]:
+    if not pmcid:
+        return None
+    pmcid = str(pmcid).strip().upper()
+    return pmcid if pmcid.startswith("PMC") else f"PMC{pmcid}"
+
+
+def _year_to_int(year: Any) -> Optional[int]:
+    try:
+        return int(str(year)[:4])
+    except (ValueError, TypeError):
+        return None
+
+
+def _compress(paper: Dict[str, Any]) -> bytes:
+    return zlib.compress(json.dumps(paper, ensure_ascii=False).encode("utf-8"), 6)
+
+
+def _decompress(blob: bytes) -> Dict[str, Any]:
+    return json.loads(zlib.decompress(blob).decode("utf-8"))
+
+
+class PaperCacheStore:
+    """
+    SQLite-backed store for downloaded papers.
+
+    Each thread gets its own connection, so a single store can be shared
+    by thread pools; separate processes pointing at the same file are
+    coordinated by SQLite's WAL locking.
+    """
+
+    def __init__(self, db_path: Path, busy_timeout_ms: int = 30000):
+        """
+        Initialize the store.
+
+        Args:
+            db_path: Path to the SQLite database file
+            busy_timeout_ms: How long writers wait on a locked database
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.busy_timeout_ms = busy_timeout_ms
+        self._local = threading.local()
+        self.has_fts = False
+        self._init_schema()
+
+    # ------------------------------------------------------------------
+    # Connection / schema
+    # ------------------------------------------------------------------
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(
+                str(self.db_path),
+                timeout=self.busy_timeout_ms / 1000,
+                isolation_level=None,  # explicit transactions only
+            )
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(f"PRAGMA busy_timeout={int(self.busy_timeout_ms)}")
+            self._local.conn = conn
+        return conn
+
+    def _init_schema(self):
+        conn = self._conn()
+        conn.executescript(_SCHEMA)
+        try:
+            conn.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS papers_title_fts "
+                "USING fts5(pmid UNINDEXED, title, tokenize='trigram')"
+            )
+            self.has_fts = True
+        except sqlite3.OperationalError as e:
+            logger.info(f"FTS5 trigram index unavailable, title search will scan: {e}")
+
+    def close(self):
+        """Close this thread's connection."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _row_to_metadata(row: sqlite3.Row) -> Dict[str, Any]:
+        return {
+            'pmid': row['pmid'],
+            'pmcid': row['pmcid'],
+            'doi': row['doi'],
+            'title': row['title'],
+            'authors': json.loads(row['authors']) if row['authors'] else [],
+            'journal': row['journal'],
+            'year': row['year'],
+            'cached_date': row['cached_date'],
+            'file_path': row['file_path'],
+        }
+
+    def _lookup_row(
+        self,
+        columns: str,
+        pmid: Optional[str] = None,
+        pmcid: Optional[str] = None,
+        doi: Optional[str] = None,
+    ) -> Optional[sqlite3.Row]:
+        conn = self._conn()
+        if pmid:
+            return conn.execute(
+                f"SELECT {columns} FROM papers WHERE pmid = ?", (str(pmid),)
+            ).fetchone()
+        if pmcid:
+            return conn.execute(
+                f"SELECT {columns} FROM papers WHERE pmcid = ? LIMIT 1",
+                (_normalize_pmcid(pmcid),),
+            ).fetchone()
+        if doi:
+            return conn.execute(
+                f"SELECT {columns} FROM papers WHERE doi_norm = ? LIMIT 1",
+                (normalize_doi(doi),),
+            ).fetchone()
+        return None
+
+    def contains(self, pmid: str) -> bool:
+        """Check whether a PMID is in the cache."""
+        return self._lookup_row("1", pmid=pmid) is not None
+
+    def get_metadata(
+        self,
+        pmid: Optional[str] = None,
+        pmcid: Optional[str] = None,
+        doi: Optional[str] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """Get the index entry for a paper by PMID, PMCID or DOI."""
+        row = self._lookup_row(_METADATA_COLUMNS, pmid=pmid, pmcid=pmcid, doi=doi)
+        return self._row_to_metadata(row) if row else None
+
+    def get(
+        self,
+        pmid: Optional[str] = None,
+        pmcid: Optional[str] = None,
+        doi: Optional[str] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Get the full cached paper by PMID, PMCID or DOI.
+
+        Falls back to the entry's JSON file when no payload is stored.
+
+        Returns:
+            Paper dict or None if not cached
+        """
+        row = self._lookup_row("pmid, payload, file_path", pmid=pmid, pmcid=pmcid, doi=doi)
+        if row is None:
+            return None
+
+        if row['payload'] is not None:
+            try:
+                return _decompress(row['payload'])
+            except (zlib.error, ValueError) as e:
+                logger.error(f"Corrupt cached payload for PMID {row['pmid']}: {e}")
+
+        file_path = row['file_path']
+        if file_path and Path(file_path).exists():
+            try:
+                with open(file_path, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+            except Exception as e:
+                logger.error(f"Failed to load cached paper file {file_path}: {e}")
+        return None
+
+    def search(
+        self,
+        title_contains: Optional[List[str]] = None,
+        year_min: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Search index entries.
+
+        Args:
+            title_contains: Case-insensitive substrings that must all appear in the title
+            year_min: Minimum publication year (entries without a year are kept)
+
+        Returns:
+            List of metadata dicts
+        """
+        clauses = []
+        params: List[Any] = []
+
+        for term in title_contains or []:
+            if not term:
+                continue
+            escaped = _escape_like(term)
+            # ESCAPE is only added when needed so the trigram index stays usable
+            like = "LIKE ? ESCAPE '\\'" if escaped != term else "LIKE ?"
+            if self.has_fts:
+                clauses.append(f"pmid IN (SELECT pmid FROM papers_title_fts WHERE title {like})")
+            else:
+                clauses.append(f"title {like}")
+            params.append(f"%{escaped}%")
+
+        if year_min:
+            clauses.append("(year_int IS NULL OR year_int >= ?)")
+            params.append(int(year_min))
+
+        sql = f"SELECT {_METADATA_COLUMNS} FROM papers"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY rowid"
+
+        rows = self._conn().execute(sql, params).fetchall()
+        return [self._row_to_metadata(row) for row in rows]
+
+    def stats(self) -> Dict[str, Any]:
+        """Aggregate statistics over the cache."""
+        row = self._conn().execute(
+            "SELECT COUNT(*) AS n, COALESCE(SUM(payload_bytes), 0) AS payload_bytes, "
+            "MIN(year_int) AS year_min, MAX(year_int) AS year_max FROM papers"
+        ).fetchone()
+        db_bytes = sum(
+            p.stat().st_size
+            for p in (self.db_path, Path(f"{self.db_path}-wal"))
+            if p.exists()
+        )
+        return {
+            'total_papers': row['n'],
+            'payload_bytes': row['payload_bytes'],
+            'db_bytes': db_bytes,
+            'year_min': row['year_min'],
+            'year_max': row['year_max'],
+        }
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def put(
+        self,
+        paper: Dict[str, Any],
+        file_path: Optional[Path] = None,
+        store_payload: bool = True,
+    ) -> bool:
+        """
+        Insert or replace a paper.
+
+        Args:
+            paper: Paper dict (must have 'pmid')
+            file_path: Optional JSON file holding the same paper
+            store_payload: Store the compressed paper in the database
+
+        Returns:
+            True if written
+        """
+        return self.put_many([(paper, file_path)], store_payload=store_payload) == 1
+
+    def put_many(
+        self,
+        items: Iterable[Any],
+        store_payload: bool = True,
+    ) -> int:
+        """
+        Insert or replace several papers in one transaction.
+
+        Args:
+            items: Paper dicts, or (paper, file_path[, cached_date]) tuples
+            store_payload: Store the compressed papers in the database
+
+        Returns:
+            Number of papers written
+        """
+        rows = []
+        now = datetime.now().isoformat()
+        for item in items:
+            if isinstance(item, tuple):
+                paper, file_path, cached_date = (tuple(item) + (None, None))[:3]
+            else:
+                paper, file_path, cached_date = item, None, None
+            pmid = paper.get('pmid')
+            if not pmid:
+                continue
+            payload = _compress(paper) if store_payload else None
+            rows.append((
+                str(pmid),
+                _normalize_pmcid(paper.get('pmcid')),
+                paper.get('doi'),
+                normalize_doi(paper.get('doi')),
+                paper.get('title'),
+                json.dumps(paper.get('authors') or [], ensure_ascii=False),
+                paper.get('journal'),
+                str(paper['year']) if paper.get('year') is not None else None,
+                _year_to_int(paper.get('year')),
+                cached_date or now,
+                str(file_path) if file_path else None,
+                payload,
+                len(payload) if payload else 0,
+            ))
+
+        if not rows:
+            return 0
+
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany(
+                """
+                INSERT INTO papers (
+                    pmid, pmcid, doi, doi_norm, title, authors, journal, year,
+                    year_int, cached_date, file_path, payload, payload_bytes
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(pmid) DO UPDATE SET
+                    pmcid = COALESCE(excluded.pmcid, papers.pmcid),
+                    doi = COALESCE(excluded.doi, papers.doi),
+                    doi_norm = COALESCE(excluded.doi_norm, papers.doi_norm),
+                    title = COALESCE(excluded.title, papers.title),
+                    authors = excluded.authors,
+                    journal = COALESCE(excluded.journal, papers.journal),
+                    year = COALESCE(excluded.year, papers.year),
+                    year_int = COALESCE(excluded.year_int, papers.year_int),
+                    cached_date = excluded.cached_date,
+                    file_path = COALESCE(excluded.file_path, papers.file_path),
+                    payload = COALESCE(excluded.payload, papers.payload),
+                    payload_bytes = CASE WHEN excluded.payload IS NULL
+                        THEN papers.payload_bytes ELSE excluded.payload_bytes END
+                """,
+                rows,
+            )
+            if self.has_fts:
+                pmids = [(r[0],) for r in rows]
+                conn.executemany("DELETE FROM papers_title_fts WHERE pmid = ?", pmids)
+                # Index the merged title: an upsert without one keeps the stored title
+                conn.executemany(
+                    "INSERT INTO papers_title_fts (pmid, title) "
+                    "SELECT pmid, COALESCE(title, '') FROM papers WHERE pmid = ?",
+                    pmids,
+                )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return len(rows)
+
+    # ------------------------------------------------------------------
+    # Migration
+    # ------------------------------------------------------------------
+
+    def _get_meta(self, key: str) -> Optional[str]:
+        row = self._conn().execute("SELECT value FROM store_meta WHERE key = ?", (key,)).fetchone()
+        return row['value'] if row else None
+
+    def _set_meta(self, key: str, value: str):
+        self._conn().execute(
+            "INSERT OR REPLACE INTO store_meta (key, value) VALUES (?, ?)", (key, value)
+        )
+
+    def migrate_from_json_index(self, index_path: Path, cache_dir: Path) -> int:
+        """
+        One-shot import of the legacy ``index.json`` layout.
+
+        Paper files are loaded and their contents stored as compressed
+        payloads. The import is recorded in the store's metadata table so it
+        only runs once; the index and paper files are left in place (the
+        index may be tracked in version control). Safe to race: the import
+        is idempotent.
+
+        Args:
+            index_path: Path to the legacy index.json
+            cache_dir: Directory containing the legacy paper files
+
+        Returns:
+            Number of papers imported
+        """
+        index_path = Path(index_path)
+        if not index_path.exists() or self._get_meta(_LEGACY_INDEX_MIGRATED):
+            return 0
+
+        try:
+            with open(index_path, 'r', encoding='utf-8') as f:
+                index = json.load(f)
+        except FileNotFoundError:
+            return 0  # Migrated by another process since the exists() check
+        except Exception as e:
+            logger.error(f"Failed to read legacy cache index {index_path}: {e}")
+            return 0
+
+        with_files = []
+        metadata_only = []
+        for pmid, metadata in index.items():
+            file_path = _resolve_legacy_path(metadata.get('file_path'), cache_dir, pmid)
+            paper = None
+            if file_path is not None:
+                try:
+                    with open(file_path, 'r', encoding='utf-8') as f:
+                        paper = json.load(f)
+                except Exception as e:
+                    logger.warning(f"Could not read cached paper {file_path}: {e}")
+
+            cached_date = metadata.get('cached_date')
+            if paper:
+                paper.setdefault('pmid', pmid)
+                with_files.append((paper, file_path, cached_date))
+            else:
+                # Keep the index entry even if the file is gone
+                entry = dict(metadata)
+                entry['pmid'] = entry.get('pmid') or pmid
+                metadata_only.append((entry, None, cached_date))
+
+        imported = self.put_many(with_files)
+        imported += self.put_many(metadata_only, store_payload=False)
+        self._set_meta(_LEGACY_INDEX_MIGRATED, datetime.now().isoformat())
+        logger.info(f"Migrated {imported} papers from {index_path} to {self.db_path}")
+        return imported
+
+
+def _escape_like(term: str) -> str:
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _resolve_legacy_path(raw_path: Optional[str], cache_dir: Path, pmid: str) -> Optional[Path]:
+    """Resolve a file path from the legacy index (may use Windows separators)."""
+    candidates = []
+    if raw_path:
+        legacy_path = Path(raw_path.replace("\\", "/"))
+        # Prefer the file's name inside cache_dir (paths were stored relative to cwd)
+        candidates.append(Path(cache_dir) / legacy_path.name)
+        candidates.append(legacy_path)
+    candidates.append(Path(cache_dir) / f"{pmid}.json")
+    for candidate in candidates:
+        if candidate.exists():
+            return candidate
+    return None
@@ -8,6 +8,7 @@ Extracts structured content from scientific papers including:
 - Optional: Figures (future enhancement)
 """
 from pathlib import Path
+import importlib.util
 from typing import List, Dict, Any, Optional
 import json
 import logging
@@ -26,12 +27,10 @@ except ImportError:
     PYMUPDF_AVAILABLE = False
 
 # Optional imports - Camelot requires additional dependencies
-try:
-    import camelot
-    CAMELOT_AVAILABLE = True
-except ImportError:
+# (only checked here; TableExtractionService imports it where it runs)
+CAMELOT_AVAILABLE = importlib.util.find_spec("camelot") is not None
+if not CAMELOT_AVAILABLE:
     logger.warning("Camelot not available. Install with: pip install camelot-py[cv]")
-    CAMELOT_AVAILABLE = False
 
 try:
     import pandas as pd
@@ -91,30 +90,27 @@ class PaperProcessor:
     """
     Process PDFs and extract structured content.
 
-    Uses Camelot for table extraction (more accurate than pdfplumber)
-    and PyPDF2 for text extraction.
+    Uses Camelot for table extraction (more accurate than pdfplumber),
+    through the cached TableExtractionService, and PyMuPDF for text
+    extraction.
     """
 
     def __init__(
         self,
         use_camelot: bool = True,
-        camelot_flavor: str = "lattice",
-        fallback_to_stream: bool = True,
-        min_accuracy: float = 50.0
+        table_service=None
     ):
         """
         Initialize paper processor.
 
         Args:
             use_camelot: Use Camelot for table extraction
-            camelot_flavor: "lattice" (bordered tables) or "stream" (borderless)
-            fallback_to_stream: Try stream mode if lattice fails
-            min_accuracy: Minimum Camelot accuracy threshold (0-100)
+            table_service: TableExtractionService to use (default: one created
+                on first use, with the process-wide table cache)
         """
         self.use_camelot = use_camelot and CAMELOT_AVAILABLE
-        self.camelot_flavor = camelot_flavor
-        self.fallback_to_stream = fallback_to_stream
-        self.min_accuracy = min_accuracy
+        self._table_service = table_service
+        self._owns_table_service = table_service is None
 
         if use_camelot and not CAMELOT_AVAILABLE:
             logger.warning("Camelot requested but not available. Table extraction will be limited.")
@@ -259,9 +255,19 @@ class PaperProcessor:
             logger.error(f"Metadata extraction failed: {e}")
             return ExtractedMetadata()
 
+    def _get_table_service(self):
+        """Lazily create the table extraction service (one worker pool per processor)."""
+        if self._table_service is None:
+            from src.utils.table_extraction_service import TableExtractionService
+            self._table_service = TableExtractionService()
+        return self._table_service
+
     def _extract_tables_camelot(self, pdf_path: Path) -> List[ExtractedTable]:
         """
-        Extract tables using Camelot.
+        Extract tables through TableExtractionService.
+
+        The service caches results by PDF content, only runs Camelot on pages
+        that look like they carry a table, and reads those pages in parallel.
 
         Args:
             pdf_path: Path to PDF file
@@ -272,126 +278,49 @@ class PaperProcessor:
         if not CAMELOT_AVAILABLE:
             return []
 
-        tables = []
-
-        # Try lattice method first (for tables with borders)
-        if self.camelot_flavor == "lattice" or self.fallback_to_stream:
-            try:
-                logger.info("Attempting table extraction with Camelot (lattice mode)")
-                lattice_tables = camelot.read_pdf(
-                    str(pdf_path),
-                    pages='all',
-                    flavor='lattice',
-                    line_scale=40,
-                    suppress_stdout=True
-                )
-
-                for i, table in enumerate(lattice_tables):
-                    if table.accuracy >= self.min_accuracy:
-                        extracted = self._format_camelot_table(table, i, 'lattice')
-                        tables.append(extracted)
-                        logger.info(f"Extracted table {i} (page {table.page}) - accuracy: {table.accuracy:.1f}%")
-
-            except Exception as e:
-                logger.warning(f"Lattice extraction failed: {e}")
-
-        # Try stream method if fallback enabled or primary method
-        if (self.fallback_to_stream and len(tables) == 0) or self.camelot_flavor == "stream":
-            try:
-                logger.info("Attempting table extraction with Camelot (stream mode)")
-                stream_tables = camelot.read_pdf(
-                    str(pdf_path),
-                    pages='all',
-                    flavor='stream',
-                    edge_tol=50,
-                    suppress_stdout=True
-                )
-
-                for i, table in enumerate(stream_tables):
-                    if table.accuracy >= self.min_accuracy:
-                        # Check if already extracted with lattice
-                        if not self._is_duplicate_table(table, tables):
-                            extracted = self._format_camelot_table(table, i, 'stream')
-                            tables.append(extracted)
-                            logger.info(f"Extracted table {i} (page {table.page}) - accuracy: {table.accuracy:.1f}%")
-
-            except Exception as e:
-                logger.warning(f"Stream extraction failed: {e}")
+        try:
+            service_tables = self._get_table_service().extract(str(pdf_path))
+        except Exception as e:
+            logger.warning(f"Table extraction failed: {e}")
+            return []
 
+        tables = [self._format_service_table(table, i) for i, table in enumerate(service_tables)]
         logger.info(f"Extracted {len(tables)} tables total")
         return tables
 
-    def _format_camelot_table(self, camelot_table, index: int, method: str) -> ExtractedTable:
+    def _format_service_table(self, table, index: int) -> ExtractedTable:
         """
-        Format Camelot table object into ExtractedTable.
+        Format a TableExtractionService table into ExtractedTable.
 
         Args:
-            camelot_table: Camelot table object
+            table: src.utils.table_extractor.ExtractedTable
             index: Table index
-            method: Extraction method used
 
         Returns:
             ExtractedTable
         """
-        df = camelot_table.df
+        data = table.rows or []
 
-        # Convert DataFrame to list of lists
-        data = df.values.tolist()
-
-        # Convert DataFrame to JSON if pandas available
+        # Convert rows to DataFrame JSON if pandas available
         dataframe_json = None
-        if PANDAS_AVAILABLE:
-            dataframe_json = df.to_json(orient='records')
-
-        # Try to extract caption (placeholder - would need additional logic)
-        caption = self._try_extract_caption(camelot_table)
+        if PANDAS_AVAILABLE and data:
+            dataframe_json = pd.DataFrame(data).to_json(orient='records')
 
         return ExtractedTable(
-            page_number=camelot_table.page,
+            page_number=table.page,
             table_number=index,
-            caption=caption,
+            caption=table.label,
             data=data,
             dataframe_json=dataframe_json,
-            accuracy=camelot_table.accuracy,
-            extraction_method=method
+            accuracy=table.accuracy,
+            extraction_method=table.extraction_method
         )
 
-    def _try_extract_caption(self, camelot_table) -> Optional[str]:
-        """
-        Attempt to extract table caption.
-
-        This is a placeholder - would require additional text extraction
-        from the area surrounding the table.
-
-        Args:
-            camelot_table: Camelot table object
-
-        Returns:
-            Caption if found, else None
-        """
-        # TODO: Implement caption extraction by searching text above/below table
-        return None
-
-    def _is_duplicate_table(self, table, existing_tables: List[ExtractedTable]) -> bool:
-        """
-        Check if table was already extracted.
-
-        Simple heuristic: same page and similar dimensions.
-
-        Args:
-            table: Camelot table object
-            existing_tables: Already extracted tables
-
-        Returns:
-            True if likely duplicate
-        """
-        for existing in existing_tables:
-            if existing.page_number == table.page:
-                # Compare dimensions
-                if len(table.df) == len(existing.data):
-                    return True
-
-        return False
+    def close(self):
+        """Shut down the table extraction worker processes (if this processor created them)."""
+        if self._owns_table_service and self._table_service is not None:
+            self._table_service.close()
+            self._table_service = None
 
     def save_extracted_data(
         self,
@@ -16,6 +16,8 @@ import time
 from datetime import datetime, timedelta
 from urllib.parse import quote
 
+from src.tools.http_cache import ResponseCache, get_response_cache
+
 logger = logging.getLogger(__name__)
 
 
@@ -34,14 +36,16 @@ class PreprintSearchAPI:
     # Default to last 2 years
     DEFAULT_YEARS_BACK = 2
 
-    def __init__(self, timeout: int = 30):
+    def __init__(self, timeout: int = 30, response_cache: Optional[ResponseCache] = None):
         """
         Initialize preprint API client.
 
         Args:
             timeout: Request timeout in seconds
+            response_cache: HTTP response cache (defaults to the shared on-disk cache)
         """
         self.timeout = timeout
+        self.response_cache = response_cache or get_response_cache()
         self.session = httpx.Client(timeout=timeout)
         self.last_request_time = 0
         # Conservative rate limit: 60 requests per minute
@@ -65,7 +69,7 @@ class PreprintSearchAPI:
         params: Optional[Dict] = None
     ) -> Optional[Dict]:
         """
-        Make HTTP request with retry on failure.
+        Make HTTP request with retry on failure (served from the response cache when fresh).
 
         Args:
             url: Request URL
@@ -74,14 +78,38 @@ class PreprintSearchAPI:
         Returns:
             JSON response or None if failed
         """
+        response = self.response_cache.fetch(
+            "biorxiv", url, params,
+            lambda headers: self._send_with_retry(url, params, headers),
+        )
+        if response is None or response.status_code != 200:
+            return None
+        try:
+            return response.json()
+        except Exception as e:
+            logger.error(f"Unexpected error: {e}")
+            return None
+
+    def _send_with_retry(
+        self,
+        url: str,
+        params: Optional[Dict] = None,
+        headers: Optional[Dict] = None
+    ) -> Optional[httpx.Response]:
+        """
+        Send a rate-limited GET with retry on failure.
+
+        Returns:
+            Response (200, or 304 for a conditional request) or None if failed
+        """
         for attempt in range(self.max_retries):
             try:
                 self._rate_limit()
 
-                response = self.session.get(url, params=params)
+                response = self.session.get(url, params=params, headers=headers)
 
-                if response.status_code == 200:
-                    return response.json()
+                if response.status_code == 200 or (response.status_code == 304 and headers):
+                    return response
 
                 if response.status_code == 429:
                     # Rate limited
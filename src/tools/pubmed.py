@@ -2,17 +2,39 @@
 PubMed API wrapper for searching biomedical literature.
 """
 import httpx
-from typing import List, Dict, Optional, Any
+from typing import Any, Callable, Dict, List, Optional, Union
 import logging
+import os
+import threading
 import time
 import json
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from pathlib import Path
-from datetime import datetime
 from xml.etree import ElementTree as ET
 
+from src.tools.http_cache import ResponseCache, get_response_cache
+from src.tools.paper_cache_store import PaperCacheStore, DEFAULT_DB_FILENAME
+from src.tools.pubmed_xml_stream import XMLSource, iter_pubmed_articles, parse_pmc_article
+
 
 logger = logging.getLogger(__name__)
 
+# NCBI PMC ID Converter (up to 200 IDs per request)
+ID_CONVERTER_URL = "https://pmc.ncbi.nlm.nih.gov/tools/idconv/api/v1/articles/"
+ID_CONVERTER_BATCH_SIZE = 200
+
+# Concurrent PMC downloads (the shared rate limiter still spaces requests)
+DEFAULT_DOWNLOAD_WORKERS = 4
+# Processes parsing PMC XML; small batches are parsed inline
+DEFAULT_PARSE_WORKERS = min(4, os.cpu_count() or 1)
+PARSE_POOL_MIN_DOCS = 8
+
+
+def _parse_pmc_fulltext_job(xml: bytes, pmid: str, pmcid: str) -> Optional[Dict[str, Any]]:
+    """Parse PMC XML in a parser pool worker."""
+    return PMCFullTextParser()._parse_pmc_fulltext(xml, pmid, pmcid)
+
 
 class PubMedAPI:
     """
@@ -23,7 +45,8 @@ class PubMedAPI:
 
     BASE_URL = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils"
 
-    def __init__(self, api_key: Optional[str] = None, email: Optional[str] = None, timeout: int = 30):
+    def __init__(self, api_key: Optional[str] = None, email: Optional[str] = None, timeout: int = 30,
+                 response_cache: Optional[ResponseCache] = None):
         """
         Initialize PubMed API client.
 
@@ -31,14 +54,20 @@ class PubMedAPI:
             api_key: NCBI API key (for higher rate limits)
             email: Email address (required by NCBI for tracking)
             timeout: Request timeout in seconds
+            response_cache: HTTP response cache (defaults to the shared on-disk cache)
         """
         self.api_key = api_key
         self.email = email or "noreply@example.com"
         self.timeout = timeout
         self.session = httpx.Client(timeout=timeout)
         self.last_request_time = 0
+        self._rate_lock = threading.Lock()
         # Rate limit: 3 req/sec without key, 10 req/sec with key
         self.rate_limit_delay = 0.11 if api_key else 0.35
+        self.response_cache = response_cache or get_response_cache()
+        # PMC XML parser processes, started on the first large bulk fetch
+        self._parse_pool: Optional[ProcessPoolExecutor] = None
+        self._parse_pool_lock = threading.Lock()
 
         # Paper cache configuration
         self.cache_dir = Path("data/downloaded_papers")
@@ -46,40 +75,33 @@ class PubMedAPI:
         self._init_cache()
 
     def _rate_limit(self):
-        """Enforce rate limiting between requests."""
-        current_time = time.time()
-        time_since_last = current_time - self.last_request_time
-        if time_since_last < self.rate_limit_delay:
-            time.sleep(self.rate_limit_delay - time_since_last)
-        self.last_request_time = time.time()
+        """Enforce rate limiting between requests (thread-safe: each caller reserves a slot)."""
+        with self._rate_lock:
+            slot = max(time.time(), self.last_request_time + self.rate_limit_delay)
+            self.last_request_time = slot
+        wait_time = slot - time.time()
+        if wait_time > 0:
+            time.sleep(wait_time)
+
+    def _get(self, url: str, params: Dict[str, Any], source: str):
+        """GET through the shared response cache; only network calls are rate limited."""
+        def send(headers: Dict[str, str]):
+            self._rate_limit()  # Enforce rate limiting
+            return self.session.get(url, params=params, headers=headers)
+
+        return self.response_cache.fetch(source, url, params, send)
 
     def _init_cache(self):
-        """Initialize paper cache directory and index."""
+        """Initialize paper cache directory and indexed store (migrating index.json once)."""
         self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.cache_db_path = self.cache_dir / DEFAULT_DB_FILENAME
+        self._paper_store = PaperCacheStore(self.cache_db_path)
 
-        if not self.cache_index_path.exists():
-            # Create empty index
-            self._save_index({})
-            logger.info(f"Initialized paper cache at {self.cache_dir}")
-        else:
-            logger.info(f"Using existing paper cache at {self.cache_dir}")
+        if self.cache_index_path.exists():
+            migrated = self._paper_store.migrate_from_json_index(self.cache_index_path, self.cache_dir)
+            logger.info(f"Migrated {migrated} papers from legacy index to {self.cache_db_path}")
 
-    def _load_index(self) -> Dict[str, Any]:
-        """Load cache index."""
-        try:
-            with open(self.cache_index_path, 'r') as f:
-                return json.load(f)
-        except Exception as e:
-            logger.error(f"Failed to load cache index: {e}")
-            return {}
-
-    def _save_index(self, index: Dict[str, Any]):
-        """Save cache index."""
-        try:
-            with open(self.cache_index_path, 'w') as f:
-                json.dump(index, f, indent=2)
-        except Exception as e:
-            logger.error(f"Failed to save cache index: {e}")
+        logger.info(f"Using paper cache at {self.cache_dir}")
 
     def _get_cached_paper(self, pmid: str) -> Optional[Dict[str, Any]]:
         """
@@ -91,23 +113,18 @@ class PubMedAPI:
         Returns:
             Cached paper data or None if not cached
         """
-        index = self._load_index()
-
-        if pmid in index:
-            paper_path = self.cache_dir / f"{pmid}.json"
-            if paper_path.exists():
-                try:
-                    with open(paper_path, 'r', encoding='utf-8') as f:
-                        paper = json.load(f)
-                    logger.info(f"✓ Using cached paper: PMID {pmid}")
-                    return paper
-                except Exception as e:
-                    logger.error(f"Failed to load cached paper {pmid}: {e}")
+        try:
+            paper = self._paper_store.get(pmid=pmid)
+        except Exception as e:
+            logger.error(f"Failed to load cached paper {pmid}: {e}")
+            return None
 
-        return None
+        if paper:
+            logger.info(f"✓ Using cached paper: PMID {pmid}")
+        return paper
 
     def _save_paper_to_cache(self, paper: Dict[str, Any], save_dir: Optional[Path] = None,
-                            drug_name: Optional[str] = None) -> Path:
+                            drug_name: Optional[str] = None) -> Optional[Path]:
         """
         Save paper to cache with metadata and proper naming.
 
@@ -117,7 +134,8 @@ class PubMedAPI:
             drug_name: Drug name for filename (if provided, uses format: YYYY-MM_Author_drug.json)
 
         Returns:
-            Path to saved file
+            Path to the saved JSON file; None when save_dir is not given (the
+            paper is only stored in the cache database) or saving failed
         """
         pmid = paper.get('pmid')
         if not pmid:
@@ -125,8 +143,14 @@ class PubMedAPI:
             return None
 
         try:
-            # Determine save directory
-            target_dir = save_dir if save_dir else self.cache_dir
+            if save_dir is None:
+                # Default cache: compressed payload lives in the store only
+                self._paper_store.put(paper)
+                logger.info(f"✓ Cached paper: PMID {pmid} ({(paper.get('title') or 'Unknown')[:50]}...)")
+                return None
+
+            # Explicit directory: callers expect a JSON file on disk
+            target_dir = save_dir
             target_dir.mkdir(parents=True, exist_ok=True)
 
             # Determine filename
@@ -167,20 +191,8 @@ class PubMedAPI:
             with open(paper_path, 'w', encoding='utf-8') as f:
                 json.dump(paper, f, indent=2, ensure_ascii=False)
 
-            # Update index
-            index = self._load_index()
-            index[pmid] = {
-                'pmid': pmid,
-                'pmcid': paper.get('pmcid'),
-                'doi': paper.get('doi'),
-                'title': paper.get('title'),
-                'authors': paper.get('authors', []),
-                'journal': paper.get('journal'),
-                'year': paper.get('year'),
-                'cached_date': datetime.now().isoformat(),
-                'file_path': str(paper_path)
-            }
-            self._save_index(index)
+            # Index the file (payload is on disk, so don't duplicate it)
+            self._paper_store.put(paper, file_path=paper_path, store_payload=False)
 
             logger.info(f"✓ Cached paper: PMID {pmid} ({paper.get('title', 'Unknown')[:50]}...)")
 
@@ -209,28 +221,14 @@ class PubMedAPI:
         Returns:
             List of matching papers from cache index
         """
-        index = self._load_index()
-        results = []
-
-        for pmid, metadata in index.items():
-            # Apply filters
-            if query and query.lower() not in metadata.get('title', '').lower():
-                continue
-
-            if drug and drug.lower() not in metadata.get('title', '').lower():
-                continue
-
-            if target and target.upper() not in metadata.get('title', '').upper():
-                continue
-
-            if year_min and metadata.get('year'):
-                try:
-                    if int(metadata['year']) < year_min:
-                        continue
-                except (ValueError, TypeError):
-                    pass
-
-            results.append(metadata)
+        try:
+            results = self._paper_store.search(
+                title_contains=[query, drug, target],
+                year_min=year_min,
+            )
+        except Exception as e:
+            logger.error(f"Cached paper search failed: {e}")
+            return []
 
         logger.info(f"Found {len(results)} cached papers matching search criteria")
         return results
@@ -242,30 +240,20 @@ class PubMedAPI:
         Returns:
             Dictionary with cache statistics
         """
-        index = self._load_index()
-
-        total_papers = len(index)
-        total_size = 0
+        store_stats = self._paper_store.stats()
 
+        # Loose JSON files written by download_paper() into the cache dir
+        total_size = store_stats['db_bytes']
         for paper_path in self.cache_dir.glob("*.json"):
-            if paper_path.name != "index.json":
-                total_size += paper_path.stat().st_size
-
-        # Extract years
-        years = []
-        for metadata in index.values():
-            if metadata.get('year'):
-                try:
-                    years.append(int(metadata['year']))
-                except (ValueError, TypeError):
-                    pass
+            total_size += paper_path.stat().st_size
 
+        year_min, year_max = store_stats['year_min'], store_stats['year_max']
         stats = {
-            'total_papers': total_papers,
+            'total_papers': store_stats['total_papers'],
             'total_size_mb': round(total_size / (1024 * 1024), 2),
             'cache_dir': str(self.cache_dir),
-            'year_range': f"{min(years)}-{max(years)}" if years else "N/A",
-            'index_path': str(self.cache_index_path)
+            'year_range': f"{year_min}-{year_max}" if year_min is not None else "N/A",
+            'index_path': str(self.cache_db_path)
         }
 
         return stats
@@ -288,8 +276,6 @@ class PubMedAPI:
             List of PubMed IDs (PMIDs)
         """
         try:
-            self._rate_limit()  # Enforce rate limiting
-
             params = {
                 "db": "pubmed",
                 "term": query,
@@ -303,10 +289,7 @@ class PubMedAPI:
             if self.api_key:
                 params["api_key"] = self.api_key
 
-            response = self.session.get(
-                f"{self.BASE_URL}/esearch.fcgi",
-                params=params
-            )
+            response = self._get(f"{self.BASE_URL}/esearch.fcgi", params, "pubmed_esearch")
             response.raise_for_status()
 
             try:
@@ -345,8 +328,6 @@ class PubMedAPI:
             batch_pmids = pmids[i:i + batch_size]
 
             try:
-                self._rate_limit()  # Enforce rate limiting
-
                 params = {
                     "db": "pubmed",
                     "id": ",".join(batch_pmids),
@@ -359,14 +340,11 @@ class PubMedAPI:
                 if self.api_key:
                     params["api_key"] = self.api_key
 
-                response = self.session.get(
-                    f"{self.BASE_URL}/efetch.fcgi",
-                    params=params
-                )
+                response = self._get(f"{self.BASE_URL}/efetch.fcgi", params, "pubmed_efetch")
                 response.raise_for_status()
 
                 # Parse XML response
-                articles = self._parse_xml_response(response.text)
+                articles = self._parse_xml_response(response.iter_bytes())
                 all_articles.extend(articles)
 
                 if len(pmids) > batch_size:
@@ -428,12 +406,13 @@ class PubMedAPI:
                 "id": pmid,
                 "linkname": "pubmed_pubmed",  # Related articles link
                 "retmode": "json",
-                "tool": self.tool,
+                "tool": "biopharma-investment-agent",
                 "email": self.email,
             }
+            if self.api_key:
+                params["api_key"] = self.api_key
 
-            self._rate_limit()
-            response = self.client.get(elink_url, params=params)
+            response = self._get(elink_url, params, "pubmed_efetch")
             response.raise_for_status()
             data = response.json()
 
@@ -479,32 +458,29 @@ class PubMedAPI:
         """
         return self.search_and_fetch(query, max_results, sort)
 
-    def _parse_xml_response(self, xml_text: str) -> List[Dict[str, Any]]:
+    def _parse_xml_response(self, xml: XMLSource) -> List[Dict[str, Any]]:
         """
         Parse PubMed XML response into structured data.
 
+        Streams the response, building and releasing one <PubmedArticle>
+        at a time (see pubmed_xml_stream).
+
         Args:
-            xml_text: XML response from PubMed
+            xml: XML response from PubMed (text, bytes, or an iterable of
+                chunks such as response.iter_bytes())
 
         Returns:
             List of article dictionaries
         """
         try:
-            root = ET.fromstring(xml_text)
-            articles = []
-
-            for article_elem in root.findall(".//PubmedArticle"):
-                article = self._extract_article_data(article_elem)
-                if article:
-                    articles.append(article)
-
-            return articles
+            return list(iter_pubmed_articles(xml, self._extract_article_data))
 
         except ET.ParseError as e:
             logger.error(f"XML parsing error: {str(e)}")
             return []
 
-    def _extract_article_data(self, article_elem) -> Optional[Dict[str, Any]]:
+    @staticmethod
+    def _extract_article_data(article_elem) -> Optional[Dict[str, Any]]:
         """Extract article data from XML element"""
         try:
             # PMID
@@ -664,8 +640,6 @@ Abstract:
             return {}
 
         try:
-            self._rate_limit()  # Enforce rate limiting
-
             # Use efetch to get PubMed records with PMCID info
             params = {
                 "db": "pubmed",
@@ -678,10 +652,7 @@ Abstract:
             if self.api_key:
                 params["api_key"] = self.api_key
 
-            response = self.session.get(
-                f"{self.BASE_URL}/efetch.fcgi",
-                params=params
-            )
+            response = self._get(f"{self.BASE_URL}/efetch.fcgi", params, "pubmed_efetch")
 
             response.raise_for_status()
 
@@ -766,19 +737,19 @@ Abstract:
             logger.error(f"Unexpected error downloading PDF for {pmcid}: {str(e)}")
             return False
 
-    def fetch_pmc_fulltext(self, pmcid: str) -> Optional[str]:
+    def fetch_pmc_fulltext(self, pmcid: str, as_bytes: bool = False) -> Optional[Union[str, bytes]]:
         """
         Fetch full-text XML from PubMed Central.
 
         Args:
             pmcid: PubMed Central ID (e.g., "PMC1234567")
+            as_bytes: Return the raw response body, which the parsers read
+                without decoding the whole document to a string first
 
         Returns:
-            Full-text content as string, or None if unavailable
+            Full-text XML (str, or bytes if as_bytes), or None if unavailable
         """
         try:
-            self._rate_limit()  # Enforce rate limiting
-
             params = {
                 "db": "pmc",
                 "id": pmcid.replace("PMC", ""),  # Remove PMC prefix if present
@@ -790,19 +761,211 @@ Abstract:
             if self.api_key:
                 params["api_key"] = self.api_key
 
-            response = self.session.get(
-                f"{self.BASE_URL}/efetch.fcgi",
-                params=params
-            )
+            response = self._get(f"{self.BASE_URL}/efetch.fcgi", params, "pmc_efetch")
             response.raise_for_status()
 
             logger.info(f"Successfully fetched full-text for {pmcid}")
-            return response.text
+            return response.content if as_bytes else response.text
 
         except httpx.HTTPError as e:
             logger.error(f"PMC full-text fetch error for {pmcid}: {str(e)}")
             return None
 
+    def get_pmc_paper(self, pmcid: str, pmid: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Get parsed PMC full text for one paper through the paper cache.
+
+        Served from the paper cache (by PMID, else PMCID) when present;
+        otherwise downloaded, parsed and, if the PMID is known, cached.
+
+        Args:
+            pmcid: PubMed Central ID
+            pmid: PubMed ID, if known (papers are cached by PMID)
+
+        Returns:
+            Parsed paper (content, tables, sections, metadata), or None if unavailable
+        """
+        try:
+            cached = self._paper_store.get(pmid=pmid, pmcid=pmcid)
+        except Exception as e:
+            logger.error(f"Failed to load cached paper {pmid or pmcid}: {e}")
+            cached = None
+        if cached:
+            return cached
+
+        xml = self.fetch_pmc_fulltext(pmcid, as_bytes=True)
+        if not xml:
+            return None
+        parsed = self._parse_pmc_fulltext(xml, pmid or "", pmcid)
+        if not parsed or not parsed.get('content'):
+            return None
+
+        if pmid:
+            try:
+                self._paper_store.put(parsed)
+            except Exception as e:
+                logger.error(f"Failed to cache downloaded paper {pmid}: {e}")
+        return parsed
+
+    def convert_pmids_to_pmcids(self, pmids: List[str]) -> Dict[str, Optional[str]]:
+        """
+        Map PMIDs to PMCIDs with batched PMC ID Converter requests.
+
+        Batches the converter cannot answer fall back to check_pmc_availability
+        (one efetch per batch).
+
+        Args:
+            pmids: List of PubMed IDs
+
+        Returns:
+            Dictionary mapping PMID -> PMCID (None if not available in PMC)
+        """
+        pmids = list(dict.fromkeys(str(p) for p in pmids if p))
+        pmc_map: Dict[str, Optional[str]] = {}
+
+        for i in range(0, len(pmids), ID_CONVERTER_BATCH_SIZE):
+            batch = pmids[i:i + ID_CONVERTER_BATCH_SIZE]
+            params = {
+                "ids": ",".join(batch),
+                "idtype": "pmid",
+                "format": "json",
+                "tool": "biopharma-investment-agent",
+                "email": self.email
+            }
+            try:
+                response = self._get(ID_CONVERTER_URL, params, "pmc_idconv")
+                response.raise_for_status()
+                for record in response.json().get("records", []):
+                    pmid = str(record.get("pmid") or "")
+                    if pmid:
+                        pmc_map[pmid] = record.get("pmcid") or None
+                for pmid in batch:
+                    pmc_map.setdefault(pmid, None)
+            except Exception as e:
+                logger.warning(f"PMC ID Converter failed ({e}), falling back to efetch for {len(batch)} PMIDs")
+                pmc_map.update(self.check_pmc_availability(batch))
+
+        available_count = sum(1 for v in pmc_map.values() if v)
+        logger.info(f"PMC availability: {available_count}/{len(pmids)} papers available in PMC")
+        return pmc_map
+
+    def fetch_fulltext_bulk(
+        self,
+        pmids: List[str],
+        download_workers: int = DEFAULT_DOWNLOAD_WORKERS,
+        parse_workers: int = DEFAULT_PARSE_WORKERS
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Get parsed PMC full text for many papers.
+
+        Papers already in the paper cache are served from it. The rest are
+        resolved to PMCIDs in batched ID Converter calls, downloaded
+        concurrently within the NCBI rate limit, parsed on a process pool as
+        downloads complete, and written back to the paper cache in one
+        transaction so later runs reuse them.
+
+        Args:
+            pmids: List of PubMed IDs
+            download_workers: Concurrent PMC downloads
+            parse_workers: Parser processes, used when the client's parser pool
+                is first started (0 parses inline)
+
+        Returns:
+            Dictionary mapping PMID -> parsed paper (content, tables, sections,
+            metadata) for every cached or downloaded paper
+        """
+        pmids = list(dict.fromkeys(str(p) for p in pmids if p))
+        results: Dict[str, Dict[str, Any]] = {}
+
+        missing = []
+        for pmid in pmids:
+            try:
+                cached = self._paper_store.get(pmid=pmid)
+            except Exception as e:
+                logger.error(f"Failed to load cached paper {pmid}: {e}")
+                cached = None
+            if cached:
+                results[pmid] = cached
+            else:
+                missing.append(pmid)
+
+        if not missing:
+            logger.info(f"Full text: {len(results)}/{len(pmids)} papers from cache")
+            return results
+
+        pmc_map = self.convert_pmids_to_pmcids(missing)
+        to_fetch = {pmid: pmc_map[pmid] for pmid in missing if pmc_map.get(pmid)}
+
+        parse_pool = None
+        if parse_workers and len(to_fetch) >= PARSE_POOL_MIN_DOCS:
+            parse_pool = self._get_parse_pool(parse_workers)
+
+        parsed_by_pmid: Dict[str, Optional[Dict[str, Any]]] = {}
+        parse_futures = {}
+        with ThreadPoolExecutor(max_workers=max(1, download_workers)) as downloads:
+            download_futures = {
+                downloads.submit(self.fetch_pmc_fulltext, pmcid, as_bytes=True): (pmid, pmcid)
+                for pmid, pmcid in to_fetch.items()
+            }
+            for future in as_completed(download_futures):
+                pmid, pmcid = download_futures[future]
+                xml = future.result()
+                if not xml:
+                    logger.warning(f"✗ Failed to fetch PMC full-text for PMID {pmid}")
+                    continue
+                if parse_pool:
+                    parse_futures[pmid] = parse_pool.submit(_parse_pmc_fulltext_job, xml, pmid, pmcid)
+                else:
+                    parsed_by_pmid[pmid] = self._parse_pmc_fulltext(xml, pmid, pmcid)
+
+        for pmid, future in parse_futures.items():
+            try:
+                parsed_by_pmid[pmid] = future.result()
+            except Exception as e:
+                logger.error(f"PMC XML parser worker failed for PMID {pmid}: {e}")
+
+        parsed_papers = []
+        for pmid, parsed in parsed_by_pmid.items():
+            if parsed and parsed.get('content'):
+                results[pmid] = parsed
+                parsed_papers.append(parsed)
+            else:
+                logger.warning(f"✗ Failed to parse PMC XML for PMID {pmid}")
+
+        if parsed_papers:
+            try:
+                self._paper_store.put_many(parsed_papers)
+            except Exception as e:
+                logger.error(f"Failed to cache {len(parsed_papers)} downloaded papers: {e}")
+
+        logger.info(
+            f"Full text: {len(results)}/{len(pmids)} papers "
+            f"({len(pmids) - len(missing)} from cache, {len(parsed_papers)} newly downloaded, "
+            f"{len(missing) - len(to_fetch)} not in PMC)"
+        )
+        return results
+
+    def _get_parse_pool(self, parse_workers: int) -> Optional[ProcessPoolExecutor]:
+        """
+        The client's PMC XML parser pool, started on first use.
+
+        Kept until close() so worker start-up and imports are paid once per
+        client, not once per bulk fetch.
+
+        Returns:
+            Process pool, or None if processes are unavailable (parse inline)
+        """
+        with self._parse_pool_lock:
+            if self._parse_pool is None:
+                try:
+                    # Spawned, not forked: this process has download threads and an open HTTP client
+                    self._parse_pool = ProcessPoolExecutor(
+                        max_workers=parse_workers, mp_context=multiprocessing.get_context("spawn")
+                    )
+                except (OSError, NotImplementedError) as e:
+                    logger.warning(f"Parser pool unavailable, parsing inline: {e}")
+            return self._parse_pool
+
     def download_open_access_papers(
         self,
         pmids: List[str]
@@ -818,50 +981,21 @@ Abstract:
         Returns:
             Tuple of (downloaded_papers, paywalled_pmids)
         """
+        full_texts = self.fetch_fulltext_bulk(pmids)
+
         downloaded_papers = []
         paywalled_pmids = []
-        cache_hits = 0
-        new_downloads = 0
-
         for pmid in pmids:
-            # Check cache first
-            cached_paper = self._get_cached_paper(pmid)
-            if cached_paper:
-                downloaded_papers.append(cached_paper)
-                cache_hits += 1
-                continue
-
-            # Not in cache - need to download
-            # Check PMC availability for this PMID
-            pmc_map = self.check_pmc_availability([pmid])
-            pmcid = pmc_map.get(pmid)
-
-            # Try to download if we have a PMCID
-            if pmcid:
-                logger.info(f"Downloading PMID {pmid} from PMC (PMCID: {pmcid})")
-                fulltext = self.fetch_pmc_fulltext(pmcid)  # Rate limited internally
-                if fulltext:
-                    # Parse full-text XML
-                    parsed = self._parse_pmc_fulltext(fulltext, pmid, pmcid)
-                    if parsed:
-                        # Save to cache
-                        self._save_paper_to_cache(parsed)
-                        downloaded_papers.append(parsed)
-                        new_downloads += 1
-                        logger.info(f"✓ Successfully downloaded: PMID {pmid} (PMCID {pmcid})")
-                        continue
-                    else:
-                        logger.warning(f"✗ Failed to parse PMC XML for PMID {pmid}")
-                else:
-                    logger.warning(f"✗ Failed to fetch PMC full-text for PMID {pmid}")
-
-            # If no PMCID or download failed, mark as paywalled
-            paywalled_pmids.append(pmid)
-            logger.info(f"✗ Paywalled or unavailable: PMID {pmid} (no PMCID or download failed)")
+            paper = full_texts.get(str(pmid))
+            if paper:
+                downloaded_papers.append(paper)
+            else:
+                # No PMCID or download failed
+                paywalled_pmids.append(pmid)
+                logger.info(f"✗ Paywalled or unavailable: PMID {pmid} (no PMCID or download failed)")
 
         logger.info(
-            f"Download summary: {len(downloaded_papers)} papers available "
-            f"({cache_hits} from cache, {new_downloads} newly downloaded), "
+            f"Download summary: {len(downloaded_papers)} papers available, "
             f"{len(paywalled_pmids)} need user upload"
         )
 
@@ -923,6 +1057,13 @@ Abstract:
             # Fallback: return old location
             return (str(old_json_cache), True)
 
+        # Payload cached in the store (e.g. by download_open_access_papers)
+        cached_paper = self._get_cached_paper(pmid)
+        if cached_paper:
+            file_path = self._save_paper_to_cache(cached_paper, save_dir, drug_name)
+            if file_path:
+                return (str(file_path), True)
+
         # Not in cache - try to download
         pmc_map = self.check_pmc_availability([pmid])
         pmcid = pmc_map.get(pmid)
@@ -931,7 +1072,7 @@ Abstract:
             logger.info(f"Downloading PMID {pmid} from PMC (PMCID: {pmcid})")
 
             # Download full-text XML and parse
-            fulltext = self.fetch_pmc_fulltext(pmcid)
+            fulltext = self.fetch_pmc_fulltext(pmcid, as_bytes=True)
             if fulltext:
                 parsed = self._parse_pmc_fulltext(fulltext, pmid, pmcid)
                 if parsed:
@@ -958,7 +1099,7 @@ Abstract:
         """
         try:
             # Try fetching with PMID directly (sometimes works)
-            fulltext = self.fetch_pmc_fulltext(pmid)
+            fulltext = self.fetch_pmc_fulltext(pmid, as_bytes=True)
             if fulltext:
                 parsed = self._parse_pmc_fulltext(fulltext, pmid, f"PMC-{pmid}")
                 if parsed:
@@ -968,12 +1109,16 @@ Abstract:
 
         return None
 
-    def _parse_pmc_fulltext(self, xml_text: str, pmid: str, pmcid: str) -> Optional[Dict[str, Any]]:
+    def _parse_pmc_fulltext(self, xml: XMLSource, pmid: str, pmcid: str) -> Optional[Dict[str, Any]]:
         """
         Parse PMC full-text XML into structured format with section detection and table validation.
 
+        Makes a single streaming pass over the XML (see pubmed_xml_stream);
+        scripts/benchmark_pubmed_xml_parsing.py checks the result against
+        the original tree-based parser.
+
         Args:
-            xml_text: PMC full-text XML
+            xml: PMC full-text XML (text, bytes, or an iterable of chunks)
             pmid: PubMed ID
             pmcid: PubMed Central ID
 
@@ -981,202 +1126,175 @@ Abstract:
             Dictionary with paper content including sections and validated tables
         """
         try:
-            root = ET.fromstring(xml_text)
+            fields, all_text = parse_pmc_article(xml, self)
+            return self._build_pmc_paper(pmid, pmcid, fields, all_text)
 
-            # Extract title
-            title_elem = root.find(".//article-title")
-            title = title_elem.text if title_elem is not None else "No title"
+        except Exception as e:
+            logger.error(f"Error parsing PMC full-text for {pmcid}: {str(e)}")
+            return None
 
-            # Extract authors
-            authors = []
-            for contrib in root.findall(".//contrib[@contrib-type='author']"):
-                surname = contrib.find(".//surname")
-                given_names = contrib.find(".//given-names")
-                if surname is not None:
-                    author = surname.text or ""
-                    if given_names is not None:
-                        author = f"{given_names.text} {author}"
-                    authors.append(author)
-
-            # Extract journal
-            journal_elem = root.find(".//journal-title")
-            if not journal_elem:
-                journal_elem = root.find(".//journal-id")
-            journal = journal_elem.text if journal_elem is not None else "Unknown journal"
+    def _build_pmc_paper(
+        self,
+        pmid: str,
+        pmcid: str,
+        fields: Dict[str, Any],
+        all_text: Callable[[], str]
+    ) -> Dict[str, Any]:
+        """
+        Assemble the cached paper dict from fields extracted from PMC XML.
 
-            # Extract year and month
-            year_elem = root.find(".//pub-date/year")
-            if not year_elem:
-                year_elem = root.find(".//year")
-            year = year_elem.text if year_elem is not None else "Unknown"
-
-            month_elem = root.find(".//pub-date/month")
-            if not month_elem:
-                month_elem = root.find(".//month")
-            month = month_elem.text if month_elem is not None else "01"
-            # Convert month name to number if needed
-            if month and not month.isdigit():
-                month_map = {
-                    'jan': '01', 'january': '01',
-                    'feb': '02', 'february': '02',
-                    'mar': '03', 'march': '03',
-                    'apr': '04', 'april': '04',
-                    'may': '05',
-                    'jun': '06', 'june': '06',
-                    'jul': '07', 'july': '07',
-                    'aug': '08', 'august': '08',
-                    'sep': '09', 'september': '09',
-                    'oct': '10', 'october': '10',
-                    'nov': '11', 'november': '11',
-                    'dec': '12', 'december': '12'
-                }
-                month = month_map.get(month.lower(), '01')
-
-            # Extract DOI
-            doi_elem = root.find(".//article-id[@pub-id-type='doi']")
-            doi = doi_elem.text if doi_elem is not None else None
-
-            # Extract additional metadata (based on tidypmc pmc_metadata approach)
-            keywords = self._extract_keywords(root)
-            volume = self._extract_volume(root)
-            issue = self._extract_issue(root)
-            pages = self._extract_pages(root)
-            article_type = self._extract_article_type(root)
-            pub_date = self._extract_pub_date(root)
-
-            # Extract abstract
-            abstract_elem = root.find(".//abstract")
-            abstract = ""
-            if abstract_elem is not None:
-                abstract = " ".join(abstract_elem.itertext())
-
-            # Extract full body text
-            body_elem = root.find(".//body")
-            body_text = ""
-            if body_elem is not None:
-                body_text = " ".join(body_elem.itertext())
-
-            # Extract and validate tables
-            tables = self._extract_and_validate_pmc_tables(root)
-
-            # Combine all content
-            full_content = f"{title}\n\nAbstract:\n{abstract}\n\nFull Text:\n{body_text}"
-
-            # Debug logging
-            logger.info(f"Parsed {pmcid}: title={len(title)} chars, abstract={len(abstract)} chars, body={len(body_text)} chars, total={len(full_content)} chars")
-            logger.info(f"Metadata: authors={len(authors)}, journal={journal}, year={year}, doi={doi}, tables={len(tables)}")
-
-            # Check if we actually got content
-            if len(full_content) < 100 or (not abstract and not body_text):
-                logger.warning(f"Very little content extracted from {pmcid}. XML might be in different format or empty.")
-                # Try to extract at least the article text if XPath failed
-                all_text = " ".join(root.itertext())
-                if len(all_text) > len(full_content):
-                    logger.info(f"Falling back to extracting all text from XML ({len(all_text)} chars)")
-                    full_content = all_text
-
-            # Extract sections directly from PMC XML structure (based on tidypmc pmc_text approach)
-            sections = self._extract_sections_from_pmc_xml(root)
-
-            # If no sections found in XML, try pattern-based detection on content
-            if not sections:
-                logger.debug(f"  No sections found in XML structure, trying pattern-based detection...")
-                sections = self._detect_sections_in_pmc_content(full_content)
-
-            # Extract captions (based on tidypmc pmc_caption approach)
-            captions = self._extract_captions(root)
-
-            # Extract references (based on tidypmc pmc_reference approach)
-            references = self._extract_references(root)
+        Args:
+            pmid: PubMed ID
+            pmcid: PubMed Central ID
+            fields: Extracted title, authors, journal, year, month, doi, keywords,
+                volume, issue, pages, article_type, pub_date, abstract, body_text,
+                tables, sections, captions and references
+            all_text: Returns all text in the document (fallback when the
+                abstract and body are missing)
 
-            return {
-                "paper_id": f"{pmid}_{pmcid}",
-                "pmid": pmid,
-                "pmcid": pmcid,
-                "title": title,
-                "authors": authors[:3] if authors else [],  # First 3 authors
-                "journal": journal,
-                "year": year,
-                "month": month,  # Add month for filename generation
-                "doi": doi,
-                "url": f"https://pubmed.ncbi.nlm.nih.gov/{pmid}/",
-                "content": full_content,
-                "sections": sections,
-                "tables": tables,
-                "captions": captions,  # NEW: Figure/table captions
-                "references": references,  # NEW: References
-                "metadata": {
-                    "source": "PubMed Central",
-                    "open_access": True,
-                    "extraction_method": "PMC XML + tidypmc approach (text, table, caption, reference, metadata)",
-                    "tables_validated": len(tables) > 0,
-                    "sections_detected": len(sections),
-                    "captions_extracted": sum(len(v) for v in captions.values()),
-                    "references_extracted": len(references),
-                    # Enhanced metadata (based on tidypmc pmc_metadata)
-                    "keywords": keywords,
-                    "volume": volume,
-                    "issue": issue,
-                    "pages": pages,
-                    "article_type": article_type,
-                    "pub_date": pub_date
-                }
+        Returns:
+            Dictionary with paper content including sections and validated tables
+        """
+        title = fields["title"]
+        authors = fields["authors"]
+        journal = fields["journal"]
+        year = fields["year"]
+        doi = fields["doi"]
+        abstract = fields["abstract"]
+        body_text = fields["body_text"]
+        tables = fields["tables"]
+
+        month = fields["month"]
+        # Convert month name to number if needed
+        if month and not month.isdigit():
+            month_map = {
+                'jan': '01', 'january': '01',
+                'feb': '02', 'february': '02',
+                'mar': '03', 'march': '03',
+                'apr': '04', 'april': '04',
+                'may': '05',
+                'jun': '06', 'june': '06',
+                'jul': '07', 'july': '07',
+                'aug': '08', 'august': '08',
+                'sep': '09', 'september': '09',
+                'oct': '10', 'october': '10',
+                'nov': '11', 'november': '11',
+                'dec': '12', 'december': '12'
             }
+            month = month_map.get(month.lower(), '01')
+
+        # Combine all content
+        full_content = f"{title}\n\nAbstract:\n{abstract}\n\nFull Text:\n{body_text}"
+
+        # Debug logging
+        logger.info(f"Parsed {pmcid}: title={len(title)} chars, abstract={len(abstract)} chars, body={len(body_text)} chars, total={len(full_content)} chars")
+        logger.info(f"Metadata: authors={len(authors)}, journal={journal}, year={year}, doi={doi}, tables={len(tables)}")
+
+        # Check if we actually got content
+        if len(full_content) < 100 or (not abstract and not body_text):
+            logger.warning(f"Very little content extracted from {pmcid}. XML might be in different format or empty.")
+            # Try to extract at least the article text if XPath failed
+            all_text = all_text()
+            if len(all_text) > len(full_content):
+                logger.info(f"Falling back to extracting all text from XML ({len(all_text)} chars)")
+                full_content = all_text
+
+        # Sections from the PMC XML structure (based on tidypmc pmc_text approach)
+        sections = fields["sections"]
+
+        # If no sections found in XML, try pattern-based detection on content
+        if not sections:
+            logger.debug(f"  No sections found in XML structure, trying pattern-based detection...")
+            sections = self._detect_sections_in_pmc_content(full_content)
+
+        # Captions and references (based on tidypmc pmc_caption / pmc_reference approach)
+        captions = fields["captions"]
+        references = fields["references"]
+
+        return {
+            "paper_id": f"{pmid}_{pmcid}",
+            "pmid": pmid,
+            "pmcid": pmcid,
+            "title": title,
+            "authors": authors[:3] if authors else [],  # First 3 authors
+            "journal": journal,
+            "year": year,
+            "month": month,  # Add month for filename generation
+            "doi": doi,
+            "url": f"https://pubmed.ncbi.nlm.nih.gov/{pmid}/",
+            "content": full_content,
+            "sections": sections,
+            "tables": tables,
+            "captions": captions,  # NEW: Figure/table captions
+            "references": references,  # NEW: References
+            "metadata": {
+                "source": "PubMed Central",
+                "open_access": True,
+                "extraction_method": "PMC XML + tidypmc approach (text, table, caption, reference, metadata)",
+                "tables_validated": len(tables) > 0,
+                "sections_detected": len(sections),
+                "captions_extracted": sum(len(v) for v in captions.values()),
+                "references_extracted": len(references),
+                # Enhanced metadata (based on tidypmc pmc_metadata)
+                "keywords": fields["keywords"],
+                "volume": fields["volume"],
+                "issue": fields["issue"],
+                "pages": fields["pages"],
+                "article_type": fields["article_type"],
+                "pub_date": fields["pub_date"]
+            }
+        }
 
-        except Exception as e:
-            logger.error(f"Error parsing PMC full-text for {pmcid}: {str(e)}")
+    def _extract_contrib_author(self, contrib: ET.Element) -> Optional[str]:
+        """Format an author <contrib> as "Given Surname" (None without a surname)"""
+        surname = contrib.find(".//surname")
+        given_names = contrib.find(".//given-names")
+        if surname is None:
             return None
+        author = surname.text or ""
+        if given_names is not None:
+            author = f"{given_names.text} {author}"
+        return author
 
-    def _extract_and_validate_pmc_tables(self, root: ET.Element) -> List[Dict[str, Any]]:
+    def _validate_pmc_table(self, table_wrap: ET.Element) -> Optional[Dict[str, Any]]:
         """
-        Extract tables from PMC XML and validate them.
-
-        Only includes tables that have:
-        - A label (Table 1, Table 2, etc.)
-        - Actual table structure (not just text)
-        - Both headers and data rows
+        Convert one <table-wrap> to a validated markdown table.
 
         Args:
-            root: XML root element
+            table_wrap: <table-wrap> element
 
         Returns:
-            List of validated tables
+            Table dictionary, or None if the table is missing or invalid
         """
-        validated_tables = []
-
-        for table_wrap in root.findall(".//table-wrap"):
-            try:
-                # Get table label
-                table_label = table_wrap.find(".//label")
-                label = table_label.text if table_label is not None else "Table"
-
-                # Try to extract table structure
-                table_elem = table_wrap.find(".//table")
-                if table_elem is None:
-                    logger.debug(f"  Skipping {label}: No <table> element found")
-                    continue
-
-                # Extract table content as markdown
-                table_content = self._convert_pmc_table_to_markdown(table_elem)
+        try:
+            # Get table label
+            table_label = table_wrap.find(".//label")
+            label = table_label.text if table_label is not None else "Table"
+
+            # Try to extract table structure
+            table_elem = table_wrap.find(".//table")
+            if table_elem is None:
+                logger.debug(f"  Skipping {label}: No <table> element found")
+                return None
 
-                # Validate table structure
-                if not self._is_valid_table(table_content, label):
-                    logger.debug(f"  Skipping {label}: Invalid table structure")
-                    continue
+            # Extract table content as markdown
+            table_content = self._convert_pmc_table_to_markdown(table_elem)
 
-                # Add validated table
-                validated_tables.append({
-                    "label": label,
-                    "content": table_content,
-                    "validation_status": "valid"
-                })
-                logger.debug(f"  ✓ Validated {label}")
+            # Validate table structure
+            if not self._is_valid_table(table_content, label):
+                logger.debug(f"  Skipping {label}: Invalid table structure")
+                return None
 
-            except Exception as e:
-                logger.debug(f"  Error processing table: {e}")
-                continue
+            logger.debug(f"  ✓ Validated {label}")
+            return {
+                "label": label,
+                "content": table_content,
+                "validation_status": "valid"
+            }
 
-        return validated_tables
+        except Exception as e:
+            logger.debug(f"  Error processing table: {e}")
+            return None
 
     def _convert_pmc_table_to_markdown(self, table_elem: ET.Element) -> str:
         """
@@ -1409,48 +1527,8 @@ Abstract:
             logger.debug(f"  Section detection failed: {e}")
             return {}
 
-    def _extract_keywords(self, root: ET.Element) -> List[str]:
-        """Extract keywords from PMC XML"""
-        keywords = []
-        for kwd in root.findall(".//kwd"):
-            kwd_text = " ".join(kwd.itertext()).strip()
-            if kwd_text:
-                keywords.append(kwd_text)
-        return keywords
-
-    def _extract_volume(self, root: ET.Element) -> Optional[str]:
-        """Extract volume from PMC XML"""
-        volume_elem = root.find(".//volume")
-        return volume_elem.text if volume_elem is not None else None
-
-    def _extract_issue(self, root: ET.Element) -> Optional[str]:
-        """Extract issue from PMC XML"""
-        issue_elem = root.find(".//issue")
-        return issue_elem.text if issue_elem is not None else None
-
-    def _extract_pages(self, root: ET.Element) -> Optional[str]:
-        """Extract page numbers from PMC XML"""
-        fpage = root.find(".//fpage")
-        lpage = root.find(".//lpage")
-
-        if fpage is not None and lpage is not None:
-            return f"{fpage.text}-{lpage.text}"
-        elif fpage is not None:
-            return fpage.text
-        elif lpage is not None:
-            return lpage.text
-        return None
-
-    def _extract_article_type(self, root: ET.Element) -> Optional[str]:
-        """Extract article type from PMC XML"""
-        article = root.find(".//article")
-        if article is not None:
-            return article.get("article-type")
-        return None
-
-    def _extract_pub_date(self, root: ET.Element) -> Optional[str]:
-        """Extract publication date from PMC XML"""
-        pub_date = root.find(".//pub-date")
+    def _format_pub_date(self, pub_date: ET.Element) -> Optional[str]:
+        """Format a <pub-date> element as year-month-day (missing parts omitted)"""
         if pub_date is not None:
             year = pub_date.find(".//year")
             month = pub_date.find(".//month")
@@ -1468,224 +1546,99 @@ Abstract:
                 return "-".join(date_parts)
         return None
 
-    def _extract_captions(self, root: ET.Element) -> Dict[str, List[Dict[str, Any]]]:
-        """
-        Extract figure, table and supplementary material captions from PMC XML.
-
-        Based on tidypmc's pmc_caption approach:
-        - Extracts captions from <fig>, <table-wrap>, and <supplementary-material>
-        - Maintains association with parent element
-        - Splits captions into sentences
+    def _extract_caption(self, elem: ET.Element, default_label: str) -> Optional[Dict[str, str]]:
+        """Extract the label and caption text of a <fig>, <table-wrap> or <supplementary-material>"""
+        label_elem = elem.find(".//label")
+        caption_elem = elem.find(".//caption")
 
-        Args:
-            root: XML root element
-
-        Returns:
-            Dictionary with 'figures', 'tables', 'supplementary' keys containing captions
-        """
-        captions = {
-            'figures': [],
-            'tables': [],
-            'supplementary': []
-        }
-
-        # Extract figure captions
-        for fig in root.findall(".//fig"):
-            label_elem = fig.find(".//label")
-            caption_elem = fig.find(".//caption")
-
-            if caption_elem is not None:
-                label = label_elem.text if label_elem is not None else "Figure"
-                caption_text = " ".join(caption_elem.itertext()).strip()
-
-                if caption_text:
-                    captions['figures'].append({
-                        'label': label,
-                        'caption': caption_text
-                    })
-
-        # Extract table captions
-        for table_wrap in root.findall(".//table-wrap"):
-            label_elem = table_wrap.find(".//label")
-            caption_elem = table_wrap.find(".//caption")
-
-            if caption_elem is not None:
-                label = label_elem.text if label_elem is not None else "Table"
-                caption_text = " ".join(caption_elem.itertext()).strip()
-
-                if caption_text:
-                    captions['tables'].append({
-                        'label': label,
-                        'caption': caption_text
-                    })
-
-        # Extract supplementary material captions
-        for supp in root.findall(".//supplementary-material"):
-            label_elem = supp.find(".//label")
-            caption_elem = supp.find(".//caption")
-
-            if caption_elem is not None:
-                label = label_elem.text if label_elem is not None else "Supplementary Material"
-                caption_text = " ".join(caption_elem.itertext()).strip()
-
-                if caption_text:
-                    captions['supplementary'].append({
-                        'label': label,
-                        'caption': caption_text
-                    })
-
-        return captions
-
-    def _extract_references(self, root: ET.Element) -> List[Dict[str, Any]]:
-        """
-        Extract references from PMC XML.
+        if caption_elem is not None:
+            label = label_elem.text if label_elem is not None else default_label
+            caption_text = " ".join(caption_elem.itertext()).strip()
 
-        Based on tidypmc's pmc_reference approach:
-        - Extracts reference metadata from <back> section
-        - Parses author, title, journal, year, DOI
-        - Returns structured reference data
-
-        Args:
-            root: XML root element
-
-        Returns:
-            List of reference dictionaries
-        """
-        references = []
-
-        # Find all references in back section
-        for ref in root.findall(".//back/ref-list/ref"):
-            ref_id = ref.get("id", "")
-
-            # Extract mixed-citation or element-citation
-            citation = ref.find(".//mixed-citation") or ref.find(".//element-citation")
-
-            if citation is None:
-                continue
-
-            # Extract authors
-            authors = []
-            for person in citation.findall(".//person-group[@person-group-type='author']/name"):
-                surname = person.find(".//surname")
-                given_names = person.find(".//given-names")
-
-                if surname is not None:
-                    author = surname.text or ""
-                    if given_names is not None:
-                        author = f"{given_names.text} {author}"
-                    authors.append(author)
-
-            # Extract article title
-            article_title_elem = citation.find(".//article-title")
-            article_title = article_title_elem.text if article_title_elem is not None else ""
-
-            # Extract source (journal)
-            source_elem = citation.find(".//source")
-            source = source_elem.text if source_elem is not None else ""
-
-            # Extract year
-            year_elem = citation.find(".//year")
-            year = year_elem.text if year_elem is not None else ""
-
-            # Extract volume
-            volume_elem = citation.find(".//volume")
-            volume = volume_elem.text if volume_elem is not None else ""
-
-            # Extract pages
-            fpage_elem = citation.find(".//fpage")
-            lpage_elem = citation.find(".//lpage")
-            pages = ""
-            if fpage_elem is not None and lpage_elem is not None:
-                pages = f"{fpage_elem.text}-{lpage_elem.text}"
-            elif fpage_elem is not None:
-                pages = fpage_elem.text
-
-            # Extract DOI
-            doi_elem = citation.find(".//pub-id[@pub-id-type='doi']")
-            doi = doi_elem.text if doi_elem is not None else ""
-
-            # Extract PMID
-            pmid_elem = citation.find(".//pub-id[@pub-id-type='pmid']")
-            pmid = pmid_elem.text if pmid_elem is not None else ""
-
-            # Only add if we have meaningful content
-            if article_title or source:
-                references.append({
-                    'ref_id': ref_id,
-                    'authors': authors,
-                    'title': article_title,
-                    'journal': source,
-                    'year': year,
-                    'volume': volume,
-                    'pages': pages,
-                    'doi': doi,
-                    'pmid': pmid
-                })
-
-        return references
-
-    def _extract_sections_from_pmc_xml(self, root: ET.Element) -> Dict[str, Dict[str, Any]]:
-        """
-        Extract sections directly from PMC XML structure.
+            if caption_text:
+                return {
+                    'label': label,
+                    'caption': caption_text
+                }
+        return None
 
-        Based on tidypmc's pmc_text function approach:
-        - Extracts <sec> elements with <title> tags
-        - Builds full path to subsection titles
-        - Extracts all paragraphs within each section
+    def _extract_reference(self, ref: ET.Element) -> Optional[Dict[str, Any]]:
+        """Extract metadata for one <ref> (None without a citation, title or source)"""
+        ref_id = ref.get("id", "")
 
-        Args:
-            root: XML root element
+        # Extract mixed-citation or element-citation
+        citation = ref.find(".//mixed-citation") or ref.find(".//element-citation")
 
-        Returns:
-            Dictionary of sections with content
-        """
-        sections = {}
-
-        # Find all top-level sections
-        for sec in root.findall(".//sec"):
-            # Get section title
-            title_elem = sec.find(".//title")
-            if title_elem is None:
-                continue
-
-            title = " ".join(title_elem.itertext()).strip()
-            if not title:
-                continue
-
-            # Extract all paragraphs in this section
-            paragraphs = []
-            for p in sec.findall(".//p"):
-                p_text = " ".join(p.itertext()).strip()
-                if p_text:
-                    paragraphs.append(p_text)
-
-            # Extract subsections
-            subsections = []
-            for subsec in sec.findall(".//sec"):
-                subsec_title_elem = subsec.find(".//title")
-                if subsec_title_elem is not None:
-                    subsec_title = " ".join(subsec_title_elem.itertext()).strip()
-                    if subsec_title and subsec_title != title:
-                        subsections.append(subsec_title)
-
-            # Create section key (normalize title)
-            section_key = title.lower().replace(" ", "_")
-
-            # Store section
-            if paragraphs or subsections:
-                sections[section_key] = {
-                    "title": title,
-                    "content": "\n\n".join(paragraphs),
-                    "subsections": subsections,
-                    "paragraph_count": len(paragraphs)
-                }
+        if citation is None:
+            return None
 
-        logger.debug(f"  Extracted {len(sections)} sections from PMC XML: {list(sections.keys())}")
-        return sections
+        # Extract authors
+        authors = []
+        for person in citation.findall(".//person-group[@person-group-type='author']/name"):
+            surname = person.find(".//surname")
+            given_names = person.find(".//given-names")
+
+            if surname is not None:
+                author = surname.text or ""
+                if given_names is not None:
+                    author = f"{given_names.text} {author}"
+                authors.append(author)
+
+        # Extract article title
+        article_title_elem = citation.find(".//article-title")
+        article_title = article_title_elem.text if article_title_elem is not None else ""
+
+        # Extract source (journal)
+        source_elem = citation.find(".//source")
+        source = source_elem.text if source_elem is not None else ""
+
+        # Extract year
+        year_elem = citation.find(".//year")
+        year = year_elem.text if year_elem is not None else ""
+
+        # Extract volume
+        volume_elem = citation.find(".//volume")
+        volume = volume_elem.text if volume_elem is not None else ""
+
+        # Extract pages
+        fpage_elem = citation.find(".//fpage")
+        lpage_elem = citation.find(".//lpage")
+        pages = ""
+        if fpage_elem is not None and lpage_elem is not None:
+            pages = f"{fpage_elem.text}-{lpage_elem.text}"
+        elif fpage_elem is not None:
+            pages = fpage_elem.text
+
+        # Extract DOI
+        doi_elem = citation.find(".//pub-id[@pub-id-type='doi']")
+        doi = doi_elem.text if doi_elem is not None else ""
+
+        # Extract PMID
+        pmid_elem = citation.find(".//pub-id[@pub-id-type='pmid']")
+        pmid = pmid_elem.text if pmid_elem is not None else ""
+
+        # Only add if we have meaningful content
+        if article_title or source:
+            return {
+                'ref_id': ref_id,
+                'authors': authors,
+                'title': article_title,
+                'journal': source,
+                'year': year,
+                'volume': volume,
+                'pages': pages,
+                'doi': doi,
+                'pmid': pmid
+            }
+        return None
 
     def close(self):
-        """Close the HTTP session"""
+        """Close the HTTP session and stop the parser pool"""
         self.session.close()
+        with self._parse_pool_lock:
+            if self._parse_pool is not None:
+                self._parse_pool.shutdown()
+                self._parse_pool = None
 
     def __enter__(self):
         return self
@@ -1694,6 +1647,30 @@ Abstract:
         self.close()
 
 
+class PMCFullTextParser:
+    """
+    PMC full-text XML parsing without a client.
+
+    Borrows the PubMedAPI helpers the streaming parser calls; none of them
+    touch client state, so parser pool workers don't build an HTTP session,
+    caches or locks.
+    """
+
+    _parse_pmc_fulltext = PubMedAPI._parse_pmc_fulltext
+    _build_pmc_paper = PubMedAPI._build_pmc_paper
+    _extract_contrib_author = PubMedAPI._extract_contrib_author
+    _validate_pmc_table = PubMedAPI._validate_pmc_table
+    _convert_pmc_table_to_markdown = PubMedAPI._convert_pmc_table_to_markdown
+    _parse_table_header = PubMedAPI._parse_table_header
+    _parse_table_body = PubMedAPI._parse_table_body
+    _extract_row_cells = PubMedAPI._extract_row_cells
+    _is_valid_table = PubMedAPI._is_valid_table
+    _detect_sections_in_pmc_content = PubMedAPI._detect_sections_in_pmc_content
+    _format_pub_date = PubMedAPI._format_pub_date
+    _extract_caption = PubMedAPI._extract_caption
+    _extract_reference = PubMedAPI._extract_reference
+
+
 def get_tool_definition() -> dict:
     """
     Get tool definition for Claude tool use.
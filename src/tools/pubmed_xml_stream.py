@@ -0,0 +1,441 @@
+"""
+Streaming parsers for PubMed efetch and PMC full-text XML.
+
+ET.fromstring builds a DOM for the whole response, and the original tree
+parsers then walked it once per field (sections, tables, captions,
+references, keywords). The XMLParser targets here make one pass over the
+document instead:
+
+- PubMed efetch batches are built and released one <PubmedArticle> at a
+  time, each handed to PubMedAPI._extract_article_data.
+- PMC articles keep only the text segments of the document plus the small
+  subtrees the per-element extractors need (table-wrap, fig,
+  supplementary-material, contrib, pub-date, ref); everything else is
+  tracked as element bookkeeping that is dropped when the element closes.
+
+The results match the tree-based parsers exactly, including their
+first-match lookups and Element truthiness checks (``if not elem`` is true
+for an element without children). scripts/benchmark_pubmed_xml_parsing.py
+keeps the tree parsers as the reference and compares both over a corpus of
+PMC articles.
+"""
+
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+from xml.etree import ElementTree as ET
+
+XMLSource = Union[str, bytes, Iterable[Union[str, bytes]]]
+
+# Feed size when the source is a single string/bytes
+CHUNK_SIZE = 64 * 1024
+
+# Subtrees built for the per-element PMC extractors
+PMC_CAPTURE_TAGS = frozenset({
+    "table-wrap", "fig", "supplementary-material", "contrib", "pub-date", "ref",
+})
+
+# Elements whose first occurrence in the document is read
+PMC_FIRST_TAGS = frozenset({
+    "article-title", "journal-title", "journal-id", "year", "month",
+    "volume", "issue", "fpage", "lpage", "abstract", "body", "pub-date",
+})
+
+# Elements that need bookkeeping (text, position, children) while parsing
+PMC_TRACKED_TAGS = PMC_FIRST_TAGS | PMC_CAPTURE_TAGS | frozenset({
+    "title", "p", "sec", "kwd", "article", "article-id",
+})
+
+
+def _chunks(source: XMLSource) -> Iterator[Union[str, bytes]]:
+    """Split a document into parser feeds (iterables of chunks pass through)."""
+    if isinstance(source, (str, bytes)):
+        for i in range(0, len(source), CHUNK_SIZE):
+            yield source[i:i + CHUNK_SIZE]
+    else:
+        yield from source
+
+
+class _SubtreeCapture:
+    """
+    Builds Elements only inside captured subtrees.
+
+    A capture starts at the outermost element whose tag is in capture_tags
+    and ends with it; captured elements nested inside it (e.g. a fig in a
+    table-wrap) share the same subtree, which is released once the
+    outermost element has been handled.
+    """
+
+    def __init__(self, capture_tags: frozenset):
+        self.capture_tags = capture_tags
+        self.builder: Optional[ET.TreeBuilder] = None
+        self._depth = 0
+
+    def start(self, tag, attrib):
+        if self.builder is None:
+            if tag not in self.capture_tags:
+                return
+            self.builder = ET.TreeBuilder()
+        self.builder.start(tag, attrib)
+        self._depth += 1
+
+    def end(self, tag) -> Optional[ET.Element]:
+        """Close an element; returns it if it is a completed capture."""
+        elem = self.builder.end(tag)
+        self._depth -= 1
+        if self._depth == 0:
+            self.builder = None
+        return elem if tag in self.capture_tags else None
+
+
+class _PubmedArticleTarget:
+    """XMLParser target handing each completed <PubmedArticle> to an extractor."""
+
+    def __init__(self, extract: Callable[[ET.Element], Optional[Dict[str, Any]]]):
+        self._extract = extract
+        self._capture = _SubtreeCapture(frozenset({"PubmedArticle"}))
+        self._depth = 0
+        self.ready: List[Dict[str, Any]] = []
+
+    def start(self, tag, attrib):
+        # findall(".//PubmedArticle") does not match the root itself
+        if self._depth:
+            self._capture.start(tag, attrib)
+        self._depth += 1
+
+    def data(self, text):
+        if self._capture.builder is not None:
+            self._capture.builder.data(text)
+
+    def end(self, tag):
+        self._depth -= 1
+        if self._capture.builder is not None:
+            elem = self._capture.end(tag)
+            if elem is not None:
+                article = self._extract(elem)
+                if article:
+                    self.ready.append(article)
+
+    def close(self):
+        return None
+
+
+def iter_pubmed_articles(
+    source: XMLSource,
+    extract: Callable[[ET.Element], Optional[Dict[str, Any]]]
+) -> Iterator[Dict[str, Any]]:
+    """
+    Stream article dicts out of a PubMed efetch XML response.
+
+    Args:
+        source: XML text/bytes, or an iterable of chunks
+        extract: Maps a <PubmedArticle> element to an article dict (or None)
+
+    Yields:
+        Article dictionaries in document order
+
+    Raises:
+        ET.ParseError: If the XML is malformed
+    """
+    target = _PubmedArticleTarget(extract)
+    parser = ET.XMLParser(target=target)
+    for chunk in _chunks(source):
+        parser.feed(chunk)
+        yield from target.ready
+        target.ready.clear()
+    parser.close()
+    yield from target.ready
+
+
+class _Frame:
+    """Bookkeeping for one tracked element."""
+
+    __slots__ = ("tag", "attrib", "order", "start", "end", "text", "children", "in_ref_list")
+
+    def __init__(self, tag, attrib, order, start):
+        self.tag = tag
+        self.attrib = attrib
+        self.order = order
+        self.start = start
+        self.end = None
+        self.text = None
+        self.children = 0
+        self.in_ref_list = False
+
+
+class _SecRecord:
+    """A <sec> with its first title, paragraphs and nested secs (document order)."""
+
+    __slots__ = ("order", "title", "paragraphs", "subsections")
+
+    def __init__(self, order):
+        self.order = order
+        self.title: Optional[_Frame] = None
+        self.paragraphs: List[_Frame] = []
+        self.subsections: List["_SecRecord"] = []
+
+
+class _PMCArticleTarget:
+    """
+    XMLParser target extracting the fields PMCFullTextParser._build_pmc_paper needs.
+
+    Text is kept as the document's text segments in order (what itertext
+    yields), so any element's itertext is the slice of segments between its
+    start and end tags. Only tracked tags get a _Frame; other elements cost
+    a stack slot while open.
+    """
+
+    def __init__(self, extractors):
+        self._x = extractors
+        self._capture = _SubtreeCapture(PMC_CAPTURE_TAGS)
+        self.segments: List[str] = []
+        self._pending: List[str] = []
+        self._last_was_start = False
+        self._frames: List[Optional[_Frame]] = []
+        self._tags: List[str] = []
+        self._order = 0
+
+        self.first: Dict[str, _Frame] = {}
+        self.keywords: List[_Frame] = []
+        self._open_secs: List[_SecRecord] = []
+        self.sections: List[Tuple[int, str, Dict[str, Any]]] = []
+        self.authors: List[Tuple[int, str]] = []
+        self.tables: List[Tuple[int, Dict[str, Any]]] = []
+        self.captions: Dict[str, List[Tuple[int, Dict[str, str]]]] = {
+            'figures': [], 'tables': [], 'supplementary': [],
+        }
+        self.references: List[Tuple[int, Dict[str, Any]]] = []
+        self.pub_date: Optional[str] = None
+
+    def _flush(self):
+        segment = "".join(self._pending)
+        self._pending.clear()
+        self.segments.append(segment)
+        if self._last_was_start and self._frames[-1] is not None:
+            self._frames[-1].text = segment
+
+    def itertext(self, frame: _Frame) -> str:
+        """Equivalent of " ".join(elem.itertext()) for a closed element."""
+        return " ".join(self.segments[frame.start:frame.end])
+
+    def start(self, tag, attrib):
+        if self._pending:
+            self._flush()
+        frames, tags = self._frames, self._tags
+        frame = None
+
+        if tags:  # root-relative ".//" lookups never match the root
+            parent_frame = frames[-1]
+            if parent_frame is not None:
+                parent_frame.children += 1
+            if tag in PMC_TRACKED_TAGS:
+                frame = _Frame(tag, attrib, self._order, len(self.segments))
+                self._track(frame, tags)
+            self._capture.start(tag, attrib)
+
+        self._order += 1
+        frames.append(frame)
+        tags.append(tag)
+        self._last_was_start = True
+
+    def _track(self, frame: _Frame, tags: List[str]):
+        tag = frame.tag
+        if tag in PMC_FIRST_TAGS:
+            self.first.setdefault(tag, frame)
+        if tag == "title":
+            for sec in self._open_secs:
+                if sec.title is None:
+                    sec.title = frame
+        elif tag == "p":
+            for sec in self._open_secs:
+                sec.paragraphs.append(frame)
+        elif tag == "sec":
+            record = _SecRecord(frame.order)
+            for sec in self._open_secs:
+                sec.subsections.append(record)
+            self._open_secs.append(record)
+        elif tag in ("year", "month"):
+            if tags[-1] == "pub-date" and len(tags) >= 2:
+                self.first.setdefault(f"pub-date/{tag}", frame)
+        elif tag == "article-id":
+            if frame.attrib.get("pub-id-type") == "doi":
+                self.first.setdefault("doi", frame)
+        elif tag == "article":
+            self.first.setdefault("article", frame)
+        elif tag == "kwd":
+            self.keywords.append(frame)
+        elif tag == "ref":
+            frame.in_ref_list = len(tags) >= 3 and tags[-1] == "ref-list" and tags[-2] == "back"
+
+    def data(self, text):
+        self._pending.append(text)
+        if self._capture.builder is not None:
+            self._capture.builder.data(text)
+
+    def end(self, tag):
+        if self._pending:
+            self._flush()
+        frame = self._frames.pop()
+        self._tags.pop()
+        self._last_was_start = False
+        if frame is None:
+            if self._capture.builder is not None:
+                self._capture.end(tag)
+            return
+
+        frame.end = len(self.segments)
+        if tag == "sec":
+            self._close_sec(self._open_secs.pop())
+        if self._capture.builder is not None:
+            elem = self._capture.end(tag)
+            if elem is not None:
+                self._on_capture(elem, frame)
+
+    def close(self):
+        return None
+
+    def _close_sec(self, record: _SecRecord):
+        """Mirror the tree parser's _extract_sections_from_pmc_xml for one <sec>."""
+        if record.title is None:
+            return
+        title = self.itertext(record.title).strip()
+        if not title:
+            return
+
+        paragraphs = []
+        for p in record.paragraphs:
+            p_text = self.itertext(p).strip()
+            if p_text:
+                paragraphs.append(p_text)
+
+        subsections = []
+        for subsec in record.subsections:
+            if subsec.title is not None:
+                subsec_title = self.itertext(subsec.title).strip()
+                if subsec_title and subsec_title != title:
+                    subsections.append(subsec_title)
+
+        if paragraphs or subsections:
+            self.sections.append((record.order, title.lower().replace(" ", "_"), {
+                "title": title,
+                "content": "\n\n".join(paragraphs),
+                "subsections": subsections,
+                "paragraph_count": len(paragraphs)
+            }))
+
+    def _on_capture(self, elem: ET.Element, frame: _Frame):
+        order = frame.order
+        tag = elem.tag
+        if tag == "table-wrap":
+            table = self._x._validate_pmc_table(elem)
+            if table:
+                self.tables.append((order, table))
+            self._add_caption("tables", order, elem, "Table")
+        elif tag == "fig":
+            self._add_caption("figures", order, elem, "Figure")
+        elif tag == "supplementary-material":
+            self._add_caption("supplementary", order, elem, "Supplementary Material")
+        elif tag == "contrib":
+            if elem.get("contrib-type") == "author":
+                author = self._x._extract_contrib_author(elem)
+                if author is not None:
+                    self.authors.append((order, author))
+        elif tag == "pub-date":
+            if self.first.get("pub-date") is frame:
+                self.pub_date = self._x._format_pub_date(elem)
+        elif tag == "ref":
+            if frame.in_ref_list:
+                reference = self._x._extract_reference(elem)
+                if reference:
+                    self.references.append((order, reference))
+
+    def _add_caption(self, kind, order, elem, default_label):
+        caption = self._x._extract_caption(elem, default_label)
+        if caption:
+            self.captions[kind].append((order, caption))
+
+    def fields(self) -> Dict[str, Any]:
+        """The fields dict PMCFullTextParser._build_pmc_paper expects."""
+        first = self.first
+
+        def text_of(key, default=None):
+            frame = first.get(key)
+            return frame.text if frame is not None else default
+
+        def with_fallback(key, fallback, default):
+            # find(key); `if not elem` also replaces an element without children
+            frame = first.get(key)
+            if frame is None or not frame.children:
+                frame = first.get(fallback)
+            return frame.text if frame is not None else default
+
+        fpage, lpage = first.get("fpage"), first.get("lpage")
+        if fpage is not None and lpage is not None:
+            pages = f"{fpage.text}-{lpage.text}"
+        elif fpage is not None:
+            pages = fpage.text
+        elif lpage is not None:
+            pages = lpage.text
+        else:
+            pages = None
+
+        keywords = []
+        for kwd in self.keywords:
+            kwd_text = self.itertext(kwd).strip()
+            if kwd_text:
+                keywords.append(kwd_text)
+
+        sections = {}
+        for _, key, section in sorted(self.sections, key=lambda s: s[0]):
+            sections[key] = section
+
+        article = first.get("article")
+        abstract, body = first.get("abstract"), first.get("body")
+
+        def ordered(items):
+            return [item for _, item in sorted(items, key=lambda i: i[0])]
+
+        return {
+            "title": text_of("article-title", "No title"),
+            "authors": ordered(self.authors),
+            "journal": with_fallback("journal-title", "journal-id", "Unknown journal"),
+            "year": with_fallback("pub-date/year", "year", "Unknown"),
+            "month": with_fallback("pub-date/month", "month", "01"),
+            "doi": text_of("doi"),
+            "keywords": keywords,
+            "volume": text_of("volume"),
+            "issue": text_of("issue"),
+            "pages": pages,
+            "article_type": article.attrib.get("article-type") if article is not None else None,
+            "pub_date": self.pub_date,
+            "abstract": self.itertext(abstract) if abstract is not None else "",
+            "body_text": self.itertext(body) if body is not None else "",
+            "tables": ordered(self.tables),
+            "sections": sections,
+            "captions": {kind: ordered(items) for kind, items in self.captions.items()},
+            "references": ordered(self.references),
+        }
+
+
+def parse_pmc_article(source: XMLSource, extractors) -> Tuple[Dict[str, Any], Callable[[], str]]:
+    """
+    Extract the fields of a PMC full-text article in one streaming pass.
+
+    Args:
+        source: PMC XML text/bytes, or an iterable of chunks
+        extractors: Object providing the per-element extractors
+            (_validate_pmc_table, _extract_caption, _extract_contrib_author,
+            _format_pub_date, _extract_reference), i.e. a PMCFullTextParser
+
+    Returns:
+        (fields, all_text) where all_text() joins every text segment of the
+        document like " ".join(root.itertext())
+
+    Raises:
+        ET.ParseError: If the XML is malformed
+    """
+    target = _PMCArticleTarget(extractors)
+    parser = ET.XMLParser(target=target)
+    for chunk in _chunks(source):
+        parser.feed(chunk)
+    parser.close()
+    segments = target.segments
+    return target.fields(), lambda: " ".join(segments)
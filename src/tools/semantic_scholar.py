@@ -16,6 +16,8 @@ import logging
 import time
 import random
 
+from src.tools.http_cache import ResponseCache, get_response_cache
+
 logger = logging.getLogger(__name__)
 
 
@@ -43,17 +45,20 @@ class SemanticScholarAPI:
     # Extended fields for detailed paper info
     EXTENDED_FIELDS = DEFAULT_FIELDS + ["tldr", "citations", "references"]
 
-    def __init__(self, api_key: Optional[str] = None, timeout: int = 30):
+    def __init__(self, api_key: Optional[str] = None, timeout: int = 30,
+                 response_cache: Optional[ResponseCache] = None):
         """
         Initialize Semantic Scholar API client.
 
         Args:
             api_key: Optional API key for higher rate limits
             timeout: Request timeout in seconds
+            response_cache: HTTP response cache (defaults to the shared on-disk cache)
         """
         self.api_key = api_key
         self.timeout = timeout
         self.session = httpx.Client(timeout=timeout)
+        self.response_cache = response_cache or get_response_cache()
 
         # Thread-safe rate limiting with sliding window
         # Without key: 100 requests per 5 minutes = 1 request per 3 seconds
@@ -123,6 +128,9 @@ class SemanticScholarAPI:
         """
         Make HTTP request with exponential backoff retry on rate limits.
 
+        GET requests are served from the shared response cache when possible,
+        which skips both the network and the rate limiter.
+
         Args:
             method: HTTP method (get, post, etc.)
             url: Request URL
@@ -132,7 +140,24 @@ class SemanticScholarAPI:
         Returns:
             Response object or None if all retries failed
         """
+        if method == "get" and not kwargs:
+            return self.response_cache.fetch(
+                "semantic_scholar", url, params,
+                lambda headers: self._send_with_retry(method, url, params, extra_headers=headers),
+            )
+        return self._send_with_retry(method, url, params, **kwargs)
+
+    def _send_with_retry(
+        self,
+        method: str,
+        url: str,
+        params: Optional[Dict] = None,
+        extra_headers: Optional[Dict] = None,
+        **kwargs
+    ) -> Optional[httpx.Response]:
+        """Send a rate-limited request, retrying with exponential backoff."""
         last_error = None
+        headers = {**self.headers, **(extra_headers or {})}
 
         for attempt in range(self.max_retries + 1):
             try:
@@ -141,12 +166,12 @@ class SemanticScholarAPI:
                 response = getattr(self.session, method)(
                     url,
                     params=params,
-                    headers=self.headers,
+                    headers=headers,
                     **kwargs
                 )
 
-                # Success
-                if response.status_code == 200:
+                # Success (or not modified, for a conditional request)
+                if response.status_code == 200 or (response.status_code == 304 and extra_headers):
                     return response
 
                 # Rate limited - retry with backoff
@@ -42,8 +42,6 @@ class Settings(BaseSettings):
 
     # PDF Processing Configuration
     use_camelot: bool = True
-    camelot_flavor: str = "lattice"
-    camelot_fallback_to_stream: bool = True
     extract_figures: bool = False
 
     # Storage Configuration
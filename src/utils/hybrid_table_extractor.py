@@ -12,7 +12,8 @@ Strategy:
 """
 
 import logging
-from typing import List, Dict, Any, Optional, Tuple
+from concurrent.futures import Executor
+from typing import List, Dict, Any, Optional, Sequence, Tuple
 import pandas as pd
 import re
 
@@ -22,16 +23,27 @@ logger = logging.getLogger(__name__)
 class HybridTableExtractor:
     """Extract tables using hybrid approach: PyMuPDF headers + Camelot content."""
 
-    def __init__(self):
-        """Initialize the hybrid extractor."""
+    def __init__(self, executor: Optional[Executor] = None):
+        """
+        Initialize the hybrid extractor.
+
+        Args:
+            executor: Process pool to run Camelot pages in parallel
+        """
         self.logger = logger
+        self.executor = executor
     
-    def extract_tables_hybrid(self, pdf_path: str) -> List[Dict[str, Any]]:
+    def extract_tables_hybrid(
+        self,
+        pdf_path: str,
+        pages: Optional[Sequence[int]] = None
+    ) -> List[Dict[str, Any]]:
         """
         Extract tables using hybrid approach.
         
         Args:
             pdf_path: Path to PDF file
+            pages: 1-indexed pages for Camelot to read (default: all pages)
             
         Returns:
             List of extracted tables with headers and content
@@ -48,7 +60,7 @@ class HybridTableExtractor:
         try:
             # Step 1: Extract tables with Camelot (for content)
             self.logger.info("Step 1: Extracting table content with Camelot...")
-            camelot_tables = self._extract_with_camelot(pdf_path)
+            camelot_tables = self._extract_with_camelot(pdf_path, pages)
             self.logger.info(f"  Found {len(camelot_tables)} tables with Camelot")
 
             # Step 2: Extract headers with PyMuPDF (for structure)
@@ -72,7 +84,11 @@ class HybridTableExtractor:
             self.logger.error(f"Hybrid extraction failed: {e}")
             return []
     
-    def _extract_with_camelot(self, pdf_path: str) -> List[Dict[str, Any]]:
+    def _extract_with_camelot(
+        self,
+        pdf_path: str,
+        pages: Optional[Sequence[int]] = None
+    ) -> List[Dict[str, Any]]:
         """
         Extract tables with Camelot (for content).
 
@@ -81,19 +97,15 @@ class HybridTableExtractor:
         2. Fix single-cell tables (when internal column separators are missing)
         3. Fall back to stream mode for borderless tables
         """
-        import camelot
+        from src.utils.table_extraction_service import read_camelot_tables
 
         tables = []
 
         try:
             # Try lattice mode first (best for scientific papers with bordered tables)
             self.logger.info("  Extracting with Camelot lattice mode (bordered tables)...")
-            lattice_tables = camelot.read_pdf(
-                pdf_path,
-                pages='all',
-                flavor='lattice',
-                line_scale=40,
-                suppress_stdout=True
+            lattice_tables = read_camelot_tables(
+                pdf_path, 'lattice', pages=pages, executor=self.executor, line_scale=40
             )
 
             for table in lattice_tables:
@@ -142,11 +154,8 @@ class HybridTableExtractor:
             # Only if we didn't find many tables with lattice
             if len(tables) < 5:
                 self.logger.info("  Extracting with Camelot stream mode (borderless tables)...")
-                stream_tables = camelot.read_pdf(
-                    pdf_path,
-                    pages='all',
-                    flavor='stream',
-                    suppress_stdout=True
+                stream_tables = read_camelot_tables(
+                    pdf_path, 'stream', pages=pages, executor=self.executor
                 )
 
                 for table in stream_tables:
@@ -861,8 +870,11 @@ class HybridTableExtractor:
                 # No matching headers found
                 self.logger.info(f"  Table {i+1}: No matching pdfplumber headers found")
             
-            # Convert to markdown
+            # Convert to markdown (and keep the raw cells, which markdown can't carry)
             table_content = df.to_markdown(index=False)
+            rows = df.astype(str).values.tolist()
+            if not isinstance(df.columns, pd.RangeIndex):
+                rows.insert(0, [str(c) for c in df.columns])
             
             # Extract table label
             first_row_text = ' '.join(str(cell) for cell in df.iloc[0].tolist()) if df.shape[0] > 0 else ''
@@ -877,6 +889,7 @@ class HybridTableExtractor:
             result = {
                 'label': table_label,
                 'content': table_content,
+                'rows': rows,
                 'accuracy': camelot_table['accuracy'],
                 'page': page,
                 'extraction_method': 'hybrid (PyMuPDF headers + Camelot content)'
@@ -0,0 +1,389 @@
+"""
+Cached, page-parallel PDF table extraction.
+
+TableExtractor runs Camelot lattice and stream over every page (and again
+when few tables are found), all in-process. TableExtractionService wraps it:
+
+- results are keyed by the SHA-256 of the PDF bytes (plus the validation
+  config) and persisted in SQLite, so a PDF seen before - under any path
+  or file name - is not extracted again;
+- a cheap PyMuPDF pass (find_table_pages) flags pages with a "Table N"
+  caption or ruled lines, and Camelot only reads those pages;
+- Camelot pages are spread across a process pool (read_camelot_tables).
+
+Set TABLE_CACHE_DISABLED=1 to bypass the cache, or TABLE_CACHE_DIR to relocate it.
+"""
+import hashlib
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from src.utils.extraction_config import TableValidationConfig
+from src.utils.table_extractor import ExtractedTable, TableExtractor
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = Path("data/table_cache")
+# Bump when extraction logic changes so cached results are recomputed
+EXTRACTOR_VERSION = 2
+# Default Camelot worker processes per service (each holds a PDF in memory)
+DEFAULT_MAX_WORKERS = 4
+
+# "Table 2", "Table II.", "Table 3 (continued)" at the start of a line
+TABLE_CAPTION_PATTERN = re.compile(r"^\s*Table\s+[IVX0-9]+[A-Z]?\b", re.IGNORECASE | re.MULTILINE)
+# Horizontal rules at least this wide (points) and this many per page mark a ruled table
+MIN_RULE_WIDTH = 100
+MIN_RULES_PER_PAGE = 3
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tables (
+    cache_key TEXT PRIMARY KEY,
+    content_hash TEXT NOT NULL,
+    body BLOB NOT NULL,
+    table_count INTEGER NOT NULL,
+    stored_at REAL NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_tables_content_hash ON tables (content_hash);
+"""
+
+
+def pdf_content_hash(pdf_path: str) -> str:
+    """SHA-256 of the PDF bytes."""
+    digest = hashlib.sha256()
+    with open(pdf_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def find_table_pages(pdf_path: str) -> List[int]:
+    """
+    1-indexed pages that look like they carry a table.
+
+    A page qualifies if a line starts with a "Table N" caption (continuation
+    pages usually repeat it) or it has MIN_RULES_PER_PAGE horizontal rules.
+    This reads text and vector drawings only, no rendering, so it costs a few
+    milliseconds per page.
+    """
+    import fitz
+
+    pages = []
+    with fitz.open(pdf_path) as doc:
+        for page_num in range(len(doc)):
+            page = doc[page_num]
+            if TABLE_CAPTION_PATTERN.search(page.get_text("text")):
+                pages.append(page_num + 1)
+                continue
+
+            rules = 0
+            for drawing in page.get_drawings():
+                for item in drawing.get("items", ()):
+                    if item[0] == "l":
+                        start, end = item[1], item[2]
+                        is_rule = abs(start.y - end.y) < 1 and abs(start.x - end.x) >= MIN_RULE_WIDTH
+                    elif item[0] == "re":
+                        rect = item[1]
+                        is_rule = rect.height < 2 and rect.width >= MIN_RULE_WIDTH
+                    else:
+                        continue
+                    rules += is_rule
+            if rules >= MIN_RULES_PER_PAGE:
+                pages.append(page_num + 1)
+    return pages
+
+
+@dataclass
+class CamelotTable:
+    """The parts of a camelot Table the extractors read, picklable across processes."""
+    df: pd.DataFrame
+    page: int
+    accuracy: float
+    _bbox: Optional[Tuple[float, float, float, float]] = None
+
+
+def _read_pages(pdf_path: str, flavor: str, pages: str, kwargs: Dict[str, Any]) -> List[CamelotTable]:
+    """Run camelot.read_pdf on ``pages`` (runs in pool workers)."""
+    import camelot
+
+    tables = []
+    for table in camelot.read_pdf(pdf_path, pages=pages, flavor=flavor, suppress_stdout=True, **kwargs):
+        bbox = getattr(table, "_bbox", None)
+        if bbox is None and getattr(table, "cells", None):
+            try:
+                cells = [cell for row in table.cells for cell in row]
+                bbox = (
+                    min(c.x1 for c in cells), min(c.y1 for c in cells),
+                    max(c.x2 for c in cells), max(c.y2 for c in cells),
+                )
+            except (AttributeError, ValueError):
+                bbox = None
+        tables.append(CamelotTable(
+            df=table.df,
+            page=int(table.page),
+            accuracy=getattr(table, "accuracy", 0.0),
+            _bbox=tuple(bbox) if bbox is not None else None,
+        ))
+    return tables
+
+
+def read_camelot_tables(
+    pdf_path: str,
+    flavor: str,
+    pages: Optional[Sequence[int]] = None,
+    executor: Optional[Executor] = None,
+    **kwargs,
+) -> List[CamelotTable]:
+    """
+    Camelot tables for ``pages`` (all pages if None), in page order.
+
+    Args:
+        pdf_path: Path to PDF file
+        flavor: 'lattice' or 'stream'
+        pages: 1-indexed pages to read
+        executor: Pool to read pages in parallel (one task per page)
+        **kwargs: Extra camelot.read_pdf arguments (e.g. line_scale)
+    """
+    if pages is None:
+        return _read_pages(pdf_path, flavor, "all", kwargs)
+    pages = sorted(set(pages))
+    if not pages:
+        return []
+    if executor is None or len(pages) == 1:
+        return _read_pages(pdf_path, flavor, ",".join(map(str, pages)), kwargs)
+
+    futures = [executor.submit(_read_pages, pdf_path, flavor, str(page), kwargs) for page in pages]
+    return [table for future in futures for table in future.result()]
+
+
+class TableResultCache:
+    """
+    Disk-backed table extraction results keyed by PDF content.
+
+    Thread-safe (one SQLite connection per thread) and safe to share between
+    processes using the same directory.
+    """
+
+    def __init__(self, cache_dir: Path = DEFAULT_CACHE_DIR, enabled: bool = True):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir: Directory for the cache database
+            enabled: If False, every lookup misses and nothing is stored
+        """
+        self.enabled = enabled
+        self.db_path = Path(cache_dir) / "tables.sqlite3"
+        self._local = threading.local()
+        self._stats_lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "stores": 0}
+
+        if self.enabled:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn().executescript(_SCHEMA)
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.db_path), timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _count(self, name: str):
+        with self._stats_lock:
+            self._stats[name] += 1
+
+    @staticmethod
+    def make_key(content_hash: str, options: Dict[str, Any]) -> str:
+        """Cache key for a PDF's content and the options that shape the result."""
+        canonical = json.dumps({"content": content_hash, "options": options}, sort_keys=True)
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[List[ExtractedTable]]:
+        """Cached tables, or None on a miss."""
+        if not self.enabled:
+            return None
+        try:
+            row = self._conn().execute("SELECT body FROM tables WHERE cache_key = ?", (key,)).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"Table cache lookup failed, bypassing: {e}")
+            return None
+        if row is None:
+            self._count("misses")
+            return None
+
+        try:
+            tables = [ExtractedTable(**t) for t in json.loads(zlib.decompress(row[0]))]
+        except (zlib.error, ValueError, TypeError):
+            logger.warning(f"Dropping corrupt table cache entry {key[:12]}")
+            self._conn().execute("DELETE FROM tables WHERE cache_key = ?", (key,))
+            self._count("misses")
+            return None
+
+        self._conn().execute("UPDATE tables SET last_access = ? WHERE cache_key = ?", (time.time(), key))
+        self._count("hits")
+        return tables
+
+    def put(self, key: str, content_hash: str, tables: List[ExtractedTable]):
+        """Store the tables extracted from a PDF."""
+        if not self.enabled:
+            return
+        body = zlib.compress(json.dumps([asdict(t) for t in tables]).encode("utf-8"), 6)
+        now = time.time()
+        try:
+            self._conn().execute(
+                """
+                INSERT OR REPLACE INTO tables (
+                    cache_key, content_hash, body, table_count, stored_at, last_access
+                ) VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                (key, content_hash, body, len(tables), now, now),
+            )
+        except sqlite3.Error as e:
+            logger.warning(f"Table cache store failed: {e}")
+            return
+        self._count("stores")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters in this process plus the on-disk entry count."""
+        with self._stats_lock:
+            stats = dict(self._stats)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / lookups, 3) if lookups else 0.0
+        stats["enabled"] = self.enabled
+        if self.enabled:
+            stats["entries"] = self._conn().execute("SELECT COUNT(*) FROM tables").fetchone()[0]
+        return stats
+
+
+_default_cache: Optional[TableResultCache] = None
+_default_cache_lock = threading.Lock()
+
+
+def get_table_result_cache() -> TableResultCache:
+    """Get the process-wide table extraction result cache."""
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            enabled = os.getenv("TABLE_CACHE_DISABLED", "").lower() not in ("1", "true", "yes")
+            cache_dir = Path(os.getenv("TABLE_CACHE_DIR", str(DEFAULT_CACHE_DIR)))
+            try:
+                _default_cache = TableResultCache(cache_dir=cache_dir, enabled=enabled)
+            except (OSError, sqlite3.Error) as e:
+                logger.warning(f"Table result cache unavailable ({e}), continuing without it")
+                _default_cache = TableResultCache(cache_dir=cache_dir, enabled=False)
+        return _default_cache
+
+
+class TableExtractionService:
+    """
+    Table extraction with a content-hash cache, table-page detection and a
+    process pool for Camelot.
+
+    Usage:
+        with TableExtractionService(workers=4) as service:
+            for pdf in pdfs:
+                tables = service.extract(pdf)
+    """
+
+    def __init__(
+        self,
+        config: Optional[TableValidationConfig] = None,
+        workers: Optional[int] = None,
+        cache: Optional[TableResultCache] = None,
+        detect_pages: bool = True,
+    ):
+        """
+        Initialize the service.
+
+        Args:
+            config: Table validation thresholds
+            workers: Camelot worker processes (default: CPU count, at most
+                DEFAULT_MAX_WORKERS; 1 runs in-process)
+            cache: Result cache (default: the process-wide cache)
+            detect_pages: Only run Camelot on pages find_table_pages flags
+        """
+        self.config = config or TableValidationConfig()
+        self.workers = workers if workers is not None else min(os.cpu_count() or 1, DEFAULT_MAX_WORKERS)
+        self.cache = cache if cache is not None else get_table_result_cache()
+        self.detect_pages = detect_pages
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+
+    def _pool(self) -> Optional[ProcessPoolExecutor]:
+        if self.workers <= 1:
+            return None
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            return self._executor
+
+    def _cache_options(self) -> Dict[str, Any]:
+        return {
+            "version": EXTRACTOR_VERSION,
+            "config": asdict(self.config),
+            "detect_pages": self.detect_pages,
+        }
+
+    def extract(self, pdf_path: str, use_cache: bool = True) -> List[ExtractedTable]:
+        """
+        Extract tables from a PDF (see TableExtractor.extract).
+
+        If page detection flags no pages, Camelot reads them all. Empty
+        results are not cached, so a PDF with no tables found is retried.
+
+        Args:
+            pdf_path: Path to PDF file
+            use_cache: Per-call bypass; False re-extracts and refreshes the cache
+
+        Returns:
+            List of ExtractedTable objects, sorted by quality score
+        """
+        content_hash = pdf_content_hash(pdf_path)
+        key = TableResultCache.make_key(content_hash, self._cache_options())
+        if use_cache:
+            cached = self.cache.get(key)
+            if cached is not None:
+                logger.info(f"Table cache hit for {Path(pdf_path).name} ({len(cached)} tables)")
+                return cached
+
+        start = time.perf_counter()
+        pages = None
+        if self.detect_pages:
+            pages = find_table_pages(pdf_path) or None
+            logger.info(f"Table pages in {Path(pdf_path).name}: {pages or 'none detected, reading all'}")
+
+        extractor = TableExtractor(self.config, executor=self._pool())
+        tables = extractor.extract(pdf_path, pages=pages)
+        logger.info(f"Extracted {len(tables)} tables from {Path(pdf_path).name} "
+                    f"in {time.perf_counter() - start:.1f}s")
+
+        if tables:
+            self.cache.put(key, content_hash, tables)
+        return tables
+
+    def close(self):
+        """Shut down the worker processes."""
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
+
+    def __enter__(self) -> "TableExtractionService":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
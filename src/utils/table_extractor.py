@@ -6,8 +6,9 @@ Provides robust table extraction with validation and quality scoring.
 
 import logging
 import re
+from concurrent.futures import Executor
 from dataclasses import dataclass
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Sequence
 from pathlib import Path
 
 from src.utils.extraction_config import TableValidationConfig
@@ -30,6 +31,7 @@ class ExtractedTable:
     header_recovery_applied: bool = False
     header_recovery_confidence: Optional[float] = None
     has_valid_headers: bool = False
+    rows: Optional[List[List[str]]] = None  # Raw cell text, header row first if named
     
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -55,23 +57,42 @@ class TableExtractor:
     3. Camelot lattice mode (better for bordered tables)
     
     Each extracted table is validated and scored.
+
+    For cached, page-parallel extraction use TableExtractionService.
     """
     
-    def __init__(self, config: Optional[TableValidationConfig] = None):
+    def __init__(
+        self,
+        config: Optional[TableValidationConfig] = None,
+        executor: Optional[Executor] = None
+    ):
+        """
+        Args:
+            config: Table validation thresholds
+            executor: Process pool to run Camelot pages in parallel
+        """
         self.config = config or TableValidationConfig()
+        self.executor = executor
         self.logger = logging.getLogger(__name__)
     
-    def extract(self, pdf_path: str) -> List[ExtractedTable]:
+    def extract(self, pdf_path: str, pages: Optional[Sequence[int]] = None) -> List[ExtractedTable]:
         """
         Extract tables from PDF using best available method.
 
+        Args:
+            pdf_path: Path to PDF file
+            pages: 1-indexed pages for Camelot to read (default: all pages)
+
         Returns:
             List of ExtractedTable objects, sorted by quality score
         """
         tables = []
+        if pages is not None and not pages:
+            self.logger.info("No table pages to extract")
+            return tables
 
         # Strategy 1: Try HybridTableExtractor
-        hybrid_tables = self._extract_with_hybrid(pdf_path)
+        hybrid_tables = self._extract_with_hybrid(pdf_path, pages)
         if hybrid_tables:
             self.logger.info(f"Hybrid extractor found {len(hybrid_tables)} tables")
             tables.extend(hybrid_tables)
@@ -79,7 +100,7 @@ class TableExtractor:
         # Strategy 2: If hybrid found few tables, try Camelot
         if len(tables) < 2:
             self.logger.info("Trying Camelot extraction...")
-            camelot_tables = self._extract_with_camelot(pdf_path)
+            camelot_tables = self._extract_with_camelot(pdf_path, pages)
 
             # Deduplicate (some tables may be found by both methods)
             new_tables = self._deduplicate_tables(camelot_tables, tables)
@@ -97,13 +118,17 @@ class TableExtractor:
         self.logger.info(f"Total tables extracted: {len(tables)}")
         return tables
     
-    def _extract_with_hybrid(self, pdf_path: str) -> List[ExtractedTable]:
+    def _extract_with_hybrid(
+        self,
+        pdf_path: str,
+        pages: Optional[Sequence[int]] = None
+    ) -> List[ExtractedTable]:
         """Extract tables using HybridTableExtractor."""
         try:
             from src.utils.hybrid_table_extractor import HybridTableExtractor
             
-            extractor = HybridTableExtractor()
-            raw_tables = extractor.extract_tables_hybrid(pdf_path)
+            extractor = HybridTableExtractor(executor=self.executor)
+            raw_tables = extractor.extract_tables_hybrid(pdf_path, pages=pages)
             
             return [
                 self._convert_to_extracted_table(t, method='hybrid')
@@ -114,17 +139,21 @@ class TableExtractor:
             self.logger.warning(f"Hybrid extraction failed: {e}")
             return []
     
-    def _extract_with_camelot(self, pdf_path: str) -> List[ExtractedTable]:
+    def _extract_with_camelot(
+        self,
+        pdf_path: str,
+        pages: Optional[Sequence[int]] = None
+    ) -> List[ExtractedTable]:
         """Extract tables using Camelot with stream and lattice modes."""
         tables = []
         
         # Try stream mode first (better for scientific papers)
-        stream_tables = self._camelot_extract(pdf_path, flavor='stream')
+        stream_tables = self._camelot_extract(pdf_path, flavor='stream', pages=pages)
         tables.extend(stream_tables)
         
         # If few tables found, also try lattice mode
         if len(tables) < 2:
-            lattice_tables = self._camelot_extract(pdf_path, flavor='lattice')
+            lattice_tables = self._camelot_extract(pdf_path, flavor='lattice', pages=pages)
             # Only add tables not already found
             tables.extend(self._deduplicate_tables(lattice_tables, tables))
         
@@ -133,17 +162,20 @@ class TableExtractor:
     def _camelot_extract(
         self, 
         pdf_path: str, 
-        flavor: str
+        flavor: str,
+        pages: Optional[Sequence[int]] = None
     ) -> List[ExtractedTable]:
         """Extract tables using Camelot with specified flavor."""
         try:
-            import camelot
+            from src.utils.table_extraction_service import read_camelot_tables
             
-            kwargs = {'pages': 'all', 'flavor': flavor, 'suppress_stdout': True}
+            kwargs = {}
             if flavor == 'lattice':
                 kwargs['line_scale'] = 40
             
-            raw_tables = camelot.read_pdf(pdf_path, **kwargs)
+            raw_tables = read_camelot_tables(
+                pdf_path, flavor, pages=pages, executor=self.executor, **kwargs
+            )
             
             extracted = []
             for i, table in enumerate(raw_tables):
@@ -258,6 +290,7 @@ class TableExtractor:
 
         # Convert to markdown
         content = df.to_markdown(index=False)
+        rows = df.astype(str).values.tolist()
 
         # Calculate metrics
         fill_ratio = self._calculate_fill_ratio(df)
@@ -271,6 +304,7 @@ class TableExtractor:
             column_count=df.shape[1],
             fill_ratio=fill_ratio,
             extraction_method=method,
+            rows=rows,
         )
 
     def _extract_table_label(self, df, fallback_index: int) -> str:
@@ -532,5 +566,6 @@ class TableExtractor:
             column_count=col_count,
             fill_ratio=0.8,  # Hybrid extractor typically has good fill
             extraction_method=method,
+            rows=table_dict.get('rows'),
         )
 
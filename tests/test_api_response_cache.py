@@ -0,0 +1,113 @@
+"""
+Tests for the API response cache used by BaseAPIClient.
+
+Tests:
+- TTLCache evicts the least recently used entry and purges expired buckets
+- BaseAPIClient serves repeated GETs and expected 404s from the cache,
+  honours per-endpoint TTLs and reports stats in get_status()
+- The disk tier answers for a fresh memory tier (e.g. a new process)
+"""
+
+import json
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import requests
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.drug_extraction_system.api_clients.base_client import BaseAPIClient
+from src.drug_extraction_system.utils import cache as cache_module
+from src.drug_extraction_system.utils.cache import MISSING, DiskTTLCache, TieredCache, TTLCache
+
+
+class FakeClient(BaseAPIClient):
+    CACHE_TTL = 3600
+    CACHE_TTLS = {"/live": 0, "/live/archived": 60}
+
+    def health_check(self) -> bool:
+        return True
+
+
+def _response(status_code, body='{"ok": true}'):
+    response = MagicMock(status_code=status_code, content=body.encode(), text=body, headers={})
+    response.json.side_effect = lambda: json.loads(body)
+    if status_code >= 400:
+        response.raise_for_status.side_effect = requests.exceptions.HTTPError(f"{status_code} error")
+    return response
+
+
+class TestTTLCache:
+    """Tests for LRU eviction and bucketed expiry."""
+
+    def test_lru_eviction_and_expiry(self):
+        cache = TTLCache(default_ttl=3600, max_size=3)
+        for key in ("a", "b", "c"):
+            cache.set(key, key.upper())
+        assert cache.get("a") == "A"  # "b" is now least recently used
+        cache.set("d", "D")
+        assert cache.get("b") is None
+        assert [cache.get(k) for k in ("a", "c", "d")] == ["A", "C", "D"]
+        assert cache.get_stats()["evictions"] == 1
+
+        cache.set("none", None)
+        assert cache.get("none", MISSING) is None
+        assert cache.get("missing", MISSING) is MISSING
+
+        now = 1_000_000.0
+        with patch.object(cache_module.time, "time", return_value=now):
+            short = TTLCache(default_ttl=3600, max_size=10)
+            short.set("x", 1, ttl=30)
+            short.set("y", 2)
+        with patch.object(cache_module.time, "time", return_value=now + 200):
+            assert short.cleanup_expired() == 1
+            assert len(short) == 1 and short.get("y") == 2
+
+
+class TestBaseClientCache:
+    """Tests for caching in BaseAPIClient._make_request."""
+
+    def test_hits_negative_caching_and_endpoint_ttls(self):
+        client = FakeClient("https://api.example.org", name="FakeCacheAPI",
+                            cache=TieredCache(TTLCache(max_size=100)))
+        responses = {"/drug": _response(200), "/missing": _response(404, ""), "/live": _response(200)}
+        client.session.request = MagicMock(
+            side_effect=lambda method, url, **kw: responses[url.replace(client.base_url, "")]
+        )
+
+        assert client.get("/drug", params={"name": "x"}) == {"ok": True}
+        assert client.get("/drug", params={"name": "x"}) == {"ok": True}
+        assert client.get("/missing") is None
+        assert client.get("/missing") is None
+        assert client.get("/live") == {"ok": True}
+        assert client.get("/live") == {"ok": True}
+        # /drug and /missing went out once each; /live (TTL 0) twice
+        assert client.session.request.call_count == 4
+
+        # Callers get independent copies
+        client.get("/drug", params={"name": "x"})["ok"] = False
+        assert client.get("/drug", params={"name": "x"}) == {"ok": True}
+        assert client.get("/drug", params={"name": "x"}, use_cache=False) == {"ok": True}
+        assert client.session.request.call_count == 5
+
+        assert client._cache_ttl("/live/archived/1") == 60
+        assert client._cache_ttl("/missing") == 3600
+        stats = client.get_status()["cache"]
+        assert stats["hits"] == 4 and stats["negative_hits"] == 1
+
+    def test_disk_tier_survives_memory(self, tmp_path):
+        disk = DiskTTLCache(cache_dir=tmp_path)
+        first = TieredCache(TTLCache(), disk, namespace="RxNorm")
+        first.set("k", '{"rxcui": "123"}', ttl=3600)
+        first.set("gone", None, ttl=3600)
+
+        second = TieredCache(TTLCache(), DiskTTLCache(cache_dir=tmp_path), namespace="RxNorm")
+        assert second.get("k") == '{"rxcui": "123"}'
+        assert second.get("gone", "default") is None
+        assert second.get("other") is MISSING
+        stats = second.get_stats()
+        assert stats["disk_hits"] == 2 and stats["disk"]["entries"] == 2
+        # Promoted to memory
+        assert second.memory.get("k") == '{"rxcui": "123"}'
@@ -0,0 +1,199 @@
+"""
+Tests for offline extraction through the Message Batches API.
+
+Tests:
+- Multi-stage extraction runs as two batch rounds against a local fake
+  batch endpoint (through the Anthropic SDK) and yields post-processed
+  CaseSeriesExtraction objects
+- A job interrupted while a batch is processing resumes from its manifest
+  without re-submitting, and errored requests are retried once
+- The manifest keeps only keys and status; full texts and responses live
+  in per-paper / per-request files next to it
+"""
+
+import asyncio
+import json
+import re
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.case_series.services.batch_extraction import AnthropicBatchBackend, BatchExtractionJob
+from src.case_series.services.drug_info_service import DrugInfo
+from src.case_series.services.extraction_service import EXTRACTION_SYSTEM_PROMPT, ExtractionService
+from src.case_series.services.literature_search_service import Paper
+
+FULL_TEXT = "Methods. Twelve patients with alopecia areata received drugx. " * 60
+
+
+def _answer(params):
+    """Canned model output for each extraction stage."""
+    budget = (params.get("thinking") or {}).get("budget_tokens")
+    if budget == 3000:
+        return {"efficacy_tables": ["Table 2"], "safety_tables": ["Table 3"]}
+    if budget == 4000:
+        tables = re.findall(r"Table \d", params["messages"][0]["content"])
+        return [{"endpoint_name": "SALT50", "responders_n": 8, "total_n": 12, "notes": ",".join(sorted(set(tables)))}]
+    if budget == 2000:
+        return [{"event_name": "Acne", "patients_affected_n": 2}]
+    return {"disease": "Alopecia Areata", "n_patients": 12, "response_rate": "8/12 (66.7%)"}
+
+
+class FakeBatchServer:
+    """Local stand-in for /v1/messages/batches."""
+
+    def __init__(self):
+        self.batches = {}
+        self.hold = False  # keep batches "in_progress"
+        self.fail_once = set()  # custom_ids that error on their first attempt
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _send(self, body, content_type="application/json"):
+                data = body.encode()
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                batch_id = f"msgbatch_{len(server.batches)}"
+                server.batches[batch_id] = body["requests"]
+                self._send(json.dumps(server.batch_json(batch_id)))
+
+            def do_GET(self):
+                match = re.match(r"/v1/messages/batches/(\w+)(/results)?$", self.path)
+                batch_id, results = match.group(1), match.group(2)
+                if not results:
+                    return self._send(json.dumps(server.batch_json(batch_id)))
+                lines = [json.dumps(server.result(r)) for r in server.batches[batch_id]]
+                self._send("\n".join(lines), "application/binary")
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def batch_json(self, batch_id):
+        ended = not self.hold
+        size = len(self.batches[batch_id])
+        return {
+            "id": batch_id, "type": "message_batch",
+            "processing_status": "ended" if ended else "in_progress",
+            "request_counts": {"processing": 0 if ended else size, "succeeded": size if ended else 0,
+                               "errored": 0, "canceled": 0, "expired": 0},
+            "created_at": "2026-01-01T00:00:00Z", "expires_at": "2026-01-02T00:00:00Z",
+            "ended_at": "2026-01-01T01:00:00Z" if ended else None,
+            "archived_at": None, "cancel_initiated_at": None,
+            "results_url": f"{self.url}/v1/messages/batches/{batch_id}/results" if ended else None,
+        }
+
+    def result(self, request):
+        custom_id = request["custom_id"]
+        if custom_id in self.fail_once:
+            self.fail_once.discard(custom_id)
+            return {"custom_id": custom_id, "result": {
+                "type": "errored", "error": {"type": "error", "error": {"type": "overloaded_error", "message": "busy"}}}}
+        params = request["params"]
+        content = [{"type": "text", "text": json.dumps(_answer(params))}]
+        if "thinking" in params:
+            content.insert(0, {"type": "thinking", "thinking": "...", "signature": "sig"})
+        return {"custom_id": custom_id, "result": {"type": "succeeded", "message": {
+            "id": f"msg_{custom_id}", "type": "message", "role": "assistant", "model": params["model"],
+            "content": content, "stop_reason": "end_turn", "stop_sequence": None,
+            "usage": {"input_tokens": 1000, "output_tokens": 200},
+        }}}
+
+
+class FakePubMed:
+    async def fetch_fulltext(self, pmcid, pmid=None):
+        return FULL_TEXT
+
+
+def _inputs():
+    papers = [
+        Paper(pmid="1", title="Drugx in alopecia areata: a case report", abstract="A patient responded."),
+        Paper(pmid="2", pmcid="PMC2", title="Drugx for alopecia areata: case series", abstract="Twelve patients."),
+    ]
+    return papers, DrugInfo(drug_name="drugx", generic_name="drugx", mechanism="JAK inhibitor")
+
+
+class TestBatchExtraction:
+    """Tests for BatchExtractionJob / ExtractionService.extract_offline."""
+
+    def test_two_rounds_through_fake_endpoint(self, tmp_path):
+        server = FakeBatchServer()
+        service = ExtractionService(llm_client=None, pubmed_searcher=FakePubMed())
+        backend = AnthropicBatchBackend(api_key="test", base_url=server.url)
+        papers, drug_info = _inputs()
+        saved = []
+
+        extractions = asyncio.run(service.extract_offline(
+            papers, drug_info, backend, tmp_path / "job.json", poll_interval=0,
+            on_extraction_complete=lambda e, drug: saved.append((e.source.pmid, drug)),
+        ))
+
+        by_pmid = {e.source.pmid: e for e in extractions}
+        assert sorted(by_pmid) == ["1", "2"]
+        assert sorted(saved) == [("1", "drugx"), ("2", "drugx")]
+        assert by_pmid["1"].extraction_method == "single_pass"
+        full = by_pmid["2"]
+        assert full.extraction_method == "multi_stage"
+        assert full.extraction_stages_completed == [
+            "section_identification", "efficacy_extraction", "safety_extraction"]
+        # Round 2 prompts were built from the round 1 sections
+        assert full.detailed_efficacy_endpoints[0].notes == "Table 2"
+        assert full.detailed_safety_endpoints[0].event_name == "Acne"
+        assert full.patient_population.n_patients == 12
+
+        rounds = [sorted(r["custom_id"] for r in reqs) for reqs in server.batches.values()]
+        assert rounds == [["p0-single_pass", "p1-sections", "p1-single_pass"], ["p1-efficacy", "p1-safety"]]
+        round1 = {r["custom_id"]: r["params"] for r in server.batches["msgbatch_0"]}
+        assert round1["p1-sections"]["thinking"]["budget_tokens"] == 3000
+        assert round1["p0-single_pass"]["system"] == EXTRACTION_SYSTEM_PROMPT
+        assert "thinking" not in round1["p0-single_pass"]
+
+        manifest = (tmp_path / "job.json").read_text()
+        assert "Twelve patients" not in manifest and "SALT50" not in manifest
+        files = tmp_path / "job_files"
+        assert json.loads((files / "p1.json").read_text())["full_text"] == FULL_TEXT
+        assert "SALT50" in (files / "p1-efficacy.txt").read_text()
+
+    def test_resume_from_manifest_and_retry(self, tmp_path):
+        server = FakeBatchServer()
+        server.hold = True
+        server.fail_once = {"p0-single_pass"}
+        service = ExtractionService(llm_client=None, pubmed_searcher=FakePubMed())
+        backend = AnthropicBatchBackend(api_key="test", base_url=server.url)
+        papers, drug_info = _inputs()
+        manifest = tmp_path / "job.json"
+
+        async def interrupted():
+            job = BatchExtractionJob(service, backend, manifest, poll_interval=0.01)
+            await job.add_papers(papers[:1], drug_info)
+            await asyncio.wait_for(job.run(), timeout=0.3)
+
+        try:
+            asyncio.run(interrupted())
+        except asyncio.TimeoutError:
+            pass
+        assert len(server.batches) == 1
+        assert json.loads(manifest.read_text())["batches"]["msgbatch_0"]["ended"] is False
+
+        server.hold = False
+        job = BatchExtractionJob(service, backend, manifest, poll_interval=0)
+        extractions = asyncio.run(job.run())
+
+        assert [e.source.pmid for e in extractions] == ["1"]
+        # The held batch was collected, not re-submitted; the errored request was retried once
+        assert [[r["custom_id"] for r in reqs] for reqs in server.batches.values()] == [
+            ["p0-single_pass"], ["p0-single_pass"]]
+        assert job.get_stats()["emitted"] == 1
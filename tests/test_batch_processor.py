@@ -0,0 +1,175 @@
+"""
+Tests for parallel, checkpointed batch processing in BatchProcessor.
+
+Tests:
+- encode_index_set / decode_index_set round trip
+- Parallel processing uses one DrugProcessor per worker thread
+- Out-of-order completion is checkpointed as a set and resumes correctly
+- A stop on the first error (continue_on_error=False) still persists the
+  completed indices
+- Shared API rate limiters
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.drug_extraction_system.processors import batch_processor
+from src.drug_extraction_system.processors.batch_processor import (
+    BatchProcessor,
+    decode_index_set,
+    encode_index_set,
+)
+from src.drug_extraction_system.processors.drug_processor import ProcessingResult, ProcessingStatus
+from src.drug_extraction_system.utils.rate_limiter import get_shared_rate_limiter
+
+
+class FakeDrugProcessor:
+    """DrugProcessor stand-in; records which thread built it."""
+
+    instances = []
+    lock = threading.Lock()
+
+    def __init__(self, db=None):
+        self.thread = threading.get_ident()
+        self.processed = []
+        with FakeDrugProcessor.lock:
+            FakeDrugProcessor.instances.append(self)
+
+    def process(self, drug_name, force_refresh=False, batch_id=None):
+        # Later rows finish first to force out-of-order completion
+        time.sleep(0.001 * (20 - int(drug_name.split("_")[1]) % 20))
+        self.processed.append(drug_name)
+        if drug_name == "drug_7":
+            raise RuntimeError("boom")
+        return ProcessingResult(drug_name=drug_name, status=ProcessingStatus.SUCCESS)
+
+
+class FakeCheckpointProcessor(BatchProcessor):
+    """BatchProcessor with an in-memory checkpoint table."""
+
+    def __init__(self, stored=None, **kwargs):
+        super().__init__(db=None, **kwargs)
+        self.stored = stored or {}
+
+    def _load_checkpoint(self, batch_id):
+        return self.stored.get(batch_id)
+
+    def _update_checkpoint(self, batch_id, tracker):
+        encoded, count, watermark, _ = tracker.snapshot()
+        self.stored[batch_id] = {
+            "status": "in_progress",
+            "completed_indices": encoded,
+            "last_processed_index": watermark,
+        }
+
+
+def _write_csv(tmp_path, n):
+    csv_path = tmp_path / "drugs.csv"
+    csv_path.write_text("drug_name\n" + "\n".join(f"drug_{i}" for i in range(n)) + "\n")
+    return str(csv_path)
+
+
+class TestIndexSetEncoding:
+    """Tests for compact completed-index encoding."""
+
+    def test_round_trip(self):
+        indices = {0, 1, 2, 5, 7, 8, 100}
+        encoded = encode_index_set(indices)
+        assert encoded == "0-2,5,7-8,100"
+        assert decode_index_set(encoded) == indices
+
+    def test_empty(self):
+        assert encode_index_set([]) == ""
+        assert decode_index_set("") == set()
+        assert decode_index_set(None) == set()
+
+
+class TestParallelBatch:
+    """Tests for the parallel process_csv path."""
+
+    def setup_method(self):
+        FakeDrugProcessor.instances = []
+
+    def test_parallel_processes_all_with_worker_processors(self, tmp_path):
+        csv_path = _write_csv(tmp_path, 40)
+        processor = BatchProcessor(db=None, max_workers=4, batch_size=5)
+
+        with patch.object(batch_processor, "DrugProcessor", FakeDrugProcessor):
+            result = processor.process_csv(csv_path)
+
+        assert result.total == 40
+        assert result.successful == 39
+        assert result.failed == 1
+        assert result.errors == [{"drug": "drug_7", "error": "boom"}]
+        # One processor per worker thread, not per drug
+        assert 1 <= len(FakeDrugProcessor.instances) <= 4
+        assert sorted(n for p in FakeDrugProcessor.instances for n in p.processed) == sorted(
+            f"drug_{i}" for i in range(40)
+        )
+
+    def test_resume_skips_completed_set(self, tmp_path):
+        csv_path = _write_csv(tmp_path, 20)
+        batch_id = BatchProcessor._generate_batch_id(None, csv_path)
+        # Out-of-order progress from a crashed run: not a contiguous prefix
+        stored = {batch_id: {"status": "in_progress", "completed_indices": "0-3,8,15-19"}}
+        processor = FakeCheckpointProcessor(stored=stored, max_workers=3, batch_size=2)
+        processor.db = SimpleNamespace(database_url="postgresql://fake")  # enable checkpoint paths
+        processor.db_ops = None
+
+        with patch.object(batch_processor, "DrugProcessor", FakeDrugProcessor), \
+                patch.object(BatchProcessor, "_create_checkpoint"), \
+                patch.object(BatchProcessor, "_update_checkpoint_status"), \
+                patch.object(BatchProcessor, "_complete_checkpoint"), \
+                patch.object(batch_processor, "DatabaseConnection"):
+            result = processor.process_csv(csv_path)
+
+        processed = sorted(
+            int(n.split("_")[1]) for p in FakeDrugProcessor.instances for n in p.processed
+        )
+        assert processed == [4, 5, 6, 7, 9, 10, 11, 12, 13, 14]
+        assert len(result.results) == 10
+        assert decode_index_set(stored[batch_id]["completed_indices"]) == set(range(20))
+        assert stored[batch_id]["last_processed_index"] == 19
+
+    def test_stop_on_error_flushes_completed(self, tmp_path):
+        csv_path = _write_csv(tmp_path, 10)
+        batch_id = BatchProcessor._generate_batch_id(None, csv_path)
+        # flush_every is never reached before the failure
+        processor = FakeCheckpointProcessor(max_workers=1, batch_size=100, continue_on_error=False)
+        processor.db = SimpleNamespace(database_url="postgresql://fake")  # enable checkpoint paths
+        processor.db_ops = None
+
+        with patch.object(batch_processor, "DrugProcessor", FakeDrugProcessor), \
+                patch.object(BatchProcessor, "_create_checkpoint"), \
+                patch.object(BatchProcessor, "_update_checkpoint_status"), \
+                patch.object(BatchProcessor, "_complete_checkpoint"), \
+                patch.object(batch_processor, "DatabaseConnection"):
+            with pytest.raises(RuntimeError, match="boom"):
+                processor.process_csv(csv_path)
+
+        assert set(range(7)) <= decode_index_set(processor.stored[batch_id]["completed_indices"])
+
+    def test_legacy_watermark_checkpoint(self):
+        completed = BatchProcessor._checkpoint_completed_indices(
+            {"completed_indices": None, "last_processed_index": 4}
+        )
+        assert completed == {0, 1, 2, 3, 4}
+
+
+class TestSharedRateLimiter:
+    """API clients of the same name share one limiter."""
+
+    def test_same_instance(self):
+        a = get_shared_rate_limiter("TestAPI", requests_per_minute=10)
+        b = get_shared_rate_limiter("TestAPI", requests_per_minute=99)
+        assert a is b
+        assert b.requests_per_minute == 10
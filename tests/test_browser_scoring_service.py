@@ -0,0 +1,159 @@
+"""
+Tests for bulk score refresh in BrowserScoringService.
+
+Tests:
+- Changed scores are written in batched UPDATEs, unchanged rows in one statement
+- refresh_all_scores refreshes every stale drug and keeps input order
+- get_disease_summaries is a single read of the materialized summary table
+"""
+
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.case_series.services import browser_scoring_service
+from src.case_series.services.browser_scoring_service import (
+    BrowserScoringService,
+    DrugSummary,
+    RefreshResult,
+)
+
+
+def _row(i, score):
+    return {
+        'id': i, 'pmid': str(i), 'drug_name': "drugx", 'disease': "GCA", 'n_patients': 10,
+        'efficacy_signal': None, 'efficacy_summary': None, 'response_rate': None,
+        'responders_pct': None, 'evidence_level': None, 'study_design': None,
+        'follow_up_duration': None, 'follow_up_weeks': None, 'primary_endpoint': None,
+        'response_definition_quality': None, 'biomarkers_data': None,
+        'paper_title': "t", 'paper_year': 2020, 'individual_score': score,
+    }
+
+
+class FakeCursor:
+    def __init__(self, rows, log):
+        self.rows = rows
+        self.log = log
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql, params=None):
+        self.log.append((" ".join(sql.split()[:3]), params))
+
+    def fetchall(self):
+        return self.rows
+
+
+class FakeConnection:
+    def __init__(self, rows):
+        self.rows = rows
+        self.log = []
+        self.commits = 0
+
+    def cursor(self, cursor_factory=None):
+        return FakeCursor(self.rows, self.log)
+
+    def commit(self):
+        self.commits += 1
+
+    def close(self):
+        pass
+
+
+class FakeScorer:
+    """Scores every paper 6.0."""
+
+    def score_extraction(self, extraction):
+        return SimpleNamespace(total_score=6.0, model_dump=lambda: {'total_score': 6.0})
+
+
+class TestBulkRefresh:
+    """Tests for refresh_scores."""
+
+    def test_batched_writes(self):
+        # 1,200 rows: every third row already has the current score
+        rows = [_row(i, 6.0 if i % 3 == 0 else 2.0) for i in range(1200)]
+        conn = FakeConnection(rows)
+        service = BrowserScoringService("postgresql://fake")
+        service._scorer = FakeScorer()
+        batches = []
+
+        def fake_execute_values(cur, sql, values, template=None, page_size=100):
+            batches.append(list(values))
+            assert page_size == len(values)
+
+        with patch.object(service, "_get_connection", return_value=conn), \
+                patch.object(browser_scoring_service, "execute_values", fake_execute_values):
+            result = service.refresh_scores("drugx", force=True, batch_size=500)
+
+        assert result.papers_scored == 1200
+        assert result.papers_changed == 800
+        assert [len(b) for b in batches] == [333, 333, 134]
+        assert batches[0][0][:2] == (1, 6.0)
+        # One SELECT, one set-based UPDATE for unchanged rows, one summary refresh
+        assert [sql for sql, _ in conn.log] == [
+            "SELECT id, pmid,",
+            "UPDATE cs_extractions SET",
+            "SAVEPOINT cs_drug_summary",
+            "SELECT cs_refresh_drug_summary(%s)",
+            "RELEASE SAVEPOINT cs_drug_summary",
+        ]
+        assert conn.log[3][1] == ("drugx",)
+        assert len(conn.log[1][1][0]) == 400
+        assert conn.commits == 1
+
+
+class TestRefreshAll:
+    """Tests for refresh_all_scores."""
+
+    def test_refreshes_stale_drugs_in_order(self):
+        def summary(name, stale):
+            return DrugSummary(name, None, 1, 1, 1, 0.0, 0.0, None, None, stale)
+
+        service = BrowserScoringService("postgresql://fake")
+        service._scorer = FakeScorer()
+        drugs = [summary("a", True), summary("b", False), summary("c", True), summary("d", True)]
+
+        def fake_refresh(drug_name, force=False):
+            if drug_name == "c":
+                raise RuntimeError("db down")
+            return RefreshResult(drug_name, 1, 1, 0.0, [])
+
+        with patch.object(service, "get_drugs_with_extractions", return_value=drugs), \
+                patch.object(service, "refresh_scores", side_effect=fake_refresh):
+            results = service.refresh_all_scores(max_workers=3)
+
+        assert [r.drug_name for r in results] == ["a", "c", "d"]
+        assert results[1].errors == ["db down"]
+
+
+class TestDiseaseSummaries:
+    """Tests for get_disease_summaries."""
+
+    def test_single_query(self):
+        row = {
+            'disease': "GCA", 'disease_normalized': "Giant Cell Arteritis", 'parent_disease': None,
+            'paper_count': 3, 'total_patients': 40, 'aggregate_score': 6.5, 'best_paper_score': 7.0,
+            'best_paper_pmid': "123", 'avg_response_rate': 80.0, 'efficacy_signal': "Strong",
+            'best_evidence_level': "Case Series", 'explanation': "Consistent responses",
+        }
+        conn = FakeConnection([row, dict(row, disease="PMR", best_paper_pmid=None, explanation=None)])
+        service = BrowserScoringService("postgresql://fake")
+
+        with patch.object(service, "_get_connection", return_value=conn):
+            summaries = service.get_disease_summaries("DrugX", min_patients=10)
+
+        assert len(conn.log) == 1
+        assert conn.log[0][1] == ["DrugX", 10]
+        assert [(s.disease, s.best_paper_pmid, s.explanation) for s in summaries] == [
+            ("GCA", "123", "Consistent responses"),
+            ("PMR", None, None),
+        ]
@@ -0,0 +1,114 @@
+"""
+Tests for the async Anthropic LLM client built by the case series factory.
+
+Tests:
+- complete() runs concurrently instead of blocking the event loop
+- Per-model in-flight limit is respected
+- Usage accounting across concurrent calls
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.case_series import factory
+
+
+class FakeMessages:
+    """Stand-in for AsyncAnthropic().messages that records concurrency."""
+
+    def __init__(self, delay: float = 0.05):
+        self.delay = delay
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.calls = 0
+
+    async def create(self, **kwargs):
+        self.calls += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.in_flight -= 1
+        return SimpleNamespace(
+            content=[SimpleNamespace(text=f"ok:{kwargs['model']}")],
+            usage=SimpleNamespace(
+                input_tokens=10,
+                output_tokens=5,
+                cache_creation_input_tokens=0,
+                cache_read_input_tokens=0,
+            ),
+        )
+
+
+def _run_many(client, n: int):
+    async def _go():
+        return await asyncio.gather(*(client.complete(f"prompt {i}") for i in range(n)))
+    return asyncio.run(_go())
+
+
+class TestAsyncAnthropicClient:
+    """Tests for the AnthropicLLMClient wrapper."""
+
+    def test_calls_overlap(self):
+        """Concurrent complete() calls should be in flight at the same time."""
+        messages = FakeMessages()
+        fake = SimpleNamespace(messages=messages)
+        client = factory._create_anthropic_client("key", model="m", max_in_flight=8)
+
+        with patch.object(factory, "_get_async_anthropic", return_value=fake):
+            results = _run_many(client, 8)
+
+        assert results == ["ok:m"] * 8
+        assert messages.max_in_flight == 8
+
+    def test_in_flight_limit(self):
+        """No more than max_in_flight requests should be outstanding."""
+        messages = FakeMessages()
+        fake = SimpleNamespace(messages=messages)
+        client = factory._create_anthropic_client("key", model="m", max_in_flight=3)
+
+        with patch.object(factory, "_get_async_anthropic", return_value=fake):
+            _run_many(client, 10)
+
+        assert messages.calls == 10
+        assert messages.max_in_flight == 3
+
+    def test_usage_accounting(self):
+        """Token usage should accumulate across concurrent calls."""
+        fake = SimpleNamespace(messages=FakeMessages(delay=0))
+        client = factory._create_anthropic_client("key", model="m", max_in_flight=4)
+
+        with patch.object(factory, "_get_async_anthropic", return_value=fake):
+            _run_many(client, 6)
+
+        usage = client.get_usage_stats()
+        assert usage["input_tokens"] == 60
+        assert usage["output_tokens"] == 30
+        client.reset_usage_stats()
+        assert client.get_usage_stats()["input_tokens"] == 0
+
+    def test_client_reusable_across_event_loops(self):
+        """The same wrapper should work when driven from successive loops."""
+        fake = SimpleNamespace(messages=FakeMessages(delay=0))
+        client = factory._create_anthropic_client("key", model="m", max_in_flight=2)
+
+        with patch.object(factory, "_get_async_anthropic", return_value=fake):
+            _run_many(client, 3)
+            _run_many(client, 3)
+
+        assert fake.messages.calls == 6
+
+    def test_shared_pool_per_loop(self):
+        """Clients with the same key share one AsyncAnthropic per event loop."""
+        async def _get_twice():
+            return factory._get_async_anthropic("key"), factory._get_async_anthropic("key")
+
+        first, second = asyncio.run(_get_twice())
+        assert first is second
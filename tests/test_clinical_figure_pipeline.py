@@ -0,0 +1,94 @@
+"""
+Tests for the lazy figure image pipeline in ClinicalDataExtractorAgent.
+
+Tests:
+- _iter_figure_images yields each distinct figure once (images reused across
+  pages are skipped, icons are filtered) with downsampled previews
+- Stage 5b classifies previews and sends only accepted figures, at full
+  size, to _extract_data_from_figure
+"""
+
+import base64
+import sys
+import types
+from pathlib import Path
+
+import pymupdf
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.agents.clinical_data_extractor import ClinicalDataExtractorAgent
+from src.models.clinical_extraction_schemas import TrialArm
+
+
+def _png(width, height, seed):
+    pix = pymupdf.Pixmap(pymupdf.csRGB, pymupdf.IRect(0, 0, width, height), False)
+    pix.set_rect(pix.irect, (seed * 40 % 256, 120, 200))
+    pix.set_rect(pymupdf.IRect(0, 0, width // 2, height // 3), (10, seed * 70 % 256, 30))
+    return pix.tobytes("png")
+
+
+def _make_pdf(path: Path) -> Path:
+    """Large figure on pages 1 and 2 (same xref), small figure and an icon on page 3."""
+    doc = pymupdf.open()
+    large, small, icon = _png(1600, 1200, 1), _png(600, 400, 2), _png(50, 50, 3)
+    page = doc.new_page()
+    xref = page.insert_image(pymupdf.Rect(50, 50, 450, 350), stream=large)
+    doc.new_page().insert_image(pymupdf.Rect(50, 50, 450, 350), xref=xref)
+    page = doc.new_page()
+    page.insert_image(pymupdf.Rect(50, 50, 350, 250), stream=small)
+    page.insert_image(pymupdf.Rect(400, 50, 450, 100), stream=icon)
+    doc.save(str(path))
+    return path
+
+
+def _image_size(figure):
+    pix = pymupdf.Pixmap(base64.b64decode(figure['image_data']))
+    return pix.width, pix.height
+
+
+def _agent(**kwargs):
+    return ClinicalDataExtractorAgent(client=types.SimpleNamespace(), **kwargs)
+
+
+class TestIterFigureImages:
+    """Lazy, deduplicated, downsampled figure previews."""
+
+    def test_yields_distinct_figures_downsampled(self, tmp_path):
+        pdf = _make_pdf(tmp_path / "paper.pdf")
+        figures = _agent()._iter_figure_images(str(pdf), max_dimension=800)
+
+        assert isinstance(figures, types.GeneratorType)
+        figures = list(figures)
+        assert [(f['page'], f['width'], f['height']) for f in figures] == [(1, 1600, 1200), (3, 600, 400)]
+        assert _image_size(figures[0]) == (800, 600)
+        assert figures[0]['media_type'] == 'image/png'
+        assert _image_size(figures[1]) == (600, 400)
+
+
+class TestStage5bFigures:
+    """Only accepted figures reach data extraction, at full size."""
+
+    def test_classifies_previews_and_extracts_accepted_full_size(self, tmp_path, monkeypatch):
+        pdf = _make_pdf(tmp_path / "paper.pdf")
+        agent = _agent(filter_figures_by_caption=False)
+        classified, extracted = [], []
+
+        def classify(figure):
+            classified.append(_image_size(figure))
+            return figure['page'] == 1
+
+        def extract(figure, arm, indication):
+            extracted.append((figure['page'], _image_size(figure)))
+            return []
+
+        monkeypatch.setattr(agent, "_classify_figure", classify)
+        monkeypatch.setattr(agent, "_extract_data_from_figure", extract)
+
+        arm = TrialArm(arm_name="Drug 10 mg", n=100)
+        paper = {'metadata': {'original_pdf': str(pdf)}, 'content': ''}
+        agent._stage5b_extract_figures(paper, arm, "Lupus")
+
+        assert classified == [(1024, 768), (600, 400)]
+        assert extracted == [(1, (1600, 1200))]
@@ -0,0 +1,146 @@
+"""
+Tests for ClinicalTrialsAPI pagination, fan-out and rate limiting.
+
+Tests:
+- search_trials follows nextPageToken and requests only landscape modules
+- max_results caps pagination; None fetches every page
+- search_pivotal_trials runs condition queries concurrently and dedupes in order
+- A page failing mid-pagination raises instead of returning truncated results
+- The shared token bucket allows a burst, then throttles to the refill rate
+"""
+
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import requests
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+
+from src.drug_extraction_system.utils.rate_limiter import TokenBucketRateLimiter
+from src.tools.clinicaltrials import (
+    LANDSCAPE_FIELDS,
+    ClinicalTrialsAPI,
+    ClinicalTrialsIncompleteError,
+    get_shared_token_bucket,
+)
+from src.tools.http_cache import ResponseCache
+
+
+def _study(nct_id):
+    return {"protocolSection": {"identificationModule": {"nctId": nct_id, "briefTitle": nct_id}}}
+
+
+class FakeCTGov:
+    """Pages of studies per query key, with call tracking."""
+
+    def __init__(self, results, delay=0.0, fail_at=None):
+        self.results = results
+        self.delay = delay
+        self.fail_at = fail_at
+        self.calls = []
+        self.current = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def get(self, url, params=None, headers=None, timeout=None):
+        with self._lock:
+            self.calls.append(dict(params))
+            self.current += 1
+            self.peak = max(self.peak, self.current)
+        time.sleep(self.delay)
+        with self._lock:
+            self.current -= 1
+
+        key = params.get("query.cond") or params.get("query.term")
+        ncts = self.results[key]
+        start = int(params.get("pageToken", 0))
+        if start == self.fail_at:
+            return SimpleNamespace(status_code=500, headers={}, raise_for_status=_raise_500)
+        end = start + params["pageSize"]
+        body = {"studies": [_study(n) for n in ncts[start:end]]}
+        if end < len(ncts):
+            body["nextPageToken"] = str(end)
+        return SimpleNamespace(
+            status_code=200, headers={}, content=json.dumps(body).encode(),
+            json=lambda: body, raise_for_status=lambda: None,
+        )
+
+
+def _raise_500():
+    raise requests.exceptions.HTTPError(response=SimpleNamespace(status_code=500))
+
+
+def _api(tmp_path, fake):
+    api = ClinicalTrialsAPI(
+        response_cache=ResponseCache(cache_dir=tmp_path / "http"),
+        rate_limiter=TokenBucketRateLimiter(requests_per_second=1000, burst=100),
+    )
+    api.session = fake
+    return api
+
+
+class TestPagination:
+    """Tests for iter_studies-backed searches."""
+
+    def test_follows_next_page_token(self, tmp_path):
+        fake = FakeCTGov({"drugx": [f"NCT{i:03d}" for i in range(250)]})
+        api = _api(tmp_path, fake)
+
+        trials = api.search_trials("drugx", max_results=None)
+
+        assert [t["nct_id"] for t in trials] == [f"NCT{i:03d}" for i in range(250)]
+        assert len(fake.calls) == 3
+        assert fake.calls[0]["fields"] == ",".join(LANDSCAPE_FIELDS)
+
+        capped = api.search_trials("drugx", max_results=120)
+        assert len(capped) == 120
+        assert len(fake.calls) == 3  # same pages, served from the response cache
+
+    def test_pivotal_fan_out(self, tmp_path):
+        fake = FakeCTGov({
+            "disease": ["NCT1", "NCT2"],
+            "synonym a": ["NCT2", "NCT3"],
+            "synonym b": ["NCT4"],
+        }, delay=0.05)
+        api = _api(tmp_path, fake)
+
+        trials = api.search_pivotal_trials("drugx", ["disease", "synonym a", "synonym b"])
+
+        assert [t["nct_id"] for t in trials] == ["NCT1", "NCT2", "NCT3", "NCT4"]
+        assert fake.peak == 3
+
+    def test_failed_page_raises(self, tmp_path):
+        fake = FakeCTGov({"drugx": [f"NCT{i:03d}" for i in range(250)]}, fail_at=100)
+        api = _api(tmp_path, fake)
+
+        with pytest.raises(ClinicalTrialsIncompleteError) as excinfo:
+            api.search_trials("drugx", max_results=None)
+        assert excinfo.value.studies_fetched == 100
+
+        # A failed first page is still an empty search
+        fake = FakeCTGov({"drugy": ["NCT1"]}, fail_at=0)
+        assert _api(tmp_path, fake).search_trials("drugy", max_results=None) == []
+
+
+class TestTokenBucket:
+    """Tests for the token bucket limiter."""
+
+    def test_shared_bucket(self):
+        bucket = get_shared_token_bucket()
+        assert bucket is get_shared_token_bucket()
+        assert bucket.requests_per_second * 60 == pytest.approx(50)
+
+    def test_burst_then_throttle(self):
+        bucket = TokenBucketRateLimiter(requests_per_second=10, burst=3)
+        start = time.monotonic()
+        for _ in range(5):
+            bucket.acquire()
+        elapsed = time.monotonic() - start
+        assert 0.15 <= elapsed < 0.5
@@ -0,0 +1,142 @@
+"""
+Tests for bulk condition standardization.
+
+Tests:
+- The indexed fuzzy lookup returns the same match and score as scanning
+  every predefined condition with SequenceMatcher
+- standardize_trials standardizes each distinct raw condition once and
+  writes conditions, mappings and trial links as deduplicated set-based
+  upserts inside one transaction
+"""
+
+import random
+import string
+import sys
+from contextlib import contextmanager
+from difflib import SequenceMatcher
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.drug_extraction_system.services import condition_standardizer as cs
+
+
+def _full_scan(query):
+    best_match, best_score = None, 0.0
+    for known, std_name in cs.CONDITION_NORMALIZATIONS.items():
+        score = SequenceMatcher(None, query, known).ratio()
+        if score > best_score and score >= cs.FUZZY_MATCH_THRESHOLD:
+            best_match, best_score = std_name, score
+    return (best_match, best_score) if best_match else None
+
+
+class FakeCursor:
+    def __init__(self, db):
+        self.db = db
+        self._rows = []
+
+    def execute(self, sql, params=None):
+        names = params[0]
+        self._rows = [
+            {"standard_name": name, "condition_id": self.db.ids.setdefault(name, len(self.db.ids) + 1)}
+            for name in names
+        ]
+
+    def fetchall(self):
+        return self._rows
+
+
+class FakeDB:
+    def __init__(self):
+        self.ids = {}
+        self.transactions = 0
+        self.in_transaction = False
+        self.lookups = []
+
+    def execute(self, sql, params=None):
+        self.lookups.append(params)
+        return []
+
+    @contextmanager
+    def transaction(self):
+        self.transactions += 1
+        self.in_transaction = True
+        try:
+            yield self
+        finally:
+            self.in_transaction = False
+
+    @contextmanager
+    def cursor(self):
+        yield FakeCursor(self)
+
+
+class TestFuzzyConditionIndex:
+    """Indexed candidate lookup matches the exhaustive scan."""
+
+    def test_same_result_as_full_scan(self):
+        rng = random.Random(7)
+        queries = ["", "x", "diabetes mellitus typ 2", "rheumatoid arthritus", "psoriatic arthritis"]
+        for known in cs.CONDITION_NORMALIZATIONS:
+            chars = list(known)
+            for _ in range(rng.randint(1, 3)):
+                op = rng.choice("sdi")
+                pos = rng.randrange(len(chars) + (op == "i"))
+                if op == "s" and chars:
+                    chars[min(pos, len(chars) - 1)] = rng.choice(string.ascii_lowercase)
+                elif op == "d" and len(chars) > 1:
+                    del chars[min(pos, len(chars) - 1)]
+                else:
+                    chars.insert(pos, rng.choice(string.ascii_lowercase + " "))
+            queries.append("".join(chars))
+        queries += ["".join(rng.choices(string.ascii_lowercase + " ", k=rng.randint(3, 40))) for _ in range(200)]
+
+        for query in queries:
+            assert cs._FUZZY_INDEX.best_match(query) == _full_scan(query), query
+
+
+class TestStandardizeTrials:
+    """Bulk standardization of trial conditions."""
+
+    def test_distinct_conditions_written_in_one_transaction(self, monkeypatch):
+        db = FakeDB()
+        writes = []
+
+        def fake_execute_values(cur, sql, rows, page_size=100):
+            assert db.in_transaction
+            writes.append((sql.split("INTO")[1].split()[0], list(rows)))
+
+        monkeypatch.setattr(cs, "execute_values", fake_execute_values)
+        # The real MeSHClient would otherwise open the shared cache under data/
+        monkeypatch.setenv("API_CACHE_DISABLED", "1")
+        standardizer = cs.ConditionStandardizer(db)
+        mesh_calls = []
+        monkeypatch.setattr(standardizer, "_lookup_mesh", lambda name: mesh_calls.append(name))
+
+        results = standardizer.standardize_trials([
+            (1, ["Rheumatoid Arthritus", "Rheumatoid Arthritis", "Some Rare Syndrome"]),
+            (2, ["Rheumatoid Arthritus", "Some Rare Syndrome", ""]),
+            (3, ["Rheumatoid Arthritis", "Lupus"]),
+        ])
+
+        # One mapping lookup for all names; MeSH once per name without a predefined mapping
+        assert len(db.lookups) == 1
+        assert mesh_calls == ["Rheumatoid Arthritus", "Some Rare Syndrome"]
+        assert db.transactions == 1
+
+        tables = dict(writes)
+        assert [w[0] for w in writes] == ["standardized_conditions", "condition_mappings", "trial_conditions"]
+        assert sorted(row[0] for row in tables["standardized_conditions"]) == [
+            "Rheumatoid Arthritis", "Some Rare Syndrome", "Systemic Lupus Erythematosus",
+        ]
+        assert sorted(row[0] for row in tables["condition_mappings"]) == [
+            "Lupus", "Rheumatoid Arthritis", "Rheumatoid Arthritus", "Some Rare Syndrome",
+        ]
+        ra_id = db.ids["Rheumatoid Arthritis"]
+        links = tables["trial_conditions"]
+        assert len(links) == len(set(links)) == 6
+        assert links.count((1, ra_id)) == 1
+
+        assert [r["standard_name"] for r in results[2]] == ["Rheumatoid Arthritis", "Some Rare Syndrome"]
+        assert results[1][0]["condition_id"] == ra_id
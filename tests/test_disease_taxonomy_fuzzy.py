@@ -0,0 +1,85 @@
+"""
+Tests for the indexed fuzzy matcher in DiseaseTaxonomy.
+
+Tests:
+- Indexed matches equal the exhaustive SequenceMatcher scan at 0.85
+- Tie-breaking follows the exhaustive scan order
+- Memo is bounded and reset when the taxonomy changes
+"""
+
+import random
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.case_series.taxonomy import disease_taxonomy
+from src.case_series.taxonomy.disease_taxonomy import (
+    FUZZY_MATCH_THRESHOLD,
+    DiseaseEntry,
+    DiseaseTaxonomy,
+    get_default_taxonomy,
+)
+
+
+def _perturb(text, rng):
+    chars = list(text)
+    for _ in range(rng.randint(0, 3)):
+        pos = rng.randrange(len(chars) + 1)
+        op = rng.random()
+        if op < 0.33 and chars:
+            chars.pop(min(pos, len(chars) - 1))
+        elif op < 0.66:
+            chars.insert(pos, rng.choice("abcdefghijklmnopqrstuvwxyz -"))
+        elif chars:
+            chars[min(pos, len(chars) - 1)] = rng.choice("abcdefghijklmnopqrstuvwxyz")
+    return "".join(chars)
+
+
+class TestIndexedFuzzyMatch:
+    """Tests for DiseaseTaxonomy._fuzzy_match."""
+
+    def test_matches_exhaustive_scan(self):
+        taxonomy = get_default_taxonomy()
+        rng = random.Random(7)
+        names = [name for name, _ in taxonomy._fuzzy_targets]
+        queries = [_perturb(name, rng) for name in names[::3]]
+        queries += ["", "x", "covid", "lupus nephritis class iv", "giant cell arteritis and pmr"]
+
+        for query in queries:
+            expected = taxonomy._fuzzy_match_exhaustive(query)
+            if expected[1] < FUZZY_MATCH_THRESHOLD:
+                expected = (None, 0.0)
+            assert taxonomy._fuzzy_match(query) == expected, query
+
+    def test_tie_prefers_scan_order(self):
+        taxonomy = DiseaseTaxonomy({
+            "Alpha Disease": DiseaseEntry("Alpha Disease", "Cat", None, aliases=["abcdefgh"]),
+            "Beta Disease": DiseaseEntry("Beta Disease", "Cat", None, aliases=["abcdefgi"]),
+        })
+        # "abcdefgx" scores equally against both aliases
+        assert taxonomy._fuzzy_match_exhaustive("abcdefgx")[0] == "Alpha Disease"
+        assert taxonomy._fuzzy_match("abcdefgx", min_score=0.8)[0] == "Alpha Disease"
+
+    def test_normalize_uses_index(self):
+        taxonomy = get_default_taxonomy()
+        assert taxonomy.normalize("dermatomyositsi") == "Dermatomyositis"
+        assert taxonomy.normalize("completely unrelated text") is None
+
+
+class TestFuzzyMemo:
+    """Tests for the bounded fuzzy lookup memo."""
+
+    def test_bounded(self, monkeypatch):
+        monkeypatch.setattr(disease_taxonomy, "FUZZY_MEMO_SIZE", 3)
+        taxonomy = get_default_taxonomy()
+        for query in ["a1", "b2", "c3", "d4", "e5"]:
+            taxonomy._fuzzy_match(query)
+        assert len(taxonomy._fuzzy_memo) == 3
+
+    def test_reset_on_add_disease(self):
+        taxonomy = DiseaseTaxonomy({})
+        assert taxonomy.normalize("behcets disease") is None
+        taxonomy.add_disease(DiseaseEntry("Behcet's Disease", "Vasculitis", None))
+        assert taxonomy.normalize("behcets disease") == "Behcet's Disease"
@@ -0,0 +1,121 @@
+"""
+Tests for the per-drug stage graph in DrugProcessor.
+
+Tests:
+- StageGraph runs independent stages concurrently, respects dependencies
+  and re-raises stage errors without starting dependents
+- DrugProcessor.process overlaps the extractor's source lookups and the
+  Claude parsers with enrichment, and records per-stage timings
+"""
+
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.drug_extraction_system.extractors.approved_drug_extractor import ApprovedDrugExtractor
+from src.drug_extraction_system.processors.drug_processor import DrugProcessor, ProcessingStatus
+from src.drug_extraction_system.resolvers.status_detector import DrugStatus
+from src.drug_extraction_system.utils.stage_graph import StageGraph
+
+DELAY = 0.2
+
+
+def _slow(value, log=None, name=None):
+    def call(*args, **kwargs):
+        if log is not None:
+            log.append((name, "start", time.perf_counter()))
+        time.sleep(DELAY)
+        if log is not None:
+            log.append((name, "end", time.perf_counter()))
+        return value
+    return call
+
+
+class TestStageGraph:
+    """Tests for the dependency-graph executor."""
+
+    def test_concurrency_order_and_errors(self):
+        graph = StageGraph()
+        graph.add("a", _slow(1))
+        graph.add("b", _slow(2))
+        graph.add("sum", lambda r: r["a"] + r["b"], deps=("a", "b"))
+        start = time.perf_counter()
+        assert graph.run()["sum"] == 3
+        assert time.perf_counter() - start < 1.5 * DELAY
+        assert set(graph.timings) == {"a", "b", "sum", "total"}
+
+        with pytest.raises(ValueError):
+            graph.add("bad", lambda r: None, deps=("missing",))
+
+        ran = []
+        failing = StageGraph()
+        failing.add("boom", lambda r: 1 / 0)
+        failing.add("after", lambda r: ran.append("after"), deps=("boom",))
+        with pytest.raises(ZeroDivisionError):
+            failing.run()
+        assert ran == []
+
+
+class TestDrugProcessorStages:
+    """Tests for DrugProcessor.process on the stage graph."""
+
+    def test_process_overlaps_independent_stages(self):
+        log = []
+        label = {"generic_name": "drugx", "brand_name": "Drugxa", "manufacturer": "Acme",
+                 "rxcui": "123", "unii": "U1", "indications_and_usage": "Indicated for X."}
+        openfda = SimpleNamespace(
+            search_drug_labels=_slow([{"openfda": {}}], log, "openfda_label"),
+            extract_drug_data=lambda raw: label,
+            get_approval_info=_slow({"first_approval_date": "2020-01-01"}, log, "approval_info"),
+        )
+        extractor = ApprovedDrugExtractor(
+            openfda_client=openfda,
+            rxnorm_client=SimpleNamespace(normalize_drug_name=_slow(None, log, "rxnorm")),
+            mesh_client=SimpleNamespace(standardize_disease_name=lambda name: None),
+            clinicaltrials_client=SimpleNamespace(search_trials_all=_slow([], log, "trials")),
+            dailymed_client=SimpleNamespace(get_drug_info=_slow({"mechanism_of_action": "JAK"}, log, "dailymed")),
+            drug_type_classifier=SimpleNamespace(classify=lambda name, mechanism_of_action=None: "small_molecule"),
+        )
+
+        def enrich(data):
+            _slow(None, log, "enrich")()
+            return data
+
+        def parse_indications(text, drug_name):
+            _slow(None, log, "parse_indications")()
+            return [SimpleNamespace(disease_name="X", population=None, severity=None, line_of_therapy=None,
+                                    combination_therapy=None, special_conditions=None, mesh_id=None,
+                                    confidence_score=0.9)]
+
+        processor = DrugProcessor.__new__(DrugProcessor)
+        processor.skip_parsing = False
+        processor.db_ops = None
+        processor.resolver = SimpleNamespace(resolve=lambda name: SimpleNamespace(name_type="generic", generic_name=name))
+        processor.status_detector = SimpleNamespace(detect=lambda name: SimpleNamespace(status=DrugStatus.APPROVED))
+        processor.approved_extractor = extractor
+        processor.enricher = SimpleNamespace(enrich=enrich)
+        processor.indication_parser = SimpleNamespace(parse=parse_indications)
+        processor.dosing_parser = SimpleNamespace(parse=lambda text, name: None)
+        processor.target_moa_parser = None
+        processor.pipeline_dosing_extractor = None
+        processor.success_threshold = 0.8
+        processor.partial_threshold = 0.5
+
+        result = processor.process("drugx")
+
+        assert result.status in (ProcessingStatus.SUCCESS, ProcessingStatus.PARTIAL)
+        assert result.data_sources[:2] == ["openFDA", "DailyMed"]
+        assert {"resolve", "status", "extract", "enrich", "parse_indications", "structure",
+                "extract.dailymed", "extract.merge", "extract.clinical_trials", "total"} <= set(result.stage_timings)
+
+        # 4 source lookups -> trials -> enrich || parse: ~3 delays instead of 7
+        assert result.stage_timings["total"] < 5 * DELAY
+        events = {(name, kind): t for name, kind, t in log}
+        assert events[("parse_indications", "start")] < events[("enrich", "end")]
+        assert events[("dailymed", "start")] < events[("openfda_label", "end")]
@@ -0,0 +1,132 @@
+"""
+Tests for concurrent drug x trial scheduling in EfficacyComparisonAgent.
+
+Tests:
+- Blocking trial stages overlap instead of running back to back
+- Web and LLM stages respect their own concurrency limits
+- Results keep drug and trial order; progress never goes backwards
+"""
+
+import asyncio
+import sys
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.efficacy_comparison.agent import EfficacyComparisonAgent
+from src.efficacy_comparison.models import ApprovedDrug, PivotalTrial
+
+STAGE_SECONDS = 0.05
+
+
+class Gauge:
+    """Tracks peak concurrency of a stage."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.current = 0
+        self.peak = 0
+
+    def __enter__(self):
+        with self.lock:
+            self.current += 1
+            self.peak = max(self.peak, self.current)
+
+    def __exit__(self, *exc):
+        with self.lock:
+            self.current -= 1
+
+
+class FakeServices:
+    """Service stand-ins whose async methods block like the real ones."""
+
+    def __init__(self, n_drugs, n_trials):
+        self.drugs = [ApprovedDrug(drug_name=f"Drug{i}", generic_name=f"drug{i}") for i in range(n_drugs)]
+        self.n_trials = n_trials
+        self.web = Gauge()
+        self.llm = Gauge()
+
+    async def find_innovative_drugs(self, indication):
+        return self.drugs
+
+    async def identify_pivotal_trials(self, drug, indication, max_trials):
+        with self.web:
+            time.sleep(STAGE_SECONDS)
+        # Later trials finish first
+        return [PivotalTrial(nct_id=f"{drug.drug_name}-T{j}") for j in range(self.n_trials)]
+
+    async def find_primary_papers(self, trial, drug, max_papers):
+        with self.web:
+            time.sleep(STAGE_SECONDS * (1 + (self.n_trials - int(trial.nct_id[-1])) * 0.2))
+        return []
+
+    async def resolve_data_source(self, paper, trial, drug):
+        return SimpleNamespace(source_type="abstract", completeness="LOW")
+
+    async def extract_trial_data(self, data_source, trial, drug, indication, expected_endpoints):
+        if trial.nct_id == "Drug1-T2":
+            raise RuntimeError("LLM error")
+        with self.llm:
+            time.sleep(STAGE_SECONDS)
+        return SimpleNamespace(nct_id=trial.nct_id, endpoints=["EASI-75"])
+
+    async def close(self):
+        pass
+
+
+def _agent(services, progress, **kwargs):
+    return EfficacyComparisonAgent(
+        drug_finder=services,
+        trial_identifier=services,
+        paper_identifier=services,
+        data_resolver=services,
+        extractor=services,
+        repository=SimpleNamespace(),
+        progress_callback=lambda message, value: progress.append(value),
+        save_to_db=False,
+        skip_existing=False,
+        **kwargs,
+    )
+
+
+class TestConcurrentComparison:
+    """Tests for run_comparison scheduling."""
+
+    def test_concurrent_ordered_monotonic(self):
+        services = FakeServices(n_drugs=5, n_trials=3)
+        progress = []
+        agent = _agent(services, progress, web_concurrency=6, llm_concurrency=3)
+
+        start = time.monotonic()
+        result = asyncio.run(agent.run_comparison("atopic dermatitis", max_drugs=5))
+        elapsed = time.monotonic() - start
+
+        # Sequential would take ~5 * (1 + 3 * 2.2) stages
+        assert elapsed < STAGE_SECONDS * 5 * 7.6 / 2
+        assert services.web.peak <= 6
+        assert services.llm.peak <= 3
+        assert services.llm.peak > 1
+
+        assert [p.drug.drug_name for p in result.drug_profiles] == [f"Drug{i}" for i in range(5)]
+        assert [e.nct_id for e in result.drug_profiles[0].extractions] == ["Drug0-T0", "Drug0-T1", "Drug0-T2"]
+        assert [e.nct_id for e in result.drug_profiles[1].extractions] == ["Drug1-T0", "Drug1-T1"]
+        assert result.total_trials == 15
+
+        assert progress == sorted(progress)
+        assert progress[-1] == 1.0
+        assert abs(max(v for v in progress if v < 1.0) - 0.95) < 1e-9
+
+    def test_single_drug(self):
+        services = FakeServices(n_drugs=2, n_trials=2)
+        progress = []
+        agent = _agent(services, progress)
+
+        profile = asyncio.run(agent.run_comparison_for_drug("drug1", "psoriasis"))
+
+        assert [e.nct_id for e in profile.extractions] == ["Drug1-T0", "Drug1-T1"]
+        assert progress == sorted(progress)
+        assert abs(progress[-1] - 1.0) < 1e-9
@@ -0,0 +1,172 @@
+"""
+Tests for adaptive batching in the LLM relevance filter.
+
+Tests:
+- Papers are packed by token budget and output cap, not a fixed count
+- A truncated response only re-sends the papers it left unanswered
+- An unparseable single-paper answer is asked again past the response cache
+- Concurrency grows while latency holds and backs off on 429s, which are retried
+- Cache hits and near-instant responses do not drive the limit down
+"""
+
+import asyncio
+import json
+import re
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.case_series.services.filter_batching import (
+    FILTER_MAX_PAPERS_PER_BATCH,
+    AdaptiveConcurrencyLimiter,
+    pack_batches,
+)
+from src.case_series.services.literature_search_service import LiteratureSearchService, Paper
+
+
+class RateLimited(Exception):
+    """Looks like anthropic.RateLimitError."""
+    status_code = 429
+
+
+class FakeFilterLLM:
+    """Includes even PMIDs; can truncate responses and return 429s."""
+
+    def __init__(self, answer_at_most=None, rate_limit_first=0, delay=0.01):
+        self.answer_at_most = answer_at_most
+        self.rate_limit_first = rate_limit_first
+        self.delay = delay
+        self.requests = []
+        self.in_flight = 0
+        self.peak = 0
+
+    async def complete(self, prompt, max_tokens=4000, system=None, cache_system=False, **kwargs):
+        pmids = re.findall(r"--- Paper \d+ \(PMID: (\d+)\) ---", prompt)
+        self.requests.append(pmids)
+        if self.rate_limit_first > 0:
+            self.rate_limit_first -= 1
+            raise RateLimited("429 Too Many Requests")
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.in_flight -= 1
+        text = json.dumps({"evaluations": [
+            {"paper_index": i, "include": int(pmid) % 2 == 0, "reason": "r", "disease": "GCA"}
+            for i, pmid in enumerate(pmids, 1)
+        ]})
+        if self.answer_at_most is not None and len(pmids) > self.answer_at_most:
+            # Cut off mid-way through the next evaluation, as at max_tokens
+            cut = [m.start() for m in re.finditer(r'\{"paper_index"', text)][self.answer_at_most]
+            text = text[:cut + 25]
+        return text
+
+
+class StaleCacheFilterLLM(FakeFilterLLM):
+    """Answers from its "cache" with garbage unless called with use_cache=False."""
+
+    def __init__(self):
+        super().__init__()
+        self.use_cache_flags = []
+
+    async def complete(self, prompt, use_cache=True, **kwargs):
+        self.use_cache_flags.append(use_cache)
+        if use_cache:
+            return "not json"
+        return await super().complete(prompt, **kwargs)
+
+
+def _papers(n, abstract_chars=400):
+    return [
+        Paper(pmid=str(i), title=f"Drugx in patients {i}", abstract="We treated patients. " * (abstract_chars // 21))
+        for i in range(n)
+    ]
+
+
+def _filter(llm, papers):
+    service = LiteratureSearchService(filter_llm_client=llm)
+    service._pre_filter_by_keywords = lambda p, d: (p, 0)
+    return asyncio.run(service._filter_with_llm(papers, "drugx", []))
+
+
+class TestPackBatches:
+    """Tests for token-budget packing."""
+
+    def test_budget_and_output_cap(self):
+        short = pack_batches(_papers(100, 200), LiteratureSearchService._filter_paper_tokens)
+        long = pack_batches(_papers(100, 3800), LiteratureSearchService._filter_paper_tokens)
+
+        assert max(len(b) for b in short) == FILTER_MAX_PAPERS_PER_BATCH
+        assert 5 < max(len(b) for b in long) < FILTER_MAX_PAPERS_PER_BATCH
+        assert sum(len(b) for b in long) == 100
+
+
+class TestAdaptiveFilter:
+    """Tests for LiteratureSearchService._filter_with_llm."""
+
+    def test_truncated_response_resends_only_missing(self):
+        llm = FakeFilterLLM(answer_at_most=12)
+        passed = _filter(llm, _papers(20))
+
+        assert sorted(int(p.pmid) for p in passed) == list(range(0, 20, 2))
+        assert llm.requests[0] == [str(i) for i in range(20)]
+        # Papers 12-19 were re-sent (split in two); nothing else was
+        assert sorted(int(p) for r in llm.requests[1:] for p in r) == list(range(12, 20))
+        assert len(llm.requests) == 3
+
+    def test_unparseable_answer_retried_past_cache(self):
+        llm = StaleCacheFilterLLM()
+        passed = _filter(llm, [Paper(pmid="3", title="Drugx in patients", abstract="We treated patients.")])
+
+        # The fresh answer excludes odd PMIDs; keeping the paper would mean no retry
+        assert passed == []
+        assert llm.use_cache_flags == [True, False]
+
+    def test_concurrency_adapts_and_429s_are_retried(self):
+        llm = FakeFilterLLM(rate_limit_first=1, delay=0.02)
+        limiter = AdaptiveConcurrencyLimiter(initial=2, cooldown_seconds=0.05, min_latency=0.005)
+
+        async def run():
+            service = LiteratureSearchService(filter_llm_client=llm)
+            batches = [_papers(40)[i:i + 2] for i in range(0, 40, 2)]
+            results = await asyncio.gather(*(
+                service._filter_batch(i, b, "drugx", [], limiter=limiter) for i, b in enumerate(batches)
+            ))
+            return [p for r in results for p in r]
+
+        passed = asyncio.run(run())
+
+        assert sorted(int(p.pmid) for p in passed) == list(range(0, 40, 2))
+        assert limiter.rate_limited == 1
+        assert llm.peak > 2
+        assert limiter.get_stats()["limit"] > 1
+
+    def test_cache_hits_leave_limit_alone(self):
+        class Cached(str):
+            from_cache = True
+
+        limiter = AdaptiveConcurrencyLimiter(initial=8, min_latency=0.005)
+
+        async def api_call():
+            await asyncio.sleep(0.02)
+            return "{}"
+
+        async def cache_hit():
+            return Cached("{}")
+
+        async def instant():
+            return "{}"
+
+        async def run():
+            for _ in range(3):
+                await limiter.run(api_call)
+            for _ in range(20):
+                await limiter.run(cache_hit)
+                await limiter.run(instant)
+
+        asyncio.run(run())
+
+        assert limiter.get_stats()["limit"] >= 8
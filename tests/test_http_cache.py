@@ -0,0 +1,162 @@
+"""
+Tests for the shared HTTP response cache used by src/tools API clients.
+
+Tests:
+- Request normalization (param order, credential params, value escaping)
+- Fresh hits skip the network
+- Conditional revalidation (304) of expired entries
+- Stale fallback on network errors
+- LRU size-bounded eviction
+- Client integration (PubMedAPI.search)
+"""
+
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.tools.http_cache import ResponseCache, normalize_request
+
+
+def _response(status_code=200, content=b'{"ok": true}', headers=None):
+    return SimpleNamespace(status_code=status_code, content=content, headers=headers or {})
+
+
+class Sender:
+    """Records calls and returns queued responses."""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.calls = []
+
+    def __call__(self, headers):
+        self.calls.append(headers)
+        response = self.responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+
+class TestNormalizeRequest:
+    """Tests for cache key normalization."""
+
+    def test_param_order_and_credentials(self):
+        a = normalize_request("https://EUTILS.ncbi.nlm.nih.gov/esearch.fcgi", {"term": "x", "db": "pubmed", "api_key": "k1"})
+        b = normalize_request("https://eutils.ncbi.nlm.nih.gov/esearch.fcgi?db=pubmed", {"term": "x", "email": "me@x"})
+        assert a == b
+
+    def test_different_params_differ(self):
+        assert normalize_request("https://x/y", {"id": "1"}) != normalize_request("https://x/y", {"id": "2"})
+        # Values are escaped, so they cannot forge extra params
+        assert normalize_request("https://x/y", {"term": "a&b=c"}) != normalize_request("https://x/y", {"term": "a", "b": "c"})
+
+
+class TestResponseCache:
+    """Tests for ResponseCache.fetch."""
+
+    def test_fresh_hit_skips_network(self, tmp_path):
+        cache = ResponseCache(cache_dir=tmp_path)
+        sender = Sender(_response())
+
+        first = cache.fetch("pubmed_efetch", "https://x/efetch", {"id": "1"}, sender)
+        second = cache.fetch("pubmed_efetch", "https://x/efetch", {"id": "1"}, sender)
+
+        assert first.content == b'{"ok": true}'
+        assert second.json() == {"ok": True}
+        assert getattr(second, "from_cache", False)
+        assert len(sender.calls) == 1
+        stats = cache.get_stats()
+        assert stats["hits"] == 1 and stats["misses"] == 1
+        assert stats["entries"] == 1
+
+    def test_errors_not_cached(self, tmp_path):
+        cache = ResponseCache(cache_dir=tmp_path)
+        sender = Sender(_response(status_code=500), _response())
+
+        assert cache.fetch("x", "https://x/y", None, sender).status_code == 500
+        assert cache.fetch("x", "https://x/y", None, sender).status_code == 200
+        assert len(sender.calls) == 2
+
+    def test_revalidation(self, tmp_path):
+        cache = ResponseCache(cache_dir=tmp_path, ttls={"ct": 0})
+        sender = Sender(
+            _response(headers={"ETag": '"v1"', "Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"}),
+            _response(status_code=304, content=b""),
+        )
+
+        cache.fetch("ct", "https://x/studies", {"q": "a"}, sender)
+        time.sleep(0.01)
+        revalidated = cache.fetch("ct", "https://x/studies", {"q": "a"}, sender)
+
+        assert sender.calls[1]["If-None-Match"] == '"v1"'
+        assert "If-Modified-Since" in sender.calls[1]
+        assert revalidated.json() == {"ok": True}
+        assert cache.get_stats()["revalidated"] == 1
+
+    def test_stale_served_on_error(self, tmp_path):
+        cache = ResponseCache(cache_dir=tmp_path, ttls={"s2": 0})
+        sender = Sender(_response(), ConnectionError("down"))
+
+        cache.fetch("s2", "https://x/paper", None, sender)
+        time.sleep(0.01)
+        stale = cache.fetch("s2", "https://x/paper", None, sender)
+
+        assert stale.json() == {"ok": True}
+        assert cache.get_stats()["stale_served"] == 1
+
+    def test_lru_eviction(self, tmp_path):
+        import os
+        cache = ResponseCache(cache_dir=tmp_path, max_bytes=3500)
+        # Incompressible bodies so sizes are predictable
+        bodies = [os.urandom(1000) for _ in range(4)]
+
+        for i in range(3):
+            cache.fetch("x", f"https://x/{i}", None, Sender(_response(content=bodies[i])))
+        # Touch entry 0 so entry 1 becomes least recently used
+        cache.fetch("x", "https://x/0", None, Sender())
+        cache.fetch("x", "https://x/3", None, Sender(_response(content=bodies[3])))
+
+        assert cache.get_stats()["evictions"] >= 1
+        keep = cache.fetch("x", "https://x/0", None, Sender())
+        assert keep.content == bodies[0]
+        refetch = Sender(_response(content=b"new"))
+        cache.fetch("x", "https://x/1", None, refetch)
+        assert len(refetch.calls) == 1
+
+    def test_disabled(self, tmp_path):
+        cache = ResponseCache(cache_dir=tmp_path / "off", enabled=False)
+        sender = Sender(_response(), _response())
+        cache.fetch("x", "https://x/y", None, sender)
+        cache.fetch("x", "https://x/y", None, sender)
+        assert len(sender.calls) == 2
+        assert not (tmp_path / "off").exists()
+
+
+class TestClientIntegration:
+    """API clients route GETs through the cache."""
+
+    def test_pubmed_search_cached(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        from src.tools.pubmed import PubMedAPI
+
+        api = PubMedAPI(response_cache=ResponseCache(cache_dir=tmp_path / "http"))
+        calls = []
+
+        def fake_get(url, params=None, headers=None):
+            calls.append(url)
+            return SimpleNamespace(
+                status_code=200,
+                headers={},
+                content=b'{"esearchresult": {"idlist": ["1", "2"]}}',
+                json=lambda: {"esearchresult": {"idlist": ["1", "2"]}},
+                raise_for_status=lambda: None,
+            )
+
+        monkeypatch.setattr(api.session, "get", fake_get)
+        assert api.search("baricitinib") == ["1", "2"]
+        assert api.search("baricitinib") == ["1", "2"]
+        assert len(calls) == 1
+        api.close()
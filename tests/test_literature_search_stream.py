@@ -0,0 +1,170 @@
+"""
+Tests for the streaming, resumable literature search pipeline.
+
+Tests:
+- search_stream dedups across sources and emits the same papers as search()
+- First paper is emitted before the slowest source finishes
+- A resumed run skips LLM filtering for checkpointed papers
+- ExtractionService.extract_stream bounds concurrency while consuming the stream
+"""
+
+import asyncio
+import json
+import re
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.case_series.services.extraction_service import ExtractionService
+from src.case_series.services.literature_search_service import (
+    LiteratureSearchService,
+    Paper,
+    SearchResult,
+)
+from src.case_series.services.search_checkpoint import (
+    STAGE_EMITTED,
+    SearchCheckpoint,
+    make_run_key,
+)
+
+ABSTRACT = "We report a case series of patients treated with drugx; response was observed."
+
+
+def _paper(i, source):
+    return Paper(pmid=str(i), title=f"Drugx case series {i}", abstract=ABSTRACT, source=source)
+
+
+class FakeFilterLLM:
+    """Includes papers with even PMIDs."""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def complete(self, prompt, max_tokens=4000, **kwargs):
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        pmids = re.findall(r"--- Paper \d+ \(PMID: (\d+)\) ---", prompt)
+        return json.dumps({"evaluations": [
+            {"paper_index": i, "include": int(pmid) % 2 == 0, "disease": "GCA", "patient_count": 10}
+            for i, pmid in enumerate(pmids, 1)
+        ]})
+
+
+def _service(llm, source_delays):
+    service = LiteratureSearchService(filter_llm_client=llm)
+    service._semantic_scholar_api = None
+
+    async def source(name, delay, ids):
+        await asyncio.sleep(delay)
+        return [_paper(i, name) for i in ids]
+
+    def build_tasks(*args):
+        names = list(source_delays)
+        return names, [source(name, delay, ids) for name, (delay, ids) in source_delays.items()]
+
+    service._build_search_tasks = build_tasks
+    return service
+
+
+async def _collect(stream, log=None):
+    papers = []
+    async for paper in stream:
+        if log is not None:
+            log.append(asyncio.get_running_loop().time())
+        papers.append(paper)
+    return papers
+
+
+class TestSearchStream:
+    """Tests for LiteratureSearchService.search_stream."""
+
+    SOURCES = {
+        "PubMed": (0.0, range(0, 30)),
+        "Semantic Scholar": (0.05, range(20, 50)),
+    }
+
+    def test_matches_batch_search(self):
+        batch = asyncio.run(_service(FakeFilterLLM(), self.SOURCES).search("drugx"))
+        result = SearchResult()
+        streamed = asyncio.run(_collect(
+            _service(FakeFilterLLM(), self.SOURCES).search_stream("drugx", result=result)
+        ))
+
+        assert sorted(p.pmid for p in streamed) == sorted(p.pmid for p in batch.papers)
+        assert len(streamed) == 25
+        assert result.duplicates_removed == batch.duplicates_removed == 10
+        assert result.total_found == 50
+        assert result.papers == streamed
+
+    def test_first_paper_before_slow_source(self):
+        sources = {"PubMed": (0.0, range(0, 10)), "Web": (1.0, range(10, 20))}
+        loop_start = []
+        times = []
+
+        async def run():
+            loop_start.append(asyncio.get_running_loop().time())
+            return await _collect(_service(FakeFilterLLM(), sources).search_stream("drugx"), times)
+
+        papers = asyncio.run(run())
+        assert len(papers) == 10
+        assert times[0] - loop_start[0] < 0.5
+
+    def test_resume_skips_llm_filter(self, tmp_path):
+        db_path = tmp_path / "checkpoints.sqlite3"
+        run_key = make_run_key("drugx")
+
+        async def crash_after(n):
+            checkpoint = SearchCheckpoint(run_key, db_path)
+            llm = FakeFilterLLM()
+            papers = []
+            async for paper in _service(llm, self.SOURCES).search_stream("drugx", checkpoint=checkpoint):
+                papers.append(paper)
+                if len(papers) == n:
+                    break
+            checkpoint.close()
+            return papers, llm
+
+        first, first_llm = asyncio.run(crash_after(5))
+        assert len(first) == 5
+
+        checkpoint = SearchCheckpoint(run_key, db_path)
+        assert checkpoint.resumed
+        assert checkpoint.count(STAGE_EMITTED) >= 5
+        llm = FakeFilterLLM()
+        resumed = asyncio.run(_collect(_service(llm, self.SOURCES).search_stream("drugx", checkpoint=checkpoint)))
+        checkpoint.close()
+
+        assert sorted(int(p.pmid) for p in resumed) == list(range(0, 50, 2))
+        assert llm.calls < 5  # 5 batches of 10 without the checkpoint
+        assert all(p.extracted_disease == "GCA" for p in resumed)
+
+        # A completed run starts fresh next time
+        assert not SearchCheckpoint(run_key, db_path).resumed
+
+
+class TestExtractStream:
+    """Tests for ExtractionService.extract_stream."""
+
+    def test_bounded_concurrency(self):
+        service = ExtractionService(llm_client=None)
+        state = {"current": 0, "peak": 0}
+
+        async def fake_extract(paper, drug_info, use_cache=False):
+            state["current"] += 1
+            state["peak"] = max(state["peak"], state["current"])
+            await asyncio.sleep(0.01)
+            state["current"] -= 1
+            return None
+
+        service.extract = fake_extract
+
+        async def papers():
+            for i in range(8):
+                yield _paper(i, "PubMed")
+
+        extractions = asyncio.run(service.extract_stream(papers(), drug_info=None, max_concurrent=3))
+
+        assert extractions == []
+        assert state["peak"] == 3
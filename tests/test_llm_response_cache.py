@@ -0,0 +1,162 @@
+"""
+Tests for the content-addressed LLM response cache.
+
+Tests:
+- Identical requests are served from disk by a fresh client; any change to
+  the prompt, system prompt or sampling params is a miss
+- use_cache=False skips the lookup and replaces the stored answer;
+  invalidate() drops it; hits keep the stop_reason
+- Hit rate and saved tokens are reported, and cached calls cost nothing
+  and are not counted as LLM calls
+- Truncated (max_tokens) responses are not stored
+- Size-bounded LRU eviction
+"""
+
+import asyncio
+import random
+import string
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.case_series import factory
+from src.case_series.llm_cache import LLMResponseCache
+from src.case_series.run_context import RunContext, run_scope
+
+
+class FakeMessages:
+    """Stand-in for AsyncAnthropic().messages that counts calls."""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def create(self, **kwargs):
+        self.calls += 1
+        content = [SimpleNamespace(text=f"answer to {kwargs['messages'][0]['content']}")]
+        if "thinking" in kwargs:
+            content.insert(0, SimpleNamespace(thinking="reasoning"))
+        return SimpleNamespace(
+            content=content,
+            stop_reason="end_turn",
+            usage=SimpleNamespace(
+                input_tokens=100, output_tokens=20,
+                cache_creation_input_tokens=0, cache_read_input_tokens=0,
+            ),
+        )
+
+
+def _client(cache, messages):
+    client = factory._create_anthropic_client("key", model="m", response_cache=cache)
+    return client, SimpleNamespace(messages=messages)
+
+
+class TestLLMResponseCache:
+    """Tests for LLMResponseCache beneath the Anthropic client."""
+
+    def test_repeat_calls_served_from_disk(self, tmp_path):
+        messages = FakeMessages()
+        client, fake = _client(LLMResponseCache(cache_dir=tmp_path), messages)
+
+        async def _first():
+            await client.complete("p1", system="filter")
+            await client.complete_with_thinking("p2", thinking_budget=1000)
+
+        async def _second(c):
+            return [
+                await c.complete("p1", system="filter"),
+                await c.complete_with_thinking("p2", thinking_budget=1000),
+                await c.complete("p1", system="other"),
+                await c.complete("p1", system="filter", max_tokens=10),
+                await c.complete("p1", system="filter", use_cache=False),
+            ]
+
+        with patch.object(factory, "_get_async_anthropic", return_value=fake):
+            asyncio.run(_first())
+            assert messages.calls == 2
+
+            # A new client on the same directory (i.e. the next run)
+            cache = LLMResponseCache(cache_dir=tmp_path)
+            again, _ = _client(cache, messages)
+            run = RunContext(drug_name="drugx")
+            with run_scope(run):
+                results = asyncio.run(_second(again))
+
+        assert results[0] == "answer to p1"
+        assert results[1] == ("answer to p2", "reasoning")
+        # Different system prompt, sampling params and the bypass each hit the API
+        assert messages.calls == 5
+        assert again.get_usage_stats()["input_tokens"] == 300
+
+        stats = again.get_cache_stats()
+        assert stats["hits"] == 2
+        assert stats["misses"] == 2
+        assert stats["bypassed"] == 1
+        assert stats["hit_rate"] == 0.5
+        assert stats["saved_input_tokens"] == 200
+        assert stats["saved_output_tokens"] == 40
+        assert run.metrics["llm_cache_hits"] == 2
+        assert run.metrics["llm_cache_saved_input_tokens"] == 200
+        assert run.llm_calls == 3
+
+    def test_truncated_response_not_stored(self, tmp_path):
+        cache = LLMResponseCache(cache_dir=tmp_path)
+        request = {"model": "m", "max_tokens": 10, "messages": [{"role": "user", "content": "p"}]}
+        response = lambda stop_reason: SimpleNamespace(
+            content=[SimpleNamespace(text='{"evaluations": [')],
+            stop_reason=stop_reason,
+            usage=SimpleNamespace(input_tokens=1, output_tokens=10),
+        )
+
+        assert not cache.put(request, response("max_tokens"))
+        assert cache.get(request) is None
+        assert cache.put(request, response("end_turn"))
+        assert cache.get(request) is not None
+
+    def test_refresh_and_invalidate(self, tmp_path):
+        cache = LLMResponseCache(cache_dir=tmp_path)
+        messages = FakeMessages()
+        client, fake = _client(cache, messages)
+        request = {"model": "m", "max_tokens": 4000, "messages": [{"role": "user", "content": "p"}]}
+        cache.put(request, SimpleNamespace(
+            content=[SimpleNamespace(text='{"broken": ')],
+            stop_reason="end_turn",
+            usage=SimpleNamespace(input_tokens=1, output_tokens=1),
+        ))
+
+        with patch.object(factory, "_get_async_anthropic", return_value=fake):
+            assert asyncio.run(client.complete("p")) == '{"broken": '
+            # The retry path skips the cached answer and replaces it
+            assert asyncio.run(client.complete("p", use_cache=False)) == "answer to p"
+        assert messages.calls == 1
+
+        hit = cache.get(request)
+        assert hit.content[-1].text == "answer to p"
+        assert hit.stop_reason == "end_turn"
+
+        assert cache.invalidate(request)
+        assert cache.get(request) is None
+        assert not cache.invalidate(request)
+
+    def test_lru_eviction_by_size(self, tmp_path):
+        cache = LLMResponseCache(cache_dir=tmp_path, max_bytes=2000)
+        response = lambda i: SimpleNamespace(
+            content=[SimpleNamespace(text="".join(random.Random(i).choices(string.printable, k=800)))],
+            stop_reason="end_turn",
+            usage=SimpleNamespace(input_tokens=1, output_tokens=1),
+        )
+        request = lambda i: {"model": "m", "max_tokens": 10, "messages": [{"role": "user", "content": str(i)}]}
+
+        cache.put(request(0), response(0))
+        cache.put(request(1), response(1))
+        assert cache.get(request(0)) is not None  # 0 is now more recent than 1
+        for i in range(2, 5):
+            cache.put(request(i), response(i))
+
+        stats = cache.get_stats()
+        assert stats["evictions"] > 0
+        assert cache.get(request(1)) is None
+        assert cache.get(request(4)) is not None
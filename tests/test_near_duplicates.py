@@ -0,0 +1,107 @@
+"""
+Tests for MinHash/LSH near-duplicate paper detection.
+
+Tests:
+- A preprint and its published version merge on title + abstract similarity
+- Same-topic reports by different authors, or years apart, are kept
+- Injected variants are found among thousands of distinct papers
+- LiteratureSearchService._deduplicate reports the merged clusters
+"""
+
+import random
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.case_series.services.literature_search_service import (
+    LiteratureSearchService,
+    Paper,
+    SearchResult,
+)
+from src.case_series.services.near_duplicates import NearDuplicateIndex
+
+PREPRINT_ABSTRACT = (
+    "We describe a 34 year old woman with severe alopecia areata refractory to topical steroids and "
+    "methotrexate who was treated with baricitinib 4 mg daily. After 24 weeks the SALT score improved "
+    "from 95 to 10 and no serious adverse events were observed during follow up of twelve months."
+)
+PUBLISHED_ABSTRACT = (
+    "Background: We report a 34-year-old woman with severe alopecia areata refractory to topical "
+    "corticosteroids and methotrexate who was treated with baricitinib 4 mg once daily. After 24 weeks "
+    "the SALT score improved from 95 to 10, and no serious adverse events were observed during a "
+    "follow-up of 12 months."
+)
+OTHER_ABSTRACT = (
+    "A 12 year old boy with patchy alopecia areata received baricitinib 2 mg daily after failing "
+    "intralesional steroids. Regrowth exceeded 80 percent after six months and mild acne was the "
+    "only adverse event reported by the treating clinicians at the last visit."
+)
+
+
+class TestNearDuplicateIndex:
+    """Tests for NearDuplicateIndex matching and blocking."""
+
+    def test_preprint_merges_into_published(self):
+        index = NearDuplicateIndex()
+        assert index.add("pmid:1", "Baricitinib for refractory alopecia areata: a case report",
+                         PUBLISHED_ABSTRACT, "Smith J, Doe A", 2023) is None
+
+        kept = index.add("doi:10.1101/x", "Successful treatment of refractory alopecia areata with baricitinib",
+                         PREPRINT_ABSTRACT, "Jane Smith", "2022")
+
+        assert kept == "pmid:1"
+        [cluster] = index.clusters()
+        assert cluster.kept_key == "pmid:1"
+        assert cluster.merged[0]["key"] == "doi:10.1101/x"
+        assert cluster.merged[0]["basis"] == "text"
+
+    def test_blocking_keeps_distinct_reports(self):
+        index = NearDuplicateIndex()
+        title = "Baricitinib for refractory alopecia areata: a case report"
+        index.add("pmid:1", title, PUBLISHED_ABSTRACT, "Smith J", 2023)
+
+        assert index.add("pmid:2", "Baricitinib in refractory alopecia areata: a case report",
+                         OTHER_ABSTRACT, "Smith J", 2023) is None  # abstracts disagree
+        assert index.add("pmid:3", title, "", "Wang L", 2023) is None  # different first author
+        assert index.add("pmid:4", title, "", "Smith J", 2015) is None  # years apart
+        assert index.add("s2:5", title + ".", "", None, None) == "pmid:1"
+        assert len(index) == 4
+
+    def test_finds_variants_among_thousands(self):
+        rng = random.Random(0)
+        vocab = [f"term{i}" for i in range(3000)]
+        papers = [(" ".join(rng.choices(vocab, k=10)), " ".join(rng.choices(vocab, k=120))) for _ in range(3000)]
+        index = NearDuplicateIndex()
+
+        for i, (title, abstract) in enumerate(papers):
+            assert index.add(f"pmid:{i}", title, abstract, f"Author{i}", 2020) is None
+        for i in range(0, 3000, 300):
+            title, abstract = papers[i]
+            words = abstract.split()
+            variant = " ".join(words[:60] + ["revised"] + words[60:])
+            assert index.add(f"doi:{i}", title.upper(), variant, f"Author{i}", 2021) == f"pmid:{i}"
+
+        assert len(index.clusters()) == 10
+
+
+class TestLiteratureDedup:
+    """Tests for the LiteratureSearchService integration."""
+
+    def test_deduplicate_reports_clusters(self):
+        service = LiteratureSearchService.__new__(LiteratureSearchService)
+        result = SearchResult()
+        papers = [
+            Paper(pmid="1", title="Baricitinib for refractory alopecia areata: a case report",
+                  abstract=PUBLISHED_ABSTRACT, authors="Smith J", year=2023, source="PubMed"),
+            Paper(pmid="1", title="duplicate pmid", source="Semantic Scholar"),
+            Paper(doi="10.1101/x", title="Successful treatment of refractory alopecia areata with baricitinib",
+                  abstract=PREPRINT_ABSTRACT, authors="Jane Smith", year=2022, source="medRxiv"),
+        ]
+
+        unique = service._deduplicate(papers, result)
+
+        assert [p.source for p in unique] == ["PubMed"]
+        assert [c.kept_key for c in result.duplicate_clusters] == ["pmid:1"]
+        assert result.duplicate_clusters[0].merged[0]["key"] == "doi:10.1101/x"
@@ -0,0 +1,112 @@
+"""
+Tests for per-run isolation in CaseSeriesOrchestrator.
+
+Tests:
+- Concurrent analyze() calls keep their own run IDs, progress and token usage
+- aggregate_progress() combines in-flight runs and is idle afterwards
+- The last run's ID and progress stay readable after analyze() returns
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.case_series.orchestrator import AnalysisConfig, CaseSeriesOrchestrator
+from src.case_series.run_context import record_llm_usage
+from src.case_series.services.drug_info_service import DrugInfo
+from src.case_series.services.literature_search_service import SearchResult
+
+
+class FakeRepository:
+    """Records run lifecycle calls."""
+
+    _db = None
+
+    def __init__(self):
+        self.updates = []
+
+    def create_run(self, drug_name, parameters):
+        return f"run-{drug_name}"
+
+    def update_run(self, run_id, status, **stats):
+        self.updates.append((run_id, status, stats))
+
+
+def _orchestrator(repository, snapshots):
+    orchestrator = CaseSeriesOrchestrator(
+        drug_info_service=None,
+        literature_search_service=SimpleNamespace(_filter_llm_client=None),
+        extraction_service=None,
+        market_intel_service=None,
+        disease_standardizer=SimpleNamespace(assign_parent_diseases=lambda extractions: None),
+        scoring_engine=SimpleNamespace(rank=lambda opportunities: opportunities),
+        repository=repository,
+    )
+
+    async def get_drug_info(drug_name):
+        return DrugInfo(drug_name=drug_name)
+
+    async def search_literature(drug_name, **kwargs):
+        # Interleave with the other runs before and after recording usage
+        await asyncio.sleep(0.01)
+        record_llm_usage(input_tokens=1000 * len(drug_name), output_tokens=10)
+        await asyncio.sleep(0.01)
+        return SearchResult(papers=[])
+
+    async def extract_data(papers, drug_info, **kwargs):
+        snapshots.append((drug_info.drug_name, orchestrator._run_id, orchestrator.aggregate_progress()))
+        await asyncio.sleep(0.01)
+        return []
+
+    async def identify_papers_for_manual_review(**kwargs):
+        return []
+
+    orchestrator.get_drug_info = get_drug_info
+    orchestrator.search_literature = search_literature
+    orchestrator.extract_data = extract_data
+    orchestrator.identify_papers_for_manual_review = identify_papers_for_manual_review
+    return orchestrator
+
+
+class TestConcurrentRuns:
+    """Tests for RunContext isolation across concurrent analyses."""
+
+    def test_runs_do_not_share_state(self):
+        repository = FakeRepository()
+        snapshots = []
+        orchestrator = _orchestrator(repository, snapshots)
+        drugs = ["a", "bb", "ccc", "dddd"]
+
+        results = asyncio.run(orchestrator.analyze_drugs_parallel(
+            drugs, AnalysisConfig(enrich_market_data=False), max_concurrent=4
+        ))
+
+        assert sorted(r.drug_name for r in results) == drugs
+        for result in results:
+            assert result.total_input_tokens == 1000 * len(result.drug_name)
+            assert result.total_output_tokens == 10
+
+        # Each run saw its own run ID mid-pipeline
+        assert sorted((drug, run_id) for drug, run_id, _ in snapshots) == [
+            (drug, f"run-{drug}") for drug in drugs
+        ]
+        completed = {run_id: stats for run_id, status, stats in repository.updates if status == "completed"}
+        assert completed["run-ccc"]["total_tokens"] == 3010
+
+        # All four were in flight together, so the aggregate sums their tokens
+        peak = max(snapshots, key=lambda s: s[2].total_tokens)[2]
+        assert peak.total_tokens == sum(1000 * len(d) + 10 for d in drugs)
+        assert orchestrator.aggregate_progress().status == "idle"
+        assert orchestrator.active_runs == []
+
+    def test_progress_after_run(self):
+        orchestrator = _orchestrator(FakeRepository(), [])
+        asyncio.run(orchestrator.analyze("drug", AnalysisConfig(enrich_market_data=False)))
+
+        assert orchestrator.progress.status == "completed"
+        assert orchestrator.progress.total_tokens == 4010
+        assert orchestrator._run_id == "run-drug"
@@ -0,0 +1,181 @@
+"""
+Tests for the SQLite-backed paper cache store.
+
+Tests:
+- Lookups by PMID / PMCID / DOI
+- Title search and year filter
+- Concurrent writers
+- One-shot migration from the legacy index.json layout, safe to race
+- PubMedAPI integration (_save_paper_to_cache / _get_cached_paper)
+"""
+
+import json
+import sys
+import threading
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.tools.paper_cache_store import PaperCacheStore, normalize_doi
+
+
+def _paper(pmid, title="Baricitinib in giant cell arteritis", year="2022", **extra):
+    paper = {
+        'pmid': pmid,
+        'pmcid': f"PMC{pmid}",
+        'doi': f"10.1000/{pmid}",
+        'title': title,
+        'authors': ["A Author", "B Author"],
+        'journal': "Ann Rheum Dis",
+        'year': year,
+        'content': "x" * 2000,
+    }
+    paper.update(extra)
+    return paper
+
+
+class TestPaperCacheStore:
+    """Tests for PaperCacheStore."""
+
+    def test_lookup_by_ids(self, tmp_path):
+        store = PaperCacheStore(tmp_path / "papers.sqlite3")
+        store.put(_paper("111"))
+
+        assert store.get(pmid="111")['content'] == "x" * 2000
+        assert store.get(pmcid="pmc111")['pmid'] == "111"
+        assert store.get(doi="https://doi.org/10.1000/111")['pmid'] == "111"
+        assert store.get(pmid="999") is None
+        assert store.contains("111")
+        assert not store.contains("999")
+
+    def test_payload_is_compressed(self, tmp_path):
+        store = PaperCacheStore(tmp_path / "papers.sqlite3")
+        store.put(_paper("111"))
+        assert store.stats()['payload_bytes'] < 2000
+
+    def test_search(self, tmp_path):
+        store = PaperCacheStore(tmp_path / "papers.sqlite3")
+        store.put_many([
+            _paper("1", title="Baricitinib for GCA", year="2022"),
+            _paper("2", title="Tofacitinib in dermatomyositis", year="2019"),
+            _paper("3", title="JAK inhibition with baricitinib", year=None),
+        ])
+
+        assert {p['pmid'] for p in store.search(title_contains=["BARICITINIB"])} == {"1", "3"}
+        assert {p['pmid'] for p in store.search(title_contains=["jak", "baricitinib"])} == {"3"}
+        assert {p['pmid'] for p in store.search(year_min=2020)} == {"1", "3"}
+        assert [p['pmid'] for p in store.search()] == ["1", "2", "3"]
+
+    def test_upsert_keeps_existing_fields(self, tmp_path):
+        store = PaperCacheStore(tmp_path / "papers.sqlite3")
+        store.put(_paper("1"))
+        store.put({'pmid': "1", 'title': "Updated"}, store_payload=False)
+        store.put({'pmid': "1", 'doi': "10.1/updated"}, store_payload=False)
+
+        meta = store.get_metadata(pmid="1")
+        assert meta['title'] == "Updated"
+        assert meta['pmcid'] == "PMC1"
+        assert store.get(pmid="1")['content'] == "x" * 2000
+        # The title index follows the merged row, not the incoming one
+        assert [p['pmid'] for p in store.search(title_contains=["updated"])] == ["1"]
+
+    def test_concurrent_writers(self, tmp_path):
+        db_path = tmp_path / "papers.sqlite3"
+        stores = [PaperCacheStore(db_path) for _ in range(4)]
+
+        def write(worker):
+            for i in range(25):
+                stores[worker].put(_paper(f"{worker}-{i}"))
+
+        threads = [threading.Thread(target=write, args=(w,)) for w in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert PaperCacheStore(db_path).stats()['total_papers'] == 100
+
+    def test_migrate_from_json_index(self, tmp_path):
+        cache_dir = tmp_path / "downloaded_papers"
+        cache_dir.mkdir()
+        paper = _paper("35190385")
+        (cache_dir / "35190385.json").write_text(json.dumps(paper))
+        index = {
+            "35190385": {
+                'pmid': "35190385",
+                'pmcid': "PMC35190385",
+                'title': paper['title'],
+                'year': "2022",
+                'cached_date': "2025-12-06T17:59:24",
+                # Legacy index written on Windows
+                'file_path': "data\\downloaded_papers\\35190385.json",
+            },
+            "42": {'pmid': "42", 'title': "Missing file", 'file_path': "nowhere.json"},
+        }
+        index_path = cache_dir / "index.json"
+        index_path.write_text(json.dumps(index))
+
+        store = PaperCacheStore(cache_dir / "papers.sqlite3")
+        assert store.migrate_from_json_index(index_path, cache_dir) == 2
+        # The legacy index stays in place (it may be tracked in git)
+        assert index_path.exists()
+
+        assert store.get(pmid="35190385")['content'] == paper['content']
+        assert store.get_metadata(pmid="35190385")['cached_date'] == "2025-12-06T17:59:24"
+        assert store.get_metadata(pmid="42")['title'] == "Missing file"
+        assert store.get(pmid="42") is None
+
+        # Second run is a no-op, also for a new store on the same database
+        assert store.migrate_from_json_index(index_path, cache_dir) == 0
+        assert PaperCacheStore(cache_dir / "papers.sqlite3").migrate_from_json_index(index_path, cache_dir) == 0
+
+    def test_migration_race(self, tmp_path):
+        cache_dir = tmp_path / "downloaded_papers"
+        cache_dir.mkdir()
+        index_path = cache_dir / "index.json"
+        index_path.write_text(json.dumps({"42": {'pmid': "42", 'title': "Legacy"}}))
+
+        winner = PaperCacheStore(cache_dir / "papers.sqlite3")
+        loser = PaperCacheStore(cache_dir / "papers.sqlite3")
+        put_many = loser.put_many
+
+        def put_many_while_winner_migrates(*args, **kwargs):
+            winner.migrate_from_json_index(index_path, cache_dir)
+            return put_many(*args, **kwargs)
+
+        loser.put_many = put_many_while_winner_migrates
+        loser.migrate_from_json_index(index_path, cache_dir)
+
+        assert loser.get_metadata(pmid="42")['title'] == "Legacy"
+        assert winner.migrate_from_json_index(index_path, cache_dir) == 0
+        assert index_path.exists()
+
+    def test_normalize_doi(self):
+        assert normalize_doi("https://doi.org/10.1136/ABC") == "10.1136/abc"
+        assert normalize_doi("doi:10.1/x") == "10.1/x"
+        assert normalize_doi(None) is None
+
+
+class TestPubMedPaperCache:
+    """Tests for PubMedAPI cache methods backed by the store."""
+
+    def test_save_and_get(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        from src.tools.pubmed import PubMedAPI
+
+        api = PubMedAPI()
+        assert api._save_paper_to_cache(_paper("111")) is None
+        assert api._get_cached_paper("111")['title'].startswith("Baricitinib")
+        assert not list((tmp_path / "data/downloaded_papers").glob("111.json"))
+
+        assert len(api.search_cached_papers(drug="baricitinib", year_min=2020)) == 1
+        stats = api.get_cache_stats()
+        assert stats['total_papers'] == 1
+        assert stats['year_range'] == "2022-2022"
+
+        # download_paper materializes a stored payload as a file
+        file_path, is_cached = api.download_paper("111", storage_path=tmp_path / "out")
+        assert is_cached
+        assert json.loads(Path(file_path).read_text())['pmid'] == "111"
+        api.close()
@@ -0,0 +1,221 @@
+"""
+Tests for ClinicalTrials.gov delta sync in PipelineIntelligenceService.
+
+Tests:
+- Terms with a cursor only query studies updated since it; cursors advance
+- A capped delta query holds the cursor at its last study; completed-trial
+  queries are paginated and an empty sync never moves the cursor
+- More capped changes than fit in one delta on a single date still advance
+  the cursor
+- A stale landscape with cursors re-extracts only changed trials and merges
+  them into the cached drugs
+"""
+
+import asyncio
+import json
+import re
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+
+from src.drug_extraction_system.resolvers.pubchem_resolution import PubChemNameStore, PubChemResolver
+from src.pipeline_intelligence.models import PipelineRun
+from src.pipeline_intelligence.service import PipelineIntelligenceService
+
+# nct_id -> (drug, LastUpdatePostDate)
+STUDIES = {
+    "NCT001": ("oldmab", "2025-01-10"),
+    "NCT002": ("newmab", "2026-10-01"),
+    "NCT003": ("upgradinib", "2026-10-05"),
+}
+
+
+def _study(nct_id):
+    return {"protocolSection": {
+        "identificationModule": {"nctId": nct_id},
+        "statusModule": {"lastUpdatePostDateStruct": {"date": STUDIES[nct_id][1]}},
+    }}
+
+
+class FakeCTClient:
+    """Serves STUDIES, honouring LastUpdatePostDate RANGE filters."""
+
+    def __init__(self):
+        self.calls = []
+
+    def get(self, path, params=None):
+        self.calls.append(params)
+        match = re.search(r"RANGE\[(\d{4}-\d{2}-\d{2}),MAX\]", params.get("filter.advanced", ""))
+        since = match.group(1) if match else ""
+        if "filter.overallStatus" not in params or "COMPLETED" in params["filter.overallStatus"]:
+            return {"studies": []}
+        return {"studies": [_study(n) for n, (_, updated) in STUDIES.items() if updated >= since]}
+
+    def extract_trial_data(self, study):
+        nct_id = study["protocolSection"]["identificationModule"]["nctId"]
+        return {"nct_id": nct_id, "trial_status": "RECRUITING", "interventions": []}
+
+
+class PagedCTClient:
+    """Active studies served oldest-update first in pages; one late completed study."""
+
+    def __init__(self, active_dates, completed_dates=(), page_size=40):
+        self.active = [(f"NCT1{i:03d}", d) for i, d in enumerate(active_dates)]
+        self.completed = [(f"NCT2{i:03d}", d) for i, d in enumerate(completed_dates)]
+        self.page_size = page_size
+        self.calls = []
+
+    def get(self, path, params=None):
+        self.calls.append(params)
+        since = re.search(r"RANGE\[(\d{4}-\d{2}-\d{2}),MAX\]", params["filter.advanced"]).group(1)
+        completed = "COMPLETED" in params["filter.advanced"] + params.get("filter.overallStatus", "")
+        rows = sorted((d, n) for n, d in (self.completed if completed else self.active) if d >= since)
+        start = int(params.get("pageToken", 0))
+        page = rows[start:start + self.page_size]
+        result = {"studies": [{"protocolSection": {
+            "identificationModule": {"nctId": n},
+            "statusModule": {"lastUpdatePostDateStruct": {"date": d}},
+        }} for d, n in page]}
+        if start + self.page_size < len(rows):
+            result["nextPageToken"] = str(start + self.page_size)
+        return result
+
+
+class FakeLLM:
+    """Returns one drug per trial in the extraction prompt."""
+
+    def __init__(self):
+        self.extracted_ncts = []
+
+    async def complete(self, prompt, **kwargs):
+        ncts = re.findall(r"Trial: (NCT\d+)", prompt)
+        self.extracted_ncts.extend(ncts)
+        phase = {"upgradinib": "Phase 3"}
+        return json.dumps({"drugs": [
+            {
+                "generic_name": STUDIES[n][0],
+                "highest_phase": phase.get(STUDIES[n][0], "Phase 2"),
+                "trial_nct_ids": [n],
+            }
+            for n in ncts
+        ]})
+
+
+class FakeRepository:
+    """In-memory landscape cache with one stale completed run."""
+
+    def __init__(self, cursors):
+        self.cursors = dict(cursors)
+        self.runs = []
+
+    def ensure_disease(self, disease_name, therapeutic_area=None):
+        return {"disease_id": 7, "disease_key": "DIS-X-0007"}
+
+    def get_latest_run(self, disease_id):
+        return PipelineRun(status="completed", run_timestamp=datetime.now() - timedelta(days=30))
+
+    def get_pipeline_for_disease(self, disease_name):
+        return [
+            {"drug_id": 1, "generic_name": "oldmab", "highest_phase": "Phase 2"},
+            {"drug_id": 2, "generic_name": "upgradinib", "highest_phase": "Phase 2"},
+        ]
+
+    def get_sync_cursors(self, disease_id):
+        return dict(self.cursors)
+
+    def save_sync_cursors(self, disease_id, cursors):
+        self.cursors.update(cursors)
+
+    def create_run(self, disease_id, disease_key, run_type="full"):
+        self.runs.append({"run_type": run_type})
+        return len(self.runs)
+
+    def update_run(self, run_id, status, **stats):
+        self.runs[run_id - 1].update(status=status, **stats)
+
+
+def _service(repository, tmp_path):
+    # No PubChem client: every name stays unresolved, and the store lives under tmp_path
+    resolver = PubChemResolver(store=PubChemNameStore(tmp_path / "pubchem"))
+    service = PipelineIntelligenceService(FakeCTClient(), None, FakeLLM(), repository, pubchem_resolver=resolver)
+    service.stored = []
+
+    async def store_drugs(drugs, *args, **kwargs):
+        service.stored.extend(d.generic_name for d in drugs)
+
+    service._store_drugs = store_drugs
+    return service
+
+
+class TestDeltaSync:
+    """Tests for cursor-based incremental landscape refresh."""
+
+    @pytest.fixture(autouse=True)
+    def _no_api_cache(self, monkeypatch):
+        # The service builds real MeSH/PubChem clients; keep their cache out of data/
+        monkeypatch.setenv("API_CACHE_DISABLED", "1")
+
+    def test_cursor_filters_and_advances(self, tmp_path):
+        service = _service(FakeRepository({}), tmp_path)
+        cursors = {"Disease X": "2026-09-01"}
+
+        trials = asyncio.run(service._search_clinical_trials("Disease X", [], cursors))
+
+        assert sorted(t["protocolSection"]["identificationModule"]["nctId"] for t in trials) == ["NCT002", "NCT003"]
+        assert all("RANGE[2026-09-01,MAX]" in p["filter.advanced"] for p in service.ct_client.calls)
+        assert cursors == {"Disease X": "2026-10-05"}
+
+    def test_delta_refresh_merges_changed_trials(self, tmp_path):
+        repository = FakeRepository({"Disease X": "2026-09-01"})
+        service = _service(repository, tmp_path)
+
+        landscape = asyncio.run(service.get_landscape(
+            "Disease X", include_web_search=False, filter_related_conditions=False, delta_refresh=True
+        ))
+
+        assert sorted(service.llm.extracted_ncts) == ["NCT002", "NCT003"]
+        assert sorted(service.stored) == ["newmab", "upgradinib"]
+        assert [d.generic_name for d in landscape.phase3_drugs] == ["upgradinib"]
+        assert sorted(d.generic_name for d in landscape.phase2_drugs) == ["newmab", "oldmab"]
+        assert repository.runs == [{
+            "run_type": "incremental", "status": "completed", "clinicaltrials_searched": 2,
+            "drugs_found_total": 3, "drugs_new": 1, "drugs_updated": 1,
+        }]
+        assert repository.cursors == {"Disease X": "2026-10-05"}
+
+    def test_capped_delta_holds_cursor(self, tmp_path):
+        # 150 active changes over September; the query stops after the page reaching 100
+        active = [f"2026-09-{1 + i // 5:02d}" for i in range(150)]
+        service = _service(FakeRepository({}), tmp_path)
+        service.ct_client = PagedCTClient(active, completed_dates=["2026-10-10"] * 45)
+        cursors = {"Disease X": "2026-09-01"}
+
+        asyncio.run(service._search_clinical_trials("Disease X", [], cursors))
+
+        # Active query stopped at 120 studies (last at 09-24); completed queries drained in 2 pages each
+        assert cursors == {"Disease X": "2026-09-24"}
+        assert all(p["sort"] == "LastUpdatePostDate:asc" for p in service.ct_client.calls)
+        assert len(service.ct_client.calls) == 3 + 2 + 2
+
+        service.ct_client = PagedCTClient([])
+        cursors = {"Disease X": "2026-09-01"}
+        asyncio.run(service._search_clinical_trials("Disease X", [], cursors))
+        assert cursors == {"Disease X": "2026-09-01"}
+
+    def test_saturated_date_advances_cursor(self, tmp_path):
+        # 101 changes share the cursor date; the cap of 100 lands inside that date
+        active = ["2026-09-05"] * 101 + ["2026-09-06"] * 60
+        service = _service(FakeRepository({}), tmp_path)
+        service.ct_client = PagedCTClient(active, page_size=50)
+        cursors = {"Disease X": "2026-09-05"}
+
+        trials = asyncio.run(service._search_clinical_trials("Disease X", [], cursors))
+
+        # Paged past the cap to 150 studies: all 101 on 09-05, then into 09-06
+        assert len(trials) == 150
+        assert cursors == {"Disease X": "2026-09-06"}
@@ -0,0 +1,183 @@
+"""
+Tests for bulk PMC full-text acquisition.
+
+Tests:
+- PMCIDs are resolved in one ID Converter call and downloads run concurrently
+- Parsed papers are persisted and served from the paper cache on later calls
+- The ID Converter falling over degrades to the efetch availability check
+- The spawned parser pool produces the same papers as inline parsing and is
+  reused across calls until close()
+- Single-paper full-text lookups go through the paper cache
+- PaperScope v2 fills content/tables/sections from the bulk stage
+"""
+
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.agents.paperscope_v2 import PaperScopeV2Agent
+from src.tools.http_cache import ResponseCache
+from src.tools import pubmed
+from src.tools.pubmed import ID_CONVERTER_URL, PubMedAPI
+
+PMC_IDS = {"101": "PMC9001", "102": "PMC9002", "103": "PMC9003"}  # "104" is paywalled
+
+
+def _pmc_xml(pmcid):
+    return f"""<article><front><article-meta>
+<article-title>Trial report {pmcid}</article-title>
+<abstract><p>Patients responded to treatment in study {pmcid}.</p></abstract>
+</article-meta></front>
+<body><sec><title>Results</title><p>Response rate was 42% in {pmcid} at week 12 of the study.</p></sec></body>
+</article>"""
+
+
+def _response(text, body=None):
+    return SimpleNamespace(
+        status_code=200, headers={}, text=text, content=text.encode(),
+        json=lambda: body, raise_for_status=lambda: None,
+    )
+
+
+class FakeNCBI:
+    """Serves the ID Converter and PMC efetch, tracking calls and concurrency."""
+
+    def __init__(self, idconv_fails=False, delay=0.05):
+        self.idconv_fails = idconv_fails
+        self.delay = delay
+        self.calls = []
+        self.current = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def get(self, url, params=None, headers=None):
+        if url == ID_CONVERTER_URL:
+            self.calls.append(("idconv", params["ids"]))
+            if self.idconv_fails:
+                raise RuntimeError("idconv unavailable")
+            ids = params["ids"].split(",")
+            body = {"records": [{"pmid": p, "pmcid": PMC_IDS.get(p)} for p in ids]}
+            return _response(json.dumps(body), body)
+
+        if params["db"] == "pubmed":
+            self.calls.append(("efetch_pubmed", params["id"]))
+            articles = "".join(
+                f"<PubmedArticle><MedlineCitation><PMID>{p}</PMID></MedlineCitation>"
+                f"<PubmedData><ArticleIdList><ArticleId IdType=\"pmc\">{PMC_IDS[p]}</ArticleId>"
+                f"</ArticleIdList></PubmedData></PubmedArticle>"
+                for p in params["id"].split(",") if p in PMC_IDS
+            )
+            return _response(f"<PubmedArticleSet>{articles}</PubmedArticleSet>")
+
+        with self._lock:
+            self.calls.append(("efetch_pmc", params["id"]))
+            self.current += 1
+            self.peak = max(self.peak, self.current)
+        time.sleep(self.delay)
+        with self._lock:
+            self.current -= 1
+        return _response(_pmc_xml(f"PMC{params['id']}"))
+
+    def close(self):
+        pass
+
+
+def _api(tmp_path, monkeypatch, fake):
+    monkeypatch.chdir(tmp_path)  # keep the paper cache out of data/
+    api = PubMedAPI(api_key="test", response_cache=ResponseCache(cache_dir=tmp_path / "http"))
+    api.rate_limit_delay = 0
+    api.session = fake
+    return api
+
+
+class TestFetchFulltextBulk:
+    """Tests for PubMedAPI.fetch_fulltext_bulk."""
+
+    def test_batched_lookup_concurrent_download_and_reuse(self, tmp_path, monkeypatch):
+        fake = FakeNCBI()
+        api = _api(tmp_path, monkeypatch, fake)
+
+        results = api.fetch_fulltext_bulk(["101", "102", "103", "104"], parse_workers=0)
+
+        assert sorted(results) == ["101", "102", "103"]
+        assert "42%" in results["102"]["content"]
+        assert [c for c in fake.calls if c[0] == "idconv"] == [("idconv", "101,102,103,104")]
+        assert fake.peak == 3
+
+        # A fresh client on the same paper cache makes no requests
+        again = FakeNCBI()
+        cached = _api(tmp_path, monkeypatch, again).fetch_fulltext_bulk(["101", "103"])
+        assert again.calls == []
+        assert cached["103"]["pmcid"] == "PMC9003"
+
+    def test_idconv_failure_falls_back_to_efetch(self, tmp_path, monkeypatch):
+        fake = FakeNCBI(idconv_fails=True)
+        api = _api(tmp_path, monkeypatch, fake)
+
+        results = api.fetch_fulltext_bulk(["101", "104"], parse_workers=0)
+
+        assert sorted(results) == ["101"]
+        assert ("efetch_pubmed", "101,104") in fake.calls
+
+    def test_parser_pool_matches_inline(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(pubmed, "PARSE_POOL_MIN_DOCS", 1)
+        results = []
+        for parse_workers in (0, 2):
+            workdir = tmp_path / str(parse_workers)
+            workdir.mkdir()
+            api = _api(workdir, monkeypatch, FakeNCBI())
+            results.append(api.fetch_fulltext_bulk(["101", "102", "103"], parse_workers=parse_workers))
+        inline, pooled = results
+
+        assert sorted(pooled) == ["101", "102", "103"]
+        for pmid in pooled:
+            assert pooled[pmid]["content"] == inline[pmid]["content"]
+            assert pooled[pmid]["sections"] == inline[pmid]["sections"]
+
+        pool = api._parse_pool
+        PMC_IDS["105"] = "PMC9005"
+        try:
+            assert sorted(api.fetch_fulltext_bulk(["105"], parse_workers=2)) == ["105"]
+        finally:
+            del PMC_IDS["105"]
+        assert api._parse_pool is pool
+        api.close()
+        assert api._parse_pool is None
+
+    def test_single_paper_goes_through_cache(self, tmp_path, monkeypatch):
+        fake = FakeNCBI()
+        api = _api(tmp_path, monkeypatch, fake)
+
+        paper = api.get_pmc_paper("PMC9002", pmid="102")
+        assert "42%" in paper["content"]
+        assert fake.calls == [("efetch_pmc", "9002")]
+
+        # Served from the paper cache by PMID, and by PMCID alone
+        again = FakeNCBI()
+        api = _api(tmp_path, monkeypatch, again)
+        assert api.get_pmc_paper("PMC9002", pmid="102")["content"] == paper["content"]
+        assert api.get_pmc_paper("PMC9002")["pmid"] == "102"
+        assert api.fetch_fulltext_bulk(["102"])["102"]["content"] == paper["content"]
+        assert again.calls == []
+
+
+class TestPaperScopeFullText:
+    """Tests for PaperScope v2's full-text stage."""
+
+    def test_articles_get_full_text_fields(self, tmp_path, monkeypatch):
+        agent = PaperScopeV2Agent.__new__(PaperScopeV2Agent)
+        agent.pubmed = _api(tmp_path, monkeypatch, FakeNCBI())
+        articles = [{"pmid": "101"}, {"pmid": "104"}, {"title": "no pmid"}]
+
+        agent._download_full_text_content(articles)
+
+        assert "Response rate" in articles[0]["content"]
+        assert articles[0]["metadata"]["source"] == "PubMed Central"
+        assert "content" not in articles[1]
+        assert "content" not in articles[2]
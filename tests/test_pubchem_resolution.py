@@ -0,0 +1,187 @@
+"""
+Tests for batched, cached PubChem name resolution.
+
+Tests:
+- Distinct names are resolved once, concurrently, and persisted across resolvers
+- Expired entries are re-resolved; "not found" answers are cached
+- Rate limits, 5xx and transport errors are not cached as "not found"
+- Pipeline drug merging resolves all names up front and dedupes by CID
+- DrugNameResolver.resolve_batch looks each distinct name up once
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+import requests
+
+from src.drug_extraction_system.api_clients.pubchem_client import (
+    PubChemClient,
+    PubChemUnavailableError,
+)
+from src.drug_extraction_system.resolvers.drug_name_resolver import DrugNameResolver
+from src.drug_extraction_system.resolvers.pubchem_resolution import (
+    PubChemNameStore,
+    PubChemResolver,
+)
+from src.pipeline_intelligence.models import PipelineDrug
+from src.pipeline_intelligence.service import PipelineIntelligenceService
+
+COMPOUNDS = {
+    "pf-06823859": (123, "dazukibart"),
+    "dazukibart": (123, "dazukibart"),
+    "upadacitinib": (456, "upadacitinib"),
+}
+
+
+class FakePubChemClient:
+    """Answers get_drug_info from COMPOUNDS, tracking calls and concurrency."""
+
+    def __init__(self, delay=0.02):
+        self.delay = delay
+        self.calls = []
+        self.current = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def get_drug_info(self, name):
+        with self._lock:
+            self.calls.append(name)
+            self.current += 1
+            self.peak = max(self.peak, self.current)
+        time.sleep(self.delay)
+        with self._lock:
+            self.current -= 1
+        match = COMPOUNDS.get(name.lower())
+        if not match:
+            return None
+        cid, generic = match
+        return {
+            'cid': cid,
+            'generic_name': generic,
+            'research_codes': [],
+            'all_synonyms': [generic],
+            'molecular_formula': None,
+        }
+
+
+class FakeResponse:
+    """Bare requests.Response stand-in with only a status code."""
+
+    def __init__(self, status_code):
+        self.status_code = status_code
+
+
+class StatusSession:
+    """Session answering every GET with a fixed status (or raising)."""
+
+    def __init__(self, status_code=None, error=None):
+        self.status_code = status_code
+        self.error = error
+        self.urls = []
+
+    def get(self, url, timeout=None):
+        self.urls.append(url)
+        if self.error:
+            raise self.error
+        return FakeResponse(self.status_code)
+
+
+class TestPubChemResolver:
+    """Tests for PubChemResolver and PubChemNameStore."""
+
+    def test_dedup_concurrency_and_persistence(self, tmp_path):
+        client = FakePubChemClient()
+        resolver = PubChemResolver(client, PubChemNameStore(tmp_path), max_workers=4, batch_size=2)
+
+        results = resolver.resolve_many(
+            ["PF-06823859", "pf-06823859", "Dazukibart", "upadacitinib", "unknownmab"]
+        )
+
+        assert sorted(n.lower() for n in client.calls) == [
+            "dazukibart", "pf-06823859", "unknownmab", "upadacitinib"
+        ]
+        assert client.peak == 2  # bounded by batch size
+        assert results["pf-06823859"]["cid"] == results["Dazukibart"]["cid"] == 123
+        assert results["unknownmab"] is None
+        assert resolver.names_for_cid(123) == ["dazukibart", "pf-06823859"]
+
+        # A fresh resolver on the same store makes no requests, even for misses
+        again = FakePubChemClient()
+        cached = PubChemResolver(again, PubChemNameStore(tmp_path)).resolve_many(["PF-06823859", "unknownmab"])
+        assert again.calls == []
+        assert cached["PF-06823859"]["generic_name"] == "dazukibart"
+        assert cached["unknownmab"] is None
+
+    def test_expired_entries_are_refreshed(self, tmp_path):
+        PubChemResolver(FakePubChemClient(), PubChemNameStore(tmp_path)).resolve_many(["upadacitinib", "nothing"])
+
+        client = FakePubChemClient()
+        store = PubChemNameStore(tmp_path, ttl_seconds=0, negative_ttl_seconds=0)
+        time.sleep(0.01)
+        PubChemResolver(client, store).resolve_many(["upadacitinib", "nothing"])
+        assert sorted(client.calls) == ["nothing", "upadacitinib"]
+
+    def test_unavailable_pubchem_is_not_cached(self, tmp_path):
+        store = PubChemNameStore(tmp_path)
+        for session in (StatusSession(503), StatusSession(429),
+                        StatusSession(error=requests.exceptions.ConnectionError("down"))):
+            client = PubChemClient()
+            client.session = session
+            with pytest.raises(PubChemUnavailableError):
+                client.search_by_name("flakymab")
+            assert PubChemResolver(client, store).resolve_many(["flakymab"]) == {"flakymab": None}
+            assert store.get_many(["flakymab"]) == {}
+
+        # A genuine 404 is a cacheable "not found"
+        client = PubChemClient()
+        client.session = StatusSession(404)
+        PubChemResolver(client, store).resolve_many(["flakymab"])
+        assert len(client.session.urls) == 2  # compound, then substance
+        assert store.get_many(["flakymab"]) == {"flakymab": None}
+
+
+class TestBatchedCallers:
+    """Tests for callers that share the resolver."""
+
+    def test_merge_drugs_dedupes_by_cid(self, tmp_path, monkeypatch):
+        client = FakePubChemClient()
+        # The service builds real MeSH/PubChem clients; keep their cache out of data/
+        monkeypatch.setenv("API_CACHE_DISABLED", "1")
+        service = PipelineIntelligenceService(
+            None, None, None, repository=None,
+            pubchem_resolver=PubChemResolver(client, PubChemNameStore(tmp_path)),
+        )
+
+        merged = service._merge_drugs(
+            [PipelineDrug(generic_name="PF-06823859", highest_phase="Phase 2"),
+             PipelineDrug(generic_name="upadacitinib", highest_phase="Approved")],
+            [PipelineDrug(generic_name="dazukibart", highest_phase="Phase 3"),
+             PipelineDrug(generic_name="PF-06823859", highest_phase="Phase 2")],
+        )
+
+        assert len(merged) == 2
+        assert merged[0].pubchem_cid == 123
+        assert merged[0].highest_phase == "Phase 3"
+        assert len(client.calls) == 3
+
+    def test_resolve_batch_looks_up_each_name_once(self, tmp_path):
+        client = FakePubChemClient(delay=0)
+        resolver = DrugNameResolver(
+            rxnorm_client=object(),
+            openfda_client=object(),
+            pubchem_client=client,
+            pubchem_resolver=PubChemResolver(client, PubChemNameStore(tmp_path)),
+        )
+        resolver.resolve = lambda name: resolver._resolve_via_pubchem(name)
+
+        results = resolver.resolve_batch(["PF-06823859", "PF-06823859", " PF-06823859 "])
+
+        assert client.calls == ["PF-06823859"]
+        assert results["PF-06823859"]["generic_name"] == "dazukibart"
+        assert results[" PF-06823859 "] is results["PF-06823859"]
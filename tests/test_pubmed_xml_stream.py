@@ -0,0 +1,123 @@
+"""
+Tests for the streaming PubMed/PMC XML parsers.
+
+Tests:
+- PMC articles parse identically to the tree parser, including its
+  first-match and element-truthiness quirks
+- Chunked byte input (split inside multi-byte characters) gives the same result
+- The text-only fallback matches root.itertext()
+- PubMed efetch batches match the tree parser, including when fed from a
+  response's iter_bytes(); malformed XML yields []
+"""
+
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from scripts.benchmark_pubmed_xml_parsing import PMCTreeParser, parse_pubmed_tree
+from src.tools.http_cache import CachedResponse
+from src.tools.pubmed import PMCFullTextParser, PubMedAPI
+from src.tools.pubmed_xml_stream import parse_pmc_article
+
+PMC_XML = """<?xml version="1.0" encoding="UTF-8"?>
+<pmc-articleset><article article-type="case-report">
+<front><journal-meta><journal-id>J Derm</journal-id>
+<journal-title-group><journal-title>Journal of Dermatology</journal-title></journal-title-group></journal-meta>
+<article-meta><article-id pub-id-type="doi">10.1/abc</article-id>
+<title-group><article-title>Baricitinib in <italic>refractory</italic> alopecia</article-title></title-group>
+<contrib-group><contrib contrib-type="author"><name><surname>Smith</surname><given-names>Ann</given-names></name></contrib>
+<contrib contrib-type="editor"><name><surname>Ed</surname></name></contrib>
+<contrib contrib-type="author"><name><surname>Lee</surname></name></contrib></contrib-group>
+<pub-date><day>3</day><month>Mar</month><year>2021</year></pub-date><volume>12</volume><fpage>100</fpage>
+<kwd-group><kwd>JAK <italic>inhibitor</italic></kwd><kwd> </kwd></kwd-group>
+<abstract><sec><title>Background</title><p>A patient with &amp; severe disease – treated.</p></sec></abstract>
+</article-meta></front>
+<body>
+<sec><title>Introduction</title><p>Intro <xref>1</xref> here.</p>
+  <sec><title>Sub <bold>one</bold></title><p>Nested para.</p><sec><p>Untitled</p></sec></sec>
+  <fig><label>Figure 1</label><caption><title>Scalp</title><p>Before and after.</p></caption></fig></sec>
+<sec><title>Results</title>
+<table-wrap><label>Table 1</label><caption><p>Outcomes at week 12</p></caption>
+<table><thead><tr><th>Outcome</th><th>Value</th></tr></thead>
+<tbody><tr><td>SALT&#160;50</td><td>42%</td></tr><tr><td>SALT 90</td><td>20%</td></tr></tbody></table></table-wrap>
+<p>Results para.</p></sec>
+<sec><title>Results</title><p>Duplicate key para.</p></sec>
+</body>
+<back><ref-list><ref id="r1"><mixed-citation><article-title>Prior work</article-title><source>NEJM</source>
+<year>2019</year><fpage>1</fpage><lpage>9</lpage></mixed-citation></ref>
+<ref id="r2"><element-citation><source>Lancet</source></element-citation></ref></ref-list>
+<app-group><supplementary-material><label>S1</label><caption><p>Extra data</p></caption></supplementary-material></app-group></back>
+</article></pmc-articleset>"""
+
+PUBMED_XML = """<?xml version="1.0" ?>
+<PubmedArticleSet>
+<PubmedArticle><MedlineCitation><PMID>1</PMID><Article><Journal><Title>J</Title>
+<JournalIssue><PubDate><Year>2020</Year><Month>Feb</Month><Day>3</Day></PubDate></JournalIssue></Journal>
+<ArticleTitle>A</ArticleTitle><Abstract><AbstractText Label="BG">x</AbstractText><AbstractText>y</AbstractText></Abstract>
+<AuthorList><Author><LastName>Z</LastName><ForeName>Q</ForeName></Author></AuthorList></Article></MedlineCitation>
+<PubmedData><ArticleIdList><ArticleId IdType="doi">10/1</ArticleId></ArticleIdList></PubmedData></PubmedArticle>
+<PubmedArticle><MedlineCitation><PMID>2</PMID></MedlineCitation></PubmedArticle>
+<PubmedArticle><MedlineCitation><PMID>3</PMID><Article><ArticleTitle>B</ArticleTitle></Article></MedlineCitation></PubmedArticle>
+</PubmedArticleSet>"""
+
+
+def _api():
+    return PubMedAPI.__new__(PubMedAPI)  # _parse_xml_response uses no client state
+
+
+class TestPMCStream:
+    """Tests for PubMedAPI._parse_pmc_fulltext against the tree parser."""
+
+    def test_identical_to_tree_parser(self):
+        expected = PMCTreeParser().parse(PMC_XML, "101", "PMC1")
+        paper = PMCFullTextParser()._parse_pmc_fulltext(PMC_XML, "101", "PMC1")
+
+        assert paper == expected
+        assert paper["title"] == "Baricitinib in "  # <article-title>.text
+        assert paper["journal"] == "J Derm"  # journal-title has no children
+        assert paper["authors"] == ["Ann Smith", "Lee"]
+        assert list(paper["sections"]) == ["background", "introduction", "sub__one", "results"]
+        assert paper["sections"]["results"]["content"] == "Duplicate key para."
+        assert paper["metadata"]["pages"] == "100-9"  # first <lpage> is in the references
+        assert [t["label"] for t in paper["tables"]] == ["Table 1"]
+        assert [r["ref_id"] for r in paper["references"]] == ["r1", "r2"]
+
+    def test_chunked_bytes(self):
+        api = PMCFullTextParser()
+        data = PMC_XML.encode("utf-8")
+        chunks = [data[i:i + 7] for i in range(0, len(data), 7)]
+
+        fields, _ = parse_pmc_article(chunks, api)
+        expected, _ = parse_pmc_article(PMC_XML, api)
+
+        assert fields == expected
+        assert "–" in fields["abstract"]
+
+    def test_text_fallback(self):
+        api = PMCFullTextParser()
+        xml = ("<article><front><article-title>T</article-title></front>"
+               "<back><p>" + "trailing text " * 10 + "<b>bold</b> tail</p></back></article>")
+
+        paper = api._parse_pmc_fulltext(xml, "1", "PMC2")
+
+        assert paper == PMCTreeParser().parse(xml, "1", "PMC2")
+        assert paper["content"].endswith("bold  tail")
+
+
+class TestPubmedStream:
+    """Tests for PubMedAPI._parse_xml_response against the tree parser."""
+
+    def test_identical_to_tree_parser(self):
+        api = _api()
+        articles = api._parse_xml_response(PUBMED_XML)
+
+        assert articles == parse_pubmed_tree(PUBMED_XML)
+        response = CachedResponse("https://x", 200, {}, PUBMED_XML.encode("utf-8"))
+        assert api._parse_xml_response(response.iter_bytes(64)) == articles
+        assert [a["pmid"] for a in articles] == ["1", "3"]
+        assert articles[0]["publication_date"] == "2020-02-3"
+
+    def test_malformed_returns_empty(self):
+        assert _api()._parse_xml_response(PUBMED_XML[:400]) == []
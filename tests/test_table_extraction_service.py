@@ -0,0 +1,143 @@
+"""
+Tests for the cached, page-parallel table extraction service.
+
+Tests:
+- find_table_pages flags pages with a "Table N" caption or ruled lines and
+  skips plain text pages
+- TableExtractionService only sends flagged pages to Camelot and serves a
+  byte-identical PDF under another name from the content-hash cache
+- A PDF with no detected table pages is read in full, and an empty result
+  is not cached
+- PaperProcessor extracts tables through the service (cached, raw cells
+  kept, including newlines and pipes)
+"""
+
+import shutil
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pymupdf
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.tools.paper_processor import PaperProcessor
+from src.utils import table_extraction_service as tes
+
+
+def _make_pdf(path: Path) -> Path:
+    """Page 1 text, page 2 captioned table, page 3 text, page 4 ruled grid without caption."""
+    doc = pymupdf.open()
+    for page_num in range(4):
+        page = doc.new_page()
+        if page_num == 1:
+            page.insert_text((72, 60), "Table 1. Baseline characteristics", fontsize=11)
+        if page_num in (1, 3):
+            for row in range(6):
+                page.draw_line((72, 80 + row * 20), (472, 80 + row * 20))
+        if page_num in (0, 2):
+            for line in range(20):
+                page.insert_text((72, 60 + line * 16), "Patients were treated with the study drug.")
+    doc.save(str(path))
+    return path
+
+
+class TestFindTablePages:
+    """Cheap PyMuPDF pass over the PDF."""
+
+    def test_flags_captioned_and_ruled_pages(self, tmp_path):
+        pdf = _make_pdf(tmp_path / "paper.pdf")
+        assert tes.find_table_pages(str(pdf)) == [2, 4]
+
+
+BASELINE_ROWS = [
+    ["Table 1. Baseline", "Placebo", "Drug"],
+    ["Age", "54", "55"],
+    ["Female\nn | %", "80%", "82%"],
+    ["BMI", "27", "28"],
+]
+
+
+def _baseline_table() -> tes.CamelotTable:
+    return tes.CamelotTable(df=pd.DataFrame(BASELINE_ROWS), page=2, accuracy=99.0, _bbox=(72, 80, 472, 180))
+
+
+class TestTableExtractionService:
+    """Content-hash cache and page selection."""
+
+    def test_camelot_reads_flagged_pages_and_cache_hits_by_content(self, tmp_path, monkeypatch):
+        calls = []
+        table = _baseline_table()
+
+        def fake_read_pages(pdf_path, flavor, pages, kwargs):
+            calls.append((flavor, pages))
+            return [table] if flavor == "lattice" else []
+
+        monkeypatch.setattr(tes, "_read_pages", fake_read_pages)
+        cache = tes.TableResultCache(cache_dir=tmp_path / "cache")
+        pdf = _make_pdf(tmp_path / "paper.pdf")
+
+        with tes.TableExtractionService(workers=1, cache=cache) as service:
+            first = service.extract(str(pdf))
+            assert calls and all(pages == "2,4" for _, pages in calls)
+            assert [t.label for t in first] == ["Table 1"]
+
+            calls.clear()
+            copy = shutil.copy(pdf, tmp_path / "renamed.pdf")
+            second = service.extract(str(copy))
+
+        assert calls == []
+        assert second == first
+        assert cache.get_stats()["hits"] == 1
+
+    def test_no_detected_pages_reads_all_and_skips_cache(self, tmp_path, monkeypatch):
+        calls = []
+
+        def fake_read_pages(pdf_path, flavor, pages, kwargs):
+            calls.append(pages)
+            return []
+
+        monkeypatch.setattr(tes, "_read_pages", fake_read_pages)
+        monkeypatch.setattr(tes, "find_table_pages", lambda pdf_path: [])
+        cache = tes.TableResultCache(cache_dir=tmp_path / "cache")
+        pdf = _make_pdf(tmp_path / "paper.pdf")
+
+        with tes.TableExtractionService(workers=1, cache=cache) as service:
+            assert service.extract(str(pdf)) == []
+            assert calls and set(calls) == {"all"}
+            calls.clear()
+            service.extract(str(pdf))
+
+        assert calls
+        assert cache.get_stats()["hits"] == 0
+
+
+class TestPaperProcessorTables:
+    """PaperProcessor table extraction goes through the service."""
+
+    def test_tables_cached_and_rows_kept(self, tmp_path, monkeypatch):
+        calls = []
+
+        def fake_read_pages(pdf_path, flavor, pages, kwargs):
+            calls.append(flavor)
+            return [_baseline_table()] if flavor == "lattice" else []
+
+        monkeypatch.setattr(tes, "_read_pages", fake_read_pages)
+        monkeypatch.setattr(tes.TableExtractor, "_extract_with_hybrid", lambda self, pdf_path, pages: [])
+        cache = tes.TableResultCache(cache_dir=tmp_path / "cache")
+        pdf = _make_pdf(tmp_path / "paper.pdf")
+
+        service = tes.TableExtractionService(workers=1, cache=cache)
+        processor = PaperProcessor(table_service=service)
+        first = processor.process_pdf(pdf, "paper-1")
+        assert calls
+        calls.clear()
+        second = processor.process_pdf(pdf, "paper-2")
+        service.close()
+
+        assert calls == []
+        assert [t.caption for t in first.tables] == ["Table 1"]
+        assert first.tables[0].data == BASELINE_ROWS
+        assert first.tables[0].page_number == 2
+        assert second.tables == first.tables